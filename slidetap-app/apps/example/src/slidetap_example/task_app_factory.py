@@ -18,6 +18,7 @@ from dishka import make_container
 from procrastinate import App as TaskApp
 
 from slidetap import BaseProvider
+from slidetap.config import DatabaseConfig
 from slidetap.service_provider import ConfigProvider
 from slidetap.task import (
     ProcrastinateAppProvider,
@@ -52,7 +53,9 @@ def make_task_app() -> TaskApp:
     task_provider.provide(ExampleImagePostProcessor)
     task_provider.provide(ExampleImagePreProcessor)
     app_provider = ProcrastinateAppProvider()
-    config_provider = ConfigProvider()
+    config_provider = ConfigProvider(
+        database_config=DatabaseConfig.parser_for("worker")
+    )
     config_provider.provide(ExampleConfig.parse, provides=ExampleConfig)
     container = make_container(
         base_provider, task_provider, app_provider, config_provider
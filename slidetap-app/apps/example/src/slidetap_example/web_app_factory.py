@@ -18,6 +18,7 @@ from dishka import make_async_container
 from fastapi import FastAPI
 
 from slidetap import BaseProvider
+from slidetap.config import DatabaseConfig
 from slidetap.external_interfaces.implementations.json_file_auth import (
     JsonFileAuthConfig,
     JsonFileAuthInterface,
@@ -43,7 +44,7 @@ def create_app() -> FastAPI:
         metadata_import_interface=ExampleMetadataImportInterface,
         mapper_injector=ExampleMapperInjector,
     )
-    config_provider = ConfigProvider()
+    config_provider = ConfigProvider(database_config=DatabaseConfig.parser_for("web"))
     config_provider.provide(JsonFileAuthConfig.parse, provides=JsonFileAuthConfig)
     config_provider.provide(ExampleConfig.parse, provides=ExampleConfig)
     web_provider = WebAppProvider(auth_interface=JsonFileAuthInterface)
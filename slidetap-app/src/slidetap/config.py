@@ -16,7 +16,7 @@
 import logging
 import os
 from collections.abc import Callable, Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any, Literal
 
@@ -170,6 +170,14 @@ class TaskConfig:
     )
     """Root log level for the worker process."""
 
+    background_threshold: int = 1000
+    """Number of rows a curation action affects above which it is run as a
+    background operation rather than in the request asking for it."""
+
+    metrics_port: int | None = None
+    """Port a worker writes its metrics out on, at ``/metrics``. None for a
+    worker that does not."""
+
     @classmethod
     def parse(cls, parser: ConfigParser) -> "TaskConfig":
         db_uri = parser.get_env("SLIDETAP_DBURI")
@@ -187,6 +195,10 @@ class TaskConfig:
                 "stalled_worker_timeout", 30.0
             ),
             log_level=sub.get_yaml_or_default("log_level", "INFO"),
+            background_threshold=sub.get_yaml_or_default("background_threshold", 1000),
+            metrics_port=sub.get_yaml_or_env_or_default(
+                "metrics_port", "SLIDETAP_WORKER_METRICS_PORT", None, int
+            ),
         )
 
 
@@ -223,6 +235,9 @@ class StorageConfig:
     ``<project outbox>/<bundle_prefix><alias>``; when None (default) it goes
     directly in the project outbox with no extra nesting.
     """
+    profiles: Path | None = None
+    """Where profiles of requests and tasks are written, see
+    ``ProfilingConfig``. None for nowhere, which leaves profiling off."""
 
     @classmethod
     def parse(cls, parser: ConfigParser) -> "StorageConfig":
@@ -230,20 +245,87 @@ class StorageConfig:
         outbox = storage_path.joinpath("storage")
         download = storage_path.joinpath("download")
         processing = storage_path.joinpath("processing")
-        return cls(outbox, download, processing)
+        profiles = storage_path.joinpath("profiles")
+        return cls(outbox, download, processing, profiles=profiles)
+
+
+DatabaseRole = Literal["web", "worker"]
+"""Which kind of process a database connection is for. The web app serves many
+short requests at once, while a worker runs a few long jobs, and the two are
+tuned apart."""
 
 
 @dataclass(frozen=True)
 class DatabaseConfig:
+    """How to connect to the database, and how many connections to keep.
+
+    Read from the ``database`` section of the config file, where every setting
+    can be given once for all processes and again under ``web`` or ``worker``
+    for one kind of process only::
+
+        database:
+          pool_size: 5
+          web:
+            pool_size: 20
+            statement_timeout: 30
+          worker:
+            statement_timeout: null
+    """
+
     uri: str
     no_autoflush: bool
+    pool_size: int = 5
+    """Connections kept open for reuse."""
+    max_overflow: int = 10
+    """Connections opened beyond ``pool_size`` when all of those are in use,
+    and closed again when returned."""
+    pool_timeout: float = 30.0
+    """Seconds to wait for a connection when all are in use before giving up."""
+    pool_pre_ping: bool = True
+    """Whether a connection is checked before it is handed out, so that one
+    the server has closed is replaced rather than failing the first query."""
+    pool_recycle: int = 1800
+    """Seconds after which a connection is replaced rather than reused, or -1
+    to reuse connections for as long as they work."""
+    statement_timeout: float | None = None
+    """Seconds a statement may run before the server cancels it, or None for
+    no limit. Only applied on PostgreSQL."""
+    insertmanyvalues_page_size: int = 1000
+    """Rows per statement when many rows are inserted at once."""
 
     @classmethod
-    def parse(cls, parser: ConfigParser) -> "DatabaseConfig":
+    def parse(
+        cls, parser: ConfigParser, role: DatabaseRole | None = None
+    ) -> "DatabaseConfig":
         database_uri = parser.get_env("SLIDETAP_DBURI")
         no_autoflush = parser.get_yaml_or_default("no_autoflush", False)
+        section = parser.get_yaml_or_default("database", None)
+        if not isinstance(section, dict):
+            section = {}
+        settings = {
+            key: value for key, value in section.items() if key not in ("web", "worker")
+        }
+        if role is not None:
+            settings.update(section.get(role) or {})
+        unknown = settings.keys() - {
+            field.name
+            for field in fields(cls)
+            if field.name not in ("uri", "no_autoflush")
+        }
+        if unknown:
+            raise ValueError(f"Unknown database settings {sorted(unknown)}.")
+        return cls(database_uri, no_autoflush, **settings)
+
+    @classmethod
+    def parser_for(
+        cls, role: DatabaseRole
+    ) -> Callable[[ConfigParser], "DatabaseConfig"]:
+        """A parse for one kind of process, to be given to ``ConfigProvider``."""
 
-        return cls(database_uri, no_autoflush)
+        def parse(parser: ConfigParser) -> DatabaseConfig:
+            return cls.parse(parser, role)
+
+        return parse
 
 
 @dataclass(frozen=True)
@@ -274,6 +356,53 @@ class MapperConfig:
         return cls(mapping_file)
 
 
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """Profiling of a sample of the requests and tasks a process runs, and
+    counting of the queries each request makes. Both are off unless set in the
+    ``profiling`` section of the config file::
+
+        profiling:
+          sample_rate: 0.01
+          repeated_query_threshold: 20
+
+    or as ``SLIDETAP_PROFILING_SAMPLE_RATE`` and
+    ``SLIDETAP_PROFILING_QUERY_THRESHOLD``, so that a staging deployment can
+    be profiled without a config file of its own.
+    """
+
+    sample_rate: float = 0.0
+    """Fraction of requests and tasks profiled, from 0 for none to 1 for all.
+    Each profile is written as a ``pstats`` file under ``profiles`` in the
+    storage directory, named after the route or task and the job."""
+    repeated_query_threshold: int | None = None
+    """Times one statement may run in a request before the request is logged
+    as running it once per row, or None to not count the queries of requests."""
+
+    @classmethod
+    def parse(cls, parser: ConfigParser) -> "ProfilingConfig":
+        if parser.contains_yaml_key("profiling"):
+            sub = parser.get_sub_parser("profiling")
+        else:
+            sub = ConfigParser(config={}, env=parser._env)
+        sample_rate = sub.get_yaml_or_env_or_default(
+            "sample_rate", "SLIDETAP_PROFILING_SAMPLE_RATE", 0.0, float
+        )
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(
+                f"Profiling sample rate must be between 0 and 1, was {sample_rate}."
+            )
+        return cls(
+            sample_rate=sample_rate,
+            repeated_query_threshold=sub.get_yaml_or_env_or_default(
+                "repeated_query_threshold",
+                "SLIDETAP_PROFILING_QUERY_THRESHOLD",
+                None,
+                int,
+            ),
+        )
+
+
 @dataclass(frozen=True)
 class SlideTapConfig:
     """SlideTap configuration"""
@@ -285,6 +414,13 @@ class SlideTapConfig:
     cors_origins: str | None
     use_pseudonyms: bool
     logging_config: dict[str, Any] | None = None
+    web_threads: int | None = None
+    """Threads the web app runs database work in, so that a slow query holds
+    up one thread rather than every request. When not given, as many as the
+    database pool can serve at once, since a thread beyond that would only wait
+    for a connection."""
+    profiling: ProfilingConfig = field(default_factory=ProfilingConfig)
+    """Profiling of requests and tasks, off unless configured."""
 
     @classmethod
     def parse(cls, parser: ConfigParser) -> "SlideTapConfig":
@@ -294,6 +430,8 @@ class SlideTapConfig:
         cors_origins = parser.get_env_or_none("SLIDETAP_CORS_ORIGINS")
         use_pseudonyms = parser.get_yaml_or_default("use_psuedonyms", False)
         logging_config = parser.get_yaml_or_default("logging", None)
+        web_threads = parser.get_yaml_or_default("web_threads", None)
+        profiling = ProfilingConfig.parse(parser)
 
         # Parse storage paths
         return cls(
@@ -302,4 +440,6 @@ class SlideTapConfig:
             cors_origins=cors_origins,
             use_pseudonyms=use_pseudonyms,
             logging_config=logging_config,
+            web_threads=web_threads,
+            profiling=profiling,
         )
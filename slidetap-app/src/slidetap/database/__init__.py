@@ -27,6 +27,8 @@ from slidetap.database.attribute import (
     DatabaseStringAttribute,
     DatabaseUnionAttribute,
 )
+from slidetap.database.batch_image_progress import DatabaseBatchImageProgress
+from slidetap.database.batch_validation import DatabaseBatchValidation
 from slidetap.database.db import Base, NotAllowedActionError, NotFoundError
 from slidetap.database.item import (
     DatabaseAnnotation,
@@ -42,14 +44,21 @@ from slidetap.database.mapper import (
     DatabaseMapperGroup,
     DatabaseMappingItem,
 )
+from slidetap.database.mapper_injection import DatabaseMapperInjection
 from slidetap.database.metadata_search_item import DatabaseMetadataSearchItem
+from slidetap.database.operation import DatabaseOperation
+from slidetap.database.pool import PoolStatistics
 from slidetap.database.project import (
     DatabaseBatch,
     DatabaseDataset,
     DatabaseProject,
 )
 from slidetap.database.review_issue import DatabaseReviewIssue
-from slidetap.database.unmapped_value import DatabaseUnmappedValue
+from slidetap.database.review_summary import DatabaseReviewSummary
+from slidetap.database.unmapped_value import (
+    DatabaseUnmappedValue,
+    DatabaseUnmappedValueCount,
+)
 
 __all__ = [
     "Base",
@@ -76,10 +85,17 @@ __all__ = [
     "DatabaseMapper",
     "DatabaseMappingItem",
     "DatabaseMapperGroup",
+    "DatabaseMapperInjection",
     "DatabaseMetadataSearchItem",
+    "DatabaseOperation",
     "DatabaseReviewIssue",
+    "DatabaseReviewSummary",
     "DatabaseUnmappedValue",
+    "DatabaseUnmappedValueCount",
+    "PoolStatistics",
     "DatabaseProject",
     "DatabaseDataset",
     "DatabaseBatch",
+    "DatabaseBatchValidation",
+    "DatabaseBatchImageProgress",
 ]
@@ -71,6 +71,15 @@ AttributeType = TypeVar("AttributeType", bound="Attribute")
 DatabaseAttributeType = TypeVar("DatabaseAttributeType", bound="DatabaseAttribute")
 
 
+def _copy(value: Mapping | Iterable | None):
+    """A plain copy of the attributes an attribute holds, if it holds any."""
+    if value is None:
+        return None
+    if isinstance(value, Mapping):
+        return dict(value)
+    return list(value)
+
+
 class DatabaseAttribute(Base, Generic[AttributeType, ValueStorageType]):
     """An attribute defined by a tag and a value"""
 
@@ -178,6 +187,13 @@ class DatabaseAttribute(Base, Generic[AttributeType, ValueStorageType]):
         self.updated_value = updated_value
         self.mapped_value = mapped_value
 
+    # Every kind keeps its values on its own table, and is loaded inline: a
+    # query for attributes, or for the attributes of items, joins all of those
+    # tables into the one statement. Otherwise the rows come back as the base
+    # attribute and the values of each are read the first time they are
+    # touched, a statement per attribute -- which any page of items showing
+    # its attributes does for every one of them. The tables are narrow, three
+    # values and a key, so the outer joins cost less than the round trips.
     __mapper_args__ = {
         "polymorphic_on": "attribute_value_type",
     }
@@ -238,10 +254,42 @@ class DatabaseAttribute(Base, Generic[AttributeType, ValueStorageType]):
         self.updated_value = value
         self.display_value = display_value
 
+    def holds(self, attribute: Attribute, with_mapping: bool = True) -> bool:
+        """Whether storing an attribute over this one would change nothing.
+
+        Compared on what storing it writes: the edited and displayed value,
+        the mappable value and what is refused, and with `with_mapping` also
+        what it is mapped to, for a caller that writes that too. What the item
+        came in with is not written by a save, and is not compared.
+
+        Parameters
+        ----------
+        attribute: Attribute
+            The attribute about to be stored over this one.
+        with_mapping: bool = True
+            Whether the mapping is to be written as well.
+
+        Returns
+        -------
+        bool
+            True if every part that would be written is already as stored.
+        """
+        if (
+            self.updated_value != attribute.updated_value
+            or self.display_value != attribute.display_value
+            or self.mappable_value != attribute.mappable_value
+            or self._rejected != attribute.rejected
+        ):
+            return False
+        return not with_mapping or (
+            self.mapping_item_uid == attribute.mapping_item_uid
+            and self.mapped_value == attribute.mapped_value
+        )
+
     @property
     def _rejected(self) -> RejectedValues:
         """What is refused, nothing until the column default is written on insert."""
-        return self.rejected or RejectedValues.NONE
+        return RejectedValues(self.rejected or RejectedValues.NONE)
 
     @property
     def _accepted_value(self):
@@ -291,6 +339,13 @@ class DatabaseAttribute(Base, Generic[AttributeType, ValueStorageType]):
     @property
     @abstractmethod
     def model(self) -> AnyAttribute:
+        """The attribute as a model.
+
+        Constructed rather than validated: what a row holds was validated on
+        its way into the database, and the columns are already of the types
+        the model's fields are. Validating it again on the way out is most of
+        the time a list of items takes to build, for nothing.
+        """
         raise NotImplementedError()
 
     def _raise_if_not_editable(self):
@@ -345,6 +400,7 @@ class DatabaseStringAttribute(DatabaseAttribute[StringAttribute, str]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.STRING,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "string_attribute"
 
@@ -355,7 +411,7 @@ class DatabaseStringAttribute(DatabaseAttribute[StringAttribute, str]):
 
     @property
     def model(self) -> StringAttribute:
-        return StringAttribute(
+        return StringAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -424,6 +480,7 @@ class DatabaseEnumAttribute(DatabaseAttribute[EnumAttribute, str]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.ENUM,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "enum_attribute"
 
@@ -434,7 +491,7 @@ class DatabaseEnumAttribute(DatabaseAttribute[EnumAttribute, str]):
 
     @property
     def model(self) -> EnumAttribute:
-        return EnumAttribute(
+        return EnumAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -503,6 +560,7 @@ class DatabaseDatetimeAttribute(DatabaseAttribute[DatetimeAttribute, datetime]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.DATETIME,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "datetime_attribute"
 
@@ -513,7 +571,7 @@ class DatabaseDatetimeAttribute(DatabaseAttribute[DatetimeAttribute, datetime]):
 
     @property
     def model(self) -> DatetimeAttribute:
-        return DatetimeAttribute(
+        return DatetimeAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -582,6 +640,7 @@ class DatabaseNumericAttribute(DatabaseAttribute[NumericAttribute, float]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.NUMERIC,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "number_attribute"
 
@@ -592,7 +651,7 @@ class DatabaseNumericAttribute(DatabaseAttribute[NumericAttribute, float]):
 
     @property
     def model(self) -> NumericAttribute:
-        return NumericAttribute(
+        return NumericAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -663,6 +722,7 @@ class DatabaseMeasurementAttribute(
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.MEASUREMENT,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "measurement_attribute"
 
@@ -673,7 +733,7 @@ class DatabaseMeasurementAttribute(
 
     @property
     def model(self) -> MeasurementAttribute:
-        return MeasurementAttribute(
+        return MeasurementAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -742,6 +802,7 @@ class DatabaseCodeAttribute(DatabaseAttribute[CodeAttribute, Code]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.CODE,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "code_attribute"
 
@@ -752,7 +813,7 @@ class DatabaseCodeAttribute(DatabaseAttribute[CodeAttribute, Code]):
 
     @property
     def model(self) -> CodeAttribute:
-        return CodeAttribute(
+        return CodeAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -821,6 +882,7 @@ class DatabaseBooleanAttribute(DatabaseAttribute[BooleanAttribute, bool]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.BOOLEAN,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "boolean_attribute"
 
@@ -831,7 +893,7 @@ class DatabaseBooleanAttribute(DatabaseAttribute[BooleanAttribute, bool]):
 
     @property
     def model(self) -> BooleanAttribute:
-        return BooleanAttribute(
+        return BooleanAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -908,6 +970,7 @@ class DatabaseObjectAttribute(
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.OBJECT,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "object_attribute"
 
@@ -918,12 +981,14 @@ class DatabaseObjectAttribute(
 
     @property
     def model(self) -> ObjectAttribute:
-        return ObjectAttribute(
+        return ObjectAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
-            original_value=self.original_value,
-            updated_value=self.updated_value,
-            mapped_value=self.mapped_value,
+            # Copies, as validating the model would have made: the model is
+            # not to share what it holds with the row.
+            original_value=_copy(self.original_value),
+            updated_value=_copy(self.updated_value),
+            mapped_value=_copy(self.mapped_value),
             valid=self.valid,
             display_value=self.display_value,
             mappable_value=self.mappable_value,
@@ -993,6 +1058,7 @@ class DatabaseListAttribute(DatabaseAttribute[ListAttribute, list[AnyAttribute]]
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.LIST,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "attribute_list"
 
@@ -1003,12 +1069,12 @@ class DatabaseListAttribute(DatabaseAttribute[ListAttribute, list[AnyAttribute]]
 
     @property
     def model(self) -> ListAttribute:
-        return ListAttribute(
+        return ListAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
-            original_value=self.original_value,
-            updated_value=self.updated_value,
-            mapped_value=self.mapped_value,
+            original_value=_copy(self.original_value),
+            updated_value=_copy(self.updated_value),
+            mapped_value=_copy(self.mapped_value),
             valid=self.valid,
             display_value=self.display_value,
             mappable_value=self.mappable_value,
@@ -1073,6 +1139,7 @@ class DatabaseUnionAttribute(DatabaseAttribute[UnionAttribute, AnyAttribute]):
 
     __mapper_args__ = {
         "polymorphic_identity": AttributeValueType.UNION,
+        "polymorphic_load": "inline",
     }
     __tablename__ = "attribute_union"
 
@@ -1083,7 +1150,7 @@ class DatabaseUnionAttribute(DatabaseAttribute[UnionAttribute, AnyAttribute]):
 
     @property
     def model(self) -> UnionAttribute:
-        return UnionAttribute(
+        return UnionAttribute.model_construct(
             uid=self.uid,
             schema_uid=self.schema_uid,
             original_value=self.original_value,
@@ -0,0 +1,248 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""How many of the selected images of a batch are still to be processed or
+stored, kept as the images change."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import (
+    Connection,
+    ForeignKey,
+    Integer,
+    Table,
+    event,
+    inspect,
+    update,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    Session,
+    UOWTransaction,
+    mapped_column,
+    relationship,
+)
+
+from slidetap.database.db import Base
+from slidetap.database.item import DatabaseImage
+from slidetap.database.project import DatabaseBatch
+from slidetap.model import ImageStatus
+
+PRE_PROCESSING_SETTLED = [
+    # An image that failed is not going to reach the next status by itself, and
+    # waiting for it would leave the batch unfinished for good — which would
+    # also keep the case it is under from ever being flagged for somebody to
+    # deal with it. It stays in the batch, not valid and raised on, for a
+    # person to fetch again or take out of the project.
+    ImageStatus.DOWNLOADING_FAILED,
+    ImageStatus.PRE_PROCESSING_FAILED,
+    ImageStatus.PRE_PROCESSED,
+]
+"""What an image has to be for the batch to be finished pre-processing it."""
+
+POST_PROCESSING_SETTLED = [
+    ImageStatus.POST_PROCESSING_FAILED,
+    ImageStatus.POST_PROCESSED,
+]
+"""What an image has to be for the batch to be finished post-processing it."""
+
+
+class DatabaseBatchImageProgress(Base):
+    """The counts of what the images of a batch are still waiting for.
+
+    Each image finishing pre- or post-processing asked whether any image of
+    its batch was still not done, a query over the images of the batch for
+    every image in it, and the batch moved on when the last one found none.
+    The counts are instead moved as each image's status, selection or batch
+    is written, in the same transaction as the write, so that the image that
+    finishes the batch reads one row to know it did.
+
+    Like the counts of the validation of a batch, they are moved rather than
+    recounted, and what could make them drift is corrected by recounting
+    them now and then, see ``DatabaseService.reconcile_batch_image_progress``.
+    """
+
+    __tablename__ = "batch_image_progress"
+
+    batch_uid: Mapped[UUID] = mapped_column(ForeignKey("batch.uid"), primary_key=True)
+    not_pre_processed: Mapped[int] = mapped_column(Integer, default=0)
+    """Selected images in the batch not in ``PRE_PROCESSING_SETTLED``."""
+    not_post_processed: Mapped[int] = mapped_column(Integer, default=0)
+    """Selected images in the batch not in ``POST_PROCESSING_SETTLED``."""
+    not_stored: Mapped[int] = mapped_column(Integer, default=0)
+    """Selected images in the batch not stored."""
+    failed_to_store: Mapped[int] = mapped_column(Integer, default=0)
+    """Selected images in the batch that failed to store."""
+
+    batch: Mapped[DatabaseBatch] = relationship(
+        DatabaseBatch, back_populates="image_progress"
+    )
+
+    def __init__(
+        self,
+        not_pre_processed: int = 0,
+        not_post_processed: int = 0,
+        not_stored: int = 0,
+        failed_to_store: int = 0,
+    ):
+        super().__init__(
+            not_pre_processed=not_pre_processed,
+            not_post_processed=not_post_processed,
+            not_stored=not_stored,
+            failed_to_store=failed_to_store,
+        )
+
+
+_Counts = tuple[int, int, int, int]
+
+
+def add_to_batch_image_progress(
+    connection: Connection, changes: Mapping[UUID, _Counts]
+) -> None:
+    """Move the counts of batches by how much their images changed.
+
+    Parameters
+    ----------
+    connection: Connection
+        Connection of the transaction the images were changed in.
+    changes: Mapping[UUID, tuple[int, int, int, int]]
+        By batch, how many selected images not pre-processed, not
+        post-processed, not stored and failed to store were added to it.
+        Removed ones count as negative.
+    """
+    # A table of its own, which ``__table__`` is typed more loosely than.
+    table = cast(Table, DatabaseBatchImageProgress.__table__)
+    for batch_uid, (
+        not_pre_processed,
+        not_post_processed,
+        not_stored,
+        failed_to_store,
+    ) in changes.items():
+        if not any(
+            (not_pre_processed, not_post_processed, not_stored, failed_to_store)
+        ):
+            continue
+        connection.execute(
+            update(table)
+            .where(table.c.batch_uid == batch_uid)
+            .values(
+                not_pre_processed=table.c.not_pre_processed + not_pre_processed,
+                not_post_processed=table.c.not_post_processed + not_post_processed,
+                not_stored=table.c.not_stored + not_stored,
+                failed_to_store=table.c.failed_to_store + failed_to_store,
+            )
+        )
+
+
+_COUNTED = ("batch_uid", "selected", "status")
+"""What an image's part in the counts of its batch is read from. Mapped with
+active history, so that the value an image had before a change is known when
+the change is flushed."""
+
+_WAS_COUNTED = "slidetap.batch_image_progress"
+"""Key in ``Session.info`` for what the images changed in a flush counted for
+before it."""
+
+
+def _counted_as(values: Mapping[str, Any]) -> tuple[UUID, _Counts] | None:
+    if values["batch_uid"] is None or not values["selected"]:
+        return None
+    status = values["status"]
+    return values["batch_uid"], (
+        0 if status in PRE_PROCESSING_SETTLED else 1,
+        0 if status in POST_PROCESSING_SETTLED else 1,
+        0 if status == ImageStatus.STORED else 1,
+        1 if status == ImageStatus.STORING_FAILED else 0,
+    )
+
+
+def _counted_before(image: DatabaseImage) -> tuple[UUID, _Counts] | None:
+    state = inspect(image)
+    values: dict[str, Any] = {}
+    for key in _COUNTED:
+        history = state.attrs[key].load_history()
+        if history.deleted:
+            values[key] = history.deleted[0]
+        elif history.unchanged:
+            values[key] = history.unchanged[0]
+        else:
+            values[key] = None
+    return _counted_as(values)
+
+
+def _counted_now(image: DatabaseImage) -> tuple[UUID, _Counts] | None:
+    return _counted_as({key: getattr(image, key) for key in _COUNTED})
+
+
+_Changes = defaultdict[UUID, list[int]]
+
+
+def _add(changes: _Changes, counted: tuple[UUID, _Counts] | None, sign: int) -> None:
+    if counted is None:
+        return
+    batch_uid, counts = counted
+    for index, count in enumerate(counts):
+        changes[batch_uid][index] += sign * count
+
+
+def _changes_counted(image: DatabaseImage) -> bool:
+    state = inspect(image)
+    return any(state.attrs[key].history.has_changes() for key in _COUNTED)
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(
+    session: Session, flush_context: UOWTransaction, instances: Iterable[Any] | None
+) -> None:
+    # A new batch is given its counts here, to be inserted with it.
+    for batch in session.new:
+        if isinstance(batch, DatabaseBatch) and batch.image_progress is None:
+            batch.image_progress = DatabaseBatchImageProgress()
+    # What a removed or changed image counted for has to be read before the
+    # flush: a removed one cannot be loaded after it.
+    changes: _Changes = defaultdict(lambda: [0, 0, 0, 0])
+    changed: list[DatabaseImage] = []
+    for image in session.dirty:
+        if isinstance(image, DatabaseImage) and _changes_counted(image):
+            changed.append(image)
+            _add(changes, _counted_before(image), -1)
+    for image in session.deleted:
+        if isinstance(image, DatabaseImage):
+            _add(changes, _counted_before(image), -1)
+    session.info[_WAS_COUNTED] = (changes, changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    # What a new or changed image counts for is read after the flush, when the
+    # column defaults of a new one have been filled in.
+    changes: _Changes
+    changed: list[DatabaseImage]
+    changes, changed = session.info.pop(
+        _WAS_COUNTED, (defaultdict(lambda: [0, 0, 0, 0]), [])
+    )
+    for image in (*session.new, *changed):
+        if isinstance(image, DatabaseImage) and image not in session.deleted:
+            _add(changes, _counted_now(image), 1)
+    if changes:
+        add_to_batch_image_progress(
+            session.connection(),
+            {
+                batch_uid: (counts[0], counts[1], counts[2], counts[3])
+                for batch_uid, counts in changes.items()
+            },
+        )
@@ -0,0 +1,217 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""How many of the items of a batch are selected, and how many of those are
+not valid, kept as the items change."""
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from typing import Any, cast
+from uuid import UUID
+
+from sqlalchemy import (
+    Connection,
+    ForeignKey,
+    Integer,
+    Table,
+    event,
+    inspect,
+    update,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    Session,
+    UOWTransaction,
+    mapped_column,
+    relationship,
+)
+
+from slidetap.database.db import Base
+from slidetap.database.item import (
+    FAILED_IMAGE_STATUSES,
+    DatabaseImage,
+    DatabaseItem,
+)
+from slidetap.database.project import DatabaseBatch
+
+
+class DatabaseBatchValidation(Base):
+    """The counts a batch's validation is answered from.
+
+    The validation of a batch is polled by the client for as long as the
+    batch is processed, and answering it meant loading every selected item of
+    the batch to look at its validity. The counts are instead moved as each
+    item's validity, selection or batch is written, in the same transaction
+    as the write, so that reading them is one row. Moved rather than
+    recounted, so that a write costs the same whatever the size of the batch.
+
+    What could make the counts drift -- a statement written around the
+    session, a row edited by hand -- is corrected by recounting them now and
+    then, see ``DatabaseService.reconcile_batch_validations``.
+    """
+
+    __tablename__ = "batch_validation"
+
+    batch_uid: Mapped[UUID] = mapped_column(ForeignKey("batch.uid"), primary_key=True)
+    selected_items: Mapped[int] = mapped_column(Integer, default=0)
+    non_valid_items: Mapped[int] = mapped_column(Integer, default=0)
+    """Selected items in the batch that are not valid."""
+
+    batch: Mapped[DatabaseBatch] = relationship(
+        DatabaseBatch, back_populates="validation"
+    )
+
+    def __init__(self, selected_items: int = 0, non_valid_items: int = 0):
+        super().__init__(selected_items=selected_items, non_valid_items=non_valid_items)
+
+
+def add_to_batch_validations(
+    connection: Connection, changes: Mapping[UUID, tuple[int, int]]
+) -> None:
+    """Move the counts of batches by how much their items changed.
+
+    Parameters
+    ----------
+    connection: Connection
+        Connection of the transaction the items were changed in.
+    changes: Mapping[UUID, tuple[int, int]]
+        By batch, how many selected items and how many selected non-valid
+        items were added to it. Removed ones count as negative.
+    """
+    # A table of its own, which ``__table__`` is typed more loosely than.
+    table = cast(Table, DatabaseBatchValidation.__table__)
+    for batch_uid, (selected_items, non_valid_items) in changes.items():
+        if selected_items == 0 and non_valid_items == 0:
+            continue
+        connection.execute(
+            update(table)
+            .where(table.c.batch_uid == batch_uid)
+            .values(
+                selected_items=table.c.selected_items + selected_items,
+                non_valid_items=table.c.non_valid_items + non_valid_items,
+            )
+        )
+
+
+_COUNTED = (
+    "batch_uid",
+    "selected",
+    "valid_attributes",
+    "valid_relations",
+    "valid_pseudonym",
+)
+"""What an item's part in the counts of its batch is read from. Mapped with
+active history, so that the value an item had before a change is known when
+the change is flushed."""
+
+_COUNTED_IMAGE = (*_COUNTED, "status")
+"""What an image's part is read from: an image that has failed is not valid,
+see ``DatabaseImage.valid``."""
+
+
+def _counted_keys(item: DatabaseItem[Any]) -> tuple[str, ...]:
+    return _COUNTED_IMAGE if isinstance(item, DatabaseImage) else _COUNTED
+
+
+_WAS_COUNTED = "slidetap.batch_validation"
+"""Key in ``Session.info`` for what the items changed in a flush counted for
+before it."""
+
+
+def _counted_as(values: Mapping[str, Any]) -> tuple[UUID, int, int] | None:
+    if values["batch_uid"] is None or not values["selected"]:
+        return None
+    valid = (
+        values["valid_attributes"]
+        and values["valid_relations"]
+        and values["valid_pseudonym"]
+        and values.get("status") not in FAILED_IMAGE_STATUSES
+    )
+    return values["batch_uid"], 1, 0 if valid else 1
+
+
+def _counted_before(item: DatabaseItem[Any]) -> tuple[UUID, int, int] | None:
+    state = inspect(item)
+    values: dict[str, Any] = {}
+    for key in _counted_keys(item):
+        history = state.attrs[key].load_history()
+        if history.deleted:
+            values[key] = history.deleted[0]
+        elif history.unchanged:
+            values[key] = history.unchanged[0]
+        else:
+            values[key] = None
+    return _counted_as(values)
+
+
+def _counted_now(item: DatabaseItem[Any]) -> tuple[UUID, int, int] | None:
+    return _counted_as({key: getattr(item, key) for key in _counted_keys(item)})
+
+
+_Changes = defaultdict[UUID, list[int]]
+
+
+def _add(changes: _Changes, counted: tuple[UUID, int, int] | None, sign: int):
+    if counted is None:
+        return
+    batch_uid, items, non_valid_items = counted
+    changes[batch_uid][0] += sign * items
+    changes[batch_uid][1] += sign * non_valid_items
+
+
+def _changes_counted(item: DatabaseItem[Any]) -> bool:
+    state = inspect(item)
+    return any(state.attrs[key].history.has_changes() for key in _counted_keys(item))
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(
+    session: Session, flush_context: UOWTransaction, instances: Iterable[Any] | None
+) -> None:
+    # A new batch is given its counts here, to be inserted with it.
+    for batch in session.new:
+        if isinstance(batch, DatabaseBatch) and batch.validation is None:
+            batch.validation = DatabaseBatchValidation()
+    # What a removed or changed item counted for has to be read before the
+    # flush: a removed one cannot be loaded after it.
+    changes: _Changes = defaultdict(lambda: [0, 0])
+    changed: list[DatabaseItem[Any]] = []
+    for item in session.dirty:
+        if isinstance(item, DatabaseItem) and _changes_counted(item):
+            changed.append(item)
+            _add(changes, _counted_before(item), -1)
+    for item in session.deleted:
+        if isinstance(item, DatabaseItem):
+            _add(changes, _counted_before(item), -1)
+    session.info[_WAS_COUNTED] = (changes, changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    # What a new or changed item counts for is read after the flush, when the
+    # column defaults of a new one have been filled in.
+    changes: _Changes
+    changed: list[DatabaseItem[Any]]
+    changes, changed = session.info.pop(_WAS_COUNTED, (defaultdict(lambda: [0, 0]), []))
+    for item in (*session.new, *changed):
+        if isinstance(item, DatabaseItem) and item not in session.deleted:
+            _add(changes, _counted_now(item), 1)
+    if changes:
+        add_to_batch_validations(
+            session.connection(),
+            {
+                batch_uid: (items, non_valid)
+                for batch_uid, (items, non_valid) in changes.items()
+            },
+        )
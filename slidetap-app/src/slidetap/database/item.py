@@ -18,7 +18,7 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from datetime import datetime
 from typing import (
     Any,
@@ -46,16 +46,20 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from slidetap.database.attribute import DatabaseAttribute
 from slidetap.database.db import Base, NotAllowedActionError
 from slidetap.database.project import DatabaseBatch, DatabaseDataset
+from slidetap.database.types import processing_profile_db_type
 from slidetap.model import (
     Annotation,
     AnyItem,
     Image,
     ImageFile,
     ImageFormat,
+    ImageProcessingPhase,
+    ImageProcessingProfile,
     ImageStatus,
     ItemType,
     ItemValueType,
     Observation,
+    ProcessingMeasurement,
     ReviewStatus,
     Sample,
 )
@@ -64,6 +68,15 @@ from slidetap.model.tag import Tag
 
 DatabaseItemType = TypeVar("DatabaseItemType", bound="DatabaseItem")
 
+FAILED_IMAGE_STATUSES = (
+    ImageStatus.DOWNLOADING_FAILED,
+    ImageStatus.PRE_PROCESSING_FAILED,
+    ImageStatus.POST_PROCESSING_FAILED,
+    ImageStatus.STORING_FAILED,
+)
+"""The statuses of an image that has failed, see ``DatabaseImage.failed``. A
+failed image is not valid, however valid its attributes and relations are."""
+
 
 class DatabaseTag(Base):
     uid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
@@ -136,12 +149,18 @@ class DatabaseItem(Base, Generic[ItemType]):
     name: Mapped[str | None] = mapped_column(String(128))
     external_identifier: Mapped[str | None] = mapped_column(String(128))
     pseudonym: Mapped[str | None] = mapped_column(String(128))
-    selected: Mapped[bool] = mapped_column(Boolean, default=True)
+    selected: Mapped[bool] = mapped_column(Boolean, default=True, active_history=True)
     comment: Mapped[str | None] = mapped_column(String(512))
 
-    valid_attributes: Mapped[bool] = mapped_column(Boolean, default=False)
-    valid_relations: Mapped[bool] = mapped_column(Boolean, default=False)
-    valid_pseudonym: Mapped[bool] = mapped_column(Boolean, default=True)
+    valid_attributes: Mapped[bool] = mapped_column(
+        Boolean, default=False, active_history=True
+    )
+    valid_relations: Mapped[bool] = mapped_column(
+        Boolean, default=False, active_history=True
+    )
+    valid_pseudonym: Mapped[bool] = mapped_column(
+        Boolean, default=True, active_history=True
+    )
     item_value_type: Mapped[ItemValueType] = mapped_column(
         Enum(ItemValueType), index=True
     )
@@ -174,7 +193,9 @@ class DatabaseItem(Base, Generic[ItemType]):
     dataset_uid: Mapped[UUID] = mapped_column(
         Uuid, ForeignKey("dataset.uid"), index=True
     )
-    batch_uid: Mapped[UUID] = mapped_column(Uuid, ForeignKey("batch.uid"), index=True)
+    batch_uid: Mapped[UUID] = mapped_column(
+        Uuid, ForeignKey("batch.uid"), index=True, active_history=True
+    )
 
     __mapper_args__ = {
         "polymorphic_on": "item_value_type",
@@ -271,6 +292,12 @@ class DatabaseItem(Base, Generic[ItemType]):
     @property
     @abstractmethod
     def model(self) -> AnyItem:
+        """The item as a model.
+
+        Constructed rather than validated, as the attributes are (see
+        :py:attr:`DatabaseAttribute.model`): the columns are already of the
+        types the model's fields are.
+        """
         raise NotImplementedError()
 
     @property
@@ -365,7 +392,7 @@ class DatabaseObservation(DatabaseItem[Observation]):
 
     @property
     def model(self) -> Observation:
-        return Observation(
+        return Observation.model_construct(
             uid=self.uid,
             identifier=self.identifier,
             name=self.name,
@@ -472,7 +499,7 @@ class DatabaseAnnotation(DatabaseItem[Annotation]):
         for observation in self.observations:
             if observation.selected:
                 observations[observation.dataset_uid].append(observation.uid)
-        return Annotation(
+        return Annotation.model_construct(
             uid=self.uid,
             identifier=self.identifier,
             name=self.name,
@@ -500,7 +527,7 @@ class DatabaseAnnotation(DatabaseItem[Annotation]):
                 if self.image is not None and self.image.selected
                 else None
             ),
-            observation=observations,
+            observation=dict(observations),
             comment=self.comment,
             tags=[tag.uid for tag in self.tags],
         )
@@ -536,7 +563,7 @@ class DatabaseImageFile(Base):
 
     @property
     def model(self) -> ImageFile:
-        return ImageFile(uid=self.uid, filename=self.filename)
+        return ImageFile.model_construct(uid=self.uid, filename=self.filename)
 
 
 class DatabaseImage(DatabaseItem[Image]):
@@ -571,9 +598,15 @@ class DatabaseImage(DatabaseItem[Image]):
     converted, so that writing the metadata again fills in from the file rather
     than from what the application last wrote."""
 
-    status: Mapped[ImageStatus] = mapped_column(Enum(ImageStatus))
+    status: Mapped[ImageStatus] = mapped_column(Enum(ImageStatus), active_history=True)
     status_message: Mapped[str | None] = mapped_column(String(512))
     format: Mapped[ImageFormat] = mapped_column(Enum(ImageFormat))
+    processing_profile: Mapped[ImageProcessingProfile | None] = mapped_column(
+        processing_profile_db_type, deferred=True
+    )
+    """What each phase of processing the image took, the last time it ran.
+    Deferred, as it is read for the image alone and would otherwise be loaded
+    with every image listed."""
     # Relationship
     samples: Mapped[set[DatabaseSample]] = relationship(
         "DatabaseSample", secondary=sample_to_image, back_populates="images"
@@ -661,13 +694,7 @@ class DatabaseImage(DatabaseItem[Image]):
             cls.valid_attributes,
             cls.valid_relations,
             cls.valid_pseudonym,
-            cls.status.notin_(
-                [
-                    ImageStatus.DOWNLOADING_FAILED,
-                    ImageStatus.PRE_PROCESSING_FAILED,
-                    ImageStatus.POST_PROCESSING_FAILED,
-                ]
-            ),
+            cls.status.notin_(FAILED_IMAGE_STATUSES),
         )
 
     @hybrid_property
@@ -733,12 +760,12 @@ class DatabaseImage(DatabaseItem[Image]):
 
     @hybrid_property
     def failed(self) -> bool:
-        return (
-            self.downloading_failed
-            or self.pre_processing_failed
-            or self.post_processing_failed
-            or self.storing_failed
-        )
+        return self.status in FAILED_IMAGE_STATUSES
+
+    @failed.inplace.expression
+    @classmethod
+    def _failed_expression(cls):
+        return cls.status.in_(FAILED_IMAGE_STATUSES)
 
     @property
     def model(self) -> Image:
@@ -754,7 +781,7 @@ class DatabaseImage(DatabaseItem[Image]):
         for observation in self.observations:
             if observation.selected:
                 observations[observation.schema_uid].append(observation.uid)
-        return Image(
+        return Image.model_construct(
             uid=self.uid,
             identifier=self.identifier,
             name=self.name,
@@ -788,14 +815,25 @@ class DatabaseImage(DatabaseItem[Image]):
             metadata_digest=self.metadata_digest,
             source_metadata=self.source_metadata,
             files=[file.model for file in self.files],
-            samples=samples,
-            annotations=annotations,
-            observations=observations,
+            samples=dict(samples),
+            annotations=dict(annotations),
+            observations=dict(observations),
             comment=self.comment,
             tags=[tag.uid for tag in self.tags],
             format=self.format,
         )
 
+    def record_processing(
+        self,
+        phase: ImageProcessingPhase,
+        measurement: ProcessingMeasurement,
+        steps: Mapping[str, ProcessingMeasurement] | None = None,
+    ) -> None:
+        """Put a run of a phase in the processing profile, in place of any
+        earlier run of it."""
+        profile = self.processing_profile or ImageProcessingProfile()
+        self.processing_profile = profile.with_phase(phase, measurement, steps)
+
     def set_status_message(self, message: str | None) -> None:
         """Set ``status_message``, trimmed to the column width.
 
@@ -1059,7 +1097,7 @@ class DatabaseSample(DatabaseItem[Sample]):
         for observation in self.observations:
             if observation.selected:
                 observations[observation.schema_uid].append(observation.uid)
-        return Sample(
+        return Sample.model_construct(
             uid=self.uid,
             identifier=self.identifier,
             name=self.name,
@@ -1082,10 +1120,10 @@ class DatabaseSample(DatabaseItem[Sample]):
             dataset_uid=self.dataset_uid,
             schema_uid=self.schema_uid,
             batch_uid=self.batch_uid,
-            children=children,
-            parents=parents,
-            images=images,
-            observations=observations,
+            children=dict(children),
+            parents=dict(parents),
+            images=dict(images),
+            observations=dict(observations),
             external_identifier=self.external_identifier,
             comment=self.comment,
             tags=[tag.uid for tag in self.tags],
@@ -0,0 +1,43 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""What the mappers were last injected from."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from slidetap.database.db import Base
+
+
+class DatabaseMapperInjection(Base):
+    """The fingerprint of what an injector last injected the mappers from.
+
+    Every process that starts injects the mappers, and a process starting
+    with the same mapping file and schema as the one before it has nothing
+    to add. It reads this instead of the mapping file, and skips injecting.
+    """
+
+    __tablename__ = "mapper_injection"
+
+    injector: Mapped[str] = mapped_column(String(128), primary_key=True)
+    """The injector that injected, by the name of its class."""
+    fingerprint: Mapped[str] = mapped_column(String(128))
+    injected_at: Mapped[datetime] = mapped_column(DateTime)
+
+    def __init__(self, injector: str, fingerprint: str, injected_at: datetime):
+        super().__init__(
+            injector=injector, fingerprint=fingerprint, injected_at=injected_at
+        )
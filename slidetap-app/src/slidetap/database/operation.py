@@ -0,0 +1,86 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""A curation action run in the background, and how far it has come."""
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import JSON, Boolean, DateTime, Enum, Integer, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from slidetap.database.db import Base
+from slidetap.model.operation import Operation, OperationKind, OperationStatus
+
+
+class DatabaseOperation(Base):
+    """An action run in the background.
+
+    Kept in the database rather than in the job queue, so that the web process
+    can answer how far it has come without asking the workers, and so that
+    what it ended with is still there after the job is cleaned out of the
+    queue.
+    """
+
+    __tablename__ = "operation"
+
+    uid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
+    kind: Mapped[OperationKind] = mapped_column(Enum(OperationKind))
+    subject_uid: Mapped[UUID] = mapped_column(Uuid, index=True)
+    """What the action is run on. Not a foreign key: it is an item, a batch, a
+    dataset or a mapping depending on the kind, and deleting it is one of the
+    actions."""
+
+    parameters: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+    """What else the action is asked with, as the worker is handed it."""
+
+    status: Mapped[OperationStatus] = mapped_column(Enum(OperationStatus))
+    total: Mapped[int | None] = mapped_column(Integer)
+    done: Mapped[int] = mapped_column(Integer, default=0)
+    message: Mapped[str | None] = mapped_column(String(512))
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+    def __init__(
+        self,
+        kind: OperationKind,
+        subject_uid: UUID,
+        parameters: dict[str, Any] | None = None,
+    ):
+        super().__init__(
+            kind=kind,
+            subject_uid=subject_uid,
+            parameters=parameters or {},
+            status=OperationStatus.QUEUED,
+            done=0,
+            cancel_requested=False,
+            created_at=datetime.now(),
+        )
+
+    @property
+    def model(self) -> Operation:
+        return Operation(
+            uid=self.uid,
+            kind=self.kind,
+            subject_uid=self.subject_uid,
+            status=self.status,
+            total=self.total,
+            done=self.done,
+            message=self.message,
+            cancel_requested=self.cancel_requested,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+        )
@@ -0,0 +1,98 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""The connections kept to the database, and how long they are waited for."""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
+
+
+@dataclass(frozen=True)
+class PoolStatistics:
+    """How the connections of a process have been handed out since it started.
+
+    A request failing with a pool timeout while the database itself is idle
+    says the pool is too small for what the process asks of it, not that the
+    database is slow. These tell the two apart: the time spent waiting for a
+    connection, against how many are in use.
+    """
+
+    checkouts: int
+    """Connections handed out."""
+    timeouts: int
+    """Waits for a connection that gave up."""
+    wait_seconds: float
+    """Time spent waiting for connections, in all."""
+    longest_wait_seconds: float
+    """The longest wait for one connection."""
+    checked_out: int
+    """Connections in use now."""
+    size: int
+    """Connections the pool keeps open for reuse."""
+    overflow: int
+    """Connections open beyond ``size`` now."""
+
+
+class TimedQueuePool(QueuePool):
+    """A ``QueuePool`` that counts what it hands out and how long that took.
+
+    The pool has events for a connection being handed out, but none for a
+    request for one starting, so the wait is timed around getting one from the
+    queue instead. Counted under a lock, as the web app hands connections out
+    from many threads at once.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._statistics_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+        self._longest_wait_seconds = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self._count(time.perf_counter() - start, timed_out=True)
+            raise
+        self._count(time.perf_counter() - start, timed_out=False)
+        return connection
+
+    def _count(self, waited: float, timed_out: bool) -> None:
+        with self._statistics_lock:
+            if timed_out:
+                self._timeouts += 1
+            else:
+                self._checkouts += 1
+            self._wait_seconds += waited
+            self._longest_wait_seconds = max(self._longest_wait_seconds, waited)
+
+    def statistics(self) -> PoolStatistics:
+        with self._statistics_lock:
+            return PoolStatistics(
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                wait_seconds=self._wait_seconds,
+                longest_wait_seconds=self._longest_wait_seconds,
+                checked_out=self.checkedout(),
+                size=self.size(),
+                overflow=max(self.overflow(), 0),
+            )
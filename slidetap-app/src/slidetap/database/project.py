@@ -18,7 +18,7 @@ from __future__ import annotations
 
 import datetime
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from uuid import UUID, uuid4
 
 from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, String, Table, Uuid
@@ -36,6 +36,10 @@ from slidetap.model import (
     ProjectStatus,
 )
 
+if TYPE_CHECKING:
+    from slidetap.database.batch_image_progress import DatabaseBatchImageProgress
+    from slidetap.database.batch_validation import DatabaseBatchValidation
+
 
 class DatabaseProject(Base):
     """
@@ -290,6 +294,18 @@ class DatabaseBatch(Base):
         DatabaseProject,
         back_populates="batches",
     )
+    validation: Mapped[DatabaseBatchValidation | None] = relationship(
+        "DatabaseBatchValidation",
+        back_populates="batch",
+        # Deleted with the batch.
+        cascade="all, delete-orphan",
+    )
+    image_progress: Mapped[DatabaseBatchImageProgress | None] = relationship(
+        "DatabaseBatchImageProgress",
+        back_populates="batch",
+        # Deleted with the batch.
+        cascade="all, delete-orphan",
+    )
     # For relations
     project_uid: Mapped[UUID] = mapped_column(Uuid, ForeignKey("project.uid"))
 
@@ -0,0 +1,55 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""What is open on a review unit, as the queue shows it."""
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import JSON, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
+
+from slidetap.database.db import Base
+from slidetap.database.item import DatabaseItem
+
+
+class DatabaseReviewSummary(Base):
+    """How many issues are open on a review unit, and why the first of them
+    were raised.
+
+    Kept up to date as issues are raised and settled rather than gathered from
+    the issues each time the queue is read: the queue is read far more often
+    than anything is raised, and gathering it meant reading every open issue of
+    every unit in the dataset before the first row could be shown. With it the
+    queue is one query over the units, which can be paged, sorted and filtered
+    by the database.
+
+    A unit with nothing open has no row, and is shown as having nothing open.
+    """
+
+    __tablename__ = "review_summary"
+
+    review_unit_uid: Mapped[UUID] = mapped_column(
+        ForeignKey("item.uid"), primary_key=True
+    )
+    open_issues: Mapped[int] = mapped_column(Integer, index=True)
+    reasons: Mapped[list[str]] = mapped_column(JSON)
+    """Why the first of what is open was raised, in the order the queue shows
+    them, held to as many as a row can carry."""
+
+    review_unit: Mapped[DatabaseItem[Any]] = relationship(
+        DatabaseItem,
+        # Deleted with the unit, as the issues answered on it are.
+        backref=backref("review_summary", cascade="all, delete-orphan", uselist=False),
+    )
@@ -12,13 +12,20 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from collections.abc import Iterator
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
 from sqlalchemy import JSON, Dialect, TypeDecorator
 from sqlalchemy.ext.mutable import MutableDict, MutableList
 
-from slidetap.model import AnyAttribute, Code, Measurement, attribute_factory
+from slidetap.model import (
+    AnyAttribute,
+    Code,
+    ImageProcessingProfile,
+    Measurement,
+    attribute_factory,
+)
 
 ValueType = TypeVar("ValueType")
 ModelType = TypeVar("ModelType", bound=BaseModel)
@@ -61,41 +68,211 @@ class LoadingAttributeJson(BaseLoadingJson[AnyAttribute, AnyAttribute]):
         return attribute_factory(value)
 
 
+class LazyAttributeDict(MutableDict[str, AnyAttribute]):
+    """Mutable dictionary of attributes, each read from its JSON when first used.
+
+    Read from the database an entry is kept as the JSON it was stored as, and
+    turned into an attribute the first time it is looked up. Validating every
+    nested attribute of every row as it is loaded is most of the cost of
+    loading them, and most rows are loaded for something other than the values
+    nested in them -- a display value, a tag, whether they are valid.
+
+    Every way of reading a value goes through the lookup, so what is held as
+    JSON is never handed out as it is. Building a dictionary from this one
+    does as well: overriding ``__iter__`` is what makes ``dict()`` and ``**``
+    copy it entry by entry rather than from its storage. Entries not yet read
+    are written back as the JSON they were read as.
+    """
+
+    def __getitem__(self, key: str) -> AnyAttribute:
+        value = dict.__getitem__(self, key)
+        if isinstance(value, dict):
+            # A copy: the factory takes the discriminator out of what it is given.
+            value = attribute_factory(dict(value))
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return dict.__iter__(self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        return self[key]
+
+    def values(self):  # type: ignore[override]
+        self._load_all()
+        return dict.values(self)
+
+    def items(self):  # type: ignore[override]
+        self._load_all()
+        return dict.items(self)
+
+    def pop(self, *args: Any) -> Any:
+        self._load_all()
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[str, AnyAttribute]:
+        self._load_all()
+        return super().popitem()
+
+    def setdefault(self, key: str, value: AnyAttribute) -> AnyAttribute:  # type: ignore[override]
+        self._load_all()
+        return super().setdefault(key, value)
+
+    def copy(self) -> dict[str, AnyAttribute]:
+        return dict(self)
+
+    def __eq__(self, other: object) -> bool:
+        self._load_all()
+        if isinstance(other, LazyAttributeDict):
+            other._load_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._load_all()
+        return dict.__repr__(self)
+
+    def stored_items(self) -> Iterator[tuple[str, AnyAttribute | dict[str, Any]]]:
+        """The entries as they are held, read or not."""
+        return iter(dict.items(self))
+
+    def _load_all(self) -> None:
+        for key in dict.keys(self):
+            self[key]
+
+
+class LazyAttributeList(MutableList[AnyAttribute]):
+    """Mutable list of attributes, read from their JSON when first used.
+
+    As :py:class:`LazyAttributeDict`, but all at once: a list is read from one
+    end to the other rather than picked from, so it is read whole the first
+    time any of it is. Concatenating lists copies their storage without asking
+    for their items, which is why this one answers ``+`` from either side.
+    """
+
+    def __getitem__(self, index):  # type: ignore[override]
+        self._load_all()
+        return list.__getitem__(self, index)
+
+    def __iter__(self) -> Iterator[AnyAttribute]:
+        self._load_all()
+        return list.__iter__(self)
+
+    def __reversed__(self) -> Iterator[AnyAttribute]:
+        self._load_all()
+        return list.__reversed__(self)
+
+    def __contains__(self, value: object) -> bool:
+        self._load_all()
+        return list.__contains__(self, value)
+
+    def __add__(self, other):  # type: ignore[override]
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def index(self, *args: Any) -> int:
+        self._load_all()
+        return list.index(self, *args)
+
+    def count(self, value: Any) -> int:
+        self._load_all()
+        return list.count(self, value)
+
+    def pop(self, *args: Any) -> AnyAttribute:
+        self._load_all()
+        return super().pop(*args)
+
+    def sort(self, **kwargs: Any) -> None:
+        self._load_all()
+        super().sort(**kwargs)
+
+    def copy(self) -> list[AnyAttribute]:
+        return list(self)
+
+    def __eq__(self, other: object) -> bool:
+        self._load_all()
+        if isinstance(other, LazyAttributeList):
+            other._load_all()
+        return list.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._load_all()
+        return list.__repr__(self)
+
+    def stored_items(self) -> Iterator[AnyAttribute | dict[str, Any]]:
+        """The items as they are held, read or not."""
+        return list.__iter__(self)
+
+    def _load_all(self) -> None:
+        for index, value in enumerate(list.__iter__(self)):
+            if isinstance(value, dict):
+                list.__setitem__(self, index, attribute_factory(dict(value)))
+
+
 class LoadingAttributeDictJson(BaseLoadingJson[dict[str, AnyAttribute], AnyAttribute]):
-    """JSON column for a string-keyed dict of polymorphic attributes."""
+    """JSON column for a string-keyed dict of polymorphic attributes.
+
+    Read into a :py:class:`LazyAttributeDict`, which validates an entry when
+    it is first used rather than as the row is loaded."""
 
     def process_bind_param(
         self, value: dict[str, AnyAttribute] | None, dialect: Dialect
     ):
         if value is None:
             return value
-        return {
-            key: value.model_dump(mode="json", by_alias=True)
-            for key, value in value.items()
-        }
+        items = (
+            value.stored_items()
+            if isinstance(value, LazyAttributeDict)
+            else value.items()
+        )
+        return {key: _dump(item) for key, item in items}
 
     def process_result_value(
         self, value: dict[str, Any] | None, dialect: Dialect
     ) -> dict[str, AnyAttribute] | None:
         if value is None or value == {}:
             return value
-        return {key: attribute_factory(value) for key, value in value.items()}
+        return LazyAttributeDict(value)
 
 
 class LoadingAttributeListJson(BaseLoadingJson[list[AnyAttribute], AnyAttribute]):
-    """JSON column for a list of polymorphic attributes."""
+    """JSON column for a list of polymorphic attributes.
+
+    Read into a :py:class:`LazyAttributeList`, which validates its items when
+    they are first used rather than as the row is loaded."""
 
     def process_bind_param(self, value: list[AnyAttribute] | None, dialect: Dialect):
         if value is None:
             return value
-        return [item.model_dump(mode="json", by_alias=True) for item in value]
+        items = value.stored_items() if isinstance(value, LazyAttributeList) else value
+        return [_dump(item) for item in items]
 
     def process_result_value(
         self, value: list[Any] | None, dialect: Dialect
     ) -> list[AnyAttribute] | None:
         if value is None or value == {}:
             return value
-        return [attribute_factory(item) for item in value]
+        return LazyAttributeList(value)
+
+
+def _dump(value: AnyAttribute | dict[str, Any]) -> dict[str, Any]:
+    """An attribute as it is stored. One never read is still what was stored."""
+    if isinstance(value, dict):
+        return value
+    return value.model_dump(mode="json", by_alias=True)
 
 
 class MeasurementJson(LoadingJson[Measurement]):
@@ -108,6 +285,14 @@ class CodeJson(LoadingJson[Code]):
     cache_ok = True
 
 
+class ImageProcessingProfileJson(LoadingJson[ImageProcessingProfile]):
+    # Stored as SQL NULL rather than JSON null for an image not yet processed,
+    # so that the images that have a profile can be told apart in a query.
+    impl = JSON(none_as_null=True)
+    model = ImageProcessingProfile
+    cache_ok = True
+
+
 class AttributeJson(LoadingAttributeJson):
     cache_ok = True
 
@@ -124,9 +309,11 @@ measurement_db_type = MeasurementJson()
 """Database type for (immutable) measurement."""
 code_db_type = CodeJson()
 """Database type for (immutable) code."""
+processing_profile_db_type = ImageProcessingProfileJson()
+"""Database type for the (immutable) processing profile of an image."""
 attribute_db_type = AttributeJson()
 """Database type for single (immutable) attribute."""
-attribute_dict_db_type = MutableDict.as_mutable(AttributeDictJson())
-"""Mutable dictionary of (immutable) attributes."""
-attribute_list_db_type = MutableList.as_mutable(AttributeListJson())
-"""Mutable list of (immutable) attributes."""
+attribute_dict_db_type = LazyAttributeDict.as_mutable(AttributeDictJson())
+"""Mutable dictionary of (immutable) attributes, read when first used."""
+attribute_list_db_type = LazyAttributeList.as_mutable(AttributeListJson())
+"""Mutable list of (immutable) attributes, read when first used."""
@@ -14,13 +14,38 @@
 
 """A value someone recorded that no mapping accounts for."""
 
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any, cast
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String, Uuid
-from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
+from sqlalchemy import (
+    Connection,
+    ForeignKey,
+    Integer,
+    String,
+    Table,
+    Uuid,
+    event,
+    func,
+    inspect,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import (
+    Mapped,
+    Session,
+    UOWTransaction,
+    backref,
+    mapped_column,
+    relationship,
+)
 
 from slidetap.database.attribute import DatabaseAttribute
 from slidetap.database.db import Base
+from slidetap.database.item import DatabaseItem
+from slidetap.database.project import DatabaseBatch
 
 
 class DatabaseUnmappedValue(Base):
@@ -70,3 +95,241 @@ class DatabaseUnmappedValue(Base):
         DatabaseAttribute,
         backref=backref("unmapped_values", cascade="all, delete-orphan"),
     )
+
+
+class DatabaseUnmappedValueCount(Base):
+    """How many items of a batch carry a value with no mapping.
+
+    The mapping work list is these counts, summed over the batches of a
+    project. Counting them from ``unmapped_value`` when asked meant joining it
+    through the attributes and items of the whole project and counting
+    distinct items per value, every time the list was opened. They are
+    instead moved as values are recorded, removed and carried between
+    batches, see ``note_unmapped_values_removed``, so that the list is read
+    from a table the size of the distinct values of the project.
+
+    Counted by item, as the list is: an item carrying the same wording twice
+    is one item a key would settle. A count that has come down to nothing is
+    left as a zero rather than deleted, so that a value coming back does not
+    race another writer to insert it.
+    """
+
+    __tablename__ = "unmapped_value_count"
+
+    batch_uid: Mapped[UUID] = mapped_column(ForeignKey("batch.uid"), primary_key=True)
+    schema_uid: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    value: Mapped[str] = mapped_column(String(512), primary_key=True)
+    items: Mapped[int] = mapped_column(Integer)
+
+    batch: Mapped[DatabaseBatch] = relationship(
+        DatabaseBatch,
+        # Deleted with the batch.
+        backref=backref("unmapped_value_counts", cascade="all, delete-orphan"),
+    )
+
+
+_PENDING = "slidetap.unmapped_value_count"
+"""Key in ``Session.info`` for what has changed since the counts were last
+moved."""
+
+
+@dataclass
+class _Pending:
+    removed: Counter[tuple[UUID, UUID, str]] = field(default_factory=Counter)
+    """Values removed, by item, schema and value."""
+    added: list[DatabaseUnmappedValue] = field(default_factory=list)
+    """Values added, whose item is only known once they are flushed."""
+    was_in: dict[UUID, UUID] = field(default_factory=dict)
+    """The batch each item changed was in before it was changed."""
+    deleted_batches: set[UUID] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.removed or self.added or self.was_in)
+
+
+def _pending(session: Session) -> _Pending:
+    return session.info.setdefault(_PENDING, _Pending())
+
+
+def note_unmapped_values_removed(
+    session: Session, removed: Iterable[tuple[UUID, UUID, UUID, str]]
+) -> None:
+    """Note values about to be deleted by a statement, which the session does
+    not see, so that the counts are moved for them with the next flush.
+
+    Parameters
+    ----------
+    session: Session
+        Session the values are deleted in.
+    removed: Iterable[tuple[UUID, UUID, UUID, str]]
+        The item, batch, schema and value of each value removed.
+    """
+    pending = _pending(session)
+    for item_uid, batch_uid, schema_uid, value in removed:
+        pending.removed[(item_uid, schema_uid, value)] += 1
+        pending.was_in.setdefault(item_uid, batch_uid)
+
+
+def _move_counts(session: Session, pending: _Pending) -> None:
+    """Move the counts by what the items changed carry now against what they
+    carried before.
+
+    What an item carries now is read from ``unmapped_value``; what it carried
+    before is that, less what was added and plus what was removed. A value
+    counts for an item while the item carries it at least once.
+    """
+    added: Counter[tuple[UUID, UUID, str]] = Counter()
+    if pending.added:
+        # Read rather than followed from each value, as what it was recorded
+        # with is only the uid of its attribute.
+        item_of: dict[UUID, UUID | None] = {
+            attribute_uid: item_uid
+            for attribute_uid, item_uid in session.execute(
+                select(
+                    DatabaseAttribute.uid, DatabaseAttribute.attribute_item_uid
+                ).where(
+                    DatabaseAttribute.uid.in_(
+                        {value.root_attribute_uid for value in pending.added}
+                    )
+                )
+            )
+        }
+        for value in pending.added:
+            item_uid = item_of.get(value.root_attribute_uid)
+            if item_uid is not None:
+                added[(item_uid, value.schema_uid, value.value)] += 1
+    items = (
+        {item_uid for item_uid, _, _ in added}
+        | {item_uid for item_uid, _, _ in pending.removed}
+        | set(pending.was_in)
+    )
+    if not items:
+        return
+    now: Counter[tuple[UUID, UUID, str]] = Counter(
+        {
+            (item_uid, schema_uid, value): count
+            for item_uid, schema_uid, value, count in session.execute(
+                select(
+                    DatabaseAttribute.attribute_item_uid,
+                    DatabaseUnmappedValue.schema_uid,
+                    DatabaseUnmappedValue.value,
+                    func.count(),
+                )
+                .join(
+                    DatabaseAttribute,
+                    DatabaseAttribute.uid == DatabaseUnmappedValue.root_attribute_uid,
+                )
+                .where(DatabaseAttribute.attribute_item_uid.in_(items))
+                .group_by(
+                    DatabaseAttribute.attribute_item_uid,
+                    DatabaseUnmappedValue.schema_uid,
+                    DatabaseUnmappedValue.value,
+                )
+            )
+            if item_uid is not None
+        }
+    )
+    is_in: dict[UUID, UUID] = {
+        item_uid: batch_uid
+        for item_uid, batch_uid in session.execute(
+            select(DatabaseItem.uid, DatabaseItem.batch_uid).where(
+                DatabaseItem.uid.in_(items)
+            )
+        )
+    }
+    before = now.copy()
+    before.subtract(added)
+    before.update(pending.removed)
+    changes: Counter[tuple[UUID, UUID, str]] = Counter()
+    for (item_uid, schema_uid, value), count in before.items():
+        batch_uid = pending.was_in.get(item_uid, is_in.get(item_uid))
+        if count > 0 and batch_uid is not None:
+            changes[(batch_uid, schema_uid, value)] -= 1
+    for (item_uid, schema_uid, value), count in now.items():
+        batch_uid = is_in.get(item_uid)
+        if count > 0 and batch_uid is not None:
+            changes[(batch_uid, schema_uid, value)] += 1
+    _add_to_counts(
+        session.connection(),
+        {
+            key: items
+            for key, items in changes.items()
+            if items != 0 and key[0] not in pending.deleted_batches
+        },
+    )
+
+
+def _add_to_counts(
+    connection: Connection, changes: dict[tuple[UUID, UUID, str], int]
+) -> None:
+    if not changes:
+        return
+    # Inserted or added to in one statement, so that two workers recording the
+    # same new wording at once both land on the one row.
+    insert = (
+        postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    )
+    table = cast(Table, DatabaseUnmappedValueCount.__table__)
+    statement = insert(table)
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.batch_uid, table.c.schema_uid, table.c.value],
+            set_={"items": table.c["items"] + statement.excluded["items"]},
+        ),
+        [
+            {
+                "batch_uid": batch_uid,
+                "schema_uid": schema_uid,
+                "value": value,
+                "items": items,
+            }
+            for (batch_uid, schema_uid, value), items in changes.items()
+        ],
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _before_flush(
+    session: Session, flush_context: UOWTransaction, instances: Iterable[Any] | None
+) -> None:
+    pending = _pending(session)
+    for value in session.new:
+        if isinstance(value, DatabaseUnmappedValue):
+            pending.added.append(value)
+    for item in session.dirty:
+        if isinstance(item, DatabaseItem):
+            history = inspect(item).attrs.batch_uid.history
+            if history.deleted:
+                pending.was_in.setdefault(item.uid, history.deleted[0])
+    for deleted in session.deleted:
+        if isinstance(deleted, DatabaseItem):
+            pending.was_in.setdefault(deleted.uid, deleted.batch_uid)
+        elif isinstance(deleted, DatabaseUnmappedValue):
+            attribute = deleted.root_attribute
+            item_uid = attribute.attribute_item_uid if attribute else None
+            if item_uid is not None:
+                pending.removed[(item_uid, deleted.schema_uid, deleted.value)] += 1
+        elif isinstance(deleted, DatabaseBatch):
+            pending.deleted_batches.add(deleted.uid)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        _move_counts(session, pending)
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    # Values removed by a statement with nothing added after them leave
+    # nothing for a flush to do, and so are settled here.
+    session.flush()
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        _move_counts(session, pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING, None)
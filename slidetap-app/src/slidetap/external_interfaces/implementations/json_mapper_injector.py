@@ -14,6 +14,7 @@
 
 """Service for accessing mappers and mapping items."""
 
+import hashlib
 from collections.abc import Iterable
 from uuid import uuid4
 
@@ -49,6 +50,22 @@ class JsonMapperInjector(MapperInjectorInterface):
         for group in groups:
             yield self._parse_group(group)
 
+    def fingerprint(self) -> str | None:
+        """A hash of the mapping file and of the schema it is read against.
+
+        The schema is part of it because the mappers are matched to the
+        attributes of the schema by name, and the uids they are stored under
+        are regenerated with it.
+        """
+        if self._config.mapping_file is None:
+            return None
+        digest = hashlib.sha256()
+        with open(self._config.mapping_file, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(self._schema_service.root.model_dump_json().encode("utf-8"))
+        return digest.hexdigest()
+
     def _parse_group(
         self, group_external: MapperGroupExternal
     ) -> tuple[MapperGroup, Iterable[tuple[Mapper, Iterable[MappingItem]]]]:
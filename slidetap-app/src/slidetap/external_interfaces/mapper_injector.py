@@ -26,3 +26,15 @@ class MapperInjectorInterface(metaclass=ABCMeta):
         self,
     ) -> Iterable[tuple[MapperGroup, Iterable[tuple[Mapper, Iterable[MappingItem]]]]]:
         raise NotImplementedError()
+
+    def fingerprint(self) -> str | None:
+        """What the mappers injected are made from, as a string that changes
+        when they would.
+
+        The mappers are injected by every process that starts, and injecting
+        a large mapping file means reading and checking all of it. Where the
+        fingerprint is the same as when the mappers were last injected, they
+        are not injected again. None, the default, has them injected every
+        time.
+        """
+        return None
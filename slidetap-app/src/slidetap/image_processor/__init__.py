@@ -20,10 +20,14 @@ from slidetap.image_processor.image_processing_step import (
     ImageProcessingStep,
     StoreProcessingStep,
 )
-from slidetap.image_processor.image_processor import ImageProcessor
+from slidetap.image_processor.image_processor import (
+    ImageProcessingError,
+    ImageProcessor,
+)
 
 __all__ = [
     "ImageProcessor",
+    "ImageProcessingError",
     "ImageProcessingStep",
     "DicomMetadataWriter",
     "DicomProcessingStep",
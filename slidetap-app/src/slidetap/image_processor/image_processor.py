@@ -22,12 +22,27 @@ from tempfile import TemporaryDirectory
 from slidetap.image_processor.image_processing_step import (
     ImageProcessingStep,
 )
-from slidetap.model import Image
+from slidetap.image_processor.processing_meter import ProcessingMeter
+from slidetap.metrics import IMAGE_PROCESSING_STEP_SECONDS
+from slidetap.model import Image, ImageProcessingProfile, ProcessingMeasurement
 from slidetap.model.batch import Batch
 from slidetap.model.project import Project
 from slidetap.services import SchemaService, StorageService
 
 
+class ImageProcessingError(Exception):
+    """Raised by `ImageProcessor.run` when a step of it fails.
+
+    Carries what each step run took, the failed one included, so that a
+    failure is recorded with where its time went rather than with the time of
+    the phase alone.
+    """
+
+    def __init__(self, message: str, steps: dict[str, ProcessingMeasurement]):
+        super().__init__(message)
+        self.steps = steps
+
+
 class ImageProcessor:
     """Image processor that runs a sequence of steps on the processing image."""
 
@@ -49,6 +64,19 @@ class ImageProcessor:
         self._root_schema = schema_service.root
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    @staticmethod
+    def _record_step(
+        steps: dict[str, ProcessingMeasurement],
+        name: str,
+        measurement: ProcessingMeasurement,
+    ) -> None:
+        steps[name] = measurement
+        IMAGE_PROCESSING_STEP_SECONDS.observe(
+            measurement.wall_seconds,
+            step=name,
+            outcome="failed" if measurement.failed else "done",
+        )
+
     def run(
         self,
         image: Image,
@@ -60,9 +88,12 @@ class ImageProcessor:
         if image.folder_path is None:
             raise FileNotFoundError(f"Image {image.uid} does not have a folder path. ")
         processing_path = Path(image.folder_path)
+        steps: dict[str, ProcessingMeasurement] = {}
         with TemporaryDirectory() as temp_dir:
             try:
                 for index, step in enumerate(self._steps):
+                    name = type(step).__name__
+                    meter = ProcessingMeter()
                     try:
                         processing_path, image = step.run(
                             self._root_schema,
@@ -74,13 +105,17 @@ class ImageProcessor:
                             task_id,
                         )
                     except Exception as exception:
-                        raise Exception(
+                        self._record_step(steps, name, meter.read(failed=True))
+                        raise ImageProcessingError(
                             f"Processing failed for {image.uid} name {image.name} "
-                            f"at step {step}."
+                            f"at step {step}.",
+                            steps,
                         ) from exception
+                    self._record_step(steps, name, meter.read())
 
                 self._logger.debug(f"Processing complete for {image.uid}.")
                 image.folder_path = str(processing_path)
+                image.processing_profile = ImageProcessingProfile(steps=steps)
                 return image
             finally:
                 self._logger.debug(f"Cleanup {image.uid} name {image.name}.")
@@ -0,0 +1,100 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Measuring what a run of a phase or a step of processing an image takes."""
+
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from slidetap.model import ProcessingMeasurement
+
+if sys.platform != "win32":
+    import resource
+
+
+_PROCESS_IO = Path("/proc/self/io")
+"""Where Linux counts what the process has read from and written to storage."""
+
+
+@dataclass(frozen=True)
+class _Reading:
+    wall: float
+    cpu: float
+    read_bytes: int | None
+    written_bytes: int | None
+
+
+class ProcessingMeter:
+    """Reads what the process has used since the meter was started.
+
+    Started where a run starts and read where it ends, however it ends, so
+    that a run that failed is measured as well as one that did not:
+
+    >>> meter = ProcessingMeter()
+    >>> ...
+    >>> measurement = meter.read()
+
+    What the platform does not count -- storage use outside Linux, memory on
+    Windows -- is left out of the measurement rather than failing it.
+    """
+
+    def __init__(self):
+        self._start = _read()
+
+    def read(self, failed: bool = False) -> ProcessingMeasurement:
+        now = _read()
+        return ProcessingMeasurement(
+            wall_seconds=now.wall - self._start.wall,
+            cpu_seconds=now.cpu - self._start.cpu,
+            read_bytes=_difference(now.read_bytes, self._start.read_bytes),
+            written_bytes=_difference(now.written_bytes, self._start.written_bytes),
+            peak_rss_bytes=_peak_rss_bytes(),
+            failed=failed,
+        )
+
+
+def _read() -> _Reading:
+    read_bytes, written_bytes = _process_io()
+    return _Reading(
+        wall=time.perf_counter(),
+        cpu=time.process_time(),
+        read_bytes=read_bytes,
+        written_bytes=written_bytes,
+    )
+
+
+def _process_io() -> tuple[int | None, int | None]:
+    try:
+        counters = dict(
+            line.split(": ", 1) for line in _PROCESS_IO.read_text().splitlines()
+        )
+        return int(counters["read_bytes"]), int(counters["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def _peak_rss_bytes() -> int | None:
+    if sys.platform == "win32":
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Counted in bytes on macOS, and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _difference(now: int | None, start: int | None) -> int | None:
+    if now is None or start is None:
+        return None
+    return now - start
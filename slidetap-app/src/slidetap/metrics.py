@@ -0,0 +1,440 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Counts and timings of what a process spends its time on, to be scraped.
+
+A batch moving slowly through the pipeline can be held up by the tiles being
+read, the images being opened, a processing step, the mappers or by jobs
+queueing for a worker, and the logs say which only by reading all of them.
+What is measured here is written out in the Prometheus text format on
+``/metrics``, by the web app on its own port and by a worker on the one it is
+configured with, see ``serve_metrics``.
+
+Kept in the process rather than sent anywhere, and written without a client
+library: what is needed is a handful of counters and histograms, and each is a
+few numbers under a lock. Each process keeps its own; adding them up across
+processes is left to what scrapes them.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TypeVar
+
+from slidetap.database.pool import PoolStatistics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Content type of the Prometheus text format."""
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Upper bounds, in seconds, for timing a request or a lookup."""
+
+PROCESSING_BUCKETS: tuple[float, ...] = (
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1800.0,
+)
+"""Upper bounds, in seconds, for timing work on a whole image."""
+
+_LabelValues = tuple[str, ...]
+
+
+class _Metric:
+    """A named metric, with a value for each set of label values."""
+
+    type_name: str
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> _LabelValues:
+        if labels.keys() != set(self.labels):
+            raise ValueError(
+                f"Metric {self.name} has labels {self.labels}, got {tuple(labels)}."
+            )
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _label_text(self, values: _LabelValues, extra: str | None = None) -> str:
+        parts = [
+            f'{label}="{_escape(value)}"'
+            for label, value in zip(self.labels, values, strict=True)
+        ]
+        if extra is not None:
+            parts.append(extra)
+        if not parts:
+            return ""
+        return "{" + ",".join(parts) + "}"
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape_help(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self.samples()
+
+
+class Counter(_Metric):
+    """A count that only goes up, by labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[_LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, total: float, **labels: str) -> None:
+        """Set the count to one kept elsewhere, as the connection pool keeps
+        its own."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = total
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._label_text(key)} {_number(value)}"
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, by labels."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[_LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{self._label_text(key)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    """How many observations fell under each of a set of bounds, by labels.
+
+    Counted per bucket and summed when written, as the format has each bucket
+    count everything under its bound.
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[_LabelValues, list[int]] = {}
+        self._sums: dict[_LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = next(
+            (index for index, bound in enumerate(self.buckets) if value <= bound),
+            len(self.buckets),
+        )
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the block took, whether or not it raised."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            counts = {key: list(values) for key, values in self._counts.items()}
+            sums = dict(self._sums)
+        for key in sorted(counts):
+            cumulative = 0
+            for bound, count in zip(
+                (*self.buckets, math.inf), counts[key], strict=True
+            ):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{self._label_text(key, le)} {cumulative}"
+            yield f"{self.name}_sum{self._label_text(key)} {_number(sums[key])}"
+            yield f"{self.name}_count{self._label_text(key)} {cumulative}"
+
+
+MetricType = TypeVar("MetricType", bound=_Metric)
+
+
+class MetricsRegistry:
+    """The metrics a process writes out, and what is read just before.
+
+    Most metrics are moved where what they count happens. Some are kept
+    elsewhere, as the connection pool keeps its statistics, and are read
+    into a metric by a collector each time the metrics are written out.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def register(self, metric: MetricType) -> MetricType:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Read the collector each time the metrics are written out. A
+        collector already added is not added again."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]) -> None:
+        """Stop reading a collector, as one added for something that is gone.
+        A collector not added is left as it is."""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        """The metrics in the Prometheus text format.
+
+        A collector that fails leaves its metrics as they were last read
+        rather than failing the scrape, which would hide every other metric
+        too.
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                collector()
+            except Exception:
+                self._logger.warning("Failed to collect metrics.", exc_info=True)
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+"""The metrics of this process."""
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "slidetap_http_request_seconds",
+        "Time to answer a request, by route template.",
+        ("method", "route", "status"),
+    )
+)
+IMAGE_CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "slidetap_image_cache_requests_total",
+        "Images asked of the image cache, by whether they were open already.",
+        ("result",),
+    )
+)
+IMAGE_CACHE_EVICTIONS = REGISTRY.register(
+    Counter(
+        "slidetap_image_cache_evictions_total",
+        "Images closed to make room in the image cache.",
+    )
+)
+IMAGE_OPEN_SECONDS = REGISTRY.register(
+    Histogram(
+        "slidetap_image_open_seconds",
+        "Time to open an image for the image cache, by format.",
+        ("format",),
+    )
+)
+IMAGE_PROCESSING_STEP_SECONDS = REGISTRY.register(
+    Histogram(
+        "slidetap_image_processing_step_seconds",
+        "Time for a step of processing an image, by step and outcome.",
+        ("step", "outcome"),
+        PROCESSING_BUCKETS,
+    )
+)
+MAPPER_RESOLVE_SECONDS = REGISTRY.register(
+    Histogram(
+        "slidetap_mapper_resolve_seconds",
+        "Time to resolve a value to the expression of a mapper that maps it.",
+        buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+    )
+)
+TASK_QUEUE_JOBS = REGISTRY.register(
+    Gauge(
+        "slidetap_task_queue_jobs",
+        "Jobs in a task queue, by status.",
+        ("queue", "status"),
+    )
+)
+DATABASE_POOL_CHECKOUTS = REGISTRY.register(
+    Counter(
+        "slidetap_database_pool_checkouts_total",
+        "Connections handed out by the database pool of the process.",
+    )
+)
+DATABASE_POOL_TIMEOUTS = REGISTRY.register(
+    Counter(
+        "slidetap_database_pool_timeouts_total",
+        "Waits for a connection from the database pool that gave up.",
+    )
+)
+DATABASE_POOL_WAIT_SECONDS = REGISTRY.register(
+    Counter(
+        "slidetap_database_pool_wait_seconds_total",
+        "Time spent waiting for connections from the database pool.",
+    )
+)
+DATABASE_POOL_CONNECTIONS = REGISTRY.register(
+    Gauge(
+        "slidetap_database_pool_connections",
+        "Connections of the database pool, in use and kept open.",
+        ("state",),
+    )
+)
+
+
+def collect_pool_statistics(
+    statistics: Callable[[], PoolStatistics | None],
+) -> Callable[[], None]:
+    """A collector reading the statistics of a connection pool into the
+    metrics, as ``DatabaseService.pool_statistics`` gives them."""
+
+    def collect() -> None:
+        current = statistics()
+        if current is None:
+            return
+        DATABASE_POOL_CHECKOUTS.set_total(current.checkouts)
+        DATABASE_POOL_TIMEOUTS.set_total(current.timeouts)
+        DATABASE_POOL_WAIT_SECONDS.set_total(current.wait_seconds)
+        DATABASE_POOL_CONNECTIONS.set(current.checked_out, state="checked_out")
+        DATABASE_POOL_CONNECTIONS.set(current.size, state="size")
+        DATABASE_POOL_CONNECTIONS.set(current.overflow, state="overflow")
+
+    return collect
+
+
+def serve_metrics(
+    port: int, registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Write the metrics out on ``/metrics`` of a port, from a thread.
+
+    For a worker, which answers no requests otherwise. The thread is a daemon,
+    so that it goes with the worker.
+    """
+    server = ThreadingHTTPServer(("", port), _handler(registry))
+    threading.Thread(
+        target=server.serve_forever, name="slidetap-metrics", daemon=True
+    ).start()
+    logging.getLogger(__name__).info(f"Serving metrics on port {port}.")
+    return server
+
+
+def _handler(registry: MetricsRegistry) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            body = registry.render().encode()
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Scraped every few seconds; not worth a line in the log each time.
+            pass
+
+    return MetricsHandler
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
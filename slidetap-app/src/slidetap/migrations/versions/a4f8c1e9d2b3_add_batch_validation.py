@@ -0,0 +1,75 @@
+"""add batch validation
+
+Revision ID: a4f8c1e9d2b3
+Revises: e2c84a1d7f35
+Create Date: 2026-10-18 16:00:00.000000
+
+How many items of each batch are selected, and how many of those are not
+valid, kept as the items change so that the validation of a batch is read as
+one row rather than by loading every item of it.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a4f8c1e9d2b3"
+down_revision: Union[str, None] = "e2c84a1d7f35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    validation = op.create_table(
+        "batch_validation",
+        sa.Column("batch_uid", sa.Uuid(), nullable=False),
+        sa.Column("selected_items", sa.Integer(), nullable=False),
+        sa.Column("non_valid_items", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["batch_uid"], ["batch.uid"]),
+        sa.PrimaryKeyConstraint("batch_uid"),
+    )
+    # Counted from the items now, so that every batch has counts to be moved
+    # from the first change on. An item is not valid where a part of its
+    # validity is not or is not worked out yet, or where it is an image that
+    # has failed. The statuses are written as literals, which postgres takes
+    # for its enum type where a bound string would not be.
+    item = sa.table(
+        "item",
+        sa.column("uid", sa.Uuid()),
+        sa.column("batch_uid", sa.Uuid()),
+        sa.column("selected", sa.Boolean()),
+        sa.column("valid_attributes", sa.Boolean()),
+        sa.column("valid_relations", sa.Boolean()),
+        sa.column("valid_pseudonym", sa.Boolean()),
+    )
+    image = sa.table("image", sa.column("uid", sa.Uuid()))
+    batch = sa.table("batch", sa.column("uid", sa.Uuid()))
+    selected = sa.and_(item.c.batch_uid == batch.c.uid, item.c.selected)
+    not_valid = sa.or_(
+        item.c.valid_attributes.is_not(True),
+        item.c.valid_relations.is_not(True),
+        item.c.valid_pseudonym.is_not(True),
+        sa.text(
+            "image.status IN ('DOWNLOADING_FAILED', 'PRE_PROCESSING_FAILED', "
+            "'POST_PROCESSING_FAILED', 'STORING_FAILED')"
+        ),
+    )
+    op.execute(
+        sa.insert(validation).from_select(
+            ["batch_uid", "selected_items", "non_valid_items"],
+            sa.select(
+                batch.c.uid,
+                sa.select(sa.func.count()).where(selected).scalar_subquery(),
+                sa.select(sa.func.count())
+                .select_from(item.outerjoin(image, image.c.uid == item.c.uid))
+                .where(selected, not_valid)
+                .scalar_subquery(),
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("batch_validation")
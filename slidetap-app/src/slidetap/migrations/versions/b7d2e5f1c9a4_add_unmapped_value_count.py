@@ -0,0 +1,71 @@
+"""add unmapped value count
+
+Revision ID: b7d2e5f1c9a4
+Revises: a4f8c1e9d2b3
+Create Date: 2026-10-18 18:00:00.000000
+
+How many items of each batch carry each value with no mapping, kept as values
+are recorded so that the mapping work list is read from the counts rather than
+counted over every attribute of the project when opened.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b7d2e5f1c9a4"
+down_revision: Union[str, None] = "a4f8c1e9d2b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    count = op.create_table(
+        "unmapped_value_count",
+        sa.Column("batch_uid", sa.Uuid(), nullable=False),
+        sa.Column("schema_uid", sa.Uuid(), nullable=False),
+        sa.Column("value", sa.String(length=512), nullable=False),
+        sa.Column("items", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["batch_uid"], ["batch.uid"]),
+        sa.PrimaryKeyConstraint("batch_uid", "schema_uid", "value"),
+    )
+    # Counted from the values recorded now, so that the counts are moved from
+    # where they stand on the first change on.
+    unmapped_value = sa.table(
+        "unmapped_value",
+        sa.column("root_attribute_uid", sa.Uuid()),
+        sa.column("schema_uid", sa.Uuid()),
+        sa.column("value", sa.String()),
+    )
+    attribute = sa.table(
+        "attribute",
+        sa.column("uid", sa.Uuid()),
+        sa.column("attribute_item_uid", sa.Uuid()),
+    )
+    item = sa.table(
+        "item", sa.column("uid", sa.Uuid()), sa.column("batch_uid", sa.Uuid())
+    )
+    op.execute(
+        sa.insert(count).from_select(
+            ["batch_uid", "schema_uid", "value", "items"],
+            sa.select(
+                item.c.batch_uid,
+                unmapped_value.c.schema_uid,
+                unmapped_value.c.value,
+                sa.func.count(sa.distinct(item.c.uid)),
+            )
+            .select_from(unmapped_value)
+            .join(attribute, attribute.c.uid == unmapped_value.c.root_attribute_uid)
+            .join(item, item.c.uid == attribute.c.attribute_item_uid)
+            .where(item.c.batch_uid.is_not(None))
+            .group_by(
+                item.c.batch_uid, unmapped_value.c.schema_uid, unmapped_value.c.value
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("unmapped_value_count")
@@ -0,0 +1,79 @@
+"""add batch image progress
+
+Revision ID: c3a8e6f2d1b7
+Revises: b7d2e5f1c9a4
+Create Date: 2026-10-18 18:00:00.000000
+
+How many selected images of each batch are still to be pre-processed,
+post-processed or stored, kept as the images change so that the image that
+finishes a batch knows it from one row rather than by looking through every
+image of the batch.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c3a8e6f2d1b7"
+down_revision: Union[str, None] = "b7d2e5f1c9a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    progress = op.create_table(
+        "batch_image_progress",
+        sa.Column("batch_uid", sa.Uuid(), nullable=False),
+        sa.Column("not_pre_processed", sa.Integer(), nullable=False),
+        sa.Column("not_post_processed", sa.Integer(), nullable=False),
+        sa.Column("failed_to_store", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["batch_uid"], ["batch.uid"]),
+        sa.PrimaryKeyConstraint("batch_uid"),
+    )
+    # Counted from the images now, so that every batch has counts to be moved
+    # from the first change on. The statuses are written as literals, which
+    # postgres takes for its enum type where a bound string would not be.
+    item = sa.table(
+        "item",
+        sa.column("uid", sa.Uuid()),
+        sa.column("batch_uid", sa.Uuid()),
+        sa.column("selected", sa.Boolean()),
+    )
+    image = sa.table("image", sa.column("uid", sa.Uuid()))
+    batch = sa.table("batch", sa.column("uid", sa.Uuid()))
+
+    def count(status: str):
+        return (
+            sa.select(sa.func.count())
+            .select_from(image.join(item, item.c.uid == image.c.uid))
+            .where(item.c.batch_uid == batch.c.uid, item.c.selected, sa.text(status))
+            .scalar_subquery()
+        )
+
+    op.execute(
+        sa.insert(progress).from_select(
+            [
+                "batch_uid",
+                "not_pre_processed",
+                "not_post_processed",
+                "failed_to_store",
+            ],
+            sa.select(
+                batch.c.uid,
+                count(
+                    "image.status NOT IN "
+                    "('DOWNLOADING_FAILED', 'PRE_PROCESSING_FAILED', 'PRE_PROCESSED')"
+                ),
+                count(
+                    "image.status NOT IN ('POST_PROCESSING_FAILED', 'POST_PROCESSED')"
+                ),
+                count("image.status = 'STORING_FAILED'"),
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("batch_image_progress")
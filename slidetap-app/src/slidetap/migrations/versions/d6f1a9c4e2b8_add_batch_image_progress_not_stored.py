@@ -0,0 +1,59 @@
+"""add batch image progress not stored
+
+Revision ID: d6f1a9c4e2b8
+Revises: c3a8e6f2d1b7
+Create Date: 2026-10-18 19:00:00.000000
+
+How many selected images of each batch are not yet stored, so that the task
+storing the last image of a batch, now that each image is stored by a task of
+its own, knows it is the last from one row.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d6f1a9c4e2b8"
+down_revision: Union[str, None] = "c3a8e6f2d1b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "batch_image_progress",
+        sa.Column("not_stored", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Counted from the images now, as the other counts were when added. The
+    # status is written as a literal, which postgres takes for its enum type
+    # where a bound string would not be.
+    progress = sa.table(
+        "batch_image_progress",
+        sa.column("batch_uid", sa.Uuid()),
+        sa.column("not_stored", sa.Integer()),
+    )
+    item = sa.table(
+        "item",
+        sa.column("uid", sa.Uuid()),
+        sa.column("batch_uid", sa.Uuid()),
+        sa.column("selected", sa.Boolean()),
+    )
+    image = sa.table("image", sa.column("uid", sa.Uuid()))
+    op.execute(
+        sa.update(progress).values(
+            not_stored=sa.select(sa.func.count())
+            .select_from(image.join(item, item.c.uid == image.c.uid))
+            .where(
+                item.c.batch_uid == progress.c.batch_uid,
+                item.c.selected,
+                sa.text("image.status != 'STORED'"),
+            )
+            .scalar_subquery()
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("batch_image_progress", "not_stored")
@@ -0,0 +1,66 @@
+"""add operation
+
+Revision ID: d9e3b27f1a46
+Revises: b6f4a80c2d17
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d9e3b27f1a46"
+down_revision: Union[str, None] = "b6f4a80c2d17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Progress of what runs in the background, kept beside the data rather
+    # than in the job queue, so that the web process can report on it without
+    # asking the workers.
+    op.create_table(
+        "operation",
+        sa.Column("uid", sa.Uuid(), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum(
+                "FLAG_INVALID",
+                "REMAP_ITEM_HIERARCHY",
+                "APPLY_MAPPING",
+                "MOVE_ITEM",
+                "DELETE_BATCH",
+                name="operationkind",
+            ),
+            nullable=False,
+        ),
+        sa.Column("subject_uid", sa.Uuid(), nullable=False),
+        sa.Column("parameters", sa.JSON(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "QUEUED",
+                "RUNNING",
+                "COMPLETED",
+                "FAILED",
+                "CANCELLED",
+                name="operationstatus",
+            ),
+            nullable=False,
+        ),
+        sa.Column("total", sa.Integer(), nullable=True),
+        sa.Column("done", sa.Integer(), nullable=False),
+        sa.Column("message", sa.String(length=512), nullable=True),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("uid"),
+    )
+    op.create_index("ix_operation_subject_uid", "operation", ["subject_uid"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_operation_subject_uid", table_name="operation")
+    op.drop_table("operation")
@@ -0,0 +1,87 @@
+"""add review summary
+
+Revision ID: e2c84a1d7f35
+Revises: d9e3b27f1a46
+Create Date: 2026-10-18 14:00:00.000000
+
+What is open on each review unit, kept up to date as issues are raised and
+settled, so that the queue is read as one query over the units rather than by
+gathering every open issue of the dataset on every read.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e2c84a1d7f35"
+down_revision: Union[str, None] = "d9e3b27f1a46"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# As the service orders them: a person waiting first, what validation found
+# last. Written out rather than imported, so that the migration says what it
+# did when it was run.
+_QUEUE_PRIORITY = {
+    "USER": 0,
+    "METADATA_IMPORTER": 1,
+    "IMAGE_IMPORTER": 1,
+    "VALIDATION": 2,
+}
+_QUEUED_REASONS = 5
+
+
+def upgrade() -> None:
+    summary = op.create_table(
+        "review_summary",
+        sa.Column("review_unit_uid", sa.Uuid(), nullable=False),
+        sa.Column("open_issues", sa.Integer(), nullable=False),
+        sa.Column("reasons", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["review_unit_uid"], ["item.uid"]),
+        sa.PrimaryKeyConstraint("review_unit_uid"),
+    )
+    op.create_index(
+        "ix_review_summary_open_issues", "review_summary", ["open_issues"]
+    )
+    # Filled from what is open now, so that the queue does not read as empty
+    # until each unit next has something raised or settled on it.
+    open_issues = sa.table(
+        "review_issue",
+        sa.column("review_unit_uid", sa.Uuid()),
+        sa.column("source", sa.String()),
+        sa.column("reason", sa.String()),
+        sa.column("raised_at", sa.DateTime()),
+        sa.column("resolved_at", sa.DateTime()),
+    )
+    rows: dict = {}
+    for unit_uid, source, reason, raised_at in op.get_bind().execute(
+        sa.select(
+            open_issues.c.review_unit_uid,
+            open_issues.c.source,
+            open_issues.c.reason,
+            open_issues.c.raised_at,
+        ).where(open_issues.c.resolved_at.is_(None))
+    ):
+        rows.setdefault(unit_uid, []).append(
+            (_QUEUE_PRIORITY.get(source, 2), -raised_at.timestamp(), reason)
+        )
+    if rows:
+        op.bulk_insert(
+            summary,
+            [
+                {
+                    "review_unit_uid": unit_uid,
+                    "open_issues": len(unit_rows),
+                    "reasons": [
+                        reason for _, _, reason in sorted(unit_rows)[:_QUEUED_REASONS]
+                    ],
+                }
+                for unit_uid, unit_rows in rows.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_review_summary_open_issues", table_name="review_summary")
+    op.drop_table("review_summary")
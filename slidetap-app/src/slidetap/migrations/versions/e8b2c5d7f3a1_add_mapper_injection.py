@@ -0,0 +1,35 @@
+"""add mapper injection
+
+Revision ID: e8b2c5d7f3a1
+Revises: d6f1a9c4e2b8
+Create Date: 2026-10-18 20:00:00.000000
+
+The fingerprint of what each mapper injector last injected the mappers from,
+so that a process starting with the same mapping file and schema skips
+injecting them again.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e8b2c5d7f3a1"
+down_revision: Union[str, None] = "d6f1a9c4e2b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "mapper_injection",
+        sa.Column("injector", sa.String(length=128), nullable=False),
+        sa.Column("fingerprint", sa.String(length=128), nullable=False),
+        sa.Column("injected_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("injector"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("mapper_injection")
@@ -0,0 +1,29 @@
+"""add image processing profile
+
+Revision ID: f3a7c1e9b5d2
+Revises: e8b2c5d7f3a1
+Create Date: 2026-10-18 22:00:00.000000
+
+What each phase of processing an image took the last time it ran, and what
+each step of post-processing took within it, so that the batches that are slow
+to process can be told why.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f3a7c1e9b5d2"
+down_revision: Union[str, None] = "e8b2c5d7f3a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("image", sa.Column("processing_profile", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("image", "processing_profile")
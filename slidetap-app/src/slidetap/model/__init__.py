@@ -55,6 +55,7 @@ from slidetap.model.item import (
     NewChildSuggestion,
     Observation,
     ReviewQueueItem,
+    ReviewQueueSort,
     ReviewRequest,
     Sample,
     item_factory,
@@ -69,6 +70,15 @@ from slidetap.model.metadata_search_result import (
     MetadataSearchResult,
     ReviewIssueToRaise,
 )
+from slidetap.model.operation import Operation, OperationKind, OperationStatus
+from slidetap.model.processing_profile import (
+    BatchProcessingProfile,
+    ImageProcessingPhase,
+    ImageProcessingProfile,
+    ProcessingMeasurement,
+    ProcessingSummary,
+    SlowImage,
+)
 from slidetap.model.project import Project
 from slidetap.model.project_status import ProjectStatus
 from slidetap.model.review_issue import ReviewIssue
@@ -171,6 +181,7 @@ __all__ = [
     "Batch",
     "BatchCreate",
     "BatchStatus",
+    "BatchProcessingProfile",
     "BatchValidation",
     "BooleanAttribute",
     "BooleanAttributeSchema",
@@ -196,6 +207,8 @@ __all__ = [
     "ImageGroup",
     "ImageSchema",
     "ImageStatus",
+    "ImageProcessingPhase",
+    "ImageProcessingProfile",
     "MetadataImportCompleteness",
     "ImageToSampleRelation",
     "Item",
@@ -221,6 +234,7 @@ __all__ = [
     "ReviewIssueToRaise",
     "MoveAttributeRequest",
     "ReviewQueueItem",
+    "ReviewQueueSort",
     "ReviewRequest",
     "NumericAttribute",
     "NumericAttributeSchema",
@@ -241,6 +255,8 @@ __all__ = [
     "HierarchyLevelLayout",
     "OverviewLayout",
     "OverviewSectionLayout",
+    "ProcessingMeasurement",
+    "ProcessingSummary",
     "Project",
     "HierarchyPanelLayout",
     "ImagesPanelLayout",
@@ -253,6 +269,9 @@ __all__ = [
     "NonValidItem",
     "ReviewTabLayout",
     "ProjectStatus",
+    "Operation",
+    "OperationKind",
+    "OperationStatus",
     "ReviewIssue",
     "ReviewIssueSource",
     "ReviewStatus",
@@ -262,6 +281,7 @@ __all__ = [
     "SampleSchema",
     "Cardinality",
     "SampleToSampleRelation",
+    "SlowImage",
     "StringAttribute",
     "StringAttributeSchema",
     "TableRequest",
@@ -29,6 +29,7 @@ from slidetap.model.attribute import AnyAttribute
 from slidetap.model.base_model import CamelCaseBaseModel
 from slidetap.model.image_status import ImageStatus
 from slidetap.model.item_value_type import ItemValueType
+from slidetap.model.processing_profile import ImageProcessingProfile
 from slidetap.model.review_status import ReviewStatus
 
 ItemType = TypeVar("ItemType", bound="Item")
@@ -95,6 +96,12 @@ class Image(Item):
     """What the image file itself said, as wsidicom json, kept from before it
     was converted so that writing the metadata again can fill in from the file
     rather than from what the application last wrote."""
+    processing_profile: ImageProcessingProfile | None = Field(
+        default=None, exclude=True
+    )
+    """What the steps of processing the image took, from the processing that
+    returned it. Not read from the database with the image, see
+    ``DatabaseImage.processing_profile``."""
 
     files: list[ImageFile] = Field(default_factory=list)
     samples: dict[UUID, list[UUID]] = Field(default=defaultdict(list))
@@ -182,10 +189,11 @@ class ReviewQueueItem(CamelCaseBaseModel):
     review_reasons: list[str] = Field(default_factory=list)
     """Why what is open on it was raised, most recently raised first.
 
-    Read from what is open rather than stored on the item: a line written when
-    it was first flagged went on saying why long after the thing it named had
-    been dealt with, and said nothing about the rest of what was raised since.
-    Held to the few a row can carry, with `open_issues` counting the rest.
+    Kept up to date with what is open rather than written once on the item: a
+    line written when it was first flagged went on saying why long after the
+    thing it named had been dealt with, and said nothing about the rest of what
+    was raised since. Held to the few a row can carry, with `open_issues`
+    counting the rest.
     """
     last_saved: datetime | None = None
     open_issues: int = 0
@@ -196,6 +204,16 @@ class ReviewQueueItem(CamelCaseBaseModel):
     """
 
 
+class ReviewQueueSort(Enum):
+    """What the review queue is ordered by."""
+
+    IDENTIFIER = "identifier"
+    LAST_SAVED = "last_saved"
+    """Most recently saved first, and never saved last either way: the point
+    of the order is getting back to what was worked on."""
+    OPEN_ISSUES = "open_issues"
+
+
 class ItemNeighbours(CamelCaseBaseModel):
     """What comes before and after an item among those of its own kind, so that
     a view of one item can be stepped through."""
@@ -0,0 +1,99 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""A curation action run in the background, and how far it has come."""
+
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from slidetap.model.base_model import CamelCaseBaseModel
+
+
+class OperationKind(Enum):
+    """Which action an operation runs.
+
+    The actions that can touch a whole batch or dataset, and so are the ones a
+    request can time out waiting for.
+    """
+
+    FLAG_INVALID = "flag_invalid"
+    """Flag every review unit of a dataset, or of a batch of it, that holds
+    something not valid. The subject is the dataset."""
+
+    REMAP_ITEM_HIERARCHY = "remap_item_hierarchy"
+    """Re-apply the mappers to an item and everything under it. The subject is
+    the item."""
+
+    APPLY_MAPPING = "apply_mapping"
+    """Apply a mapping that was created or changed to every attribute its
+    mapper maps. The subject is the mapping."""
+
+    MOVE_ITEM = "move_item"
+    """Move an item, and so everything under it, to another parent. The
+    subject is the item."""
+
+    DELETE_BATCH = "delete_batch"
+    """Delete a batch, handing what other batches share to them. The subject
+    is the batch."""
+
+
+class OperationStatus(Enum):
+    """Where an operation stands."""
+
+    QUEUED = "queued"
+    """Waiting for a worker."""
+
+    RUNNING = "running"
+
+    COMPLETED = "completed"
+
+    FAILED = "failed"
+    """Stopped by an error, which is the message."""
+
+    CANCELLED = "cancelled"
+    """Stopped because somebody asked it to. What it did before it noticed
+    stays done."""
+
+    @property
+    def finished(self) -> bool:
+        """Whether the operation will not change any more."""
+        return self in (
+            OperationStatus.COMPLETED,
+            OperationStatus.FAILED,
+            OperationStatus.CANCELLED,
+        )
+
+
+class Operation(CamelCaseBaseModel):
+    """An action run in the background, as whoever started it follows it."""
+
+    uid: UUID
+    kind: OperationKind
+    subject_uid: UUID
+    """What the action is run on, which depends on the kind."""
+
+    status: OperationStatus
+    total: int | None = None
+    """How many steps the action takes, once it has counted them."""
+
+    done: int = 0
+    """How many of them it has taken."""
+
+    message: str | None = None
+    """What it ended with: the outcome, or the error that stopped it."""
+
+    cancel_requested: bool = False
+    created_at: datetime
+    finished_at: datetime | None = None
@@ -0,0 +1,116 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""What processing an image took, phase by phase and step by step."""
+
+from collections.abc import Mapping, Sequence
+from enum import StrEnum
+from uuid import UUID
+
+from pydantic import Field
+
+from slidetap.model.base_model import FrozenBaseModel
+
+
+class ImageProcessingPhase(StrEnum):
+    """The jobs an image goes through, each run by a task of its own."""
+
+    DOWNLOAD = "download"
+    PRE_PROCESS = "pre_process"
+    POST_PROCESS = "post_process"
+    STORE = "store"
+
+
+class ProcessingMeasurement(FrozenBaseModel):
+    """What one run of a phase or a step took.
+
+    The CPU time, the bytes read and written and the peak memory are those of
+    the worker process, which runs as many jobs at a time as it has been given
+    concurrency for: with more than one, they include what the other jobs
+    took meanwhile. Sizing from them is done with a worker running one job at
+    a time. The wall time is the job's own either way.
+    """
+
+    wall_seconds: float
+    cpu_seconds: float
+    read_bytes: int | None = None
+    """Read from storage, where the platform counts it."""
+    written_bytes: int | None = None
+    """Written to storage, where the platform counts it."""
+    peak_rss_bytes: int | None = None
+    """The most memory the worker had held at the end of the run, since it
+    started, where the platform counts it."""
+    failed: bool = False
+
+
+class ImageProcessingProfile(FrozenBaseModel):
+    """What each phase of processing an image took, the last time it ran, and
+    what each step of post-processing took within it."""
+
+    phases: Mapping[ImageProcessingPhase, ProcessingMeasurement] = Field(
+        default_factory=dict
+    )
+    steps: Mapping[str, ProcessingMeasurement] = Field(default_factory=dict)
+    """By the name of the step class."""
+
+    def with_phase(
+        self,
+        phase: ImageProcessingPhase,
+        measurement: ProcessingMeasurement,
+        steps: Mapping[str, ProcessingMeasurement] | None = None,
+    ) -> "ImageProcessingProfile":
+        """The profile with a run of a phase in it, in place of any earlier
+        run of it. Steps given replace those of the earlier run."""
+        return ImageProcessingProfile(
+            phases={**self.phases, phase: measurement},
+            steps=self.steps if steps is None else steps,
+        )
+
+
+class ProcessingSummary(FrozenBaseModel):
+    """What a phase or a step took over the images of a batch."""
+
+    images: int
+    failed: int
+    total_wall_seconds: float
+    median_wall_seconds: float
+    max_wall_seconds: float
+    total_cpu_seconds: float
+    read_bytes: int | None = None
+    written_bytes: int | None = None
+    peak_rss_bytes: int | None = None
+    """The largest of the peaks of the images."""
+
+
+class SlowImage(FrozenBaseModel):
+    """An image among those that took the longest to process in a batch."""
+
+    uid: UUID
+    identifier: str
+    wall_seconds: float
+    """The phases of the image, together."""
+    times_median: float | None
+    """How many times the median image of the batch that is, None where the
+    median took no time."""
+
+
+class BatchProcessingProfile(FrozenBaseModel):
+    """What processing the images of a batch took, over all of them."""
+
+    uid: UUID
+    images: int
+    """Images of the batch with anything recorded."""
+    phases: Mapping[ImageProcessingPhase, ProcessingSummary]
+    steps: Mapping[str, ProcessingSummary]
+    slowest: Sequence[SlowImage]
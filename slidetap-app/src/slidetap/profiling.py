@@ -0,0 +1,254 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Profiling of a sample of the requests and tasks a process runs, and
+counting of the queries a request makes.
+
+What the metrics say is that a route or a task has become slower; what they
+do not say is where the time went, and by the time a regression is noticed in
+production the change that made it is weeks old. With profiling on in staging,
+a sample of requests and tasks are profiled and written out as ``pstats``
+files, and a request running one statement over and over -- once per row of
+something it loaded -- is logged as it happens.
+
+Both are off unless configured, see ``ProfilingConfig``. A process has one
+``PROFILER``, configured where it starts, as it has one ``REGISTRY`` of metrics.
+"""
+
+import cProfile
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from slidetap.config import ProfilingConfig
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+"""What is left out of a route or task name made into a file name."""
+
+_STATEMENT_LENGTH = 300
+"""How much of a statement is logged."""
+
+_QUERY_START = "slidetap_query_start"
+"""Where on a connection the start of the statement running on it is kept."""
+
+
+@dataclass
+class StatementCount:
+    """How often one statement ran, and for how long."""
+
+    statement: str
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class QueryCount:
+    """The queries run within one request."""
+
+    queries: int = 0
+    seconds: float = 0.0
+    statements: dict[str, StatementCount] = field(default_factory=dict)
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.seconds += seconds
+        count = self.statements.get(statement)
+        if count is None:
+            count = self.statements[statement] = StatementCount(statement)
+        count.count += 1
+        count.seconds += seconds
+
+    def repeated(self, threshold: int) -> list[StatementCount]:
+        """The statements run more than ``threshold`` times, most run first."""
+        return sorted(
+            (count for count in self.statements.values() if count.count > threshold),
+            key=lambda count: count.count,
+            reverse=True,
+        )
+
+
+_QUERY_COUNT: ContextVar[QueryCount | None] = ContextVar(
+    "slidetap_query_count", default=None
+)
+"""The count of the request running, if its queries are counted. Copied into
+the threads a request runs database work in, and thus shared with them."""
+
+
+def count_queries(engine: Engine) -> None:
+    """Count each query run on an engine towards the request running it, where
+    that request is counted. For a request that is not, a query costs a lookup
+    of the context."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(connection: Any, *args: Any) -> None:
+    if _QUERY_COUNT.get() is not None:
+        connection.info[_QUERY_START] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    connection: Any, cursor: Any, statement: str, *args: Any
+) -> None:
+    count = _QUERY_COUNT.get()
+    start = connection.info.pop(_QUERY_START, None)
+    if count is not None and start is not None:
+        count.add(statement, time.perf_counter() - start)
+
+
+class Profiler:
+    """Profiles a sample of the requests and tasks a process runs, and counts
+    the queries of its requests.
+
+    Profiling takes over the interpreter rather than a thread, so one run is
+    profiled at a time, and a run sampled while another is profiled is not. A
+    profile is of the process while the run ran: in the web app, where requests
+    run side by side, it includes what the others did meanwhile, and is read
+    for where the time of the route went rather than for its totals.
+
+    Neither a profile nor a count fails what it was taken of. A profile that
+    cannot be written is logged and left out.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        directory: Path | None = None,
+        repeated_query_threshold: int | None = None,
+    ):
+        self._sample_rate = sample_rate
+        self._directory = directory
+        self._repeated_query_threshold = repeated_query_threshold
+        self._profiling = threading.Lock()
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def configure(self, config: ProfilingConfig, directory: Path | None) -> None:
+        """Set what to profile, and where to write the profiles, from the
+        configuration of the process."""
+        self._sample_rate = config.sample_rate
+        self._directory = directory
+        self._repeated_query_threshold = config.repeated_query_threshold
+        if self._sample_rate > 0 and directory is not None:
+            self._logger.info(
+                f"Profiling {self._sample_rate:.1%} of requests and tasks "
+                f"into {directory}."
+            )
+
+    def start(self) -> cProfile.Profile | None:
+        """A profile started for a run, or None for a run not sampled or
+        sampled while another run is profiled. A profile started is to be
+        finished, whatever the run comes to."""
+        if (
+            self._directory is None
+            or self._sample_rate <= 0
+            or random.random() >= self._sample_rate  # noqa: S311
+            or not self._profiling.acquire(blocking=False)
+        ):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Something else, a debugger, is profiling the interpreter already.
+            self._profiling.release()
+            return None
+        return profile
+
+    def finish(
+        self, profile: cProfile.Profile, kind: str, name: str, tag: str
+    ) -> Path | None:
+        """Stop a profile and write it as ``<kind>/<name>-<tag>-<time>.prof``
+        under the profile directory.
+
+        Returns
+        -------
+        Path | None
+            Where the profile was written, or None where it could not be.
+        """
+        profile.disable()
+        self._profiling.release()
+        if self._directory is None:
+            return None
+        path = self._directory.joinpath(
+            kind,
+            f"{_safe(name)}-{_safe(tag)}-"
+            f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.prof",
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError:
+            self._logger.warning(f"Failed to write profile {path}.", exc_info=True)
+            return None
+        return path
+
+    @contextmanager
+    def profiling(self, kind: str, name: str, tag: str) -> Iterator[None]:
+        """Profile what is run within, if it is sampled."""
+        profile = self.start()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                self.finish(profile, kind, name, tag)
+
+    @contextmanager
+    def counting_queries(self) -> Iterator[QueryCount | None]:
+        """Count the queries run within, on engines counted by ``count_queries``,
+        or None where queries are not counted."""
+        if self._repeated_query_threshold is None:
+            yield None
+            return
+        count = QueryCount()
+        token = _QUERY_COUNT.set(count)
+        try:
+            yield count
+        finally:
+            _QUERY_COUNT.reset(token)
+
+    def log_queries(self, count: QueryCount, name: str) -> None:
+        """Log the queries of a request, and warn about the statements it ran
+        more times than the threshold, which is most often one per row of
+        something loaded without them."""
+        self._logger.debug(
+            f"{name} ran {count.queries} queries in {count.seconds:.3f} s."
+        )
+        if self._repeated_query_threshold is None:
+            return
+        for repeated in count.repeated(self._repeated_query_threshold):
+            self._logger.warning(
+                f"{name} ran one statement {repeated.count} times, taking "
+                f"{repeated.seconds:.3f} s of {count.seconds:.3f} s in "
+                f"{count.queries} queries: "
+                f"{' '.join(repeated.statement.split())[:_STATEMENT_LENGTH]}"
+            )
+
+
+def _safe(name: str) -> str:
+    return _UNSAFE.sub("_", name).strip("_") or "unnamed"
+
+
+PROFILER = Profiler()
+"""The profiler of the process, off until configured."""
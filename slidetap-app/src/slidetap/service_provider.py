@@ -47,6 +47,7 @@ from slidetap.services import (
     MapperService,
     MetadataSearchItemService,
     ModelService,
+    OperationService,
     OverviewService,
     ProjectService,
     ReviewService,
@@ -89,6 +90,7 @@ class BaseProvider(Provider):
         self.provide(ReviewService)
         self.provide(MapperService)
         self.provide(MetadataSearchItemService)
+        self.provide(OperationService)
         self.provide(OverviewService)
         self.provide(ProjectService)
         self.provide(SchemaService)
@@ -27,6 +27,11 @@ from slidetap.services.mapper_service import (
 )
 from slidetap.services.metadata_search_item_service import MetadataSearchItemService
 from slidetap.services.model_service import ModelService
+from slidetap.services.operation_service import (
+    OperationCancelled,
+    OperationProgress,
+    OperationService,
+)
 from slidetap.services.overview_service import OverviewService
 from slidetap.services.project_service import ProjectService
 from slidetap.services.review_service import ReviewService
@@ -50,6 +55,9 @@ __all__ = [
     "MapperCache",
     "MapperService",
     "MetadataSearchItemService",
+    "OperationCancelled",
+    "OperationProgress",
+    "OperationService",
     "OverviewService",
     "ProjectService",
     "SchemaService",
@@ -60,6 +60,7 @@ from slidetap.services.database_service import DatabaseService
 from slidetap.services.review_service import ReviewService
 from slidetap.services.schema_service import SchemaService
 from slidetap.services.validation_service import ValidationService
+from slidetap.services.validation_tracker import ValidationTracker
 
 
 class AttributeService:
@@ -84,16 +85,14 @@ class AttributeService:
 
         An attribute is edited through here without the item it belongs to
         being saved, so this is the only place that notices what a curator
-        filling one in did to the item.
+        filling one in did to the item. Inside a `ValidationTracker` already
+        open on the session, the item is only noted, and validated once that
+        one is done.
         """
-        was_valid = self._validation_service.item_is_valid_for_now(item_uid, session)
-        self._validation_service.validate_item_attributes(item_uid, session)
-        self._review_service.item_validity_changed(
-            item_uid,
-            was_valid,
-            self._validation_service.item_is_valid_for_now(item_uid, session),
-            session=session,
-        )
+        with ValidationTracker.track(
+            self._validation_service, self._review_service, session
+        ) as tracker:
+            tracker.attributes_changed(item_uid)
 
     def get(self, attribute_uid: UUID) -> AnyAttribute:
         with self._database_service.get_session() as session:
@@ -126,6 +125,10 @@ class AttributeService:
             if existing_attribute is None:
                 raise ValueError(f"Attribute with uid {attribute.uid} does not exist")
             self.set_display_value(attribute)
+            if existing_attribute.holds(attribute):
+                # Saved as it was: nothing to write, no unmapped values to
+                # record again and nothing to validate.
+                return existing_attribute.model
             existing_attribute.set_value(
                 attribute.updated_value, attribute.display_value
             )
@@ -158,27 +161,53 @@ class AttributeService:
     ) -> None:
         with self._database_service.get_session(session) as session:
             item = self._database_service.get_item(session, item)
+            attributes = list(attributes)
+            # Looked up, and what they carry without a mapping replaced, as a
+            # group: an image's scanner metadata is hundreds of attributes, and
+            # each of them on its own was a lookup and a delete.
+            existing = self._database_service.get_optional_attributes(
+                session, attributes
+            )
+            # A save sends every attribute of the item, most of them as they
+            # were. Those are left alone: not written, their unmapped values
+            # not recorded again, and not validated.
+            changed: list[AnyAttribute] = []
             for attribute in attributes:
                 self.set_display_value(attribute)
-                database_attribute = self._database_service.get_optional_attribute(
-                    session, attribute.uid
-                )
-                if database_attribute is None:
-                    database_attribute = self._database_service.add_attribute(
-                        session,
-                        attribute,
-                        self._schema_service.get_attribute(attribute.schema_uid),
-                    )
-                    item.attributes.add(database_attribute)
-                else:
-                    database_attribute.set_value(
-                        attribute.updated_value, attribute.display_value
-                    )
-                    database_attribute.set_mappable_value(attribute.mappable_value)
-                    database_attribute.set_rejected(attribute.rejected)
-                    self._database_service.record_unmapped_values(database_attribute, session)
-                self._validation_service.validate_attribute(database_attribute, session)
-            self._validate_item_and_report(item.uid, session)
+                database_attribute = existing.get(attribute.uid)
+                if database_attribute is None or not database_attribute.holds(
+                    attribute, with_mapping=False
+                ):
+                    changed.append(attribute)
+            if not changed:
+                return
+            # Noted before anything is changed, so that what the item was is
+            # read before it is.
+            with ValidationTracker.track(
+                self._validation_service, self._review_service, session
+            ) as tracker:
+                tracker.attributes_changed(item)
+                stored: list[DatabaseAttribute] = []
+                updated: list[DatabaseAttribute] = []
+                for attribute in changed:
+                    database_attribute = existing.get(attribute.uid)
+                    if database_attribute is None:
+                        database_attribute = self._database_service.add_attribute(
+                            session,
+                            attribute,
+                            self._schema_service.get_attribute(attribute.schema_uid),
+                        )
+                        item.attributes.add(database_attribute)
+                    else:
+                        database_attribute.set_value(
+                            attribute.updated_value, attribute.display_value
+                        )
+                        database_attribute.set_mappable_value(attribute.mappable_value)
+                        database_attribute.set_rejected(attribute.rejected)
+                        updated.append(database_attribute)
+                    stored.append(database_attribute)
+                self._database_service.record_unmapped_values_of(session, updated)
+                self._validation_service.validate_many(stored)
 
     def update_for_project(
         self,
@@ -20,6 +20,7 @@ from sqlalchemy.orm import Session
 
 from slidetap.database import (
     DatabaseBatch,
+    DatabaseBatchImageProgress,
     DatabaseImage,
     DatabaseItem,
     DatabaseProject,
@@ -34,6 +35,7 @@ from slidetap.model import (
     ProjectStatus,
 )
 from slidetap.services.database_service import DatabaseService
+from slidetap.services.operation_service import OperationProgress
 from slidetap.services.review_service import ReviewService
 from slidetap.services.schema_service import SchemaService
 from slidetap.services.validation_service import ValidationService
@@ -102,7 +104,18 @@ class BatchService:
             existing_batch.name = batch.name
             return existing_batch.model
 
-    def delete(self, uid: UUID) -> Batch | None:
+    def delete(
+        self, uid: UUID, progress: OperationProgress | None = None
+    ) -> Batch | None:
+        """Delete a batch, handing what other batches hang off to the project's
+        default batch.
+
+        Give ``progress`` to have it told about each item as it is dealt with,
+        as an operation run in the background is. Each kind of item is
+        committed as it is done, so a delete cancelled part-way leaves the
+        batch deleted with what was not reached still in it, and deleting it
+        again finishes it.
+        """
         with self._database_service.get_session() as session:
             batch = self._database_service.get_optional_batch(session, uid)
             if batch is None:
@@ -111,12 +124,17 @@ class BatchService:
             model = batch.model
             if batch.project.default_batch_uid is None:
                 raise ValueError("Project does not have a default batch uid.")
+            if progress is not None:
+                progress.begin(
+                    self._database_service.count_items(session, batch_uid=uid)
+                )
             for schema in self._schema_service.items.values():
                 self._delete_or_change_batch_to_default_for_items(
                     batch,
                     schema,
                     default_batch_uid=batch.project.default_batch_uid,
                     session=session,
+                    progress=progress,
                 )
             project = batch.project
             session.delete(batch)
@@ -212,6 +230,7 @@ class BatchService:
         default_batch_uid: UUID,
         session: Session,
         only_non_selected=False,
+        progress: OperationProgress | None = None,
     ) -> None:
         batch_uid = self._database_service.get_batch(session, batch).uid
         items = self._database_service.get_items(
@@ -239,6 +258,8 @@ class BatchService:
                         session=session,
                     )
                 session.delete(item)
+            if progress is not None:
+                progress.advance()
         session.commit()
 
     def reset(
@@ -345,6 +366,123 @@ class BatchService:
             session.commit()
             return batch.model
 
+    def finish_pre_processing(self, batch: UUID, session: Session) -> bool:
+        """Set the batch as pre-processed if no selected image of it is still
+        to be pre-processed.
+
+        Called by the task of each image once it is done with it. The batch
+        row is locked while it is looked at, so when the last images finish at
+        the same time one of them moves the batch on and the others, waiting
+        for the lock, find it already moved.
+
+        Returns
+        -------
+        bool
+            Whether this call moved the batch on.
+        """
+        database_batch = self._database_service.get_batch_for_update(session, batch)
+        if not database_batch.image_pre_processing:
+            return False
+        progress = self._image_progress(database_batch, session)
+        if progress.not_pre_processed > 0:
+            return False
+        self.set_as_pre_processed(database_batch, session=session)
+        return True
+
+    def finish_post_processing(self, batch: UUID, session: Session) -> bool:
+        """Set the batch as post-processed if no selected image of it is still
+        to be post-processed. As ``finish_pre_processing``.
+
+        Returns
+        -------
+        bool
+            Whether this call moved the batch on.
+        """
+        database_batch = self._database_service.get_batch_for_update(session, batch)
+        if not database_batch.image_post_processing:
+            return False
+        progress = self._image_progress(database_batch, session)
+        if progress.not_post_processed > 0:
+            return False
+        self.set_as_post_processed(database_batch, session=session)
+        return True
+
+    def finish_storing(self, batch: UUID, session: Session) -> bool:
+        """Set the batch as completed if every selected image of it is stored.
+
+        Called by the task storing each image once it is done with it, and for
+        a batch that had nothing left to store. As ``finish_pre_processing``,
+        the batch row is locked so that only one of them completes it. An image
+        that failed to store is not stored, so it holds the batch until it is
+        retried or deselected.
+
+        Returns
+        -------
+        bool
+            Whether this call completed the batch.
+        """
+        database_batch = self._database_service.get_batch_for_update(session, batch)
+        if not database_batch.image_storing:
+            return False
+        progress = self._image_progress(database_batch, session)
+        if progress.not_stored > 0:
+            return False
+        self.set_as_completed(database_batch, session=session)
+        return True
+
+    def _image_progress(
+        self, batch: DatabaseBatch, session: Session
+    ) -> DatabaseBatchImageProgress:
+        """The counts of what the images of the batch are still waiting for,
+        counted here for a batch that has none kept."""
+        progress = self._database_service.get_batch_image_progress(session, batch)
+        if progress is None:
+            self._database_service.reconcile_batch_image_progress(session, [batch.uid])
+            session.flush()
+            return session.get_one(DatabaseBatchImageProgress, batch.uid)
+        return progress
+
+    def reconcile_image_progress_counts(self) -> int:
+        """Count again the selected images of every batch still to be processed
+        or stored, and correct the counts kept for them where they have drifted.
+
+        A batch is moved on by the task of its last image to finish, which
+        found it held by counts that were too high. With the counts set right
+        no task is left to move it, so each batch still processing or storing
+        is then finished here as that task would have finished it. Each is
+        finished in a session of its own, so that the row lock taken for one
+        is not held while the next is looked at.
+
+        Returns
+        -------
+        int
+            How many batches had their counts corrected.
+        """
+        with self._database_service.get_session() as session:
+            corrected = self._database_service.reconcile_batch_image_progress(session)
+            session.commit()
+        finishers = {
+            BatchStatus.IMAGE_PRE_PROCESSING: self.finish_pre_processing,
+            BatchStatus.IMAGE_POST_PROCESSING: self.finish_post_processing,
+            BatchStatus.IMAGE_STORING: self.finish_storing,
+        }
+        for status, finish in finishers.items():
+            with self._database_service.get_session() as session:
+                batch_uids = [
+                    batch.uid
+                    for batch in self._database_service.get_batches(
+                        session, None, status
+                    )
+                ]
+            for batch_uid in batch_uids:
+                with self._database_service.get_session() as session:
+                    if finish(batch_uid, session):
+                        self._logger.info(
+                            f"Batch {batch_uid} moved on from {status} once its "
+                            "image progress was reconciled."
+                        )
+        return corrected
+
     def set_as_post_processed(
         self,
         batch: UUID | Batch | DatabaseBatch,
@@ -427,6 +565,11 @@ class BatchService:
         """
         with self._database_service.get_session(session) as session:
             batch = self._database_service.get_batch(session, batch)
+            # The count says whether there is one, so the images are only
+            # looked through for which one when there is.
+            progress = self._database_service.get_batch_image_progress(session, batch)
+            if progress is not None and progress.failed_to_store == 0:
+                return None
             return self._database_service.get_first_image_for_batch(
                 session,
                 batch_uid=batch.uid,
@@ -16,32 +16,48 @@
 
 import datetime
 import re
-from collections.abc import Iterator, Iterable, Iterator, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
 from typing import (
+    Any,
     NamedTuple,
     Optional,
     TypeVar,
     overload,
 )
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    CTE,
     Column,
+    ColumnElement,
+    ColumnExpressionArgument,
+    Engine,
+    FromClause,
     Label,
     Row,
     Select,
     String,
+    Subquery,
     Table,
+    Uuid,
     and_,
     cast,
     create_engine,
+    delete,
     func,
+    insert,
+    inspect,
+    literal,
+    null,
+    nulls_last,
     or_,
     select,
-    true,
-    delete,
+    union_all,
+    update,
 )
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import (
     InstrumentedAttribute,
     Mapped,
@@ -49,6 +65,7 @@ from sqlalchemy.orm import (
     aliased,
     selectinload,
     sessionmaker,
+    with_polymorphic,
 )
 
 from slidetap.config import DatabaseConfig
@@ -56,6 +73,8 @@ from slidetap.database import (
     DatabaseAnnotation,
     DatabaseAttribute,
     DatabaseBatch,
+    DatabaseBatchImageProgress,
+    DatabaseBatchValidation,
     DatabaseBooleanAttribute,
     DatabaseCodeAttribute,
     DatabaseDataset,
@@ -67,19 +86,30 @@ from slidetap.database import (
     DatabaseListAttribute,
     DatabaseMapper,
     DatabaseMapperGroup,
+    DatabaseMapperInjection,
     DatabaseMappingItem,
     DatabaseMeasurementAttribute,
     DatabaseNumericAttribute,
     DatabaseObjectAttribute,
     DatabaseObservation,
+    DatabaseOperation,
     DatabaseProject,
     DatabaseReviewIssue,
+    DatabaseReviewSummary,
     DatabaseSample,
     DatabaseStringAttribute,
     DatabaseUnionAttribute,
     DatabaseUnmappedValue,
+    DatabaseUnmappedValueCount,
+)
+from slidetap.database.batch_image_progress import (
+    POST_PROCESSING_SETTLED,
+    PRE_PROCESSING_SETTLED,
 )
-from slidetap.database.item import DatabaseTag
+from slidetap.database.batch_validation import add_to_batch_validations
+from slidetap.database.item import FAILED_IMAGE_STATUSES, DatabaseTag
+from slidetap.database.pool import PoolStatistics, TimedQueuePool
+from slidetap.database.unmapped_value import note_unmapped_values_removed
 from slidetap.model import (
     Annotation,
     AnnotationSchema,
@@ -102,6 +132,7 @@ from slidetap.model import (
     EnumAttribute,
     EnumAttributeSchema,
     Image,
+    ImageProcessingProfile,
     ImageSchema,
     ImageStatus,
     Item,
@@ -118,8 +149,11 @@ from slidetap.model import (
     ObjectAttributeSchema,
     Observation,
     ObservationSchema,
+    OperationKind,
     Project,
+    RejectedValues,
     ReviewIssueSource,
+    ReviewQueueSort,
     ReviewStatus,
     Sample,
     SampleSchema,
@@ -127,7 +161,6 @@ from slidetap.model import (
     StringAttributeSchema,
     UnionAttribute,
     UnionAttributeSchema,
-    RejectedValues,
 )
 from slidetap.model.table import (
     AttributeFilter,
@@ -139,6 +172,7 @@ from slidetap.model.table import (
     SortType,
 )
 from slidetap.model.tag import Tag
+from slidetap.profiling import count_queries
 
 DatabaseEntity = TypeVar("DatabaseEntity")
 
@@ -146,7 +180,7 @@ DatabaseEntity = TypeVar("DatabaseEntity")
 class OpenIssues(NamedTuple):
     """What is open on a review unit, as the queue needs to say it."""
 
-    count: int
+    total: int
     """How many issues are open on it."""
 
     reasons: tuple[str, ...]
@@ -168,13 +202,96 @@ to overrun this is not a wording anyone will write a mapping key for.
 """
 
 
+class NotValidUnder(NamedTuple):
+    """An item that is not valid under a review unit, as a sweep over many
+    units finds it."""
+
+    unit_uid: UUID
+    """The unit it was found under."""
+
+    item_uid: UUID
+    """The item."""
+
+    batch_status: BatchStatus | None
+    """Where the unit's batch stands, which is what decides whether what its
+    import leaves out is still excused. ``None`` for a unit with no batch."""
+
+    raised: bool
+    """Whether validation already has an issue open on the item."""
+
+
+class ItemLink(NamedTuple):
+    """One step of a walk through the items, as the walk reports it."""
+
+    uid: UUID
+    """The item stepped to."""
+
+    schema_uid: UUID
+    """What kind of item it is."""
+
+    depth: int
+    """How many steps it is from where the walk started, which is zero."""
+
+    via_uid: UUID | None
+    """The item it was stepped to from, ``None`` for where the walk started."""
+
+
+class ProfiledImage(NamedTuple):
+    """An image with what processing it took on record."""
+
+    uid: UUID
+    identifier: str
+    profile: ImageProcessingProfile
+
+
 class DatabaseService:
     QUEUED_REASONS = 5
     """How many of a unit's open issues the queue is given the reasons for."""
 
+    WALK_DEPTH = 32
+    """How many steps a walk through the items takes at most. The hierarchy is
+    a handful of levels deep, so this is a guard against a relation that loops
+    rather than a limit anything reaches."""
+
     def __init__(self, config: DatabaseConfig):
-        self._engine = create_engine(self._sqlalchemy_uri(config.uri))
+        self._engine = self._create_engine(config)
+        # Counted only for a request that is, see ``Profiler.counting_queries``.
+        count_queries(self._engine)
         self._no_autoflush = config.no_autoflush
+        # Made once: a session maker holds nothing per session, and making one
+        # for every session was work done on every request for nothing.
+        self._sessionmakers = {
+            autoflush: sessionmaker(autoflush=autoflush, bind=self._engine)
+            for autoflush in (True, False)
+        }
+
+    @classmethod
+    def _create_engine(cls, config: DatabaseConfig) -> Engine:
+        uri = make_url(cls._sqlalchemy_uri(config.uri))
+        arguments: dict[str, Any] = {
+            "pool_pre_ping": config.pool_pre_ping,
+            "pool_recycle": config.pool_recycle,
+            "insertmanyvalues_page_size": config.insertmanyvalues_page_size,
+        }
+        if uri.get_backend_name() != "sqlite" or uri.database not in (
+            None,
+            "",
+            ":memory:",
+        ):
+            # An in-memory SQLite database is one connection per thread, which
+            # there is nothing to size.
+            arguments.update(
+                poolclass=TimedQueuePool,
+                pool_size=config.pool_size,
+                max_overflow=config.max_overflow,
+                pool_timeout=config.pool_timeout,
+            )
+        if uri.get_backend_name() == "postgresql" and config.statement_timeout:
+            arguments["connect_args"] = {
+                "options": "-c statement_timeout="
+                f"{round(config.statement_timeout * 1000)}"
+            }
+        return create_engine(uri, **arguments)
 
     @staticmethod
     def _sqlalchemy_uri(uri: str) -> str:
@@ -188,8 +305,15 @@ class DatabaseService:
                 return "postgresql+psycopg://" + uri[len(scheme) :]
         return uri
 
-    def create_session(self, autoflush: bool = True):
-        return sessionmaker(autoflush=autoflush, bind=self._engine)
+    def create_session(self, autoflush: bool = True) -> sessionmaker[Session]:
+        return self._sessionmakers[autoflush]
+
+    def pool_statistics(self) -> PoolStatistics | None:
+        """How the connections of this process have been handed out, or None
+        where there is no pool to speak of."""
+        if isinstance(self._engine.pool, TimedQueuePool):
+            return self._engine.pool.statistics()
+        return None
 
     @contextmanager
     def get_session(
@@ -298,6 +422,25 @@ class DatabaseService:
             return session.get(DatabaseBatch, batch.uid)
         return batch
 
+    def get_batch_for_update(
+        self,
+        session: Session,
+        batch: UUID | Batch | DatabaseBatch,
+    ) -> DatabaseBatch:
+        """Get batch with a row-level lock (SELECT FOR UPDATE).
+
+        For moving a batch on from what its images are, which the task of every
+        image may try at once: the lock has the others wait for the one that
+        does it, and see it done."""
+        if isinstance(batch, (Batch, DatabaseBatch)):
+            batch = batch.uid
+        return session.scalars(
+            select(DatabaseBatch)
+            .where(DatabaseBatch.uid == batch)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).one()
+
     def get_attribute(
         self,
         session: Session,
@@ -447,14 +590,32 @@ class DatabaseService:
     def walk_item_descendants(
         self,
         root: DatabaseItem,
+        load_attributes: bool = False,
     ) -> Iterable[DatabaseItem]:
-        """Yield ``root`` plus every descendant once, de-duped by uid.
+        """Yield ``root`` plus every descendant once, nearest first.
 
         Sample → child samples + images + observations.
         Image  → annotations + observations.
         Annotation → observations.
         Observation → leaf.
+
+        Found by one query over the relation tables, see
+        :py:meth:`get_descendants`, rather than by following each item's
+        relationships, which is a query per item walked and a case holds them
+        by the hundred. An item not stored yet has nothing under it the
+        database knows of, and is walked through its relationships instead.
         """
+        session = Session.object_session(root)
+        if session is None or not inspect(root).persistent:
+            yield from self._walk_loaded_descendants(root)
+            return
+        yield from self.get_descendants(session, [root.uid], load_attributes)
+
+    def _walk_loaded_descendants(
+        self,
+        root: DatabaseItem,
+    ) -> Iterable[DatabaseItem]:
+        """:py:meth:`walk_item_descendants` through the relationships."""
         visited: set[UUID] = set()
         stack: list[DatabaseItem] = [root]
         while stack:
@@ -493,14 +654,28 @@ class DatabaseService:
         under parents of several kinds at once, so the search is breadth first
         and the nearest is the one returned.
         """
-        return next(
+        session = Session.object_session(item)
+        if session is None or not inspect(item).persistent:
+            return next(
+                (
+                    ancestor
+                    for ancestor in self._walk_item_ancestors(item)
+                    if ancestor.schema_uid in schema_uids
+                ),
+                None,
+            )
+        nearest = min(
             (
-                ancestor
-                for ancestor in self._walk_item_ancestors(item)
-                if ancestor.schema_uid in schema_uids
+                link
+                for link in self.get_ancestor_links(session, [item.uid], schema_uids)
+                if link.depth > 0
             ),
-            None,
+            key=lambda link: (link.depth, str(link.uid)),
+            default=None,
         )
+        if nearest is None:
+            return None
+        return self.get_optional_item(session, nearest.uid)
 
     def _walk_item_ancestors(
         self,
@@ -508,7 +683,9 @@ class DatabaseService:
     ) -> Iterable[DatabaseItem]:
         """Yield everything ``item`` hangs under, nearest first, once each.
 
-        The reverse of :py:meth:`walk_item_descendants`, breadth first.
+        The reverse of :py:meth:`walk_item_descendants`, breadth first, through
+        the relationships. For an item not stored yet; a stored one is asked
+        about with :py:meth:`get_ancestor_links`.
         """
         visited = {item.uid}
         level: list[DatabaseItem] = [item]
@@ -539,6 +716,585 @@ class DatabaseService:
             ]
         return []
 
+    def get_descendant_links(
+        self,
+        session: Session,
+        roots: Iterable[UUID],
+        schema_uids: Iterable[UUID] | None = None,
+        samples_only: bool = False,
+    ) -> list[ItemLink]:
+        """Every step down from the roots through what hangs under them.
+
+        One query for the whole of it, however deep and wide, where following
+        each item's relationships is a query per item. The roots
+        are answered as links of their own, at depth zero and reached from
+        nothing. An item reached from several parents is answered once for
+        each of them, which is what a caller laying out a tree needs; one that
+        wants the items alone takes the uids.
+
+        Parameters
+        ----------
+        session: Session
+            Session to use.
+        roots: Iterable[UUID]
+            The items to walk down from.
+        schema_uids: Iterable[UUID] | None
+            Only the items of these schemas, though the walk goes through the
+            others to reach them. All of them by default.
+        samples_only: bool
+            Walk from sample to sample alone, leaving out the images,
+            annotations and observations hanging off them.
+        """
+        return self._walk_links(session, roots, True, schema_uids, samples_only)
+
+    def get_ancestor_links(
+        self,
+        session: Session,
+        items: Iterable[UUID],
+        schema_uids: Iterable[UUID] | None = None,
+        samples_only: bool = False,
+    ) -> list[ItemLink]:
+        """Every step up from the items to what they hang under, the reverse of
+        :py:meth:`get_descendant_links`. Where a link was reached from is the
+        item below it."""
+        return self._walk_links(session, items, False, schema_uids, samples_only)
+
+    def get_descendants(
+        self,
+        session: Session,
+        roots: Iterable[UUID],
+        load_attributes: bool = False,
+    ) -> list[DatabaseItem]:
+        """The roots and everything under them, once each, nearest first.
+
+        Read in one query joined to the walk, with the rows of every kind of
+        item in it, rather than the walk's uids being looked up one by one.
+        Set ``load_attributes=True`` for callers that will read the items'
+        attributes, for the reason :py:meth:`get_items_in_batch` gives.
+        """
+        roots = list(roots)
+        if not roots:
+            return []
+        walk = self._walk(roots, downward=True)
+        nearest = (
+            select(walk.c.uid, func.min(walk.c.depth).label("depth"))
+            .group_by(walk.c.uid)
+            .subquery("nearest")
+        )
+        item = with_polymorphic(DatabaseItem, "*")
+        query = (
+            select(item)
+            .join(nearest, nearest.c.uid == item.uid)
+            .order_by(nearest.c.depth, item.uid)
+        )
+        if load_attributes:
+            query = query.options(
+                selectinload(item.attributes),
+                selectinload(item.private_attributes),
+            )
+        return list(session.scalars(query).unique())
+
+    def get_items_by_uid(
+        self,
+        session: Session,
+        uids: Iterable[UUID],
+        load_attributes: bool = False,
+    ) -> dict[UUID, DatabaseItem]:
+        """The items with these uids, of whatever kind, by uid.
+
+        One query for the group, with the rows of every kind of item in it:
+        asked for as the base item, each one's own columns are read when first
+        touched, which is a query per item. Uids with no item are left out.
+        """
+        uids = set(uids)
+        if not uids:
+            return {}
+        item = with_polymorphic(DatabaseItem, "*")
+        query = select(item).where(item.uid.in_(uids))
+        if load_attributes:
+            query = query.options(
+                selectinload(item.attributes),
+                selectinload(item.private_attributes),
+            )
+        return {
+            database_item.uid: database_item for database_item in session.scalars(query)
+        }
+
+    def get_attributes_of_items(
+        self,
+        session: Session,
+        item_uids: Iterable[UUID],
+        tags: Iterable[str] | None = None,
+        private: bool = False,
+    ) -> dict[UUID, list[DatabaseAttribute]]:
+        """The attributes of several items at once, by the item they are on.
+
+        For a caller showing a few attributes of many items: loading each
+        item's attributes loads all of them, where it only reads the ones it
+        shows. Items with none of the attributes asked for are left out.
+
+        Parameters
+        ----------
+        session: Session
+            Session to use.
+        item_uids: Iterable[UUID]
+            The items to read the attributes of.
+        tags: Iterable[str] | None
+            Only the attributes with these tags. All of them by default.
+        private: bool
+            Read the private attributes rather than the others.
+        """
+        item_uids = set(item_uids)
+        if not item_uids:
+            return {}
+        # Every kind of attribute is loaded inline, so this is one statement
+        # with the values of each.
+        owner = (
+            DatabaseAttribute.private_attribute_item_uid
+            if private
+            else DatabaseAttribute.attribute_item_uid
+        )
+        query = select(owner, DatabaseAttribute).where(owner.in_(item_uids))
+        if tags is not None:
+            query = query.where(DatabaseAttribute.tag.in_(set(tags)))
+        attributes: dict[UUID, list[DatabaseAttribute]] = {}
+        for item_uid, loaded in session.execute(query):
+            if item_uid is not None:
+                attributes.setdefault(item_uid, []).append(loaded)
+        return attributes
+
+    def _walk_links(
+        self,
+        session: Session,
+        start: Iterable[UUID],
+        downward: bool,
+        schema_uids: Iterable[UUID] | None,
+        samples_only: bool,
+    ) -> list[ItemLink]:
+        start = list(start)
+        if not start:
+            return []
+        walk = self._walk(start, downward, samples_only)
+        item = DatabaseItem.__table__
+        query = (
+            select(
+                walk.c.uid,
+                item.c.schema_uid,
+                func.min(walk.c.depth),
+                walk.c.via_uid,
+            )
+            .join(item, item.c.uid == walk.c.uid)
+            .group_by(walk.c.uid, walk.c.via_uid, item.c.schema_uid)
+        )
+        if schema_uids is not None:
+            query = query.where(item.c.schema_uid.in_(set(schema_uids)))
+        return [
+            ItemLink(uid=uid, schema_uid=schema_uid, depth=depth, via_uid=via_uid)
+            for uid, schema_uid, depth, via_uid in session.execute(query)
+        ]
+
+    @classmethod
+    def _walk(
+        cls,
+        start: Sequence[UUID] | Select,
+        downward: bool,
+        samples_only: bool = False,
+        rooted: bool = False,
+    ) -> CTE:
+        """The walk from the start items through the item graph, as a recursive
+        query of (uid, via_uid, depth) rows.
+
+        Kept to the rows the relation tables hold rather than the items, so
+        that the walk itself touches nothing but the link tables and their
+        indexes. Each step is taken once per depth it is reached at, and the
+        walk stops at :py:attr:`WALK_DEPTH` steps: the graph is a few levels
+        deep, and a relation looping back on itself would otherwise be walked
+        forever.
+
+        The start items can be given as a query of their uids, for a walk from
+        more of them than are worth sending over as parameters. A ``rooted``
+        walk also carries the start item each row was reached from, as
+        ``root_uid``, for a caller walking from many items at once and asking
+        what is under each: an item under two of them is then reached once
+        from each.
+        """
+        edge = cls._item_edges(samples_only)
+        source, target = (
+            (edge.c.parent_uid, edge.c.child_uid)
+            if downward
+            else (edge.c.child_uid, edge.c.parent_uid)
+        )
+        item = DatabaseItem.__table__
+        columns: list = [
+            item.c.uid.label("uid"),
+            cast(null(), Uuid).label("via_uid"),
+            literal(0).label("depth"),
+        ]
+        if rooted:
+            columns.append(item.c.uid.label("root_uid"))
+        walk = select(*columns).where(item.c.uid.in_(start)).cte("walk", recursive=True)
+        step: list = [target, source, walk.c.depth + 1]
+        if rooted:
+            step.append(walk.c.root_uid)
+        return walk.union(
+            select(*step)
+            .join(walk, source == walk.c.uid)
+            .where(walk.c.depth < cls.WALK_DEPTH)
+        )
+
+    @staticmethod
+    def _item_edges(samples_only: bool = False) -> Subquery:
+        """Every link from an item to what hangs directly under it, as
+        (parent_uid, child_uid) rows, read from the tables holding them.
+
+        The links :py:meth:`get_children` follows, from every table they are
+        kept in.
+        """
+        sample_to_sample = DatabaseSample.sample_to_sample
+        edges: list[Select] = [
+            select(
+                sample_to_sample.c.parent_uid.label("parent_uid"),
+                sample_to_sample.c.child_uid.label("child_uid"),
+            )
+        ]
+        if not samples_only:
+            sample_to_image = DatabaseImage.sample_to_image
+            annotation = DatabaseAnnotation.__table__
+            observation = DatabaseObservation.__table__
+            edges.append(
+                select(sample_to_image.c.sample_uid, sample_to_image.c.image_uid)
+            )
+            edges.append(
+                select(annotation.c.image_uid, annotation.c.uid).where(
+                    annotation.c.image_uid.is_not(None)
+                )
+            )
+            for parent_uid in (
+                observation.c.sample_uid,
+                observation.c.image_uid,
+                observation.c.annotation_uid,
+            ):
+                edges.append(
+                    select(parent_uid, observation.c.uid).where(parent_uid.is_not(None))
+                )
+        return union_all(*edges).subquery("edge")
+
+    def get_edges_touching(
+        self, session: Session, item_uids: Iterable[UUID]
+    ) -> set[tuple[UUID, UUID]]:
+        """Every link to or from the given items, as (parent, child), from
+        every table links are kept in. One query for the lot, where following
+        each item's relationships is a load per item and kind of link."""
+        uids = set(item_uids)
+        if not uids:
+            return set()
+        edge = self._item_edges()
+        return {
+            (parent_uid, child_uid)
+            for parent_uid, child_uid in session.execute(
+                select(edge.c.parent_uid, edge.c.child_uid).where(
+                    or_(edge.c.parent_uid.in_(uids), edge.c.child_uid.in_(uids))
+                )
+            )
+        }
+
+    def get_relation_rows(
+        self, session: Session, item_uids: Iterable[UUID]
+    ) -> dict[UUID, Row]:
+        """What relations are counted from of each of the given items, as rows
+        of uid, schema, kind, whether selected, and the stored
+        ``valid_relations``, rather than as loaded items."""
+        uids = set(item_uids)
+        if not uids:
+            return {}
+        return {
+            row.uid: row
+            for row in session.execute(
+                select(
+                    DatabaseItem.uid,
+                    DatabaseItem.schema_uid,
+                    DatabaseItem.item_value_type,
+                    DatabaseItem.selected,
+                    DatabaseItem.valid_relations,
+                ).where(DatabaseItem.uid.in_(uids))
+            )
+        }
+
+    def set_valid_relations(
+        self, session: Session, valid_relations: Mapping[UUID, bool]
+    ) -> None:
+        """Store ``valid_relations`` for many items, as a statement per value
+        rather than a write per item. Items loaded in the session are given the
+        new value too.
+
+        Written around the flush, so the counts of the batches the items are
+        in are moved here, by the selected items whose validity the new value
+        turns over."""
+        for value in (True, False):
+            uids = [uid for uid, valid in valid_relations.items() if valid == value]
+            if not uids:
+                continue
+            turned = session.execute(
+                select(DatabaseItem.batch_uid, func.count())
+                .where(
+                    DatabaseItem.uid.in_(uids),
+                    DatabaseItem.valid_relations != value,
+                    DatabaseItem.selected,
+                    DatabaseItem.batch_uid.is_not(None),
+                    DatabaseItem.valid_attributes,
+                    DatabaseItem.valid_pseudonym,
+                )
+                .group_by(DatabaseItem.batch_uid)
+            )
+            add_to_batch_validations(
+                session.connection(),
+                {
+                    batch_uid: (0, -count if value else count)
+                    for batch_uid, count in turned
+                },
+            )
+            session.execute(
+                update(DatabaseItem)
+                .where(DatabaseItem.uid.in_(uids))
+                .values(valid_relations=value)
+            )
+
+    def get_batch_validation(
+        self, session: Session, batch: UUID | Batch | DatabaseBatch
+    ) -> DatabaseBatchValidation | None:
+        """The counts of selected and non-valid items kept for a batch, or None
+        for a batch that has none yet."""
+        if isinstance(batch, (Batch, DatabaseBatch)):
+            batch = batch.uid
+        return session.get(DatabaseBatchValidation, batch)
+
+    def get_non_valid_items(
+        self, session: Session, batch: UUID | Batch | DatabaseBatch
+    ) -> Iterable[Row]:
+        """The selected items of a batch that are not valid, as rows of uid,
+        identifier and schema uid."""
+        if isinstance(batch, (Batch, DatabaseBatch)):
+            batch = batch.uid
+        item = DatabaseItem.__table__
+        image = DatabaseImage.__table__
+        return session.execute(
+            select(item.c.uid, item.c.identifier, item.c.schema_uid)
+            .select_from(item)
+            .outerjoin(image, image.c.uid == item.c.uid)
+            .where(
+                item.c.batch_uid == batch,
+                item.c.selected,
+                self._not_valid(item, image),
+            )
+            .order_by(item.c.identifier)
+        )
+
+    @staticmethod
+    def _not_valid(item: FromClause, image: FromClause) -> ColumnElement[bool]:
+        """`DatabaseItem.valid`, and for an image `DatabaseImage.failed` as
+        well, negated and read off the columns of the item joined outer to its
+        image. A part of validity not worked out yet counts as not valid, as it
+        does on the item."""
+        return or_(
+            item.c.valid_attributes.is_not(True),
+            item.c.valid_relations.is_not(True),
+            item.c.valid_pseudonym.is_not(True),
+            image.c.status.in_(FAILED_IMAGE_STATUSES),
+        )
+
+    def reconcile_batch_validations(
+        self, session: Session, batches: Iterable[UUID] | None = None
+    ) -> int:
+        """Count again the selected and non-valid items of batches, and correct
+        the counts kept for them where they have drifted.
+
+        The counts are set to what is counted rather than moved by the
+        difference, so a write to the batch that lands between the count and
+        the correction can leave it off again; the next run sets it right.
+
+        Parameters
+        ----------
+        session: Session
+            Session to count in.
+        batches: Iterable[UUID] | None = None
+            The batches to count. All of them if not given.
+
+        Returns
+        -------
+        int
+            How many batches had counts that were wrong or missing.
+        """
+        batch_uids = (
+            set(batches)
+            if batches is not None
+            else set(session.scalars(select(DatabaseBatch.uid)))
+        )
+        if not batch_uids:
+            return 0
+        item = DatabaseItem.__table__
+        image = DatabaseImage.__table__
+        counts = {
+            batch_uid: (selected_items, non_valid_items)
+            for batch_uid, selected_items, non_valid_items in session.execute(
+                select(
+                    item.c.batch_uid,
+                    func.count(),
+                    func.count().filter(self._not_valid(item, image)),
+                )
+                .select_from(item)
+                .outerjoin(image, image.c.uid == item.c.uid)
+                .where(item.c.batch_uid.in_(batch_uids), item.c.selected)
+                .group_by(item.c.batch_uid)
+            )
+        }
+        kept = {
+            validation.batch_uid: validation
+            for validation in session.scalars(
+                select(DatabaseBatchValidation).where(
+                    DatabaseBatchValidation.batch_uid.in_(batch_uids)
+                )
+            )
+        }
+        corrected = 0
+        for batch_uid in batch_uids:
+            selected_items, non_valid_items = counts.get(batch_uid, (0, 0))
+            validation = kept.get(batch_uid)
+            if validation is None:
+                validation = DatabaseBatchValidation()
+                validation.batch_uid = batch_uid
+                session.add(validation)
+            elif (validation.selected_items, validation.non_valid_items) == (
+                selected_items,
+                non_valid_items,
+            ):
+                continue
+            validation.selected_items = selected_items
+            validation.non_valid_items = non_valid_items
+            corrected += 1
+        return corrected
+
+    def get_batch_image_progress(
+        self, session: Session, batch: UUID | Batch | DatabaseBatch
+    ) -> DatabaseBatchImageProgress | None:
+        """The counts of selected images still to be processed or stored kept
+        for a batch, or None for a batch that has none yet."""
+        if isinstance(batch, (Batch, DatabaseBatch)):
+            batch = batch.uid
+        return session.get(DatabaseBatchImageProgress, batch)
+
+    def get_image_processing_profiles(
+        self, session: Session, batch: UUID | Batch | DatabaseBatch
+    ) -> list[ProfiledImage]:
+        """The images of a batch that have what processing them took on
+        record, with the profile read alone rather than with the rest of each
+        image."""
+        if isinstance(batch, (Batch, DatabaseBatch)):
+            batch = batch.uid
+        query = select(
+            DatabaseImage.uid,
+            DatabaseImage.identifier,
+            DatabaseImage.processing_profile,
+        ).where(
+            DatabaseImage.batch_uid == batch,
+            DatabaseImage.processing_profile.is_not(None),
+        )
+        return [ProfiledImage(*row) for row in session.execute(query)]
+
+    def reconcile_batch_image_progress(
+        self, session: Session, batches: Iterable[UUID] | None = None
+    ) -> int:
+        """Count again the selected images of batches still to be processed or
+        stored, and correct the counts kept for them where they have drifted.
+
+        As for ``reconcile_batch_validations``, the counts are set to what is
+        counted, so a write landing between the two is set right by the next
+        run.
+
+        Parameters
+        ----------
+        session: Session
+            Session to count in.
+        batches: Iterable[UUID] | None = None
+            The batches to count. All of them if not given.
+
+        Returns
+        -------
+        int
+            How many batches had counts that were wrong or missing.
+        """
+        batch_uids = (
+            set(batches)
+            if batches is not None
+            else set(session.scalars(select(DatabaseBatch.uid)))
+        )
+        if not batch_uids:
+            return 0
+        counts = {
+            batch_uid: (
+                not_pre_processed,
+                not_post_processed,
+                not_stored,
+                failed_to_store,
+            )
+            for (
+                batch_uid,
+                not_pre_processed,
+                not_post_processed,
+                not_stored,
+                failed_to_store,
+            ) in session.execute(
+                select(
+                    DatabaseImage.batch_uid,
+                    func.count().filter(
+                        DatabaseImage.status.notin_(PRE_PROCESSING_SETTLED)
+                    ),
+                    func.count().filter(
+                        DatabaseImage.status.notin_(POST_PROCESSING_SETTLED)
+                    ),
+                    func.count().filter(DatabaseImage.status != ImageStatus.STORED),
+                    func.count().filter(
+                        DatabaseImage.status == ImageStatus.STORING_FAILED
+                    ),
+                )
+                .where(
+                    DatabaseImage.batch_uid.in_(batch_uids),
+                    DatabaseImage.selected,
+                )
+                .group_by(DatabaseImage.batch_uid)
+            )
+        }
+        kept = {
+            progress.batch_uid: progress
+            for progress in session.scalars(
+                select(DatabaseBatchImageProgress).where(
+                    DatabaseBatchImageProgress.batch_uid.in_(batch_uids)
+                )
+            )
+        }
+        corrected = 0
+        for batch_uid in batch_uids:
+            counted = counts.get(batch_uid, (0, 0, 0, 0))
+            progress = kept.get(batch_uid)
+            if progress is None:
+                progress = DatabaseBatchImageProgress()
+                progress.batch_uid = batch_uid
+                session.add(progress)
+            elif (
+                progress.not_pre_processed,
+                progress.not_post_processed,
+                progress.not_stored,
+                progress.failed_to_store,
+            ) == counted:
+                continue
+            (
+                progress.not_pre_processed,
+                progress.not_post_processed,
+                progress.not_stored,
+                progress.failed_to_store,
+            ) = counted
+            corrected += 1
+        return corrected
+
     def get_optional_image(
         self,
         session: Session,
@@ -622,20 +1378,57 @@ class DatabaseService:
             ]
         )
         if recursive:
-            for child in sample.children:
-                children.update(
-                    self.get_sample_children(
-                        session,
-                        child,
-                        sample_schema,
-                        True,
-                        selected,
-                        valid,
-                        batch_uid=batch_uid,
-                    )
+            children.update(
+                self._get_sample_descendants(
+                    session, sample, sample_schema, selected, valid, batch_uid
                 )
+            )
         return children
 
+    def _get_sample_descendants(
+        self,
+        session: Session,
+        sample: DatabaseSample,
+        sample_schema: UUID | None,
+        selected: bool | None,
+        valid: bool | None,
+        batch_uid: UUID | None,
+    ) -> Iterable[DatabaseSample]:
+        """The samples under the sample at any depth, for
+        :py:meth:`get_sample_children` to answer ``recursive`` with.
+
+        In one query over the walk down the sample links, with the filters
+        applied to what it reaches rather than to the way there: a block is
+        found under a case whatever the specimen between them is.
+        """
+        if not inspect(sample).persistent:
+            return [
+                descendant
+                for child in sample.children
+                for descendant in self.get_sample_children(
+                    session,
+                    child,
+                    sample_schema,
+                    True,
+                    selected,
+                    valid,
+                    batch_uid=batch_uid,
+                )
+            ]
+        walk = self._walk([sample.uid], downward=True, samples_only=True)
+        query = select(DatabaseSample).where(
+            DatabaseSample.uid.in_(select(walk.c.uid).where(walk.c.depth > 0))
+        )
+        if sample_schema is not None:
+            query = query.where(DatabaseSample.schema_uid == sample_schema)
+        if selected is not None:
+            query = query.where(DatabaseSample.selected == selected)
+        if valid is not None:
+            query = query.where(DatabaseSample.valid == valid)
+        if batch_uid is not None:
+            query = query.where(DatabaseSample.batch_uid == batch_uid)
+        return session.scalars(query)
+
     def get_sample_parents(
         self,
         session: Session,
@@ -866,6 +1659,26 @@ class DatabaseService:
 
         return session.scalars(query)
 
+    def get_image_uids(
+        self,
+        session: Session,
+        batch_uid: UUID,
+        schema_uids: Iterable[UUID],
+        selected: bool | None = None,
+        status_filter: Iterable[ImageStatus] | None = None,
+    ) -> list[UUID]:
+        """The uids of the images of some schemas in a batch, without loading
+        the images."""
+        query = select(DatabaseImage.uid).where(
+            DatabaseImage.batch_uid == batch_uid,
+            DatabaseImage.schema_uid.in_(set(schema_uids)),
+        )
+        if selected is not None:
+            query = query.where(DatabaseImage.selected == selected)
+        if status_filter is not None:
+            query = query.where(DatabaseImage.status.in_(status_filter))
+        return list(session.scalars(query.order_by(DatabaseImage.identifier)))
+
     def get_images(
         self,
         session: Session,
@@ -897,7 +1710,46 @@ class DatabaseService:
             attributes_filters=attributes_filters,
             tag_filter=tag_filter,
             relation_filters=relation_filters,
-            status_filter=status_filter,
+            status_filter=status_filter,
+            sorting=sorting,
+            start=start,
+            size=size,
+            selected=selected,
+            valid=valid,
+            review_status=review_status,
+            load_relations=load_relations,
+        )
+
+    def get_samples(
+        self,
+        session: Session,
+        schema: SampleSchema,
+        dataset: UUID | Dataset | DatabaseDataset | None = None,
+        batch: UUID | Batch | DatabaseBatch | None = None,
+        start: int | None = None,
+        size: int | None = None,
+        identifier_filter: str | None = None,
+        pseudonym_mode: bool = False,
+        attributes_filters: Sequence[AttributeFilter] | None = None,
+        tag_filter: Iterable[UUID] | None = None,
+        relation_filters: Iterable[RelationFilter] | None = None,
+        sorting: Iterable[ColumnSort] | None = None,
+        selected: bool | None = None,
+        valid: bool | None = None,
+        review_status: ReviewStatus | None = None,
+        load_relations: bool = False,
+    ) -> Iterable[DatabaseSample]:
+        return self._query_sort_and_limit_items(
+            session,
+            select_type=DatabaseSample,
+            schema=schema,
+            dataset=dataset,
+            batch=batch,
+            identifier_filter=identifier_filter,
+            pseudonym_mode=pseudonym_mode,
+            attributes_filters=attributes_filters,
+            tag_filter=tag_filter,
+            relation_filters=relation_filters,
             sorting=sorting,
             start=start,
             size=size,
@@ -907,14 +1759,13 @@ class DatabaseService:
             load_relations=load_relations,
         )
 
-    def get_samples(
+    def get_sample_neighbours(
         self,
         session: Session,
         schema: SampleSchema,
+        sample_uid: UUID,
         dataset: UUID | Dataset | DatabaseDataset | None = None,
         batch: UUID | Batch | DatabaseBatch | None = None,
-        start: int | None = None,
-        size: int | None = None,
         identifier_filter: str | None = None,
         pseudonym_mode: bool = False,
         attributes_filters: Sequence[AttributeFilter] | None = None,
@@ -923,28 +1774,47 @@ class DatabaseService:
         sorting: Iterable[ColumnSort] | None = None,
         selected: bool | None = None,
         valid: bool | None = None,
-        review_status: ReviewStatus | None = None,
-        load_relations: bool = False,
-    ) -> Iterable[DatabaseSample]:
-        return self._query_sort_and_limit_items(
-            session,
-            select_type=DatabaseSample,
+    ) -> tuple[UUID | None, UUID | None]:
+        """The samples before and after a sample in the list the filters and
+        sorting make, as (previous, next).
+
+        Filtered and sorted as :py:meth:`get_samples` would, and the neighbours
+        read off that order by the database with ``lag`` and ``lead``: listing
+        the samples to find the one before and after reads every one of them,
+        attributes and all, to answer with two uids. Ties in the sorting are
+        broken by uid, so the answer is the same every time it is asked.
+        Nothing either side when the sample is not in the list.
+        """
+        if isinstance(dataset, (Dataset, DatabaseDataset)):
+            dataset = dataset.uid
+        if isinstance(batch, (Batch, DatabaseBatch)):
+            batch = batch.uid
+        query = self._items_query(
+            select(DatabaseSample.uid),
+            dataset_uid=dataset,
+            batch_uid=batch,
             schema=schema,
-            dataset=dataset,
-            batch=batch,
             identifier_filter=identifier_filter,
             pseudonym_mode=pseudonym_mode,
             attributes_filters=attributes_filters,
             tag_filter=tag_filter,
             relation_filters=relation_filters,
-            sorting=sorting,
-            start=start,
-            size=size,
             selected=selected,
             valid=valid,
-            review_status=review_status,
-            load_relations=load_relations,
         )
+        query, order_by = self._item_query_ordering(
+            query, schema, sorting or [], dataset_uid=dataset, batch_uid=batch
+        )
+        ranked = query.add_columns(
+            func.lag(DatabaseSample.uid).over(order_by=order_by).label("previous"),
+            func.lead(DatabaseSample.uid).over(order_by=order_by).label("next"),
+        ).subquery()
+        row = session.execute(
+            select(ranked.c.previous, ranked.c.next).where(ranked.c.uid == sample_uid)
+        ).first()
+        if row is None:
+            return None, None
+        return row.previous, row.next
 
     def get_observations(
         self,
@@ -1147,6 +2017,69 @@ class DatabaseService:
             query = query.filter_by(source=source)
         return session.scalars(query)
 
+    def get_not_valid_under_units(
+        self,
+        session: Session,
+        unit_schema_uid: UUID,
+        dataset_uid: UUID,
+        batch_uid: UUID | None = None,
+    ) -> list[NotValidUnder]:
+        """Every selected item that is not valid under every review unit of a
+        dataset, or of one batch of it, in one query.
+
+        Read from the validity stored on the items rather than by validating
+        them again, and from one walk down from all the units at once rather
+        than one per unit: a sweep over a batch asks this of every case in it,
+        and walking each case and reading each item under it was a few
+        statements per item. What validation has already raised on an item is
+        read in the same query, by joining its open issues, so that a sweep run
+        twice can tell what it raised the first time without asking per item.
+
+        Selected items only, the unit itself among them, as
+        ``ReviewService`` counts them. An item under two units is found under
+        each.
+        """
+        item = DatabaseItem.__table__
+        unit = item.alias("unit")
+        image = DatabaseImage.__table__
+        batch = DatabaseBatch.__table__
+        units = select(item.c.uid).where(
+            item.c.schema_uid == unit_schema_uid, item.c.dataset_uid == dataset_uid
+        )
+        if batch_uid is not None:
+            units = units.where(item.c.batch_uid == batch_uid)
+        walk = self._walk(units, downward=True, rooted=True)
+        raised = (
+            select(DatabaseReviewIssue.item_uid)
+            .where(DatabaseReviewIssue.source == ReviewIssueSource.VALIDATION)
+            .where(DatabaseReviewIssue.resolved_at.is_(None))
+            .distinct()
+            .subquery("raised")
+        )
+        query = (
+            select(
+                walk.c.root_uid,
+                walk.c.uid,
+                batch.c.status,
+                raised.c.item_uid.is_not(None),
+            )
+            .distinct()
+            .select_from(walk)
+            .join(item, item.c.uid == walk.c.uid)
+            .outerjoin(image, image.c.uid == walk.c.uid)
+            .join(unit, unit.c.uid == walk.c.root_uid)
+            .outerjoin(batch, batch.c.uid == unit.c.batch_uid)
+            .outerjoin(raised, raised.c.item_uid == walk.c.uid)
+            .where(item.c.selected)
+            .where(self._not_valid(item, image))
+        )
+        return [
+            NotValidUnder(unit_uid, item_uid, batch_status, bool(already_raised))
+            for unit_uid, item_uid, batch_status, already_raised in session.execute(
+                query
+            )
+        ]
+
     def get_open_issues_on_units(
         self,
         session: Session,
@@ -1180,7 +2113,7 @@ class DatabaseService:
         # source says about itself, which the database has no opinion on.
         return {
             unit_uid: OpenIssues(
-                count=len(unit_rows),
+                total=len(unit_rows),
                 reasons=tuple(
                     reason
                     for _, _, reason in sorted(
@@ -1191,6 +2124,182 @@ class DatabaseService:
             for unit_uid, unit_rows in rows.items()
         }
 
+    def refresh_review_summaries(
+        self, session: Session, review_units: Iterable[UUID]
+    ) -> None:
+        """Write down again what is open on each of the given review units, as
+        the queue reads it.
+
+        Called wherever issues are raised or settled, with the units they are
+        answered on. Rewritten from what is open rather than counted up and
+        down, so that a unit touched by two changes in one go ends up right
+        whatever order they came in. A unit with nothing left open loses its
+        row.
+        """
+        uids = set(review_units)
+        if not uids:
+            return
+        session.flush()
+        open_issues = self.get_open_issues_on_units(session, uids)
+        session.execute(
+            delete(DatabaseReviewSummary).where(
+                DatabaseReviewSummary.review_unit_uid.in_(uids)
+            )
+        )
+        if open_issues:
+            session.execute(
+                insert(DatabaseReviewSummary),
+                [
+                    {
+                        "review_unit_uid": unit_uid,
+                        "open_issues": summary.total,
+                        "reasons": list(summary.reasons),
+                    }
+                    for unit_uid, summary in open_issues.items()
+                ],
+            )
+
+    def get_review_queue(
+        self,
+        session: Session,
+        schema_uid: UUID,
+        dataset_uid: UUID,
+        batch_uid: UUID | None = None,
+        review_status: ReviewStatus | None = None,
+        identifier_filter: str | None = None,
+        sort: ReviewQueueSort = ReviewQueueSort.IDENTIFIER,
+        descending: bool = False,
+        start: int | None = None,
+        size: int | None = None,
+    ) -> Iterable[Row]:
+        """The units of a schema with what is open on them, a page at a time.
+
+        Rows of the columns the queue shows rather than items: an entry in the
+        queue is a line, and loading each unit with everything it carries to
+        write that line is what made the queue of a large dataset slow.
+        """
+        query = self._review_queue_query(
+            select(
+                DatabaseItem.uid,
+                DatabaseItem.identifier,
+                DatabaseItem.pseudonym,
+                DatabaseItem.review_status,
+                DatabaseItem.last_saved,
+                func.coalesce(DatabaseReviewSummary.open_issues, 0).label(
+                    "open_issues"
+                ),
+                DatabaseReviewSummary.reasons,
+            ),
+            schema_uid,
+            dataset_uid,
+            batch_uid,
+            review_status,
+            identifier_filter,
+        )
+        if sort == ReviewQueueSort.LAST_SAVED:
+            sort_by = DatabaseItem.last_saved
+            query = query.order_by(
+                nulls_last(sort_by.desc() if not descending else sort_by.asc())
+            )
+        else:
+            if sort == ReviewQueueSort.OPEN_ISSUES:
+                sort_by = func.coalesce(DatabaseReviewSummary.open_issues, 0)
+            else:
+                sort_by = DatabaseItem.identifier
+            query = query.order_by(sort_by.desc() if descending else sort_by)
+        query = query.order_by(DatabaseItem.identifier, DatabaseItem.uid)
+        if start is not None:
+            query = query.offset(start)
+        if size is not None:
+            query = query.limit(size)
+        return session.execute(query)
+
+    def get_review_queue_count(
+        self,
+        session: Session,
+        schema_uid: UUID,
+        dataset_uid: UUID,
+        batch_uid: UUID | None = None,
+        review_status: ReviewStatus | None = None,
+        identifier_filter: str | None = None,
+    ) -> int:
+        """How many units the queue holds with the same filters, unpaged."""
+        query = self._review_queue_query(
+            select(func.count(DatabaseItem.uid)),
+            schema_uid,
+            dataset_uid,
+            batch_uid,
+            review_status,
+            identifier_filter,
+        )
+        return session.scalar(query) or 0
+
+    @staticmethod
+    def _review_queue_query(
+        query: Select,
+        schema_uid: UUID,
+        dataset_uid: UUID,
+        batch_uid: UUID | None,
+        review_status: ReviewStatus | None,
+        identifier_filter: str | None,
+    ) -> Select:
+        query = (
+            query.select_from(DatabaseItem)
+            .outerjoin(
+                DatabaseReviewSummary,
+                DatabaseReviewSummary.review_unit_uid == DatabaseItem.uid,
+            )
+            .where(DatabaseItem.schema_uid == schema_uid)
+            .where(DatabaseItem.dataset_uid == dataset_uid)
+        )
+        if batch_uid is not None:
+            query = query.where(DatabaseItem.batch_uid == batch_uid)
+        if review_status is not None:
+            query = query.where(DatabaseItem.review_status == review_status)
+        if identifier_filter:
+            query = query.where(
+                or_(
+                    DatabaseItem.identifier.icontains(identifier_filter),
+                    DatabaseItem.pseudonym.icontains(identifier_filter),
+                )
+            )
+        return query
+
+    def add_review_issues(
+        self,
+        session: Session,
+        issues: Iterable[tuple[UUID, UUID, str]],
+        source: ReviewIssueSource,
+    ) -> int:
+        """Record issues raised on many items at once, as (item, review unit,
+        reason), and flag the units they are answered on.
+
+        Written as one insert and one update rather than an item and a flag at
+        a time, for a sweep raising on a whole batch. Returns how many were
+        recorded.
+        """
+        raised_at = datetime.datetime.now()
+        rows = [
+            {
+                "uid": uuid4(),
+                "item_uid": item_uid,
+                "review_unit_uid": review_unit_uid,
+                "reason": reason,
+                "source": source,
+                "raised_at": raised_at,
+            }
+            for item_uid, review_unit_uid, reason in issues
+        ]
+        if not rows:
+            return 0
+        session.execute(insert(DatabaseReviewIssue), rows)
+        session.execute(
+            update(DatabaseItem)
+            .where(DatabaseItem.uid.in_({row["review_unit_uid"] for row in rows}))
+            .values(review_status=ReviewStatus.FLAGGED)
+        )
+        return len(rows)
+
     def add_review_issue(
         self,
         session: Session,
@@ -1563,11 +2672,7 @@ class DatabaseService:
         the sake of nothing.
         """
         if replacing:
-            session.execute(
-                delete(DatabaseUnmappedValue).where(
-                    DatabaseUnmappedValue.root_attribute_uid == attribute.uid
-                )
-            )
+            self._remove_unmapped_values(session, [attribute.uid])
         for uid, schema_uid, value in self.unmapped_under(attribute):
             session.add(
                 DatabaseUnmappedValue(
@@ -1578,25 +2683,147 @@ class DatabaseService:
                 )
             )
 
+    def record_unmapped_values_of(
+        self, session: Session, attributes: Iterable[DatabaseAttribute]
+    ) -> None:
+        """Write down what each of a group of attributes carries that has no
+        mapping, as :py:meth:`record_unmapped_values` does for one.
+
+        What the group contributed before is deleted in one statement rather
+        than in one per attribute.
+        """
+        attributes = list(attributes)
+        if not attributes:
+            return
+        self._remove_unmapped_values(
+            session, {attribute.uid for attribute in attributes}
+        )
+        for attribute in attributes:
+            self.record_unmapped_values(attribute, session, replacing=False)
+
+    def _remove_unmapped_values(
+        self, session: Session, root_attribute_uids: Iterable[UUID]
+    ) -> None:
+        """Delete what attributes contributed to ``unmapped_value``, noting
+        what is deleted for the counts the mapping work list is read from."""
+        removed = DatabaseUnmappedValue.root_attribute_uid.in_(set(root_attribute_uids))
+        note_unmapped_values_removed(
+            session,
+            session.execute(
+                select(
+                    DatabaseItem.uid,
+                    DatabaseItem.batch_uid,
+                    DatabaseUnmappedValue.schema_uid,
+                    DatabaseUnmappedValue.value,
+                )
+                .join(
+                    DatabaseAttribute,
+                    DatabaseAttribute.uid == DatabaseUnmappedValue.root_attribute_uid,
+                )
+                .join(
+                    DatabaseItem,
+                    DatabaseItem.uid == DatabaseAttribute.attribute_item_uid,
+                )
+                .where(removed)
+            ).all(),
+        )
+        session.execute(delete(DatabaseUnmappedValue).where(removed))
+
     def unmapped_value_counts(
         self,
         session: Session,
         project_uid: UUID,
         batch_uid: UUID | None = None,
+        value_prefix: str | None = None,
+        start: int | None = None,
+        size: int | None = None,
     ) -> list[tuple[UUID, str, int]]:
-        """How many items carry each value with no mapping, by attribute schema.
+        """How many items carry each value with no mapping, by attribute schema,
+        most carried first.
 
         Counted by item rather than by occurrence: what a curator decides on is
         how many items a mapping key would settle, and an item carrying the
-        same wording twice is still one item.
+        same wording twice is still one item. Read from the counts kept per
+        batch, see ``DatabaseUnmappedValueCount``, rather than counted from the
+        values themselves.
+
+        Parameters
+        ----------
+        session: Session
+            Session to read in.
+        project_uid: UUID
+            The project to count in.
+        batch_uid: UUID | None = None
+            Only items in this batch, when given.
+        value_prefix: str | None = None
+            Only values starting with this, when given.
+        start: int | None = None
+            How many to skip, for a page further down.
+        size: int | None = None
+            How many to return at most.
         """
+        items = func.sum(DatabaseUnmappedValueCount.items)
+        query = (
+            select(
+                DatabaseUnmappedValueCount.schema_uid,
+                DatabaseUnmappedValueCount.value,
+                items,
+            )
+            .join(
+                DatabaseBatch, DatabaseBatch.uid == DatabaseUnmappedValueCount.batch_uid
+            )
+            .where(DatabaseBatch.project_uid == project_uid)
+            .group_by(
+                DatabaseUnmappedValueCount.schema_uid, DatabaseUnmappedValueCount.value
+            )
+            .having(items > 0)
+            .order_by(items.desc(), DatabaseUnmappedValueCount.value)
+        )
+        if batch_uid is not None:
+            query = query.where(DatabaseUnmappedValueCount.batch_uid == batch_uid)
+        if value_prefix:
+            query = query.where(
+                DatabaseUnmappedValueCount.value.startswith(
+                    value_prefix, autoescape=True
+                )
+            )
+        if start is not None:
+            query = query.offset(start)
+        if size is not None:
+            query = query.limit(size)
         return [
             (schema_uid, value, items)
-            for schema_uid, value, items in session.execute(
+            for schema_uid, value, items in session.execute(query)
+        ]
+
+    def rebuild_unmapped_value_counts(
+        self,
+        session: Session,
+        project_uid: UUID | None = None,
+        batch_uid: UUID | None = None,
+    ) -> None:
+        """Count the items carrying each value with no mapping again from the
+        values themselves, replacing the counts kept for a batch, for the
+        batches of a project, or for every batch."""
+        session.flush()
+        batches = select(DatabaseBatch.uid)
+        if batch_uid is not None:
+            batches = batches.where(DatabaseBatch.uid == batch_uid)
+        elif project_uid is not None:
+            batches = batches.where(DatabaseBatch.project_uid == project_uid)
+        session.execute(
+            delete(DatabaseUnmappedValueCount).where(
+                DatabaseUnmappedValueCount.batch_uid.in_(batches)
+            )
+        )
+        session.execute(
+            insert(DatabaseUnmappedValueCount).from_select(
+                ["batch_uid", "schema_uid", "value", "items"],
                 select(
+                    DatabaseItem.batch_uid,
                     DatabaseUnmappedValue.schema_uid,
                     DatabaseUnmappedValue.value,
-                    func.count(func.distinct(DatabaseAttribute.attribute_item_uid)),
+                    func.count(func.distinct(DatabaseItem.uid)),
                 )
                 .join(
                     DatabaseAttribute,
@@ -1606,18 +2833,14 @@ class DatabaseService:
                     DatabaseItem,
                     DatabaseItem.uid == DatabaseAttribute.attribute_item_uid,
                 )
-                .join(DatabaseBatch, DatabaseBatch.uid == DatabaseItem.batch_uid)
-                .where(
-                    DatabaseBatch.project_uid == project_uid,
-                    (
-                        DatabaseItem.batch_uid == batch_uid
-                        if batch_uid is not None
-                        else true()
-                    ),
-                )
-                .group_by(DatabaseUnmappedValue.schema_uid, DatabaseUnmappedValue.value)
-            ).all()
-        ]
+                .where(DatabaseItem.batch_uid.in_(batches))
+                .group_by(
+                    DatabaseItem.batch_uid,
+                    DatabaseUnmappedValue.schema_uid,
+                    DatabaseUnmappedValue.value,
+                ),
+            )
+        )
 
     def add_attribute(
         self,
@@ -1928,6 +3151,54 @@ class DatabaseService:
     def get_optional_mapping(self, session: Session, mapping_uid: UUID):
         return session.get(DatabaseMappingItem, mapping_uid)
 
+    def add_operation(
+        self,
+        session: Session,
+        kind: OperationKind,
+        subject_uid: UUID,
+        parameters: dict[str, Any] | None = None,
+    ) -> DatabaseOperation:
+        return self._add_to_session(
+            session, DatabaseOperation(kind, subject_uid, parameters)
+        )
+
+    def get_optional_operation(
+        self, session: Session, operation_uid: UUID
+    ) -> DatabaseOperation | None:
+        return session.get(DatabaseOperation, operation_uid)
+
+    def count_items(
+        self,
+        session: Session,
+        dataset_uid: UUID | None = None,
+        batch_uid: UUID | None = None,
+    ) -> int:
+        """How many items of any kind there are in a dataset or a batch."""
+        query = select(func.count(DatabaseItem.uid))
+        if dataset_uid is not None:
+            query = query.where(DatabaseItem.dataset_uid == dataset_uid)
+        if batch_uid is not None:
+            query = query.where(DatabaseItem.batch_uid == batch_uid)
+        return session.scalar(query) or 0
+
+    def count_descendants(self, session: Session, item_uid: UUID) -> int:
+        """How many items there are under an item, the item itself included,
+        counted by the walk rather than by loading them."""
+        walk = self._walk([item_uid], downward=True)
+        return session.scalar(select(func.count(func.distinct(walk.c.uid)))) or 0
+
+    def count_attributes_for_schema(
+        self, session: Session, attribute_schema_uid: UUID
+    ) -> int:
+        return (
+            session.scalar(
+                select(func.count(DatabaseAttribute.uid)).where(
+                    DatabaseAttribute.schema_uid == attribute_schema_uid
+                )
+            )
+            or 0
+        )
+
     def get_mapping_for_expression(
         self, session: Session, mapper_uid: UUID, expression: str
     ):
@@ -1950,6 +3221,102 @@ class DatabaseService:
             )
         ).one_or_none()
 
+    def get_mapping_expressions(
+        self, session: Session, mapper_uids: Iterable[UUID]
+    ) -> set[tuple[UUID, str]]:
+        """The expressions the mappers have mappings for, by mapper, without
+        loading the mappings."""
+        return {
+            (mapper_uid, expression)
+            for mapper_uid, expression in session.execute(
+                select(
+                    DatabaseMappingItem.mapper_uid, DatabaseMappingItem.expression
+                ).where(DatabaseMappingItem.mapper_uid.in_(set(mapper_uids)))
+            )
+        }
+
+    def add_mappings(
+        self,
+        session: Session,
+        mappings: Iterable[tuple[UUID, str, AnyAttribute]],
+    ) -> int:
+        """Insert many mappings, as statements of many rows rather than an
+        object added to the session for each.
+
+        A mapping for an expression its mapper already has is left as it is,
+        so that another process inserting the same mappings at the same time
+        does not make this fail.
+
+        Parameters
+        ----------
+        session: Session
+            Session to insert in.
+        mappings: Iterable[tuple[UUID, str, AnyAttribute]]
+            The mapper, expression and attribute of each mapping.
+
+        Returns
+        -------
+        int
+            How many mappings were asked to be inserted.
+        """
+        rows = [
+            {
+                "uid": uuid4(),
+                "mapper_uid": mapper_uid,
+                "expression": expression,
+                "literal": DatabaseMappingItem.literal_key(expression),
+                "attribute": attribute,
+                "hits": 0,
+            }
+            for mapper_uid, expression, attribute in mappings
+        ]
+        if not rows:
+            return 0
+        dialect_insert = (
+            postgresql.insert
+            if session.get_bind().dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        session.execute(
+            dialect_insert(DatabaseMappingItem).on_conflict_do_nothing(
+                index_elements=["mapper_uid", "expression"]
+            ),
+            rows,
+        )
+        return len(rows)
+
+    def get_mapper_injection(
+        self, session: Session, injector: str
+    ) -> DatabaseMapperInjection | None:
+        """What the injector last injected the mappers from, or None if it has
+        not injected them."""
+        return session.get(DatabaseMapperInjection, injector)
+
+    def set_mapper_injection(
+        self, session: Session, injector: str, fingerprint: str
+    ) -> None:
+        """Note that the injector has injected the mappers from what has this
+        fingerprint.
+
+        Written as an upsert: the web app and the worker start together, and
+        both find the injector has nothing noted, so a look before the insert
+        has the second of them fail on the key the first wrote.
+        """
+        dialect_insert = (
+            postgresql.insert
+            if session.get_bind().dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        injected_at = datetime.datetime.now()
+        session.execute(
+            dialect_insert(DatabaseMapperInjection)
+            .values(injector=injector, fingerprint=fingerprint, injected_at=injected_at)
+            .on_conflict_do_update(
+                index_elements=["injector"],
+                set_={"fingerprint": fingerprint, "injected_at": injected_at},
+            )
+        )
+
     def get_mappings_for_mapper(self, session: Session, mapper_uid: UUID):
         return session.scalars(
             select(DatabaseMappingItem).filter_by(mapper_uid=mapper_uid)
@@ -2380,12 +3747,12 @@ class DatabaseService:
     def _effective_pseudonym():
         """SQL expression that returns the stored pseudonym or a stable
         fallback derived from the item UID (matching the frontend logic)."""
+        # Concatenated with the operator rather than concat(), which SQLite
+        # does not have.
         return func.coalesce(
             DatabaseItem.pseudonym,
-            func.concat(
-                "ANON-",
-                func.upper(func.substr(cast(DatabaseItem.uid, String), 1, 8)),
-            ),
+            literal("ANON-", String)
+            + func.upper(func.substr(cast(DatabaseItem.uid, String), 1, 8)),
         )
 
     @staticmethod
@@ -2898,52 +4265,72 @@ class DatabaseService:
         dataset_uid: UUID | None = None,
         batch_uid: UUID | None = None,
     ):
-        if sorting is not None:
-            for sort in sorting:
-                if sort.sort_type == SortType.IDENTIFIER:
-                    sort_by = DatabaseItem.identifier
-                elif sort.sort_type == SortType.PSEUDONYM:
-                    sort_by = cls._effective_pseudonym()
-                elif sort.sort_type == SortType.VALID:
-                    sort_by = DatabaseItem.valid
-                elif sort.sort_type == SortType.STATUS:
-                    sort_by = DatabaseImage.status
-                elif sort.sort_type == SortType.MESSAGE:
-                    sort_by = DatabaseImage.status_message
-                elif isinstance(sort, AttributeSort):
-                    sort_by = cls._attribute_value_column(sort.field)
-                    query = query.join(
-                        DatabaseAttribute,
-                        or_(
-                            DatabaseAttribute.attribute_item_uid == DatabaseItem.uid,
-                            DatabaseAttribute.private_attribute_item_uid
-                            == DatabaseItem.uid,
-                        ),
-                    ).where(DatabaseAttribute.tag == sort.column)
-                elif isinstance(sort, RelationSort):
-                    query, sort_by = cls._relation_sort(
-                        query,
-                        schema,
-                        sort,
-                        dataset_uid=dataset_uid,
-                        batch_uid=batch_uid,
-                    )
-                else:
-                    raise NotImplementedError(
-                        f"Got unknown sort type {sort.sort_type}."
-                    )
-
-                if sort.descending:
-                    sort_by = sort_by.desc()
-                query = query.order_by(sort_by)
-            query = query.order_by(DatabaseItem.uid)
-
+        query, order_by = cls._item_query_ordering(
+            query, schema, sorting, dataset_uid=dataset_uid, batch_uid=batch_uid
+        )
+        query = query.order_by(*order_by)
         if start is not None:
             query = query.offset(start)
         if size is not None:
             query = query.limit(size)
         return query
 
+    @classmethod
+    def _item_query_ordering(
+        cls,
+        query: Select,
+        schema: ItemSchema,
+        sorting: Iterable[ColumnSort] | None = None,
+        dataset_uid: UUID | None = None,
+        batch_uid: UUID | None = None,
+    ) -> tuple[Select, list[ColumnExpressionArgument[Any]]]:
+        """The query joined to what the sorting sorts by, and what to order it
+        by, ties broken by uid. Nothing to order by without a sorting.
+
+        Given apart from the query, so that a window over the same order can be
+        built from them without reading them back out of it.
+        """
+        if sorting is None:
+            return query, []
+        order_by: list[ColumnExpressionArgument[Any]] = []
+        for sort in sorting:
+            if sort.sort_type == SortType.IDENTIFIER:
+                sort_by = DatabaseItem.identifier
+            elif sort.sort_type == SortType.PSEUDONYM:
+                sort_by = cls._effective_pseudonym()
+            elif sort.sort_type == SortType.VALID:
+                sort_by = DatabaseItem.valid
+            elif sort.sort_type == SortType.STATUS:
+                sort_by = DatabaseImage.status
+            elif sort.sort_type == SortType.MESSAGE:
+                sort_by = DatabaseImage.status_message
+            elif isinstance(sort, AttributeSort):
+                sort_by = cls._attribute_value_column(sort.field)
+                query = query.join(
+                    DatabaseAttribute,
+                    or_(
+                        DatabaseAttribute.attribute_item_uid == DatabaseItem.uid,
+                        DatabaseAttribute.private_attribute_item_uid
+                        == DatabaseItem.uid,
+                    ),
+                ).where(DatabaseAttribute.tag == sort.column)
+            elif isinstance(sort, RelationSort):
+                query, sort_by = cls._relation_sort(
+                    query,
+                    schema,
+                    sort,
+                    dataset_uid=dataset_uid,
+                    batch_uid=batch_uid,
+                )
+            else:
+                raise NotImplementedError(f"Got unknown sort type {sort.sort_type}.")
+
+            if sort.descending:
+                sort_by = sort_by.desc()
+            order_by.append(sort_by)
+        order_by.append(DatabaseItem.uid)
+        return query, order_by
+
     @classmethod
     def _relation_sort(
         cls,
@@ -15,7 +15,9 @@
 """Service for accessing image data."""
 
 import io
-from collections.abc import Generator, Iterable
+import statistics
+from collections import defaultdict
+from collections.abc import Generator, Iterable, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
@@ -31,7 +33,22 @@ from wsidicomizer import WsiDicomizer
 
 from slidetap.config import ImageCacheConfig
 from slidetap.database import DatabaseImage
-from slidetap.model import Dzi, Image, ImageFormat
+from slidetap.metrics import (
+    IMAGE_CACHE_EVICTIONS,
+    IMAGE_CACHE_REQUESTS,
+    IMAGE_OPEN_SECONDS,
+)
+from slidetap.model import (
+    BatchProcessingProfile,
+    Dzi,
+    Image,
+    ImageFormat,
+    ImageProcessingPhase,
+    ImageProcessingProfile,
+    ProcessingMeasurement,
+    ProcessingSummary,
+    SlowImage,
+)
 from slidetap.services.database_service import DatabaseService
 from slidetap.services.storage_service import StorageService
 
@@ -90,9 +107,11 @@ class ImageCache:
 
     def _acquire(self, uid: UUID) -> ImageCacheItem | None:
         if uid in self._cache:
+            IMAGE_CACHE_REQUESTS.inc(result="hit")
             cached_item = self._cache[uid]
             cached_item.last_accessed = datetime.now()
         else:
+            IMAGE_CACHE_REQUESTS.inc(result="miss")
             cached_item = self._open(uid)
             if cached_item is None:
                 return None
@@ -104,14 +123,17 @@ class ImageCache:
             image = self._database_service.get_image(session, uid)
             if image.folder_path is None:
                 return None
-            if image.format == ImageFormat.DICOM_WSI:
-                wsi = WsiDicom.open(image.folder_path)
-            elif image.format == ImageFormat.OTHER_WSI:
-                wsi = WsiDicomizer.open(
-                    Path(image.folder_path).joinpath(next(iter(image.files)).filename)
-                )
-            else:
-                return None
+            with IMAGE_OPEN_SECONDS.time(format=image.format.name):
+                if image.format == ImageFormat.DICOM_WSI:
+                    wsi = WsiDicom.open(image.folder_path)
+                elif image.format == ImageFormat.OTHER_WSI:
+                    wsi = WsiDicomizer.open(
+                        Path(image.folder_path).joinpath(
+                            next(iter(image.files)).filename
+                        )
+                    )
+                else:
+                    return None
             return ImageCacheItem(wsi)
 
     def _insert_into_cache(self, uid: UUID, item: ImageCacheItem):
@@ -133,12 +155,16 @@ class ImageCache:
             )
             removed_item = self._cache.pop(to_remove)
             removed_item.close()
+            IMAGE_CACHE_EVICTIONS.inc()
         except StopIteration:
             return False
         return True
 
 
 class ImageService:
+    SLOWEST_IMAGES = 10
+    """How many of the images that took the longest a batch profile lists."""
+
     def __init__(
         self,
         storage_service: StorageService,
@@ -208,6 +234,96 @@ class ImageService:
             level = wsi.pyramids[0].highest_level - dzi_level
             return wsi.read_encoded_tile(level, (x, y), z)
 
+    def get_processing_profile(self, image_uid: UUID) -> ImageProcessingProfile | None:
+        """What each phase of processing an image took, the last time it ran,
+        or None for an image that has not been processed."""
+        with self._database_service.get_session() as session:
+            image = self._database_service.get_optional_image(session, image_uid)
+            if image is None:
+                return None
+            return image.processing_profile
+
+    def get_batch_processing_profile(self, batch_uid: UUID) -> BatchProcessingProfile:
+        """What processing the images of a batch took, per phase and per step
+        over all of them, and which of them took the longest.
+
+        Summed here rather than in the query: a batch is some thousand images
+        at most, and the profiles are JSON the databases do not agree on how
+        to reach into.
+        """
+        with self._database_service.get_session() as session:
+            profiled = self._database_service.get_image_processing_profiles(
+                session, batch_uid
+            )
+        phases: defaultdict[ImageProcessingPhase, list[ProcessingMeasurement]] = (
+            defaultdict(list)
+        )
+        steps: defaultdict[str, list[ProcessingMeasurement]] = defaultdict(list)
+        totals: dict[UUID, float] = {}
+        for image in profiled:
+            for phase, measurement in image.profile.phases.items():
+                phases[phase].append(measurement)
+            for step, measurement in image.profile.steps.items():
+                steps[step].append(measurement)
+            totals[image.uid] = sum(
+                measurement.wall_seconds
+                for measurement in image.profile.phases.values()
+            )
+        median = statistics.median(totals.values()) if totals else 0.0
+        slowest = [
+            SlowImage(
+                uid=image.uid,
+                identifier=image.identifier,
+                wall_seconds=totals[image.uid],
+                times_median=totals[image.uid] / median if median > 0 else None,
+            )
+            for image in sorted(
+                profiled, key=lambda image: totals[image.uid], reverse=True
+            )[: self.SLOWEST_IMAGES]
+        ]
+        return BatchProcessingProfile(
+            uid=batch_uid,
+            images=len(profiled),
+            phases={
+                phase: self._summarize(measurements)
+                for phase, measurements in phases.items()
+            },
+            steps={
+                step: self._summarize(measurements)
+                for step, measurements in steps.items()
+            },
+            slowest=slowest,
+        )
+
+    @staticmethod
+    def _summarize(measurements: Sequence[ProcessingMeasurement]) -> ProcessingSummary:
+        wall = [measurement.wall_seconds for measurement in measurements]
+
+        def total(values: Iterable[int | None]) -> int | None:
+            counted = [value for value in values if value is not None]
+            return sum(counted) if counted else None
+
+        peaks = [
+            measurement.peak_rss_bytes
+            for measurement in measurements
+            if measurement.peak_rss_bytes is not None
+        ]
+        return ProcessingSummary(
+            images=len(measurements),
+            failed=sum(1 for measurement in measurements if measurement.failed),
+            total_wall_seconds=sum(wall),
+            median_wall_seconds=statistics.median(wall),
+            max_wall_seconds=max(wall),
+            total_cpu_seconds=sum(
+                measurement.cpu_seconds for measurement in measurements
+            ),
+            read_bytes=total(measurement.read_bytes for measurement in measurements),
+            written_bytes=total(
+                measurement.written_bytes for measurement in measurements
+            ),
+            peak_rss_bytes=max(peaks) if peaks else None,
+        )
+
     def _read_thumbnail(
         self, image: DatabaseImage, width: int, height: int, format: str
     ) -> bytes | None:
@@ -14,13 +14,14 @@
 
 """Service for accessing items."""
 
+import hashlib
 import logging
 import re
 import uuid
+from collections import defaultdict
 from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
-from itertools import chain
 from uuid import UUID
 
 from sqlalchemy.exc import IntegrityError
@@ -82,10 +83,12 @@ from slidetap.model.table import RelationFilter
 from slidetap.services.attribute_service import AttributeService
 from slidetap.services.database_service import DatabaseService
 from slidetap.services.mapper_service import MapperCache, MapperService
+from slidetap.services.operation_service import OperationProgress
 from slidetap.services.review_service import ReviewService
 from slidetap.services.schema_service import SchemaService
 from slidetap.services.tag_service import TagService
 from slidetap.services.validation_service import ValidationService
+from slidetap.services.validation_tracker import ValidationTracker
 
 
 @dataclass
@@ -131,6 +134,30 @@ class AddUnit:
     """Mapper reads shared by every attribute the unit maps."""
 
 
+@dataclass
+class HierarchyTree:
+    """What a hierarchy shows, read before any of it is built.
+
+    Everything a row needs is here by the uid of its item, so building the
+    tree asks the database nothing: the order of each item's children is
+    settled once, by a sort key taken once per item, rather than by a key
+    taken again for every comparison of every sort.
+    """
+
+    items: dict[UUID, DatabaseItem]
+    """The items shown, by uid."""
+
+    children: dict[UUID, list[UUID]]
+    """The uids of what is shown under each item, in the order shown."""
+
+    attributes: Mapping[UUID, list[DatabaseAttribute]]
+    """The attributes the layout names, public and private, by item. Only
+    those: the rest of an item's attributes are not read."""
+
+    levels: Mapping[UUID, HierarchyLevelLayout]
+    """The layout's levels, by the schema they are for."""
+
+
 class ItemService:
     """Item service should be used to interface with items"""
 
@@ -432,110 +459,113 @@ class ItemService:
             # and the work of working out what the edit would mean is work for
             # an edit that is not going to happen.
             self._raise_if_locked_edit(existing_item, item)
-            # Read before the edit, and read as validity is expected to stand
-            # at this point in the batch's life: only a save that crosses
-            # between valid and not has anything to say. One that leaves an
-            # already-invalid item invalid is somebody working on it, and one
-            # that leaves out what the import has not delivered yet is not the
-            # curator's doing.
-            was_valid = self._validation_service.item_is_valid_for_now(
-                existing_item, session
-            )
-            # Also before: the edit may be the removal of the last link upward,
+            # One validation and one report for the whole save, however much of
+            # the item it changed: the attributes saved with it note their
+            # changes with the same tracker. Noted before the edit, so
+            # that the validity reported against is read before it, and read as
+            # validity is expected to stand at this point in the batch's life:
+            # only a save that crosses between valid and not has anything to
+            # say. One that leaves an already-invalid item invalid is somebody
+            # working on it, and one that leaves out what the import has not
+            # delivered yet is not the curator's doing. The review unit is read
+            # before too: the edit may be the removal of the last link upward,
             # and after it there is no way left to tell what this was part of.
-            review_unit = self._review_service.review_unit_of(existing_item)
-            orphan_holder = self._orphan_holder_of(existing_item)
-            existing_item.name = item.name
-            existing_item.identifier = item.identifier
-            existing_item.comment = item.comment
-            if isinstance(existing_item, DatabaseSample):
-                if not isinstance(item, Sample):
-                    raise TypeError(f"Expected Sample, got {type(item)}.")
-                existing_item.parents = set(
-                    self._database_service.get_sample(session, parent)
-                    for schema_parents in item.parents.values()
-                    for parent in schema_parents
+            with ValidationTracker.track(
+                self._validation_service, self._review_service, session
+            ) as tracker:
+                tracker.relations_changed(
+                    existing_item,
+                    review_unit=self._review_service.review_unit_of(existing_item),
                 )
-                existing_item.children = set(
-                    self._database_service.get_sample(session, child)
-                    for schema_children in item.children.values()
-                    for child in schema_children
-                )
-                existing_item.images = set(
-                    self._database_service.get_image(session, image)
-                    for schema_images in item.images.values()
-                    for image in schema_images
-                )
-                existing_item.observations = set(
-                    self._database_service.get_observation(session, observation)
-                    for schema_observations in item.observations.values()
-                    for observation in schema_observations
-                )
-            elif isinstance(existing_item, DatabaseImage):
-                if not isinstance(item, Image):
-                    raise TypeError(f"Expected Image, got {type(item)}.")
-                existing_item.samples = set(
-                    self._database_service.get_sample(session, sample)
-                    for schema_samples in item.samples.values()
-                    for sample in schema_samples
-                )
-            elif isinstance(existing_item, DatabaseAnnotation):
-                if not isinstance(item, Annotation):
-                    raise TypeError(f"Expected Annotation, got {type(item)}.")
-                existing_item.image = (
-                    self._database_service.get_image(session, item.image[1])
-                    if item.image is not None
-                    else None
-                )
-            elif isinstance(existing_item, DatabaseObservation):
-                if not isinstance(item, Observation):
-                    raise TypeError(f"Expected Observation, got {type(item)}.")
-                if item.sample is not None:
-                    existing_item.sample = self._database_service.get_sample(
-                        session, item.sample[1]
+                orphan_holder = self._orphan_holder_of(existing_item)
+                existing_item.name = item.name
+                existing_item.identifier = item.identifier
+                existing_item.comment = item.comment
+                if isinstance(existing_item, DatabaseSample):
+                    if not isinstance(item, Sample):
+                        raise TypeError(f"Expected Sample, got {type(item)}.")
+                    existing_item.parents = set(
+                        self._database_service.get_sample(session, parent)
+                        for schema_parents in item.parents.values()
+                        for parent in schema_parents
                     )
-                elif item.image is not None:
-                    existing_item.image = self._database_service.get_image(
-                        session, item.image[1]
+                    existing_item.children = set(
+                        self._database_service.get_sample(session, child)
+                        for schema_children in item.children.values()
+                        for child in schema_children
                     )
-                elif item.annotation is not None:
-                    existing_item.annotation = self._database_service.get_annotation(
-                        session, item.annotation[1]
+                    existing_item.images = set(
+                        self._database_service.get_image(session, image)
+                        for schema_images in item.images.values()
+                        for image in schema_images
                     )
-            else:
-                raise TypeError(f"Unknown item type {existing_item}.")
-            mappers = [
-                mapper
-                for group in existing_item.batch.project.mapper_groups
-                for mapper in self._database_service.get_mapper_group(
-                    session, group
-                ).mappers
-            ]
-            attributes = self._mapper_service.apply_mappers_to_attributes(
-                item.attributes.values(),
-                mappers,
-                validate=False,
-                session=session,
-            )
-            self._attribute_service.update_for_item(
-                existing_item, attributes, session=session
-            )
-            self._tag_service.update_for_item(existing_item, item.tags, session=session)
-            # Stamped here rather than taken from the item: this is the one
-            # path a user's save comes through, and a client that sent its own
-            # time would report its clock instead of when the save happened.
-            existing_item.last_saved = datetime.now()
-            # Parked before validating, so that what is validated is where the
-            # image ended up.
-            self._park_on_orphan_holder(existing_item, orphan_holder)
-            self._validation_service.validate_item_relations(existing_item, session)
-            self._review_service.item_validity_changed(
-                existing_item.uid,
-                was_valid,
-                self._validation_service.item_is_valid_for_now(existing_item, session),
-                review_unit=review_unit,
-                session=session,
-            )
+                    existing_item.observations = set(
+                        self._database_service.get_observation(session, observation)
+                        for schema_observations in item.observations.values()
+                        for observation in schema_observations
+                    )
+                elif isinstance(existing_item, DatabaseImage):
+                    if not isinstance(item, Image):
+                        raise TypeError(f"Expected Image, got {type(item)}.")
+                    existing_item.samples = set(
+                        self._database_service.get_sample(session, sample)
+                        for schema_samples in item.samples.values()
+                        for sample in schema_samples
+                    )
+                elif isinstance(existing_item, DatabaseAnnotation):
+                    if not isinstance(item, Annotation):
+                        raise TypeError(f"Expected Annotation, got {type(item)}.")
+                    existing_item.image = (
+                        self._database_service.get_image(session, item.image[1])
+                        if item.image is not None
+                        else None
+                    )
+                elif isinstance(existing_item, DatabaseObservation):
+                    if not isinstance(item, Observation):
+                        raise TypeError(f"Expected Observation, got {type(item)}.")
+                    if item.sample is not None:
+                        existing_item.sample = self._database_service.get_sample(
+                            session, item.sample[1]
+                        )
+                    elif item.image is not None:
+                        existing_item.image = self._database_service.get_image(
+                            session, item.image[1]
+                        )
+                    elif item.annotation is not None:
+                        existing_item.annotation = (
+                            self._database_service.get_annotation(
+                                session, item.annotation[1]
+                            )
+                        )
+                else:
+                    raise TypeError(f"Unknown item type {existing_item}.")
+                mappers = [
+                    mapper
+                    for group in existing_item.batch.project.mapper_groups
+                    for mapper in self._database_service.get_mapper_group(
+                        session, group
+                    ).mappers
+                ]
+                attributes = self._mapper_service.apply_mappers_to_attributes(
+                    item.attributes.values(),
+                    mappers,
+                    validate=False,
+                    session=session,
+                )
+                self._attribute_service.update_for_item(
+                    existing_item, attributes, session=session
+                )
+                self._tag_service.update_for_item(
+                    existing_item, item.tags, session=session
+                )
+                # Stamped here rather than taken from the item: this is the one
+                # path a user's save comes through, and a client that sent its
+                # own time would report its clock instead of when the save
+                # happened.
+                existing_item.last_saved = datetime.now()
+                # Parked before the tracker validates, so that what is validated
+                # is where the image ended up.
+                self._park_on_orphan_holder(existing_item, orphan_holder)
             return existing_item.model
 
     def get_hierarchy(
@@ -546,33 +576,100 @@ class ItemService:
         The layout decides how far the tree reaches and what each row says: an
         item of a schema the layout does not name is not shown, and nothing
         under it is either.
+
+        Read in a fixed number of queries whatever the size of the tree -- the
+        links under the item, the items they reach and the attributes the
+        layout names -- and put together from what was read. Asking each item
+        for its children is a query per row, and a case with a few hundred
+        slides is a few hundred of them before anything is shown.
         """
         levels = {level.schema_uid: level for level in layout.levels}
         with self._database_service.get_session() as session:
-            item = self._database_service.get_optional_item(session, item_uid)
-            if item is None:
+            tree = self._read_hierarchy(session, item_uid, levels)
+            if tree is None:
                 return None
             return self._build_hierarchy_node(
-                item, orphan=False, ancestors=frozenset(), levels=levels
+                item_uid, orphan=False, ancestors=frozenset(), tree=tree
             )
 
+    @staticmethod
+    def hierarchy_etag(hierarchy: HierarchyNode) -> str:
+        """An entity tag for a hierarchy, the same for as long as it reads the
+        same.
+
+        Taken over what is sent rather than what it was read from: a row says
+        things -- whether its item is valid, the attributes the layout names --
+        that no single column of the item records a change to. A client asking
+        again with the tag it was given is answered without the tree, which is
+        most of the time spent showing it.
+        """
+        digest = hashlib.sha256(
+            hierarchy.model_dump_json(by_alias=True).encode()
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def _read_hierarchy(
+        self,
+        session: Session,
+        item_uid: UUID,
+        levels: Mapping[UUID, HierarchyLevelLayout],
+    ) -> HierarchyTree | None:
+        """Read everything a hierarchy shows, before any of it is built.
+
+        Links into an item of a schema the layout does not name are dropped
+        before the rest is read, and with them whatever is only reached
+        through one, so neither is loaded for a row that is not shown.
+        """
+        links = self._database_service.get_descendant_links(session, [item_uid])
+        if not links:
+            return None
+        linked: dict[UUID, set[UUID]] = defaultdict(set)
+        for link in links:
+            if link.via_uid is not None and link.schema_uid in levels:
+                linked[link.via_uid].add(link.uid)
+        shown = {item_uid}
+        reached = [item_uid]
+        while reached:
+            for child_uid in linked.get(reached.pop(), ()):
+                if child_uid not in shown:
+                    shown.add(child_uid)
+                    reached.append(child_uid)
+        items = self._database_service.get_items_by_uid(session, shown)
+        if item_uid not in items:
+            return None
+        tags = {
+            attribute.tag for level in levels.values() for attribute in level.attributes
+        }
+        attributes: dict[UUID, list[DatabaseAttribute]] = defaultdict(list)
+        if tags:
+            for private in (False, True):
+                for (
+                    uid,
+                    item_attributes,
+                ) in self._database_service.get_attributes_of_items(
+                    session, shown, tags, private=private
+                ).items():
+                    attributes[uid].extend(item_attributes)
+        sort_keys = {uid: self._label_sort_key(item) for uid, item in items.items()}
+        return HierarchyTree(
+            items=items,
+            children={
+                uid: sorted(linked[uid] & shown, key=sort_keys.__getitem__)
+                for uid in shown
+            },
+            attributes=attributes,
+            levels=levels,
+        )
+
     def _build_hierarchy_node(
         self,
-        item: DatabaseItem,
+        item_uid: UUID,
         orphan: bool,
         ancestors: frozenset[UUID],
-        levels: Mapping[UUID, HierarchyLevelLayout],
+        tree: HierarchyTree,
     ) -> HierarchyNode:
+        item = tree.items[item_uid]
         schema = self._schema_service.items[item.schema_uid]
-        level = levels.get(item.schema_uid)
-        children = sorted(
-            (
-                child
-                for child in self._database_service.get_children(item)
-                if child.uid not in ancestors and child.schema_uid in levels
-            ),
-            key=self._label_sort_key,
-        )
         return HierarchyNode(
             uid=item.uid,
             identifier=item.identifier,
@@ -588,21 +685,24 @@ class ItemService:
             # In the order the layout names them, not the item's: an item holds
             # its attributes in a set, and a row that lists them in a different
             # order from the row above it cannot be read down the column.
-            attributes=self._layout_attributes(item, level),
+            attributes=self._layout_attributes(
+                tree.attributes.get(item.uid, ()), tree.levels.get(item.schema_uid)
+            ),
             children=[
                 self._build_hierarchy_node(
-                    child,
-                    self._is_orphan_link(item, child),
+                    child_uid,
+                    self._is_orphan_link(item, tree.items[child_uid]),
                     ancestors | {item.uid},
-                    levels,
+                    tree,
                 )
-                for child in children
+                for child_uid in tree.children.get(item.uid, ())
+                if child_uid not in ancestors
             ],
         )
 
     @staticmethod
     def _layout_attributes(
-        item: DatabaseItem, level: HierarchyLevelLayout | None
+        attributes: Iterable[DatabaseAttribute], level: HierarchyLevelLayout | None
     ) -> dict[str, AnyAttribute]:
         """The attributes the level asks for, in the order it asks for them.
 
@@ -618,10 +718,7 @@ class ItemService:
         """
         if level is None:
             return {}
-        by_tag = {
-            attribute.tag: attribute
-            for attribute in chain(item.attributes, item.private_attributes)
-        }
+        by_tag = {attribute.tag: attribute for attribute in attributes}
         return {
             attribute.tag: by_tag[attribute.tag].model
             for attribute in level.attributes
@@ -656,12 +753,8 @@ class ItemService:
             child, DatabaseImage
         ):
             return False
-        schema = self._schema_service.items[child.schema_uid]
-        if not isinstance(schema, ImageSchema):
-            return False
-        return any(
-            relation.orphan and relation.sample_uid == parent.schema_uid
-            for relation in schema.samples
+        return self._schema_service.is_orphan_relation(
+            child.schema_uid, parent.schema_uid
         )
 
     def _raise_if_locked_edit(self, existing: DatabaseItem, item: AnyItem) -> None:
@@ -1335,6 +1428,7 @@ class ItemService:
         item: UUID | Item | DatabaseItem,
         target_parent_uid: UUID,
         session: Session | None = None,
+        progress: OperationProgress | None = None,
     ) -> AnyItem:
         """Move an item to another parent, keeping the item itself.
 
@@ -1342,6 +1436,13 @@ class ItemService:
         attributes, private attributes and identifier, ends up under
         ``target_parent_uid``. Used where the data is right but sits on the
         wrong parent — an observation registered against the wrong specimen.
+
+        Give ``progress`` to have it told about each item whose validity the
+        move is checked against, as an operation run in the background is.
+        What hangs under the item moves with it without being touched, so
+        those are the item and the parents it goes to and leaves. The move is
+        committed as one, so a move cancelled part-way leaves the item where it
+        was.
         """
         with self._database_service.get_session(session) as session:
             moved = self._database_service.get_item(session, item)
@@ -1363,6 +1464,8 @@ class ItemService:
             # else would ever say so.
             left_behind = self._parents_of(moved, session)
             touched_items = [moved, parent, *left_behind]
+            if progress is not None:
+                progress.begin(len(touched_items))
             was_valid = {
                 touched.uid: self._validation_service.item_is_valid_for_now(
                     touched, session
@@ -1391,6 +1494,8 @@ class ItemService:
                     self._validation_service.item_is_valid_for_now(touched, session),
                     session=session,
                 )
+                if progress is not None:
+                    progress.advance()
             return moved.model
 
     @staticmethod
@@ -1445,27 +1550,17 @@ class ItemService:
                     f"{target.schema_uid})"
                 )
 
-            # Read before the swap, and for both ends: a value moved off one
+            # Noted before the swap, and for both ends: a value moved off one
             # item and onto the other can make the one it lands on valid and
             # leave the one it left invalid, which is the whole point of moving
             # it. Whichever way it goes, both have to say so.
-            was_valid = {
-                item.uid: self._validation_service.item_is_valid_for_now(item, session)
-                for item in (source, target)
-            }
-
-            self._attribute_service.swap_attribute_value(
-                source, target, attribute_tag, session
-            )
-
-            self._validation_service.validate_item_attributes(source, session)
-            self._validation_service.validate_item_attributes(target, session)
-            for item in (source, target):
-                self._review_service.item_validity_changed(
-                    item.uid,
-                    was_valid[item.uid],
-                    self._validation_service.item_is_valid_for_now(item, session),
-                    session=session,
+            with ValidationTracker.track(
+                self._validation_service, self._review_service, session
+            ) as tracker:
+                tracker.attributes_changed(source)
+                tracker.attributes_changed(target)
+                self._attribute_service.swap_attribute_value(
+                    source, target, attribute_tag, session
                 )
 
     def _validate_touched(
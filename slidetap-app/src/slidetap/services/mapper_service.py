@@ -37,6 +37,7 @@ from slidetap.database import (
 from slidetap.database.item import DatabaseItem
 from slidetap.database.project import DatabaseBatch
 from slidetap.external_interfaces import MapperInjectorInterface
+from slidetap.metrics import MAPPER_RESOLVE_SECONDS
 from slidetap.model import (
     UnmappedValue,
     AnyAttribute,
@@ -56,9 +57,11 @@ from slidetap.model import (
 from slidetap.model.mapper import MapperCreate, MappingItemCreate
 from slidetap.services.attribute_service import AttributeService
 from slidetap.services.database_service import DatabaseService
+from slidetap.services.operation_service import OperationProgress
 from slidetap.services.review_service import ReviewService
 from slidetap.services.schema_service import SchemaService
 from slidetap.services.validation_service import ValidationService
+from slidetap.services.validation_tracker import ValidationTracker
 
 
 @dataclass
@@ -120,13 +123,39 @@ class MapperService:
             self._inject(mapper_injector)
 
     def _inject(self, mapper_injector: MapperInjectorInterface) -> None:
-        injected_expressions: set[tuple[UUID, str]] = set()
+        """Inject the mappers of the injector, unless they are made from what
+        they were last injected from.
+
+        Every process that starts injects them, and asking for each mapping of
+        a large mapping file one at a time kept a restarting worker busy for
+        over a minute. The injector's fingerprint is compared with the one
+        noted when it last injected, and nothing is read when they are the
+        same. Otherwise the expressions the mappers already have are read once
+        per mapper, and only the mappings that are new are inserted, as
+        statements of many rows. A mapping already there is left as it is, as
+        it was when asked for one at a time: it may have been curated since.
+        """
+        injector = type(mapper_injector).__name__
+        fingerprint = mapper_injector.fingerprint()
         with self._database_service.get_session() as session:
+            if fingerprint is not None:
+                injection = self._database_service.get_mapper_injection(
+                    session, injector
+                )
+                if injection is not None and injection.fingerprint == fingerprint:
+                    self._logger.info(
+                        f"Mappers of {injector} unchanged since injected at "
+                        f"{injection.injected_at}, not injecting them again."
+                    )
+                    return
+            injected_expressions: set[tuple[UUID, str]] = set()
+            added = 0
             for group, mappers in mapper_injector.inject():
                 group = self.get_or_create_mapper_group(
                     group.name, group.default_enabled, session=session
                 )
                 group_mappers = []
+                new_mappings: list[tuple[UUID, str, AnyAttribute]] = []
                 for mapper, items in mappers:
                     mapper = self.get_or_create_mapper(
                         mapper.name,
@@ -135,6 +164,11 @@ class MapperService:
                         session=session,
                     )
                     group_mappers.append(mapper)
+                    existing_expressions = (
+                        self._database_service.get_mapping_expressions(
+                            session, [mapper.uid]
+                        )
+                    )
                     for item in items:
                         if (mapper.uid, item.expression) in injected_expressions:
                             self._logger.warning(
@@ -144,14 +178,20 @@ class MapperService:
                             )
                             continue
                         injected_expressions.add((mapper.uid, item.expression))
-                        self.get_or_create_mapping(
-                            mapper.uid,
-                            item.expression,
-                            item.attribute,
-                            session=session,
+                        if (mapper.uid, item.expression) in existing_expressions:
+                            continue
+                        self._attribute_service.set_display_value(item.attribute)
+                        new_mappings.append(
+                            (mapper.uid, item.expression, item.attribute)
                         )
                 session.flush()
+                added += self._database_service.add_mappings(session, new_mappings)
                 self.add_mappers_to_group(group, group_mappers, session=session)
+            if fingerprint is not None:
+                self._database_service.set_mapper_injection(
+                    session, injector, fingerprint
+                )
+            self._logger.info(f"Injected {added} new mappings from {injector}.")
 
     @staticmethod
     @lru_cache(1000)
@@ -484,15 +524,23 @@ class MapperService:
                 mapper.attribute_schema_uid,
             ).model
 
-    def create_mapping(self, mapping: MappingItemCreate) -> MappingItem:
+    def create_mapping(
+        self, mapping: MappingItemCreate, apply: bool = True
+    ) -> MappingItem:
+        """Create a mapping, and apply it to every attribute its mapper maps.
+
+        Pass ``apply=False`` to leave applying it to :py:meth:`apply_mapping`,
+        for a mapper mapping more attributes than a request has time for.
+        """
         with self._database_service.get_session() as session:
             database_mapping = self._database_service.add_mapping(
                 session, mapping.mapper_uid, mapping.expression, mapping.attribute
             )
             session.flush()
-            self._apply_mapping_item_to_all_attributes(
-                session, mapping.mapper_uid, database_mapping
-            )
+            if apply:
+                self._apply_mapping_item_to_all_attributes(
+                    session, mapping.mapper_uid, database_mapping
+                )
             return database_mapping.model
 
     def update_mapper(self, mapper: Mapper) -> Mapper:
@@ -501,15 +549,33 @@ class MapperService:
             database_mapper.name = mapper.name
             return database_mapper.model
 
-    def update_mapping(self, mapping: MappingItem) -> MappingItem:
+    def update_mapping(self, mapping: MappingItem, apply: bool = True) -> MappingItem:
+        """Change a mapping, and apply it again, as :py:meth:`create_mapping`."""
         with self._database_service.get_session() as session:
             database_mapping = self._database_service.get_mapping(session, mapping.uid)
             database_mapping.update(mapping.expression, mapping.attribute)
-            self._apply_mapping_item_to_all_attributes(
-                session, mapping.mapper_uid, database_mapping
-            )
+            if apply:
+                self._apply_mapping_item_to_all_attributes(
+                    session, mapping.mapper_uid, database_mapping
+                )
             return database_mapping.model
 
+    def apply_mapping(
+        self, mapping_uid: UUID, progress: OperationProgress | None = None
+    ) -> int:
+        """Apply a mapping to every attribute its mapper maps, and return how
+        many attributes that was.
+
+        What creating or changing a mapping does, for a mapping created or
+        changed without it. Committed per attribute when given ``progress``,
+        so that an operation cancelled part-way keeps what it did.
+        """
+        with self._database_service.get_session() as session:
+            mapping = self._database_service.get_mapping(session, mapping_uid)
+            return self._apply_mapping_item_to_all_attributes(
+                session, mapping.mapper_uid, mapping, progress=progress
+            )
+
     def delete_mapper(self, mapper_uid: UUID) -> bool:
         """Delete a mapper and the mappings belonging to it.
 
@@ -593,31 +659,37 @@ class MapperService:
         self,
         project_uid: UUID,
         batch_uid: UUID | None = None,
+        value_prefix: str | None = None,
+        start: int | None = None,
+        size: int | None = None,
         session: Session | None = None,
     ) -> list[UnmappedValue]:
         """The values in a project, or one of its batches, with no mapping.
 
         Ordered by how many items carry each, since that is the order in which
-        adding keys pays: the wording at the top settles the most items.
+        adding keys pays: the wording at the top settles the most items. The
+        order, filter and page are taken by the query, so that a page costs
+        the same however long the list behind it is.
         """
         with self._database_service.get_session(session) as session:
             counted = self._database_service.unmapped_value_counts(
-                session, project_uid, batch_uid
+                session, project_uid, batch_uid, value_prefix, start, size
             )
             mappers = self._mappers_by_attribute_schema(project_uid, session)
-            return sorted(
-                (
-                    UnmappedValue(
-                        attribute_schema_uid=schema_uid,
-                        display_name=self._display_name_of(schema_uid),
-                        value=value,
-                        items=items,
-                        mapper_uid=mappers.get(schema_uid),
-                    )
-                    for schema_uid, value, items in counted
-                ),
-                key=lambda unmapped: (-unmapped.items, unmapped.value),
-            )
+            display_names = {
+                schema_uid: self._display_name_of(schema_uid)
+                for schema_uid in {schema_uid for schema_uid, _, _ in counted}
+            }
+            return [
+                UnmappedValue(
+                    attribute_schema_uid=schema_uid,
+                    display_name=display_names[schema_uid],
+                    value=value,
+                    items=items,
+                    mapper_uid=mappers.get(schema_uid),
+                )
+                for schema_uid, value, items in counted
+            ]
 
     def _display_name_of(self, attribute_schema_uid: UUID) -> str:
         try:
@@ -827,15 +899,24 @@ class MapperService:
         mapper_uid: UUID,
         mapping: DatabaseMappingItem,
         validate: bool = True,
-    ):
+        progress: OperationProgress | None = None,
+    ) -> int:
         mapper = self._database_service.get_mapper(session, mapper_uid)
-        root_attributes = self._database_service.get_attributes_for_schema(
-            session, mapper.root_attribute_schema_uid
+        root_attributes = list(
+            self._database_service.get_attributes_for_schema(
+                session, mapper.root_attribute_schema_uid
+            )
         )
+        if progress is not None:
+            progress.begin(len(root_attributes))
         for root_attribute in root_attributes:
             self._apply_mappers_to_root_attribute(
                 session, [mapper], root_attribute.model, mapping.expression, validate
             )
+            if progress is not None:
+                session.commit()
+                progress.advance()
+        return len(root_attributes)
 
     @staticmethod
     def _copy_mapped_value(target: AnyAttribute, source: AnyAttribute) -> None:
@@ -891,28 +972,29 @@ class MapperService:
         `_linear_scan_expression` scans in, so the result is identical to a
         full linear scan.
         """
-        if "\n" in value:
-            # `$` in an exact `^literal$` key also matches before a trailing
-            # newline under re.match ("^X$" matches "X\n"), which an exact
-            # string-equality lookup on `literal` would miss. Route any
-            # newline-bearing value through the authoritative scan to stay
-            # byte-identical to a full linear scan. Pathological for coded
-            # values; never on the hot path.
-            return self._linear_scan_expression(session, mapper_uid, value)
-
-        candidates: list[Row[tuple[str, int, UUID]]] = []
-        exact = self._cached_literal_item(session, mapper_uid, value, cache)
-        if exact is not None:
-            candidates.append(exact)
-        candidates.extend(
-            item
-            for item in self._cached_regex_items(session, mapper_uid, cache)
-            if self.create_pattern(item.expression).match(value) is not None
-        )
-        if not candidates:
-            return None
-        winner = min(candidates, key=lambda item: (-item.hits, item.uid))
-        return winner.expression
+        with MAPPER_RESOLVE_SECONDS.time():
+            if "\n" in value:
+                # `$` in an exact `^literal$` key also matches before a trailing
+                # newline under re.match ("^X$" matches "X\n"), which an exact
+                # string-equality lookup on `literal` would miss. Route any
+                # newline-bearing value through the authoritative scan to stay
+                # byte-identical to a full linear scan. Pathological for coded
+                # values; never on the hot path.
+                return self._linear_scan_expression(session, mapper_uid, value)
+
+            candidates: list[Row[tuple[str, int, UUID]]] = []
+            exact = self._cached_literal_item(session, mapper_uid, value, cache)
+            if exact is not None:
+                candidates.append(exact)
+            candidates.extend(
+                item
+                for item in self._cached_regex_items(session, mapper_uid, cache)
+                if self.create_pattern(item.expression).match(value) is not None
+            )
+            if not candidates:
+                return None
+            winner = min(candidates, key=lambda item: (-item.hits, item.uid))
+            return winner.expression
 
     def _linear_scan_expression(
         self, session: Session, mapper_uid: UUID, value: str
@@ -1090,7 +1172,10 @@ class MapperService:
             self._remap_item_attributes(session, item, project_mappers)
 
     def remap_item_hierarchy(
-        self, item_uid: UUID, session: Session | None = None
+        self,
+        item_uid: UUID,
+        session: Session | None = None,
+        progress: OperationProgress | None = None,
     ) -> None:
         """Re-apply mappers to the item and all of its descendants
         (child samples, images, annotations, observations)."""
@@ -1099,9 +1184,14 @@ class MapperService:
             project_mappers = self._project_mappers_for_item(root)
             if not project_mappers:
                 return
-            for descendant in self._database_service.walk_item_descendants(root):
+            descendants = list(self._database_service.walk_item_descendants(root))
+            if progress is not None:
+                progress.begin(len(descendants))
+            for descendant in descendants:
                 self._remap_item_attributes(session, descendant, project_mappers)
                 session.commit()
+                if progress is not None:
+                    progress.advance()
 
     def remap_batch(self, batch_uid: UUID, session: Session | None = None) -> None:
         """Re-apply mappers to every item in a batch.
@@ -1174,19 +1264,15 @@ class MapperService:
         item: DatabaseItem,
         project_mappers: Sequence[DatabaseMapper],
     ) -> None:
-        # Read before the remap, and once for the item rather than once per
-        # attribute: what is worth recording is the item crossing between valid
-        # and not, not that it was validated once for every attribute it has.
-        was_valid = self._validation_service.item_is_valid_for_now(item, session)
-        for database_attribute in item.attributes:
-            self._remap_one_attribute(session, database_attribute, project_mappers)
-            self._validation_service.validate_item_attributes(item, session=session)
-        self._review_service.item_validity_changed(
-            item.uid,
-            was_valid,
-            self._validation_service.item_is_valid_for_now(item, session),
-            session=session,
-        )
+        # The item is validated and reported once, when every attribute has
+        # been remapped, rather than after each: validating it validates all
+        # of its attributes, so doing it per attribute is quadratic in them.
+        with ValidationTracker.track(
+            self._validation_service, self._review_service, session
+        ) as tracker:
+            tracker.attributes_changed(item)
+            for database_attribute in item.attributes:
+                self._remap_one_attribute(session, database_attribute, project_mappers)
 
     def _remap_one_attribute(
         self,
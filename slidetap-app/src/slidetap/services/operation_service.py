@@ -0,0 +1,216 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Curation actions run in the background, and how far they have come."""
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from time import monotonic
+from typing import Any
+from uuid import UUID
+
+from slidetap.database import DatabaseOperation
+from slidetap.model import Operation, OperationKind, OperationStatus
+from slidetap.services.database_service import DatabaseService
+
+
+class OperationCancelled(Exception):
+    """Raised out of the work of an operation somebody asked to stop."""
+
+
+class OperationProgress:
+    """What the work of an operation reports how far it has come through.
+
+    Written in a session of its own rather than in the one the work is done in,
+    so that whoever follows the operation sees it move while the work's own
+    transaction is still open. Written at most every :py:attr:`WRITE_INTERVAL`
+    seconds, since the work can take a step per item and a write per step
+    would be a write per item.
+
+    Whether the operation has been asked to stop is read back on each write,
+    and raised on as :class:`OperationCancelled`: the work stops at the next
+    step it reports rather than being interrupted mid-step. What it has
+    committed before then stays done.
+    """
+
+    WRITE_INTERVAL = 1.0
+    """Seconds between writes of the progress."""
+
+    def __init__(self, database_service: DatabaseService, operation_uid: UUID):
+        self._database_service = database_service
+        self._operation_uid = operation_uid
+        self._total: int | None = None
+        self._done = 0
+        self._written_at: float | None = None
+
+    @property
+    def done(self) -> int:
+        return self._done
+
+    def begin(self, total: int) -> None:
+        """Say how many steps the work is going to take."""
+        self._total = total
+        self._write()
+
+    def advance(self, steps: int = 1) -> None:
+        """Say that the work has taken some more steps."""
+        self._done += steps
+        if (
+            self._written_at is None
+            or monotonic() - self._written_at >= self.WRITE_INTERVAL
+        ):
+            self._write()
+
+    def _write(self) -> None:
+        with self._database_service.get_session() as session:
+            operation = self._database_service.get_optional_operation(
+                session, self._operation_uid
+            )
+            if operation is None:
+                return
+            operation.total = self._total
+            operation.done = self._done
+            cancel_requested = operation.cancel_requested
+        self._written_at = monotonic()
+        if cancel_requested:
+            raise OperationCancelled()
+
+
+OperationWork = Callable[[UUID, dict[str, Any], OperationProgress], str | None]
+"""The work of an operation: given what it is run on, what else it was asked
+with, and what to report progress through, do it, and return what to say about
+how it went."""
+
+
+class OperationService:
+    """Curation actions run in the background, as the web process starts and
+    follows them and a worker runs them.
+
+    An action that touches a whole batch or dataset takes longer than a
+    request is given, so above some size it is recorded here, run by a worker,
+    and followed by whoever started it through the record.
+    """
+
+    def __init__(self, database_service: DatabaseService):
+        self._database_service = database_service
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def create(
+        self,
+        kind: OperationKind,
+        subject_uid: UUID,
+        parameters: dict[str, Any] | None = None,
+    ) -> Operation:
+        """Record an operation, queued. Committed at once, as the worker that
+        is to run it reads it from its own session."""
+        with self._database_service.get_session() as session:
+            operation = self._database_service.add_operation(
+                session, kind, subject_uid, parameters
+            )
+            session.commit()
+            return operation.model
+
+    def get(self, operation_uid: UUID) -> Operation | None:
+        with self._database_service.get_session(commit=False) as session:
+            operation = self._database_service.get_optional_operation(
+                session, operation_uid
+            )
+            return operation.model if operation is not None else None
+
+    def cancel(self, operation_uid: UUID) -> Operation | None:
+        """Ask an operation to stop.
+
+        One still queued is stopped here and now, and is skipped when a worker
+        gets to it. One running stops at the next step it reports, see
+        :class:`OperationProgress`. One already finished is left as it ended.
+        """
+        with self._database_service.get_session() as session:
+            operation = self._database_service.get_optional_operation(
+                session, operation_uid
+            )
+            if operation is None:
+                return None
+            if operation.status.finished:
+                return operation.model
+            operation.cancel_requested = True
+            if operation.status == OperationStatus.QUEUED:
+                self._finish(operation, OperationStatus.CANCELLED, None)
+            return operation.model
+
+    def fail(self, operation_uid: UUID, message: str) -> Operation | None:
+        """Record an operation that could not be run as failed, unless it has
+        already finished."""
+        with self._database_service.get_session() as session:
+            operation = self._database_service.get_optional_operation(
+                session, operation_uid
+            )
+            if operation is None:
+                return None
+            if not operation.status.finished:
+                self._finish(operation, OperationStatus.FAILED, message)
+            return operation.model
+
+    def run(self, operation_uid: UUID, work: OperationWork) -> Operation | None:
+        """Run the work of an operation, and record how it went.
+
+        Run again where a worker died running it, since the work is made of
+        steps that are each committed or not, and not at all where it has
+        finished, which includes where it was cancelled before it started.
+
+        An error from the work is recorded as the operation failing rather
+        than raised: it is reported to whoever follows the operation, and the
+        queue retrying it would only fail it again.
+        """
+        with self._database_service.get_session() as session:
+            operation = self._database_service.get_optional_operation(
+                session, operation_uid
+            )
+            if operation is None or operation.status.finished:
+                return operation.model if operation is not None else None
+            operation.status = OperationStatus.RUNNING
+            subject_uid = operation.subject_uid
+            parameters = dict(operation.parameters)
+        progress = OperationProgress(self._database_service, operation_uid)
+        try:
+            message = work(subject_uid, parameters, progress)
+            status = OperationStatus.COMPLETED
+        except OperationCancelled:
+            message = f"Cancelled after {progress.done} steps."
+            status = OperationStatus.CANCELLED
+        except Exception as exception:
+            self._logger.error(f"Operation {operation_uid} failed.", exc_info=True)
+            message = str(exception)
+            status = OperationStatus.FAILED
+        with self._database_service.get_session() as session:
+            operation = self._database_service.get_optional_operation(
+                session, operation_uid
+            )
+            if operation is None:
+                return None
+            if status == OperationStatus.COMPLETED and operation.total is not None:
+                operation.done = operation.total
+            else:
+                operation.done = max(operation.done, progress.done)
+            self._finish(operation, status, message)
+            return operation.model
+
+    @staticmethod
+    def _finish(
+        operation: DatabaseOperation, status: OperationStatus, message: str | None
+    ) -> None:
+        operation.status = status
+        # Cut to fit, since an error can say more than a line.
+        operation.message = message[:512] if message is not None else None
+        operation.finished_at = datetime.now()
@@ -15,12 +15,16 @@
 """Service for building parent-rooted overview views from a layout."""
 
 import logging
+from collections import defaultdict
+from dataclasses import dataclass
 from uuid import UUID
 
-from slidetap.database import DatabaseSample
+from sqlalchemy.orm import Session
+
+from slidetap.database import DatabaseItem, DatabaseObservation, DatabaseSample
 from slidetap.model import (
     AnyAttribute,
-    Item,
+    ColumnSort,
     ObservationSchema,
     OverviewLayout,
     OverviewSectionLayout,
@@ -31,12 +35,33 @@ from slidetap.model.overview import (
     OverviewRoot,
     OverviewSection,
 )
-from slidetap.model.table import TableRequest
+from slidetap.model.table import SortType, TableRequest
 from slidetap.services.attribute_service import AttributeService
 from slidetap.services.database_service import DatabaseService
 from slidetap.services.schema_service import SchemaService
 
 
+@dataclass
+class OverviewTree:
+    """What an overview shows, read before any of it is laid out.
+
+    Only the items of the schemas the layout names, and only the attributes
+    its sections show, as models by tag ready for the sections to pick from.
+    """
+
+    items: dict[UUID, DatabaseItem]
+    """The items read, by uid, the overview's own sample among them."""
+
+    children: dict[UUID, list[UUID]]
+    """The uids of what hangs directly under each item, whether read or not."""
+
+    attributes: dict[UUID, dict[str, AnyAttribute]]
+    """The attributes read of each item, by tag."""
+
+    private_attributes: dict[UUID, dict[str, AnyAttribute]]
+    """The same for private attributes."""
+
+
 class OverviewService:
     """Build the parent-rooted overview view consumed by the overview page."""
 
@@ -59,6 +84,15 @@ class OverviewService:
         batch_uid: UUID | None = None,
         table_request: TableRequest | None = None,
     ) -> OverviewRoot | None:
+        """The overview of a sample, laid out as the layout says.
+
+        Read in a fixed number of queries however large the case: the links
+        under the sample in one walk, the items of the schemas the layout
+        names, and only the attributes its sections show. What the sections
+        group and list is then found in what was read. Walking each section's
+        path a query per item, and building every item in full to show a few
+        of its attributes, made the page's time grow with the case.
+        """
         with self._database_service.get_session() as session:
             parent = self._database_service.get_optional_item(session, item_uid)
             if parent is None:
@@ -68,6 +102,7 @@ class OverviewService:
                     f"Overview is only supported for sample items, "
                     f"got {type(parent).__name__} for item {item_uid}"
                 )
+            tree = self._read_overview(session, parent, overview_layout)
 
             # Build sections from layout
             sections: list[OverviewSection] = []
@@ -83,9 +118,6 @@ class OverviewService:
 
                 # If target is the parent itself, show parent's attributes
                 if section.schema_uid == parent.schema_uid:
-                    attrs, private_attrs = self._collect_section_attributes(
-                        parent.model, section
-                    )
                     sections.append(
                         OverviewSection(
                             item_uid=parent.uid,
@@ -94,15 +126,7 @@ class OverviewService:
                                 None if section.display_name else parent.pseudonym
                             ),
                             schema_uid=section.schema_uid,
-                            items=[
-                                OverviewItem(
-                                    item_uid=parent.uid,
-                                    identifier=parent.identifier,
-                                    pseudonym=parent.pseudonym,
-                                    attributes=attrs,
-                                    private_attributes=private_attrs,
-                                )
-                            ],
+                            items=[self._overview_item(tree, parent, section)],
                         )
                     )
                     continue
@@ -110,75 +134,45 @@ class OverviewService:
                 # Traverse the path from root to find parent items.
                 # Filter by selected so deselected/recycled specimens don't
                 # surface as parents in the overview.
-                if not section.path:
-                    # No path = parent is the root itself
-                    group_items = [parent]
-                else:
-                    # Walk path step by step to reach parent items
-                    current_items: list[DatabaseSample] = [parent]
-                    for step_schema_uid in section.path:
-                        next_items: list[DatabaseSample] = []
-                        for item in current_items:
-                            next_items.extend(
-                                self._database_service.get_sample_children(
-                                    session,
-                                    item,
-                                    step_schema_uid,
-                                    selected=True,
-                                )
-                            )
-                        current_items = next_items
-                    group_items = sorted(current_items, key=lambda c: c.identifier)
+                group_items: list[DatabaseItem] = [parent]
+                for step_schema_uid in section.path:
+                    group_items = [
+                        tree.items[uid]
+                        for item in group_items
+                        for uid in tree.children.get(item.uid, ())
+                        if uid in tree.items
+                        and tree.items[uid].schema_uid == step_schema_uid
+                        and tree.items[uid].selected
+                    ]
+                if section.path:
+                    group_items.sort(key=lambda c: c.identifier)
 
                 for group_child in group_items:
-                    target_items: list[OverviewItem] = []
-
+                    targets: list[DatabaseItem] = []
                     if isinstance(target_schema, ObservationSchema):
-                        for observation in group_child.observations:
-                            if observation.schema_uid != section.schema_uid:
-                                continue
-                            if not observation.selected:
-                                continue
-                            obs_model = observation.model
-                            attrs, private_attrs = self._collect_section_attributes(
-                                obs_model, section
-                            )
-                            target_items.append(
-                                OverviewItem(
-                                    item_uid=observation.uid,
-                                    identifier=observation.identifier,
-                                    pseudonym=observation.pseudonym,
-                                    attributes=attrs,
-                                    private_attributes=private_attrs,
-                                )
-                            )
+                        targets = [
+                            tree.items[uid]
+                            for uid in tree.children.get(group_child.uid, ())
+                            if uid in tree.items
+                            and isinstance(tree.items[uid], DatabaseObservation)
+                            and tree.items[uid].schema_uid == section.schema_uid
+                            and tree.items[uid].selected
+                        ]
                     elif isinstance(target_schema, SampleSchema):
-                        children = self._database_service.get_sample_children(
-                            session,
-                            group_child,
-                            section.schema_uid,
-                            recursive=True,
-                            selected=True,
+                        targets = sorted(
+                            self._sample_descendants(
+                                tree, group_child.uid, section.schema_uid
+                            ),
+                            key=lambda c: c.identifier,
                         )
-                        for child in sorted(children, key=lambda c: c.identifier):
-                            child_model = child.model
-                            attrs, private_attrs = self._collect_section_attributes(
-                                child_model, section
-                            )
-                            target_items.append(
-                                OverviewItem(
-                                    item_uid=child.uid,
-                                    identifier=child.identifier,
-                                    pseudonym=child.pseudonym,
-                                    attributes=attrs,
-                                    private_attributes=private_attrs,
-                                )
-                            )
                     else:
                         self._logger.warning(
                             f"Unsupported target schema type "
                             f"{type(target_schema).__name__} in overview section"
                         )
+                    target_items = [
+                        self._overview_item(tree, target, section) for target in targets
+                    ]
 
                     if target_items or section.creatable:
                         use_section_label = section.display_name and not section.path
@@ -196,7 +190,7 @@ class OverviewService:
                                 schema_uid=section.schema_uid,
                                 items=target_items,
                                 parent_item=self._collect_parent_item(
-                                    group_child, section
+                                    tree, group_child, section
                                 ),
                                 # What the group is, whether or not its own
                                 # attributes are shown: the view names the group
@@ -226,9 +220,127 @@ class OverviewService:
                 next_uid=next_uid,
             )
 
+    def _read_overview(
+        self,
+        session: Session,
+        parent: DatabaseSample,
+        overview_layout: OverviewLayout,
+    ) -> OverviewTree:
+        """Read everything the layout's sections show of what is under a parent.
+
+        One walk down from the parent, then the items of the schemas a section
+        names -- as its target or on its path -- and their attributes, as few
+        of them as the sections ask for. A section naming no attributes shows
+        all of them, and then all of them are read.
+        """
+        sections = overview_layout.sections
+        schema_uids = {parent.schema_uid}
+        for section in sections:
+            schema_uids.add(section.schema_uid)
+            schema_uids.update(section.path)
+        # Every link is kept, to walk through items of a schema the layout
+        # does not name: a section's samples may hang under some that are not
+        # shown. Only the items of the named schemas are read.
+        children: dict[UUID, list[UUID]] = defaultdict(list)
+        shown: set[UUID] = set()
+        for link in self._database_service.get_descendant_links(session, [parent.uid]):
+            if link.via_uid is not None:
+                children[link.via_uid].append(link.uid)
+            if link.schema_uid in schema_uids:
+                shown.add(link.uid)
+        items = self._database_service.get_items_by_uid(session, shown - {parent.uid})
+        items[parent.uid] = parent
+
+        tags: set[str] | None = set()
+        private_tags: set[str] | None = set()
+        for section in sections:
+            # A compound tag is a value inside an object attribute, which is
+            # read whole.
+            parent_tags = {tag.partition(".")[0] for tag in section.parent_attributes}
+            if tags is not None:
+                tags = (
+                    tags
+                    | parent_tags
+                    | {tag.partition(".")[0] for tag in section.attributes}
+                    if section.attributes
+                    else None
+                )
+            if private_tags is not None:
+                private_tags = (
+                    private_tags
+                    | parent_tags
+                    | {tag.partition(".")[0] for tag in section.private_attributes}
+                    if section.private_attributes
+                    else None
+                )
+        attributes = {
+            private: {
+                uid: {attribute.tag: attribute.model for attribute in item_attributes}
+                for uid, item_attributes in (
+                    self._database_service.get_attributes_of_items(
+                        session, items, wanted, private=private
+                    ).items()
+                )
+            }
+            for private, wanted in ((False, tags), (True, private_tags))
+        }
+        return OverviewTree(
+            items=items,
+            children=children,
+            attributes=attributes[False],
+            private_attributes=attributes[True],
+        )
+
+    @staticmethod
+    def _sample_descendants(
+        tree: OverviewTree, item_uid: UUID, schema_uid: UUID
+    ) -> list[DatabaseItem]:
+        """The selected samples of a schema anywhere under an item.
+
+        Through samples that are not selected as well: taking a specimen out
+        of the project does not take out what was cut from it, so it is only
+        what is found that has to still be in the project.
+        """
+        found: list[DatabaseItem] = []
+        seen = {item_uid}
+        reached = [item_uid]
+        while reached:
+            for uid in tree.children.get(reached.pop(), ()):
+                if uid in seen:
+                    continue
+                seen.add(uid)
+                reached.append(uid)
+                item = tree.items.get(uid)
+                if (
+                    isinstance(item, DatabaseSample)
+                    and item.schema_uid == schema_uid
+                    and item.selected
+                ):
+                    found.append(item)
+        return found
+
+    def _overview_item(
+        self,
+        tree: OverviewTree,
+        item: DatabaseItem,
+        section: OverviewSectionLayout,
+    ) -> OverviewItem:
+        attributes, private_attributes = self._collect_section_attributes(
+            tree.attributes.get(item.uid, {}),
+            tree.private_attributes.get(item.uid, {}),
+            section,
+        )
+        return OverviewItem(
+            item_uid=item.uid,
+            identifier=item.identifier,
+            pseudonym=item.pseudonym,
+            attributes=attributes,
+            private_attributes=private_attributes,
+        )
+
     def _find_neighbors(
         self,
-        session,
+        session: Session,
         parent: DatabaseSample,
         pseudonym_mode: bool,
         batch_uid: UUID | None,
@@ -236,68 +348,59 @@ class OverviewService:
     ) -> tuple[UUID | None, UUID | None]:
         """Return (previous_uid, next_uid) for ``parent`` within its sibling set.
 
-        When a ``table_request`` is provided, siblings are listed via the same
+        When a ``table_request`` is provided, siblings are ordered by the same
         filter/sort pipeline as the curate item table — so prev/next honours
         the user's active sorting, column filters, recycled/invalid toggles,
         identifier search, etc. Without a table request, falls back to the
         old behaviour: all selected samples sorted by identifier (or
         pseudonym in pseudonym mode).
+
+        Either way the database answers with the two neighbours rather than
+        the whole list of siblings for this to look the parent up in.
         """
         parent_schema = self._schema_service.samples.get(parent.schema_uid)
         if parent_schema is None:
             return None, None
 
         if table_request is None:
-            siblings = list(
-                self._database_service.get_samples(
-                    session,
-                    parent_schema,
-                    parent.dataset_uid,
-                    batch=batch_uid,
-                    selected=True,
-                )
-            )
-
-            def _sort_key(sibling: DatabaseSample) -> str:
-                if not pseudonym_mode:
-                    return sibling.identifier
-                if sibling.pseudonym:
-                    return sibling.pseudonym
-                return f"ANON-{str(sibling.uid)[:8].upper()}"
-
-            siblings.sort(key=_sort_key)
-        else:
-            siblings = list(
-                self._database_service.get_samples(
-                    session,
-                    parent_schema,
-                    parent.dataset_uid,
-                    batch=batch_uid,
-                    identifier_filter=table_request.identifier_filter,
-                    pseudonym_mode=table_request.pseudonym_mode,
-                    attributes_filters=table_request.attribute_filters,
-                    tag_filter=table_request.tag_filter,
-                    relation_filters=table_request.relation_filters,
-                    sorting=table_request.sorting,
-                    selected=table_request.included,
-                    valid=table_request.valid,
-                )
+            return self._database_service.get_sample_neighbours(
+                session,
+                parent_schema,
+                parent.uid,
+                parent.dataset_uid,
+                batch=batch_uid,
+                sorting=[
+                    ColumnSort(
+                        descending=False,
+                        sort_type=(
+                            SortType.PSEUDONYM
+                            if pseudonym_mode
+                            else SortType.IDENTIFIER
+                        ),
+                    )
+                ],
+                selected=True,
             )
-
-        previous_uid: UUID | None = None
-        next_uid: UUID | None = None
-        for index, sibling in enumerate(siblings):
-            if sibling.uid == parent.uid:
-                if index > 0:
-                    previous_uid = siblings[index - 1].uid
-                if index < len(siblings) - 1:
-                    next_uid = siblings[index + 1].uid
-                break
-        return previous_uid, next_uid
+        return self._database_service.get_sample_neighbours(
+            session,
+            parent_schema,
+            parent.uid,
+            parent.dataset_uid,
+            batch=batch_uid,
+            identifier_filter=table_request.identifier_filter,
+            pseudonym_mode=table_request.pseudonym_mode,
+            attributes_filters=table_request.attribute_filters,
+            tag_filter=table_request.tag_filter,
+            relation_filters=table_request.relation_filters,
+            sorting=table_request.sorting,
+            selected=table_request.included,
+            valid=table_request.valid,
+        )
 
     def _collect_parent_item(
         self,
-        group_child: DatabaseSample,
+        tree: OverviewTree,
+        group_child: DatabaseItem,
         section: OverviewSectionLayout,
     ) -> OverviewItem | None:
         """The group's own attributes, so they can be shown in the same card as
@@ -307,16 +410,17 @@ class OverviewService:
         """
         if not section.parent_attributes:
             return None
-        model = group_child.model
+        item_attributes = tree.attributes.get(group_child.uid, {})
+        item_private_attributes = tree.private_attributes.get(group_child.uid, {})
         attributes: dict[str, AnyAttribute] = {}
         private_attributes: dict[str, AnyAttribute] = {}
         for tag in section.parent_attributes:
-            attribute = self._attribute_service.resolve_attribute(model.attributes, tag)
+            attribute = self._attribute_service.resolve_attribute(item_attributes, tag)
             if attribute is not None:
                 attributes[tag] = attribute
                 continue
             attribute = self._attribute_service.resolve_attribute(
-                model.private_attributes, tag
+                item_private_attributes, tag
             )
             if attribute is not None:
                 private_attributes[tag] = attribute
@@ -330,7 +434,8 @@ class OverviewService:
 
     def _collect_section_attributes(
         self,
-        item_model: Item,
+        item_attributes: dict[str, AnyAttribute],
+        item_private_attributes: dict[str, AnyAttribute],
         section: OverviewSectionLayout,
     ) -> tuple[dict[str, AnyAttribute], dict[str, AnyAttribute]]:
         """Collect attributes and private attributes for a section.
@@ -340,23 +445,21 @@ class OverviewService:
         attributes: dict[str, AnyAttribute] = {}
         if section.attributes:
             for tag in section.attributes:
-                attr = self._attribute_service.resolve_attribute(
-                    item_model.attributes, tag
-                )
+                attr = self._attribute_service.resolve_attribute(item_attributes, tag)
                 if attr is not None:
                     attributes[tag] = attr
         else:
-            attributes.update(item_model.attributes)
+            attributes.update(item_attributes)
 
         private_attributes: dict[str, AnyAttribute] = {}
         if section.private_attributes:
             for tag in section.private_attributes:
                 attr = self._attribute_service.resolve_attribute(
-                    item_model.private_attributes, tag
+                    item_private_attributes, tag
                 )
                 if attr is not None:
                     private_attributes[tag] = attr
         else:
-            private_attributes.update(item_model.private_attributes)
+            private_attributes.update(item_private_attributes)
 
         return attributes, private_attributes
@@ -49,8 +49,9 @@ class RepairService:
         """Read the unmapped values again from the attributes themselves.
 
         The repair for a table that is only ever derived: what it says is
-        replaced by what the attributes say now. Returns how many values were
-        written.
+        replaced by what the attributes say now. The counts the work list is
+        read from are then counted again from what was written, in case they
+        had drifted on their own. Returns how many values were written.
         """
         with self._database_service.get_session(session) as session:
             written = 0
@@ -59,6 +60,9 @@ class RepairService:
             ):
                 self._database_service.record_unmapped_values(attribute, session)
                 written += len(list(self._database_service.unmapped_under(attribute)))
+            self._database_service.rebuild_unmapped_value_counts(
+                session, project_uid, batch_uid
+            )
             return written
 
     def verify_unmapped_values(
@@ -36,9 +36,11 @@ from slidetap.model import (
     ReviewIssue,
     ReviewIssueSource,
     ReviewQueueItem,
+    ReviewQueueSort,
     ReviewStatus,
 )
 from slidetap.services.database_service import DatabaseService
+from slidetap.services.operation_service import OperationProgress
 from slidetap.services.schema_service import SchemaService
 from slidetap.services.validation_service import ValidationService
 
@@ -145,8 +147,9 @@ class ReviewService:
         Settled rather than removed, as everywhere else: what was raised and
         answered is part of what happened to the case.
         """
-        for issue in list(self._database_service.get_review_issues(session, unit.uid)):
-            self._settle(session, issue)
+        self._settle(
+            session, *self._database_service.get_review_issues(session, unit.uid)
+        )
 
     def flag_for_review(
         self,
@@ -263,6 +266,11 @@ class ReviewService:
         dataset_uid: UUID,
         batch_uid: UUID | None = None,
         review_status: ReviewStatus | None = None,
+        identifier_filter: str | None = None,
+        sort: ReviewQueueSort = ReviewQueueSort.IDENTIFIER,
+        descending: bool = False,
+        start: int | None = None,
+        size: int | None = None,
     ) -> list[ReviewQueueItem]:
         """The items of a schema a reviewer works through, and where they stand.
 
@@ -270,47 +278,55 @@ class ReviewService:
         to look at something nothing flagged, and needs it in the same list to
         get to it.
 
-        Sorted by identifier so the queue is worked through in a stable order
-        rather than in whatever order the database returns.
+        Sorted by identifier unless asked otherwise, and by identifier within
+        any other order, so the queue is worked through in a stable order
+        rather than in whatever order the database returns. Paged, sorted and
+        filtered by the database, from what is kept written down of what is
+        open on each unit, so that a page of a queue of thousands of cases
+        reads a page of rows.
         """
-        with self._database_service.get_session() as session:
-            items = self._database_service.get_items(
+        with self._database_service.get_session(commit=False) as session:
+            return [
+                ReviewQueueItem(
+                    uid=row.uid,
+                    identifier=row.identifier,
+                    pseudonym=row.pseudonym,
+                    review_status=row.review_status,
+                    review_reasons=list(row.reasons or ()),
+                    last_saved=row.last_saved,
+                    open_issues=row.open_issues,
+                )
+                for row in self._database_service.get_review_queue(
+                    session,
+                    item_schema_uid,
+                    dataset_uid,
+                    batch_uid,
+                    review_status,
+                    identifier_filter,
+                    sort,
+                    descending,
+                    start,
+                    size,
+                )
+            ]
+
+    def get_review_queue_count(
+        self,
+        item_schema_uid: UUID,
+        dataset_uid: UUID,
+        batch_uid: UUID | None = None,
+        review_status: ReviewStatus | None = None,
+        identifier_filter: str | None = None,
+    ) -> int:
+        """How many entries the queue has with the same filters, for paging."""
+        with self._database_service.get_session(commit=False) as session:
+            return self._database_service.get_review_queue_count(
                 session,
-                self._schema_service.items[item_schema_uid],
+                item_schema_uid,
                 dataset_uid,
                 batch_uid,
-                review_status=review_status,
-            )
-            items = list(items)
-            open_issues = self._database_service.get_open_issues_on_units(
-                session, (item.uid for item in items)
-            )
-            return sorted(
-                (
-                    ReviewQueueItem(
-                        uid=item.uid,
-                        identifier=item.identifier,
-                        pseudonym=item.pseudonym,
-                        review_status=item.review_status,
-                        # Read from what is open rather than from a line
-                        # written on the unit when it was first flagged: that
-                        # line went on saying why a case was in the queue long
-                        # after the thing it named had been dealt with.
-                        review_reasons=list(
-                            open_issues[item.uid].reasons
-                            if item.uid in open_issues
-                            else ()
-                        ),
-                        last_saved=item.last_saved,
-                        open_issues=(
-                            open_issues[item.uid].count
-                            if item.uid in open_issues
-                            else 0
-                        ),
-                    )
-                    for item in items
-                ),
-                key=lambda item: item.identifier,
+                review_status,
+                identifier_filter,
             )
 
     def flag_invalid_review_units(
@@ -318,6 +334,7 @@ class ReviewService:
         dataset_uid: UUID,
         batch_uid: UUID | None = None,
         session: Session | None = None,
+        progress: OperationProgress | None = None,
     ) -> int:
         """Ask for review of every review unit holding something invalid, and
         return how many were flagged.
@@ -332,22 +349,82 @@ class ReviewService:
         What is found is raised as an issue on the item it is about, one open
         at a time per item, so running it twice adds nothing the first run did
         not and settling one item does not settle the rest.
+
+        Give ``progress`` to have it told about each issue as it is worded,
+        which is the part of the sweep that is done per item.
         """
         review_unit = self._schema_service.review_unit
         if review_unit is None:
             return 0
-        flagged = 0
         with self._database_service.get_session(session) as session:
-            units = self._database_service.get_items(
+            # Swept as a set rather than unit by unit: a batch holds its cases
+            # by the thousand, and walking each and asking after each item under
+            # it was a few statements per item, run again in full every time
+            # the sweep was. Only what is found not valid is read as items.
+            found = self._database_service.get_not_valid_under_units(
+                session, review_unit.schema_uid, dataset_uid, batch_uid
+            )
+            candidates = self._database_service.get_items_by_uid(
                 session,
-                self._schema_service.items[review_unit.schema_uid],
-                dataset_uid,
-                batch_uid,
+                (
+                    not_valid.item_uid
+                    for not_valid in found
+                    if not not_valid.raised or review_unit.completeness is not None
+                ),
+                load_attributes=True,
+            )
+            if review_unit.completeness is not None:
+                found = [
+                    not_valid
+                    for not_valid in found
+                    if not self._is_as_expected(
+                        candidates[not_valid.item_uid],
+                        self._completeness_expected_in(not_valid.batch_status),
+                        session,
+                    )
+                ]
+            # One issue per item, answered on the first unit it was found
+            # under, as raising it unit by unit did.
+            to_raise: dict[UUID, UUID] = {}
+            for not_valid in found:
+                if not not_valid.raised:
+                    to_raise.setdefault(not_valid.item_uid, not_valid.unit_uid)
+            if progress is not None:
+                progress.begin(len(to_raise))
+            issues: list[tuple[UUID, UUID, str]] = []
+            for item_uid, unit_uid in to_raise.items():
+                issues.append(
+                    (
+                        item_uid,
+                        unit_uid,
+                        self._not_valid_reason(candidates[item_uid], session),
+                    )
+                )
+                if progress is not None:
+                    progress.advance()
+            self._database_service.add_review_issues(
+                session, issues, ReviewIssueSource.VALIDATION
+            )
+            self._database_service.refresh_review_summaries(
+                session, {unit_uid for _, unit_uid, _ in issues}
             )
-            for unit in units:
-                if self._raise_on_invalid_under(unit, session):
-                    flagged += 1
-        return flagged
+            session.flush()
+            return len({not_valid.unit_uid for not_valid in found})
+
+    def _completeness_expected_in(
+        self, batch_status: BatchStatus | None
+    ) -> MetadataImportCompleteness | None:
+        """What the review unit's import leaves out, where a unit in a batch
+        standing at ``batch_status`` is still excused it."""
+        unit = self._schema_service.review_unit
+        if (
+            unit is None
+            or unit.completeness is None
+            or batch_status is None
+            or batch_status >= BatchStatus.IMAGE_PRE_PROCESSING_COMPLETE
+        ):
+            return None
+        return unit.completeness
 
     def _raise_on_invalid_under(self, unit: DatabaseItem, session: Session) -> bool:
         """Raise an issue on everything under ``unit`` that is not as valid as
@@ -450,6 +527,7 @@ class ReviewService:
             session, item, unit, reason, source
         )
         self.flag_for_review(unit.uid, session=session)
+        self._database_service.refresh_review_summaries(session, [unit.uid])
         session.flush()
         return issue.model
 
@@ -465,9 +543,9 @@ class ReviewService:
         expected to stand at this point in the batch's life.
 
         Reported as a crossing rather than as a state, since validation runs
-        over and over on items nothing has happened to: a remap validates an
-        item once per attribute, and an item that was already invalid before
-        the change has nothing new to say about it.
+        over and over on items nothing has happened to: a remap validates every
+        item it passes, and an item that was already invalid before the change
+        has nothing new to say about it.
 
         Parameters
         ----------
@@ -559,12 +637,12 @@ class ReviewService:
             if item is None:
                 return False
             unit = review_unit if review_unit is not None else self.review_unit_of(item)
-            for issue in list(
-                self._database_service.get_open_issues_for_item(
+            self._settle(
+                session,
+                *self._database_service.get_open_issues_for_item(
                     session, item.uid, ReviewIssueSource.VALIDATION
-                )
-            ):
-                self._settle(session, issue)
+                ),
+            )
             if unit is None:
                 return False
             return self.clear_flag_if_nothing_open(unit.uid, session=session)
@@ -734,15 +812,22 @@ class ReviewService:
             self.clear_flag_if_nothing_open(issue.review_unit_uid, session=session)
             return model
 
-    @staticmethod
-    def _settle(session: Session, issue: DatabaseReviewIssue) -> None:
-        """Mark an issue settled, keeping when it was settled the first time.
+    def _settle(self, session: Session, *issues: DatabaseReviewIssue) -> None:
+        """Mark issues settled, keeping when each was settled the first time,
+        and write down what is left open on the units they were answered on.
 
         Flushed, since what is open is asked of the database straight after and
         the session need not autoflush.
         """
-        if issue.resolved_at is None:
-            issue.resolved_at = datetime.now()
+        if not issues:
+            return
+        settled_at = datetime.now()
+        for issue in issues:
+            if issue.resolved_at is None:
+                issue.resolved_at = settled_at
+        self._database_service.refresh_review_summaries(
+            session, {issue.review_unit_uid for issue in issues}
+        )
         session.flush()
 
     def get_issues(
@@ -826,13 +911,9 @@ class ReviewService:
         # once that step has run: until the images are in, a reviewer can do
         # nothing about what they would have brought. An item with no batch
         # gives nothing to judge that by, and is held to plain validity.
-        expected_completeness = None
-        if (
-            unit.completeness is not None
-            and item.batch is not None
-            and item.batch.status < BatchStatus.IMAGE_PRE_PROCESSING_COMPLETE
-        ):
-            expected_completeness = unit.completeness
+        expected_completeness = self._completeness_expected_in(
+            item.batch.status if item.batch is not None else None
+        )
 
         issues = [
             NonValidItem(
@@ -0,0 +1,208 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""What is asked of the shape of a schema, answered once for all of it.
+
+Which schemas an item can hang under, which hang under it, how many parents of
+each kind it may have: these are asked while validating, creating and showing
+items, item by item, and were answered by walking the schema each time. The
+schema does not change while a process runs, so the answers are worked out for
+every item schema when it is loaded, and looking one up is what is left for the
+hot paths. `SchemaService` keeps the index of the schema it is given.
+"""
+
+import hashlib
+from collections.abc import Iterable, Mapping
+from itertools import chain
+from uuid import UUID
+
+from slidetap.model import (
+    AnnotationSchema,
+    AttributeSchema,
+    ImageSchema,
+    ItemSchema,
+    ListAttributeSchema,
+    ObjectAttributeSchema,
+    ObservationSchema,
+    RootSchema,
+    SampleSchema,
+    UnionAttributeSchema,
+)
+from slidetap.model.base_model import FrozenBaseModel
+
+
+class SchemaIndex(FrozenBaseModel):
+    """Lookups derived from a root schema, by item schema.
+
+    A model rather than plain dicts so that it can be written out with
+    ``model_dump_json`` and read back with ``model_validate_json``: a process
+    can be given the index another one built, see
+    ``SchemaService.with_index``. The fingerprint of the schema it was built
+    from goes with it, so that an index is never used with another schema.
+    """
+
+    fingerprint: str
+    """Of the root schema the index was built from, see ``fingerprint_of``."""
+    ancestors: dict[UUID, frozenset[UUID]]
+    """The schemas an item of the schema can hang under at any depth, the
+    schema itself included."""
+    hierarchies: dict[UUID, tuple[UUID, ...]]
+    """The schema and everything under it, each above what hangs from it."""
+    parent_caps: dict[UUID, dict[UUID, int | None]]
+    """The parent schemas allowed, each with the most parents of it an item
+    may have, see ``SchemaService.parent_schema_caps``."""
+    orphan_relations: frozenset[tuple[UUID, UUID]]
+    """The image and sample schema of each orphan relation."""
+
+    @classmethod
+    def build(cls, root_schema: RootSchema) -> "SchemaIndex":
+        items: dict[UUID, ItemSchema] = {
+            schema.uid: schema
+            for schema in chain(
+                root_schema.samples.values(),
+                root_schema.images.values(),
+                root_schema.annotations.values(),
+                root_schema.observations.values(),
+            )
+        }
+        return cls(
+            fingerprint=cls.fingerprint_of(root_schema),
+            ancestors={uid: _ancestors(schema, items) for uid, schema in items.items()},
+            hierarchies={
+                uid: hierarchy(schema, items) for uid, schema in items.items()
+            },
+            parent_caps={uid: parent_caps(schema) for uid, schema in items.items()},
+            orphan_relations=frozenset(
+                (schema.uid, relation.sample_uid)
+                for schema in root_schema.images.values()
+                for relation in schema.samples
+                if relation.orphan
+            ),
+        )
+
+    @staticmethod
+    def fingerprint_of(root_schema: RootSchema) -> str:
+        return hashlib.sha256(root_schema.model_dump_json().encode()).hexdigest()
+
+
+def parent_caps(item_schema: ItemSchema) -> dict[UUID, int | None]:
+    """The parent schemas allowed for an item schema, each with its cap."""
+    if isinstance(item_schema, SampleSchema):
+        return {
+            relation.parent_uid: None if relation.parents.multiple else 1
+            for relation in item_schema.parents
+        }
+    if isinstance(item_schema, ImageSchema):
+        return {
+            relation.sample_uid: None if relation.samples.multiple else 1
+            for relation in item_schema.samples
+        }
+    if isinstance(item_schema, AnnotationSchema):
+        return {relation.image_uid: None for relation in item_schema.images}
+    if isinstance(item_schema, ObservationSchema):
+        return {
+            uid: None
+            for uid in chain(
+                (relation.sample_uid for relation in item_schema.samples),
+                (relation.image_uid for relation in item_schema.images),
+                (relation.annotation_uid for relation in item_schema.annotations),
+            )
+        }
+    return {}
+
+
+def recursive_attributes(schema: AttributeSchema) -> Iterable[AttributeSchema]:
+    """The attribute schema, and those nested in it at any depth."""
+    yield schema
+    if isinstance(schema, ListAttributeSchema):
+        yield from recursive_attributes(schema.attribute)
+    elif isinstance(schema, UnionAttributeSchema):
+        for attribute in schema.attributes:
+            yield from recursive_attributes(attribute)
+    elif isinstance(schema, ObjectAttributeSchema):
+        for attribute in schema.attributes.values():
+            yield from recursive_attributes(attribute)
+
+
+def _ancestors(schema: ItemSchema, items: Mapping[UUID, ItemSchema]) -> frozenset[UUID]:
+    """Walked up rather than marked on the way down, so that a schema naming a
+    parent the root does not have ends there. ``seen`` keeps a schema that can
+    hang under its own kind from being walked forever."""
+    seen: set[UUID] = set()
+    walking = [schema.uid]
+    while walking:
+        uid = walking.pop()
+        if uid in seen:
+            continue
+        seen.add(uid)
+        parent = items.get(uid)
+        if parent is not None:
+            walking.extend(_parent_schema_uids(parent))
+    return frozenset(uid for uid in seen if uid in items)
+
+
+def hierarchy(schema: ItemSchema, items: Mapping[UUID, ItemSchema]) -> tuple[UUID, ...]:
+    """The schema and everything under it of ``items``, each above what hangs
+    from it."""
+    # Keys of a dict rather than a set: both drop the repeats, only one keeps
+    # the order they were first met in.
+    seen: dict[UUID, None] = {}
+    _walk_hierarchy(schema, items, seen)
+    return tuple(seen)
+
+
+def _walk_hierarchy(
+    schema: ItemSchema, items: Mapping[UUID, ItemSchema], seen: dict[UUID, None]
+) -> None:
+    """Add the schema and everything under it to `seen`, in that order.
+
+    Carried between the levels rather than merged after each: a schema that
+    can hold its own kind would otherwise be walked forever.
+    """
+    if schema.uid in seen:
+        return
+    seen[schema.uid] = None
+    for child_uid in _child_schema_uids(schema):
+        child = items.get(child_uid)
+        if child is not None:
+            _walk_hierarchy(child, items, seen)
+
+
+def _parent_schema_uids(schema: ItemSchema) -> Iterable[UUID]:
+    """The schemas an item of this schema can hang under."""
+    if isinstance(schema, SampleSchema):
+        return (relation.parent_uid for relation in schema.parents)
+    if isinstance(schema, ImageSchema):
+        return (relation.sample_uid for relation in schema.samples)
+    if isinstance(schema, AnnotationSchema):
+        return (relation.image_uid for relation in schema.images)
+    if isinstance(schema, ObservationSchema):
+        return chain(
+            (relation.sample_uid for relation in schema.samples),
+            (relation.image_uid for relation in schema.images),
+            (relation.annotation_uid for relation in schema.annotations),
+        )
+    return ()
+
+
+def _child_schema_uids(schema: ItemSchema) -> Iterable[UUID]:
+    """The schemas an item of this schema can have hanging under it."""
+    if isinstance(schema, SampleSchema):
+        return chain(
+            (relation.child_uid for relation in schema.children),
+            (relation.image_uid for relation in schema.images),
+        )
+    if isinstance(schema, ImageSchema):
+        return (relation.annotation_uid for relation in schema.annotations)
+    return ()
@@ -29,8 +29,6 @@ from slidetap.model import (
     ImagesLayout,
     ImagesPanelLayout,
     ItemSchema,
-    ListAttributeSchema,
-    ObjectAttributeSchema,
     ObservationSchema,
     OverviewLayout,
     OverviewPanelLayout,
@@ -38,18 +36,59 @@ from slidetap.model import (
     ReviewUnitSchema,
     RootSchema,
     SampleSchema,
-    UnionAttributeSchema,
 )
 from slidetap.model.schema.review_layout import AnyReviewPanelLayout
+from slidetap.services.schema_index import (
+    SchemaIndex,
+    hierarchy,
+    parent_caps,
+    recursive_attributes,
+)
+from slidetap.services.validators.attribute_validator import (
+    AttributeValidator,
+    CompiledValidator,
+)
 
 
 class SchemaService:
     """Schema service should be used to interface with schemas."""
 
     def __init__(self, root_schema: RootSchema):
+        self._setup(root_schema, SchemaIndex.build(root_schema))
+
+    @classmethod
+    def with_index(cls, root_schema: RootSchema, index: SchemaIndex) -> "SchemaService":
+        """A service for the schema, with an index built for it before.
+
+        Parameters
+        ----------
+        root_schema: RootSchema
+            The schema to serve.
+        index: SchemaIndex
+            The index built for the schema, as read back from what
+            ``SchemaService.index`` was written out as.
+
+        Raises
+        ------
+        ValueError
+            If the index was built from another schema.
+        """
+        if index.fingerprint != SchemaIndex.fingerprint_of(root_schema):
+            raise ValueError("The schema index was built from another schema.")
+        service = cls.__new__(cls)
+        service._setup(root_schema, index)
+        return service
+
+    def _setup(self, root_schema: RootSchema, index: SchemaIndex) -> None:
         self._root_schema = root_schema
+        self._index = index
         self._validate()
 
+    @property
+    def index(self) -> SchemaIndex:
+        """The lookups worked out from the schema when it was loaded."""
+        return self._index
+
     @property
     def root(self) -> RootSchema:
         return self._root_schema
@@ -86,6 +125,25 @@ class SchemaService:
             return self.private_attributes[attribute_schema_uid]
         raise ValueError(f"Attribute schema with UID {attribute_schema_uid} not found.")
 
+    def get_attribute_validator(self, attribute_schema_uid: UUID) -> CompiledValidator:
+        """The validator compiled for an attribute schema, public or private."""
+        return self.attribute_validators[attribute_schema_uid]
+
+    @cached_property
+    def attribute_validators(self) -> dict[UUID, CompiledValidator]:
+        """A validator for every attribute schema, compiled once.
+
+        Nested schemas are compiled with the schema they are in and again on
+        their own, since a nested attribute is also validated by itself once
+        it is edited.
+        """
+        return {
+            uid: AttributeValidator.compile(schema)
+            for uid, schema in chain(
+                self.private_attributes.items(), self.attributes.items()
+            )
+        }
+
     def get_item(self, item_schema_uid: UUID) -> ItemSchema:
         return self.items[item_schema_uid]
 
@@ -166,24 +224,24 @@ class SchemaService:
     def attributes(self) -> dict[UUID, AttributeSchema]:
         attributes: list[AttributeSchema] = []
         for schema in self.project.attributes.values():
-            attributes.extend(self._get_recursive_attributes(schema))
+            attributes.extend(recursive_attributes(schema))
         for schema in self.dataset.attributes.values():
-            attributes.extend(self._get_recursive_attributes(schema))
+            attributes.extend(recursive_attributes(schema))
         for item in self.items.values():
             for attribute in item.attributes.values():
-                attributes.extend(self._get_recursive_attributes(attribute))
+                attributes.extend(recursive_attributes(attribute))
         return {attribute.uid: attribute for attribute in attributes}
 
     @cached_property
     def attributes_by_name(self) -> dict[str, AttributeSchema]:
         attributes: list[AttributeSchema] = []
         for schema in self.project.attributes.values():
-            attributes.extend(self._get_recursive_attributes(schema))
+            attributes.extend(recursive_attributes(schema))
         for schema in self.dataset.attributes.values():
-            attributes.extend(self._get_recursive_attributes(schema))
+            attributes.extend(recursive_attributes(schema))
         for item in self.items.values():
             for attribute in item.attributes.values():
-                attributes.extend(self._get_recursive_attributes(attribute))
+                attributes.extend(recursive_attributes(attribute))
         return {attribute.name: attribute for attribute in attributes}
 
     @cached_property
@@ -249,28 +307,18 @@ class SchemaService:
         The structural single-parent constraint for Observation/Annotation
         (DB single FK) is the caller's concern.
         """
-        if isinstance(item_schema, SampleSchema):
-            return {
-                relation.parent_uid: None if relation.parents.multiple else 1
-                for relation in item_schema.parents
-            }
-        if isinstance(item_schema, ImageSchema):
-            return {
-                relation.sample_uid: None if relation.samples.multiple else 1
-                for relation in item_schema.samples
-            }
-        if isinstance(item_schema, AnnotationSchema):
-            return {relation.image_uid: None for relation in item_schema.images}
-        if isinstance(item_schema, ObservationSchema):
-            return (
-                {relation.sample_uid: None for relation in item_schema.samples}
-                | {relation.image_uid: None for relation in item_schema.images}
-                | {
-                    relation.annotation_uid: None
-                    for relation in item_schema.annotations
-                }
-            )
-        return {}
+        caps = self._index.parent_caps.get(item_schema.uid)
+        if caps is None:
+            # A schema the root does not have, as a test may ask about.
+            return parent_caps(item_schema)
+        return caps
+
+    def is_orphan_relation(
+        self, image_schema_uid: UUID, sample_schema_uid: UUID
+    ) -> bool:
+        """Whether images of the one schema hang under samples of the other by
+        an orphan relation."""
+        return (image_schema_uid, sample_schema_uid) in self._index.orphan_relations
 
     @property
     def review_unit(self) -> ReviewUnitSchema | None:
@@ -299,106 +347,29 @@ class SchemaService:
 
         Resolved by walking up to the review unit rather than by marking the
         way there, which would state a second time what the review unit
-        already states, and the two can disagree.
-
-        Done here rather than per item, so that it costs a lookup at runtime.
+        already states, and the two can disagree. The walking is done with the
+        rest of the index.
         """
         unit = self.review_unit
         if unit is None:
             return frozenset()
         return frozenset(
-            schema.uid
-            for schema in self.items.values()
-            if self._is_at_or_under(schema, unit.schema_uid)
+            uid
+            for uid, ancestors in self._index.ancestors.items()
+            if unit.schema_uid in ancestors
         )
 
-    def _is_at_or_under(self, schema: ItemSchema, unit_uid: UUID) -> bool:
-        """Whether ``schema`` is the review unit, or hangs under it.
-
-        A sample can have parents of several kinds, so the branches that lead
-        nowhere simply end, and ``seen`` keeps a cycle from walking forever.
-        """
-        seen: set[UUID] = set()
-        walking = [schema]
-        while walking:
-            item = walking.pop()
-            if item.uid == unit_uid:
-                return True
-            if item.uid in seen:
-                continue
-            seen.add(item.uid)
-            walking.extend(self.items[uid] for uid in self._parent_schema_uids(item))
-        return False
-
-    @staticmethod
-    def _parent_schema_uids(schema: ItemSchema) -> Iterable[UUID]:
-        """The schemas an item of this schema can hang under."""
-        if isinstance(schema, SampleSchema):
-            return (relation.parent_uid for relation in schema.parents)
-        if isinstance(schema, ImageSchema):
-            return (relation.sample_uid for relation in schema.samples)
-        if isinstance(schema, AnnotationSchema):
-            return (relation.image_uid for relation in schema.images)
-        if isinstance(schema, ObservationSchema):
-            return chain(
-                (relation.sample_uid for relation in schema.samples),
-                (relation.image_uid for relation in schema.images),
-                (relation.annotation_uid for relation in schema.annotations),
-            )
-        return ()
-
     def get_item_schema_hierarchy_recursive(self, schema: ItemSchema) -> list[UUID]:
         """The schema and everything under it, each above what hangs from it.
 
         Ordered rather than gathered: a list of schemas to pick from reads as
         the hierarchy it describes only if it is given in that order.
         """
-        # Keys of a dict rather than a set: both drop the repeats, only one
-        # keeps the order they were first met in.
-        schemas: dict[UUID, None] = {}
-        self._walk_schema_hierarchy(schema, schemas)
-        return list(schemas)
-
-    def _walk_schema_hierarchy(
-        self, schema: ItemSchema, seen: dict[UUID, None]
-    ) -> None:
-        """Add the schema and everything under it to `seen`, in that order.
-
-        Carried between the levels rather than merged after each: a schema that
-        can hold its own kind would otherwise be walked forever.
-        """
-        if schema.uid in seen:
-            return
-        seen[schema.uid] = None
-        for child_uid in self._child_schema_uids(schema):
-            child_schema = self.get_item(child_uid)
-            if child_schema is not None:
-                self._walk_schema_hierarchy(child_schema, seen)
-
-    @staticmethod
-    def _child_schema_uids(schema: ItemSchema) -> Iterable[UUID]:
-        """The schemas an item of this schema can have hanging under it."""
-        if isinstance(schema, SampleSchema):
-            return chain(
-                (relation.child_uid for relation in schema.children),
-                (relation.image_uid for relation in schema.images),
-            )
-        if isinstance(schema, ImageSchema):
-            return (relation.annotation_uid for relation in schema.annotations)
-        return ()
-
-    def _get_recursive_attributes(
-        self, schema: AttributeSchema
-    ) -> Iterable[AttributeSchema]:
-        yield schema
-        if isinstance(schema, ListAttributeSchema):
-            yield from self._get_recursive_attributes(schema.attribute)
-        elif isinstance(schema, UnionAttributeSchema):
-            for attribute in schema.attributes:
-                yield from self._get_recursive_attributes(attribute)
-        elif isinstance(schema, ObjectAttributeSchema):
-            for attribute in schema.attributes.values():
-                yield from self._get_recursive_attributes(attribute)
+        walked = self._index.hierarchies.get(schema.uid)
+        if walked is None:
+            # A schema the root does not have, as a test may ask about.
+            return list(hierarchy(schema, self.items))
+        return list(walked)
 
     def _validate(self):
         """Reject schemas where one UID resolves to two different attribute
@@ -41,7 +41,6 @@ from slidetap.model import (
 from slidetap.model.validation import NonValidItem
 from slidetap.services.database_service import DatabaseService
 from slidetap.services.schema_service import SchemaService
-from slidetap.services.validators.attribute_validator import AttributeValidator
 from slidetap.services.validators.relation_validator import RelationValidator
 
 
@@ -53,7 +52,6 @@ class ValidationService:
     ):
         self._schema_service = schema_service
         self._database_service = database_service
-        self._attribute_validator = AttributeValidator()
         self._relation_validator = RelationValidator(schema_service, database_service)
 
     def validate_item(self, item: UUID | Item | DatabaseItem, session: Session):
@@ -82,17 +80,19 @@ class ValidationService:
         Validating an item validates the other side of each of its relations
         too, so validating them one by one revisits the same neighbours once
         per relation that leads to them — quadratic in the size of the group,
-        and each visit writes ``valid_relations`` again. Here one pass is
-        shared, so every item the group reaches, whether it is in the group or
-        an older item related to one, is validated exactly once.
+        and each visit writes ``valid_relations`` again. Here the group is
+        validated as a set, from the links read for all of it at once, so every
+        item the group reaches, whether it is in the group or an older item
+        related to one, is validated exactly once.
 
         Only for items that are done being written. Anything validated while
         the rest of its relations are still arriving keeps the answer it had
         at the time.
         """
-        visited: set[UUID] = set()
-        for item in items:
-            self.validate_item_relations(item, session, visited=visited)
+        self._relation_validator.validate_relations_for(
+            (item.uid if isinstance(item, Item) else item for item in items),
+            session,
+        )
 
     def item_is_as_complete_as_expected(
         self,
@@ -222,8 +222,33 @@ class ValidationService:
         session: Session,
     ) -> bool:
         attribute = self._database_service.get_attribute(session, attribute)
-        attribute_schema = self._schema_service.get_attribute(attribute.schema_uid)
-        return self._attribute_validator.validate_attribute(attribute, attribute_schema)
+        validate = self._schema_service.get_attribute_validator(attribute.schema_uid)
+        return validate(attribute)
+
+    def validate_many(
+        self, attributes: Iterable[Attribute | DatabaseAttribute]
+    ) -> dict[UUID, bool]:
+        """Validate several attributes at once.
+
+        For a caller holding the attributes already, such as one storing a
+        group of them: nothing is looked up but the validator of each schema,
+        once for every attribute of it.
+
+        Parameters
+        ----------
+        attributes: Iterable[Attribute | DatabaseAttribute]
+            The attributes to validate. Each is set valid or not as it is.
+
+        Returns
+        -------
+        dict[UUID, bool]
+            Whether each attribute is valid, by the uid of the attribute.
+        """
+        validators = self._schema_service.attribute_validators
+        return {
+            attribute.uid: validators[attribute.schema_uid](attribute)
+            for attribute in attributes
+        }
 
     def get_validation_for_project(
         self,
@@ -250,6 +275,21 @@ class ValidationService:
             batch = self._database_service.get_batch(session, batch)
             return self._get_validation_for_batch(batch, session)
 
+    def reconcile_validation_counts(self) -> int:
+        """Count again the selected and non-valid items of every batch, and
+        correct the counts the validation of a batch is answered from where
+        they have drifted.
+
+        Returns
+        -------
+        int
+            How many batches had their counts corrected.
+        """
+        with self._database_service.get_session() as session:
+            corrected = self._database_service.reconcile_batch_validations(session)
+            session.commit()
+            return corrected
+
     def _validate_item_attributes(self, item: DatabaseItem) -> bool | None:
         schema = self._schema_service.items[item.schema_uid]
         item.valid_attributes = all(
@@ -284,10 +324,9 @@ class ValidationService:
         attributes: Iterable[DatabaseAttribute],
         schemas: dict[str, AnyAttributeSchema],
     ) -> Iterable[bool]:
+        validators = self._schema_service.attribute_validators
         results: dict[str, bool] = {
-            attribute.tag: self._attribute_validator.validate_attribute(
-                attribute, schemas[attribute.tag]
-            )
+            attribute.tag: validators[schemas[attribute.tag].uid](attribute)
             for attribute in attributes
         }
         unhandled_tags = set(schemas.keys()) - set(results.keys())
@@ -323,22 +362,21 @@ class ValidationService:
     def _get_validation_for_batch(
         self, batch: DatabaseBatch, session: Session
     ) -> BatchValidation:
-        schemas = self._schema_service.items.values()
-        items = (
-            item
-            for schema in schemas
-            for item in self._database_service.get_items(
-                session, schema, batch=batch, selected=True
-            )
-        )
+        # Answered from the counts kept for the batch, so that the items are
+        # only read when there are non-valid ones to list. A batch without
+        # counts, from before they were kept, is counted once here.
+        validation = self._database_service.get_batch_validation(session, batch)
+        if validation is None:
+            self._database_service.reconcile_batch_validations(session, [batch.uid])
+            session.commit()
+            validation = self._database_service.get_batch_validation(session, batch)
+        if validation is not None and validation.non_valid_items == 0:
+            return BatchValidation(valid=True, uid=batch.uid, non_valid_items=[])
+        rows = self._database_service.get_non_valid_items(session, batch)
         non_valid_items = [
-            NonValidItem(
-                uid=item.uid, identifier=item.identifier, schema_uid=item.schema_uid
-            )
-            for item in items
-            if not item.valid
+            NonValidItem(uid=uid, identifier=identifier, schema_uid=schema_uid)
+            for uid, identifier, schema_uid in rows
         ]
-
         return BatchValidation(
             valid=len(non_valid_items) == 0,
             uid=batch.uid,
@@ -0,0 +1,153 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Validation of what a unit of work changed, once, when it is done."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from uuid import UUID
+from weakref import WeakKeyDictionary
+
+from sqlalchemy.orm import Session
+
+from slidetap.database import DatabaseItem
+from slidetap.services.review_service import ReviewService
+from slidetap.services.validation_service import ValidationService
+
+_active: WeakKeyDictionary[Session, "ValidationTracker"] = WeakKeyDictionary()
+"""The tracker open on each session, if any. Kept beside the session rather
+than in its `info`, so that a session standing in for one in a test works the
+same."""
+
+
+class ValidationTracker:
+    """The items a unit of work changed, validated and reported once at its
+    end.
+
+    Validating an item after every change to it is what a single edit wants,
+    and what a unit of work changing many things cannot afford: a remap
+    changing sixty attributes of an item validated all sixty after each, and
+    reported the item's validity as often. Here a change is only noted, and
+    when the unit of work is done each item it changed is validated once, its
+    relations are validated together with those of the others, and what that
+    did to its validity is reported once -- against what it was before the
+    first change, which is what a report is about.
+
+    Open one with `track`. A service changing an item inside one notes the
+    change with it rather than validating; the outermost `track` on a session
+    is the one that validates, so a service that tracks its own changes can be
+    called inside another that does.
+    """
+
+    def __init__(
+        self,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+    ):
+        self._validation_service = validation_service
+        self._review_service = review_service
+        self._session = session
+        self._items: dict[UUID, UUID | DatabaseItem] = {}
+        self._was_valid: dict[UUID, bool] = {}
+        self._attributes_changed: set[UUID] = set()
+        self._relations_changed: set[UUID] = set()
+        self._review_units: dict[UUID, DatabaseItem] = {}
+
+    @classmethod
+    @contextmanager
+    def track(
+        cls,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+    ) -> Iterator["ValidationTracker"]:
+        """Track what is changed in the session until the block is left.
+
+        Validates and reports once the block is left, unless it is left by an
+        exception, or unless a tracker was already open on the session, in
+        which case that one is given and validates when its own block is left.
+        """
+        active = _active.get(session)
+        if active is not None:
+            yield active
+            return
+        tracker = cls(validation_service, review_service, session)
+        _active[session] = tracker
+        try:
+            yield tracker
+        finally:
+            # Closed before flushing, so that what the flush calls validates
+            # for itself rather than noting it with a tracker that is done.
+            del _active[session]
+        tracker.flush()
+
+    def attributes_changed(self, item: UUID | DatabaseItem) -> None:
+        """Note that attributes of an item are changing or have changed.
+
+        Note it before the item is validated by anything else: what the item
+        was before is read from it the first time it is noted.
+        """
+        uid = self._note(item)
+        self._attributes_changed.add(uid)
+
+    def relations_changed(
+        self, item: UUID | DatabaseItem, review_unit: DatabaseItem | None = None
+    ) -> None:
+        """Note that relations of an item are changing or have changed, as
+        above.
+
+        A change of relations can detach the item from the unit it is reviewed
+        under, after which there is no telling what that was. Where the caller
+        read it before the change, the unit is given here, and what the item
+        comes to is reported against it.
+        """
+        uid = self._note(item)
+        self._relations_changed.add(uid)
+        if review_unit is not None:
+            self._review_units.setdefault(uid, review_unit)
+
+    def flush(self) -> None:
+        """Validate what was changed and report what that did, and start
+        over."""
+        for uid in self._attributes_changed:
+            self._validation_service.validate_item_attributes(
+                self._items[uid], self._session
+            )
+        if self._relations_changed:
+            self._validation_service.validate_relations_for(
+                [self._items[uid] for uid in self._relations_changed], self._session
+            )
+        for uid, item in self._items.items():
+            self._review_service.item_validity_changed(
+                uid,
+                self._was_valid[uid],
+                self._validation_service.item_is_valid_for_now(item, self._session),
+                review_unit=self._review_units.get(uid),
+                session=self._session,
+            )
+        self._items.clear()
+        self._was_valid.clear()
+        self._review_units.clear()
+        self._attributes_changed.clear()
+        self._relations_changed.clear()
+
+    def _note(self, item: UUID | DatabaseItem) -> UUID:
+        uid = item if isinstance(item, UUID) else item.uid
+        if uid not in self._items:
+            self._items[uid] = item
+            self._was_valid[uid] = self._validation_service.item_is_valid_for_now(
+                item, self._session
+            )
+        return uid
@@ -11,7 +11,18 @@
 #    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
+"""Validation of attributes against their schemas.
 
+A schema is compiled into a validator once, and the validator is what is
+called for each attribute: everything about the schema that does not depend on
+the value -- which kind it is, its allowed values and units, its ranges, the
+validators of the attributes nested in it -- is settled when compiling rather
+than found out again for every value. `SchemaService` keeps the validator of
+each attribute schema it has.
+"""
+
+from collections.abc import Callable, Mapping
+from typing import Any
 
 from slidetap.database.attribute import (
     DatabaseAttribute,
@@ -51,220 +62,270 @@ from slidetap.model import (
     UnionAttributeSchema,
 )
 
+CompiledValidator = Callable[[Attribute | DatabaseAttribute], bool]
+"""Validates an attribute against the schema it was compiled from, setting
+and returning whether the attribute is valid."""
+
+_ValuedDatabaseAttribute = (
+    DatabaseStringAttribute
+    | DatabaseEnumAttribute
+    | DatabaseDatetimeAttribute
+    | DatabaseNumericAttribute
+    | DatabaseMeasurementAttribute
+    | DatabaseCodeAttribute
+    | DatabaseBooleanAttribute
+    | DatabaseObjectAttribute
+    | DatabaseListAttribute
+    | DatabaseUnionAttribute
+)
+"""The database attributes of each kind, which unlike their base carry a
+value."""
+
 
 class AttributeValidator:
     @classmethod
     def validate_attribute(
         cls, attribute: Attribute | DatabaseAttribute, schema: AttributeSchema
     ) -> bool:
-        if isinstance(
-            attribute, (StringAttribute, DatabaseStringAttribute)
-        ) and isinstance(schema, StringAttributeSchema):
-            return cls._validate_string_attribute(attribute, schema)
-        if isinstance(attribute, (EnumAttribute, DatabaseEnumAttribute)) and isinstance(
-            schema, EnumAttributeSchema
-        ):
-            return cls._validate_enum_attribute(attribute, schema)
-        if isinstance(
-            attribute, (DatetimeAttribute, DatabaseDatetimeAttribute)
-        ) and isinstance(schema, DatetimeAttributeSchema):
-            return cls._validate_datetime_attribute(attribute, schema)
-        if isinstance(
-            attribute, (NumericAttribute, DatabaseNumericAttribute)
-        ) and isinstance(schema, NumericAttributeSchema):
-            return cls._validate_numeric_attribute(attribute, schema)
-        if isinstance(
-            attribute, (MeasurementAttribute, DatabaseMeasurementAttribute)
-        ) and isinstance(schema, MeasurementAttributeSchema):
-            return cls._validate_measurement_attribute(attribute, schema)
-        if isinstance(attribute, (CodeAttribute, DatabaseCodeAttribute)) and isinstance(
-            schema, CodeAttributeSchema
-        ):
-            return cls._validate_code_attribute(attribute, schema)
-        if isinstance(
-            attribute, (BooleanAttribute, DatabaseBooleanAttribute)
-        ) and isinstance(schema, BooleanAttributeSchema):
-            return cls._validate_boolean_attribute(attribute, schema)
-        if isinstance(
-            attribute, (ObjectAttribute, DatabaseObjectAttribute)
-        ) and isinstance(schema, ObjectAttributeSchema):
-            return cls._validate_object_attribute(attribute, schema)
-        if isinstance(attribute, (ListAttribute, DatabaseListAttribute)) and isinstance(
-            schema, ListAttributeSchema
-        ):
-            return cls._validate_list_attribute(attribute, schema)
-        if isinstance(
-            attribute, (UnionAttribute, DatabaseUnionAttribute)
-        ) and isinstance(schema, UnionAttributeSchema):
-            return cls._validate_union_attribute(attribute, schema)
-        raise ValueError(
-            f"Attribute {attribute, schema} is not a valid attribute type."
-        )
+        """Validate an attribute against a schema once.
 
-    @classmethod
-    def _validate_string_attribute(
-        cls,
-        attribute: StringAttribute | DatabaseStringAttribute,
-        schema: StringAttributeSchema,
-    ) -> bool:
-        attribute.valid = (
-            attribute.value is not None and attribute.value != ""
-        ) or schema.optional
-        return attribute.valid
+        Compiles the schema for this one call. For a schema whose attributes
+        are validated again and again, use the validator `SchemaService`
+        compiled for it.
+        """
+        return cls.compile(schema)(attribute)
 
     @classmethod
-    def _validate_enum_attribute(
-        cls,
-        attribute: EnumAttribute | DatabaseEnumAttribute,
-        schema: EnumAttributeSchema,
-    ):
-        attribute.valid = (
-            (
-                attribute.value is not None
-                and attribute.value != ""
-                and attribute.value in schema.allowed_values
+    def compile(cls, schema: AttributeSchema) -> CompiledValidator:
+        """Compile a schema into a validator of its attributes.
+
+        Parameters
+        ----------
+        schema: AttributeSchema
+            The schema to validate against. Schemas nested in it are compiled
+            with it.
+
+        Returns
+        -------
+        CompiledValidator
+            Validates an attribute of the kind of the schema, and raises
+            ValueError for an attribute of any other kind.
+        """
+        if isinstance(schema, StringAttributeSchema):
+            return cls._compiled(
+                schema,
+                (StringAttribute, DatabaseStringAttribute),
+                cls._string_check(schema),
             )
-            or attribute.value is None
-            and schema.optional
-        )
-        return attribute.valid
+        if isinstance(schema, EnumAttributeSchema):
+            return cls._compiled(
+                schema, (EnumAttribute, DatabaseEnumAttribute), cls._enum_check(schema)
+            )
+        if isinstance(schema, DatetimeAttributeSchema):
+            return cls._compiled(
+                schema,
+                (DatetimeAttribute, DatabaseDatetimeAttribute),
+                cls._datetime_check(schema),
+            )
+        if isinstance(schema, NumericAttributeSchema):
+            return cls._compiled(
+                schema,
+                (NumericAttribute, DatabaseNumericAttribute),
+                cls._numeric_check(schema),
+            )
+        if isinstance(schema, MeasurementAttributeSchema):
+            return cls._compiled(
+                schema,
+                (MeasurementAttribute, DatabaseMeasurementAttribute),
+                cls._measurement_check(schema),
+            )
+        if isinstance(schema, CodeAttributeSchema):
+            return cls._compiled(
+                schema, (CodeAttribute, DatabaseCodeAttribute), cls._code_check(schema)
+            )
+        if isinstance(schema, BooleanAttributeSchema):
+            return cls._compiled(
+                schema,
+                (BooleanAttribute, DatabaseBooleanAttribute),
+                cls._boolean_check(schema),
+            )
+        if isinstance(schema, ObjectAttributeSchema):
+            return cls._compiled(
+                schema,
+                (ObjectAttribute, DatabaseObjectAttribute),
+                cls._object_check(schema),
+            )
+        if isinstance(schema, ListAttributeSchema):
+            return cls._compiled(
+                schema, (ListAttribute, DatabaseListAttribute), cls._list_check(schema)
+            )
+        if isinstance(schema, UnionAttributeSchema):
+            return cls._compiled(
+                schema,
+                (UnionAttribute, DatabaseUnionAttribute),
+                cls._union_check(schema),
+            )
+        raise ValueError(f"Schema {schema} is not a valid attribute schema.")
 
-    @classmethod
-    def _validate_datetime_attribute(
-        cls,
-        attribute: DatetimeAttribute | DatabaseDatetimeAttribute,
-        schema: DatetimeAttributeSchema,
-    ):
-        attribute.valid = attribute.value is not None or schema.optional
-        return attribute.valid
+    @staticmethod
+    def _compiled(
+        schema: AttributeSchema,
+        kinds: tuple[type[Attribute], type[_ValuedDatabaseAttribute]],
+        check: Callable[[Any], bool],
+    ) -> CompiledValidator:
+        """A validator that sets the attribute valid by what `check` says of
+        its value."""
 
-    @classmethod
-    def _validate_numeric_attribute(
-        cls,
-        attribute: NumericAttribute | DatabaseNumericAttribute,
-        schema: NumericAttributeSchema,
-    ):
-        if attribute.value is None:
-            valid = schema.optional
-        else:
-            if (
-                schema.min_value is not None
-                and attribute.value < schema.min_value
-                or schema.max_value is not None
-                and attribute.value > schema.max_value
-            ):
-                valid = False
-            else:
-                if schema.is_integer and int(attribute.value) != attribute.value:
-                    valid = False
-                valid = True
-        attribute.valid = valid
-        return attribute.valid
+        def validate(attribute: Attribute | DatabaseAttribute) -> bool:
+            if not isinstance(attribute, kinds):
+                raise ValueError(
+                    f"Attribute {attribute, schema} is not a valid attribute type."
+                )
+            valid = check(attribute.value)
+            attribute.valid = valid
+            return valid
 
-    @classmethod
-    def _validate_measurement_attribute(
-        cls,
-        attribute: MeasurementAttribute | DatabaseMeasurementAttribute,
+        return validate
+
+    @staticmethod
+    def _string_check(schema: StringAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        return lambda value: (value is not None and value != "") or optional
+
+    @staticmethod
+    def _enum_check(schema: EnumAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        allowed = frozenset(schema.allowed_values)
+
+        def check(value: Any) -> bool:
+            if value is None:
+                return optional
+            return value != "" and value in allowed
+
+        return check
+
+    @staticmethod
+    def _datetime_check(schema: DatetimeAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        return lambda value: value is not None or optional
+
+    @staticmethod
+    def _numeric_check(schema: NumericAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        min_value = schema.min_value
+        max_value = schema.max_value
+        is_integer = schema.is_integer
+
+        def check(value: Any) -> bool:
+            if value is None:
+                return optional
+            if min_value is not None and value < min_value:
+                return False
+            if max_value is not None and value > max_value:
+                return False
+            return not is_integer or int(value) == value
+
+        return check
+
+    @staticmethod
+    def _measurement_check(
         schema: MeasurementAttributeSchema,
-    ):
-        if attribute.value is None:
-            valid = schema.optional
-        else:
-            valid_unit = (
-                schema.allowed_units is None
-                or attribute.value.unit in schema.allowed_units
-            )
-            valid_value = (
-                schema.min_value is None or attribute.value.value >= schema.min_value
-            ) and (
-                schema.max_value is None or attribute.value.value <= schema.max_value
-            )
-            valid = valid_unit and valid_value
-        attribute.valid = valid
-        return attribute.valid
+    ) -> Callable[[Any], bool]:
+        optional = schema.optional
+        min_value = schema.min_value
+        max_value = schema.max_value
+        allowed_units = (
+            frozenset(schema.allowed_units)
+            if schema.allowed_units is not None
+            else None
+        )
 
-    @classmethod
-    def _validate_code_attribute(
-        cls,
-        attribute: CodeAttribute | DatabaseCodeAttribute,
-        schema: CodeAttributeSchema,
-    ):
-        attribute.valid = (
-            attribute.value is not None
-            and (
-                schema.allowed_schemas is None
-                or attribute.value.scheme in schema.allowed_schemas
-            )
-        ) or (attribute.value is None and schema.optional)
-        return attribute.valid
+        def check(value: Any) -> bool:
+            if value is None:
+                return optional
+            if allowed_units is not None and value.unit not in allowed_units:
+                return False
+            if min_value is not None and value.value < min_value:
+                return False
+            return max_value is None or value.value <= max_value
 
-    @classmethod
-    def _validate_boolean_attribute(
-        cls,
-        attribute: BooleanAttribute | DatabaseBooleanAttribute,
-        schema: BooleanAttributeSchema,
-    ):
-        valid = schema.optional if attribute.value is None else True
-        attribute.valid = valid
-        return attribute.valid
+        return check
 
-    @classmethod
-    def _validate_object_attribute(
-        cls,
-        attribute: ObjectAttribute | DatabaseObjectAttribute,
-        schema: ObjectAttributeSchema,
-    ):
-        if attribute.value is None or len(attribute.value) == 0:
-            valid = schema.optional
-        else:
-            validations: list[bool] = []
-            for tag, attribute_schema in schema.attributes.items():
-                if tag not in attribute.value:
-                    validations.append(attribute_schema.optional)
-                else:
-                    attribute_validation = cls.validate_attribute(
-                        attribute.value[tag], attribute_schema
-                    )
-                    validations.append(attribute_validation)
-            valid = all(validations)
-        attribute.valid = valid
-        return attribute.valid
+    @staticmethod
+    def _code_check(schema: CodeAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        allowed_schemas = (
+            frozenset(schema.allowed_schemas)
+            if schema.allowed_schemas is not None
+            else None
+        )
+
+        def check(value: Any) -> bool:
+            if value is None:
+                return optional
+            return allowed_schemas is None or value.scheme in allowed_schemas
+
+        return check
+
+    @staticmethod
+    def _boolean_check(schema: BooleanAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        return lambda value: optional if value is None else True
 
     @classmethod
-    def _validate_list_attribute(
-        cls,
-        attribute: ListAttribute | DatabaseListAttribute,
-        schema: ListAttributeSchema,
-    ):
-        if attribute.value is None or len(attribute.value) == 0:
-            valid = schema.optional
-        else:
-            valid_count = (
-                schema.min_items is None or len(attribute.value) >= schema.min_items
-            ) and (schema.max_items is None or len(attribute.value) <= schema.max_items)
+    def _object_check(cls, schema: ObjectAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        validators: Mapping[str, CompiledValidator] = {
+            tag: cls.compile(attribute) for tag, attribute in schema.attributes.items()
+        }
+        # Those that are not there count as valid only if they can be left out.
+        missing_are_valid: Mapping[str, bool] = {
+            tag: attribute.optional for tag, attribute in schema.attributes.items()
+        }
+
+        def check(value: Any) -> bool:
+            if value is None or len(value) == 0:
+                return optional
+            # Every nested attribute is validated, not only up to the first
+            # that is not valid: each one's own `valid` is set on the way.
             validations = [
-                cls.validate_attribute(value, schema.attribute)
-                for value in attribute.value
+                validate(value[tag]) if tag in value else missing_are_valid[tag]
+                for tag, validate in validators.items()
             ]
-            valid = valid_count and all(validations)
-        attribute.valid = valid
-        return attribute.valid
+            return all(validations)
+
+        return check
 
     @classmethod
-    def _validate_union_attribute(
-        cls,
-        attribute: UnionAttribute | DatabaseUnionAttribute,
-        schema: UnionAttributeSchema,
-    ):
-        if attribute.value is None:
-            attribute.valid = schema.optional
-        else:
-            attribute.valid = cls.validate_attribute(
-                attribute.value,
-                next(
-                    schema
-                    for schema in schema.attributes
-                    if schema.uid == attribute.value.schema_uid
-                ),
+    def _list_check(cls, schema: ListAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        min_items = schema.min_items
+        max_items = schema.max_items
+        validate = cls.compile(schema.attribute)
+
+        def check(value: Any) -> bool:
+            if value is None or len(value) == 0:
+                return optional
+            valid_count = (min_items is None or len(value) >= min_items) and (
+                max_items is None or len(value) <= max_items
             )
-        return attribute.valid
+            validations = [validate(item) for item in value]
+            return valid_count and all(validations)
+
+        return check
+
+    @classmethod
+    def _union_check(cls, schema: UnionAttributeSchema) -> Callable[[Any], bool]:
+        optional = schema.optional
+        validators: Mapping[Any, CompiledValidator] = {
+            attribute.uid: cls.compile(attribute) for attribute in schema.attributes
+        }
+
+        def check(value: Any) -> bool:
+            if value is None:
+                return optional
+            validate = validators.get(value.schema_uid)
+            # A value of none of the kinds the union is of is not valid.
+            return validate is not None and validate(value)
+
+        return check
@@ -13,9 +13,12 @@
 #    limitations under the License.
 
 import logging
-from typing import NamedTuple
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from typing import Any, NamedTuple
 from uuid import UUID
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
 from slidetap.database import (
@@ -25,6 +28,12 @@ from slidetap.database import (
     DatabaseObservation,
     DatabaseSample,
 )
+from slidetap.model import (
+    ImageSchema,
+    ItemValueType,
+    ObservationSchema,
+    SampleSchema,
+)
 from slidetap.services.database_service import DatabaseService
 from slidetap.services.schema_service import SchemaService
 
@@ -43,6 +52,12 @@ class RelationResult(NamedTuple):
     """Whether the item holds what the relation asks of it."""
 
 
+_Related = DatabaseItem[Any] | Row[Any]
+"""What a relation is counted from of the item at its other end, whether that
+is a loaded item or a row read for a batch: its ``schema_uid`` and whether it
+is ``selected``."""
+
+
 class RelationValidator:
     def __init__(
         self, schema_service: SchemaService, database_service: DatabaseService
@@ -84,6 +99,98 @@ class RelationValidator:
             return self._validate_sample_relations(session, item, visited=visited)
         raise ValueError(f"Item {item} is not a valid item type.")
 
+    def validate_relations_for(
+        self, items: Iterable[UUID | DatabaseItem], session: Session
+    ) -> dict[UUID, bool]:
+        """Recompute and store ``valid_relations`` for a group of items and the
+        other side of each relation they hold, as a set.
+
+        What :py:meth:`validate_item_relations` does item by item, following
+        relationships, is here done from the links themselves: those touching
+        the group and those touching what is on their other side are read in
+        two queries, what counts of the items at their ends in one more, each
+        item's relations are counted from those, and what changed is written
+        back in a statement per value. An import of a case with its blocks,
+        slides and images was otherwise a load per item and kind of link, and
+        the same neighbour was loaded again for each relation leading to it.
+
+        Only for items that are done being written, as with a shared
+        ``visited``: the group is flushed and read as it then stands.
+
+        Returns
+        -------
+        dict[UUID, bool]
+            The relations of every item validated, the group and what is on
+            the other side of it.
+        """
+        uids = {item if isinstance(item, UUID) else item.uid for item in items}
+        if not uids:
+            return {}
+        session.flush()
+        edges = self._database_service.get_edges_touching(session, uids)
+        validated = uids | {uid for edge in edges for uid in edge}
+        edges |= self._database_service.get_edges_touching(session, validated - uids)
+        rows = self._database_service.get_relation_rows(
+            session, validated | {uid for edge in edges for uid in edge}
+        )
+        parents: defaultdict[UUID, list[UUID]] = defaultdict(list)
+        children: defaultdict[UUID, list[UUID]] = defaultdict(list)
+        for parent_uid, child_uid in edges:
+            parents[child_uid].append(parent_uid)
+            children[parent_uid].append(child_uid)
+
+        def related(of: list[UUID], kind: ItemValueType) -> list[Row[Any]]:
+            return [rows[uid] for uid in of if rows[uid].item_value_type == kind]
+
+        valid_relations: dict[UUID, bool] = {}
+        for uid in validated:
+            row = rows.get(uid)
+            if row is None:
+                continue
+            if row.item_value_type == ItemValueType.SAMPLE:
+                results = self._sample_results(
+                    self._schema_service.samples[row.schema_uid],
+                    self._count_selected(related(children[uid], ItemValueType.SAMPLE)),
+                    self._count_selected(related(parents[uid], ItemValueType.SAMPLE)),
+                    self._count_selected(related(children[uid], ItemValueType.IMAGE)),
+                )
+                valid = all(result.satisfied for result in results)
+            elif row.item_value_type == ItemValueType.IMAGE:
+                results = self._image_results(
+                    self._schema_service.images[row.schema_uid],
+                    self._count_selected(related(parents[uid], ItemValueType.SAMPLE)),
+                )
+                valid = all(result.satisfied for result in results)
+            elif row.item_value_type == ItemValueType.ANNOTATION:
+                valid = any(
+                    image.selected
+                    for image in related(parents[uid], ItemValueType.IMAGE)
+                )
+            else:
+                valid = (
+                    self._observation_subject(
+                        uid,
+                        self._schema_service.observations[row.schema_uid],
+                        next(iter(related(parents[uid], ItemValueType.IMAGE)), None),
+                        next(iter(related(parents[uid], ItemValueType.SAMPLE)), None),
+                        next(
+                            iter(related(parents[uid], ItemValueType.ANNOTATION)),
+                            None,
+                        ),
+                    )
+                    is not None
+                )
+            valid_relations[uid] = valid
+        self._database_service.set_valid_relations(
+            session,
+            {
+                uid: valid
+                for uid, valid in valid_relations.items()
+                if rows[uid].valid_relations != valid
+            },
+        )
+        return valid_relations
+
     @staticmethod
     def _already_visited(item: DatabaseItem, visited: set[UUID] | None) -> bool:
         """Whether this pass has validated the item already, marking it as
@@ -132,100 +239,87 @@ class RelationValidator:
     ) -> bool:
         if self._already_visited(observation, visited):
             return bool(observation.valid_relations)
-        relation = None
         schema = self._schema_service.observations[observation.schema_uid]
-        self._logger.debug(
-            f"Validating relations for observation {observation.uid} "
-            f"of schema {observation.schema_uid} with name {schema.name}."
+        subject = self._observation_subject(
+            observation.uid,
+            schema,
+            observation.image,
+            observation.sample,
+            observation.annotation,
         )
-        if observation.image is not None and observation.image.selected:
-            self._logger.debug(
-                f"Valid relation for observation {observation.uid} "
-                f"to image {observation.image.uid}."
-            )
-            try:
-                relation = next(
-                    relation
-                    for relation in schema.images
-                    if relation.image_uid == observation.image.schema_uid
-                )
-            except StopIteration as exception:
-                schema_image_uids = [image.image_uid for image in schema.images]
-                raise ValueError(
-                    f"Observation {observation.uid} is on an image with schema "
-                    f"{observation.image.schema_uid} that is not in the "
-                    f"observation schema: {schema_image_uids}."
-                ) from exception
-            if other_side:
-                self._logger.debug(
-                    f"Validation relations for image {observation.image.uid} "
-                    f"as other side of observation {observation.uid}."
-                )
+        if other_side:
+            # The subject is always one the observation has; checked again
+            # only so that what is passed on is known not to be None.
+            if subject == ItemValueType.IMAGE and observation.image is not None:
                 self._validate_image_relations(
                     session, observation.image, other_side=False, visited=visited
                 )
-        elif observation.sample is not None and observation.sample.selected:
-            self._logger.debug(
-                f"Valid relation for observation {observation.uid} "
-                f"to sample {observation.sample.uid}."
-            )
-            try:
-                relation = next(
-                    relation
-                    for relation in schema.samples
-                    if relation.sample_uid == observation.sample.schema_uid
-                )
-            except StopIteration as exception:
-                schema_sample_uids = [sample.sample_uid for sample in schema.samples]
-                raise ValueError(
-                    f"Observation {observation.uid} is on a sample with schema "
-                    f"{observation.sample.schema_uid} that is not in the "
-                    f"observation schema: {schema_sample_uids}."
-                ) from exception
-            if other_side:
-                self._logger.debug(
-                    f"Validation relations for sample {observation.sample.uid} "
-                    f"as other side of observation {observation.uid}."
-                )
+            elif subject == ItemValueType.SAMPLE and observation.sample is not None:
                 self._validate_sample_relations(
                     session, observation.sample, other_side=False, visited=visited
                 )
+            elif (
+                subject == ItemValueType.ANNOTATION
+                and observation.annotation is not None
+            ):
+                self._validate_annotation_relations(
+                    session, observation.annotation, other_side=False, visited=visited
+                )
+        observation.valid_relations = subject is not None
+        self._logger.debug(
+            f"Relations for observation {observation.uid}: "
+            f"{'valid' if observation.valid_relations else 'invalid'}."
+        )
+        return observation.valid_relations
 
-        elif observation.annotation is not None and observation.annotation.selected:
-            self._logger.debug(
-                f"Valid relation for observation {observation.uid} "
-                f"to annotation {observation.annotation.uid}."
-            )
-            try:
-                relation = next(
-                    relation
-                    for relation in schema.annotations
-                    if relation.annotation_uid == observation.annotation.schema_uid
+    @staticmethod
+    def _observation_subject(
+        observation_uid: UUID,
+        schema: ObservationSchema,
+        image: _Related | None,
+        sample: _Related | None,
+        annotation: _Related | None,
+    ) -> ItemValueType | None:
+        """What an observation counts as being on: the first of its image, its
+        sample and its annotation that is selected, or None where none is.
+
+        Raises ValueError where that is of a schema the observation schema has
+        no relation to, which is the model being broken rather than the
+        observation being invalid.
+        """
+        if image is not None and image.selected:
+            if not any(
+                relation.image_uid == image.schema_uid for relation in schema.images
+            ):
+                raise ValueError(
+                    f"Observation {observation_uid} is on an image with schema "
+                    f"{image.schema_uid} that is not in the observation schema: "
+                    f"{[relation.image_uid for relation in schema.images]}."
                 )
-            except StopIteration as exception:
-                schema_annotation_uids = [
-                    annotation.annotation_uid for annotation in schema.annotations
-                ]
+            return ItemValueType.IMAGE
+        if sample is not None and sample.selected:
+            if not any(
+                relation.sample_uid == sample.schema_uid for relation in schema.samples
+            ):
                 raise ValueError(
-                    f"Observation {observation.uid} is on an annotation with "
-                    f"schema {observation.annotation.schema_uid} that is not in "
-                    f"the observation schema: {schema_annotation_uids}."
-                ) from exception
-            if other_side:
-                self._logger.debug(
-                    f"Validation relations for annotation "
-                    f"{observation.annotation.uid} as other side of observation "
-                    f"{observation.uid}."
+                    f"Observation {observation_uid} is on a sample with schema "
+                    f"{sample.schema_uid} that is not in the observation schema: "
+                    f"{[relation.sample_uid for relation in schema.samples]}."
                 )
-                self._validate_annotation_relations(
-                    session, observation.annotation, other_side=False, visited=visited
+            return ItemValueType.SAMPLE
+        if annotation is not None and annotation.selected:
+            if not any(
+                relation.annotation_uid == annotation.schema_uid
+                for relation in schema.annotations
+            ):
+                raise ValueError(
+                    f"Observation {observation_uid} is on an annotation with "
+                    f"schema {annotation.schema_uid} that is not in the "
+                    f"observation schema: "
+                    f"{[relation.annotation_uid for relation in schema.annotations]}."
                 )
-        if relation is not None:
-            observation.valid_relations = True
-        else:
-            self._logger.debug(f"No valid relation for observation {observation.uid}.")
-            observation.valid_relations = False
-        return observation.valid_relations
+            return ItemValueType.ANNOTATION
+        return None
 
     def relations_are_valid(
         self,
@@ -338,28 +432,9 @@ class RelationValidator:
         selected_samples = [
             sample for sample in (image.samples or []) if sample.selected
         ]
-        # Counted per relation rather than in one heap: an image may be allowed
-        # several samples of one schema and only one of another, and a sample of
-        # a schema the image schema does not relate to satisfies nothing.
-        # Orphan relations are skipped, so an image parked on one has nothing
-        # counted towards the samples it is required to have, and is invalid
-        # until it is moved to the sample it is actually of.
-        results = [
-            RelationResult(
-                relation.name,
-                relation.samples.allows(
-                    len(
-                        [
-                            sample
-                            for sample in selected_samples
-                            if sample.schema_uid == relation.sample_uid
-                        ]
-                    )
-                ),
-            )
-            for relation in schema.samples
-            if not relation.orphan and relation.uid not in non_complete_relations
-        ]
+        results = self._image_results(
+            schema, self._count_selected(selected_samples), non_complete_relations
+        )
         if other_side:
             self._logger.debug(
                 f"Validation relations for samples "
@@ -398,81 +473,114 @@ class RelationValidator:
         visited: set[UUID] | None = None,
     ) -> list[RelationResult]:
         schema = self._schema_service.samples[sample.schema_uid]
-        results: list[RelationResult] = []
-        for relation in schema.children:
-            if relation.uid in non_complete_relations:
-                continue
-            children_of_type = self._database_service.get_sample_children(
+        children: dict[UUID, set[DatabaseSample]] = {
+            relation.child_uid: self._database_service.get_sample_children(
                 session, sample, relation.child_uid
             )
-            selected_children_count = len(
-                [child for child in children_of_type if child.selected]
-            )
-            self._logger.debug(
-                f"Validating relation for sample {sample.uid} to children "
-                f"{[child.uid for child in children_of_type]}."
-            )
-            results.append(
-                RelationResult(
-                    relation.name, relation.children.allows(selected_children_count)
-                )
-            )
-            if other_side:
-                self._logger.debug(
-                    f"Validation relations for children "
-                    f"{[child.uid for child in children_of_type]} "
-                    f"as other side of sample {sample.uid}."
-                )
-                for child in children_of_type:
-                    self._validate_sample_relations(
-                        session, child, other_side=False, visited=visited
-                    )
-
-        for relation in schema.parents:
-            if relation.uid in non_complete_relations:
-                continue
-            parents_of_type = self._database_service.get_sample_parents(
+            for relation in schema.children
+            if relation.uid not in non_complete_relations
+        }
+        parents: dict[UUID, set[DatabaseSample]] = {
+            relation.parent_uid: self._database_service.get_sample_parents(
                 session, sample, relation.parent_uid
             )
-            selected_parent_count = len(
-                [parent for parent in parents_of_type if parent.selected]
+            for relation in schema.parents
+            if relation.uid not in non_complete_relations
+        }
+        images: dict[UUID, set[DatabaseImage]] = {
+            relation.image_uid: self._database_service.get_sample_images(
+                session, sample, relation.image_uid
             )
+            for relation in schema.images
+            if not relation.orphan and relation.uid not in non_complete_relations
+        }
+        results = self._sample_results(
+            schema,
+            self._count_selected(item for items in children.values() for item in items),
+            self._count_selected(item for items in parents.values() for item in items),
+            self._count_selected(item for items in images.values() for item in items),
+            non_complete_relations,
+        )
+        if other_side:
             self._logger.debug(
-                f"Validating relation for sample {sample.uid} to parents "
-                f"{[parent.uid for parent in parents_of_type]}."
-            )
-
-            results.append(
-                RelationResult(
-                    relation.name, relation.parents.allows(selected_parent_count)
-                )
+                f"Validation relations for children, parents and images of "
+                f"sample {sample.uid} as other side of it."
             )
-            if other_side:
-                self._logger.debug(
-                    f"Validation relations for parents "
-                    f"{[parent.uid for parent in parents_of_type]} "
-                    f"as other side of sample {sample.uid}."
-                )
-                for parent in parents_of_type:
+            for related in (*children.values(), *parents.values()):
+                for related_sample in related:
                     self._validate_sample_relations(
-                        session, parent, other_side=False, visited=visited
+                        session, related_sample, other_side=False, visited=visited
                     )
-        for relation in schema.images:
-            # An orphan relation says nothing about this sample: it is where
-            # images that belong elsewhere are parked, so holding one neither
-            # satisfies a requirement nor breaks one.
-            if relation.orphan or relation.uid in non_complete_relations:
-                continue
-            images_of_type = self._database_service.get_sample_images(
-                session, sample, relation.image_uid
-            )
-            selected_images = len([image for image in images_of_type if image.selected])
-            results.append(
-                RelationResult(relation.name, relation.images.allows(selected_images))
-            )
-            if other_side:
-                for image in images_of_type:
+            for related_images in images.values():
+                for image in related_images:
                     self._validate_image_relations(
                         session, image, other_side=False, visited=visited
                     )
         return results
+
+    @staticmethod
+    def _count_selected(related: Iterable[_Related]) -> Counter[UUID]:
+        """How many of the related items are selected, by schema."""
+        return Counter(item.schema_uid for item in related if item.selected)
+
+    @staticmethod
+    def _sample_results(
+        schema: SampleSchema,
+        children: Counter[UUID],
+        parents: Counter[UUID],
+        images: Counter[UUID],
+        non_complete_relations: frozenset[UUID] = frozenset(),
+    ) -> list[RelationResult]:
+        """Whether each of a sample's relations is satisfied, from how many of
+        its selected children, parents and images there are of each schema.
+
+        An orphan relation says nothing about the sample: it is where images
+        that belong elsewhere are parked, so holding one neither satisfies a
+        requirement nor breaks one.
+        """
+        results = [
+            RelationResult(
+                relation.name, relation.children.allows(children[relation.child_uid])
+            )
+            for relation in schema.children
+            if relation.uid not in non_complete_relations
+        ]
+        results.extend(
+            RelationResult(
+                relation.name, relation.parents.allows(parents[relation.parent_uid])
+            )
+            for relation in schema.parents
+            if relation.uid not in non_complete_relations
+        )
+        results.extend(
+            RelationResult(
+                relation.name, relation.images.allows(images[relation.image_uid])
+            )
+            for relation in schema.images
+            if not relation.orphan and relation.uid not in non_complete_relations
+        )
+        return results
+
+    @staticmethod
+    def _image_results(
+        schema: ImageSchema,
+        samples: Counter[UUID],
+        non_complete_relations: frozenset[UUID] = frozenset(),
+    ) -> list[RelationResult]:
+        """Whether each of an image's relations is satisfied, from how many of
+        its selected samples there are of each schema.
+
+        Counted per relation rather than in one heap: an image may be allowed
+        several samples of one schema and only one of another, and a sample of
+        a schema the image schema does not relate to satisfies nothing. Orphan
+        relations are skipped, so an image parked on one has nothing counted
+        towards the samples it is required to have, and is invalid until it is
+        moved to the sample it is actually of.
+        """
+        return [
+            RelationResult(
+                relation.name, relation.samples.allows(samples[relation.sample_uid])
+            )
+            for relation in schema.samples
+            if not relation.orphan and relation.uid not in non_complete_relations
+        ]
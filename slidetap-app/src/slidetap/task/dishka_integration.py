@@ -49,6 +49,8 @@ from dishka.entities.key import _FromComponent
 from procrastinate import App as TaskApp
 from procrastinate import Blueprint, JobContext
 
+from slidetap.profiling import PROFILER
+
 
 def _find_dishka_params(fn: Callable[..., Any]) -> list[tuple[str, type[Any]]]:
     """Return list of (param_name, service_type) for FromDishka-annotated args.
@@ -100,6 +102,9 @@ def dishka_task(
     When ``inject_task_id=True``, the wrapper passes ``str(context.job.id)``
     as the ``task_id`` parameter — useful for tasks that need a stable
     "who's currently holding this resource" marker.
+
+    Where profiling is configured, a sample of the calls is profiled, tagged
+    with the task name and the job id, see ``slidetap.profiling``.
     """
 
     def decorator(fn: Callable[..., Any]) -> Any:
@@ -131,14 +136,16 @@ def dishka_task(
             container = container_from_app(context.app)
             with container() as request_container:
                 resolved = _resolve(context, request_container)
-                return await fn(**kwargs, **resolved)
+                with PROFILER.profiling("task", name, _job_tag(context)):
+                    return await fn(**kwargs, **resolved)
 
         @functools.wraps(fn)
         def sync_wrapper(context: JobContext, **kwargs: Any) -> Any:
             container = container_from_app(context.app)
             with container() as request_container:
                 resolved = _resolve(context, request_container)
-                return fn(**kwargs, **resolved)
+                with PROFILER.profiling("task", name, _job_tag(context)):
+                    return fn(**kwargs, **resolved)
 
         wrapper = async_wrapper if inspect.iscoroutinefunction(fn) else sync_wrapper
 
@@ -156,6 +163,10 @@ def dishka_task(
     return decorator
 
 
+def _job_tag(context: JobContext) -> str:
+    return "unknown" if context.job.id is None else str(context.job.id)
+
+
 _CONTAINER_ATTR = "_slidetap_container"
 
 
@@ -21,9 +21,11 @@ from uuid import UUID
 
 from procrastinate import App as TaskApp
 from procrastinate.exceptions import AlreadyEnqueued
+from procrastinate.tasks import Task
 
-from slidetap.model import Batch, Image, Project
+from slidetap.model import Batch, Image, Operation, Project
 from slidetap.task.tasks import (
+    TaskQueue,
     download_and_pre_process_image,
     post_process_image,
     process_metadata_export,
@@ -31,7 +33,8 @@ from slidetap.task.tasks import (
     remap_batch_attributes,
     remap_dataset_attributes,
     retry_metadata_search_item,
-    store_batch_images_to_outbox,
+    run_operation,
+    store_image_to_outbox,
 )
 
 
@@ -44,6 +47,10 @@ class Scheduler:
     close the connector themselves.
     """
 
+    DEFER_CHUNK_SIZE = 1000
+    """How many jobs are deferred in one statement at most, so that a very
+    large batch is not one statement too large to send."""
+
     def __init__(self, app: TaskApp):
         self._app = app
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
@@ -57,10 +64,7 @@ class Scheduler:
         a job whose guard would just bail.
         """
         try:
-            for uid in image_uids:
-                await download_and_pre_process_image.configure(
-                    lock=f"image-{uid}",
-                ).defer_async(image_uid=str(uid))
+            await self._defer_per_image(download_and_pre_process_image, image_uids)
         except Exception:
             self._logger.error(
                 "Error deferring pre-process tasks",
@@ -90,10 +94,7 @@ class Scheduler:
         a given image at a time.
         """
         try:
-            for uid in image_uids:
-                await post_process_image.configure(
-                    lock=f"image-{uid}",
-                ).defer_async(image_uid=str(uid))
+            await self._defer_per_image(post_process_image, image_uids)
         except Exception:
             self._logger.error("Error deferring post-process tasks", exc_info=True)
 
@@ -127,20 +128,31 @@ class Scheduler:
                 f"Error exporting metadata for project {project.uid}", exc_info=True
             )
 
-    async def store_images_in_batch(self, batch: Batch):
-        """Defer outbox-move for a batch.
+    async def store_images(self, image_uids: Iterable[UUID]) -> None:
+        """Defer the outbox move for each image.
 
-        ``lock=f"store-{batch_uid}"`` serialises the outbox move per batch.
+        Each task takes ``lock=f"image-{uid}"`` so at most one task touches
+        a given image at a time, and the images of a batch are stored as many
+        at a time as there are workers for the image queue. The task storing
+        the last image of a batch completes it.
         """
-        self._logger.info(f"Storing images for batch {batch.uid}")
         try:
-            await store_batch_images_to_outbox.configure(
-                lock=f"store-{batch.uid}",
-            ).defer_async(batch_uid=str(batch.uid))
+            await self._defer_per_image(store_image_to_outbox, image_uids)
         except Exception:
-            self._logger.error(
-                f"Error storing images for batch {batch.uid}", exc_info=True
-            )
+            self._logger.error("Error deferring store tasks", exc_info=True)
+
+    async def store_image(self, image: Image):
+        """Defer the outbox move for one image.
+
+        Same per-image ``lock`` as :meth:`store_images`.
+        """
+        self._logger.info(f"Storing image {image.uid}")
+        try:
+            await store_image_to_outbox.configure(
+                lock=f"image-{image.uid}",
+            ).defer_async(image_uid=str(image.uid))
+        except Exception:
+            self._logger.error(f"Error storing image {image.uid}", exc_info=True)
 
     async def metadata_batch_import(self, batch: Batch, search_parameters: Any):
         """Defer a metadata search for the given batch.
@@ -213,3 +225,54 @@ class Scheduler:
             self._logger.error(
                 f"Error scheduling remap for dataset {dataset_uid}", exc_info=True
             )
+
+    async def run_operation(self, operation: Operation):
+        """Defer running an operation recorded with the operation service.
+
+        ``lock=f"operation-{subject_uid}"`` serialises operations on the same
+        subject, so that moving an item and remapping it run one after the
+        other rather than over each other.
+
+        Raises, unlike the others, as an operation that is never deferred
+        would otherwise stay queued for whoever follows it.
+        """
+        self._logger.info(
+            f"Running {operation.kind.value} operation {operation.uid} "
+            f"on {operation.subject_uid}"
+        )
+        await run_operation.configure(
+            lock=f"operation-{operation.subject_uid}",
+        ).defer_async(operation_uid=str(operation.uid))
+
+    async def count_jobs(self) -> dict[str, dict[str, int]]:
+        """How many jobs are waiting in each queue, and how many are running.
+
+        Every ``TaskQueue`` is answered for, with nothing in it where it has
+        no jobs, so that a queue that empties shows as empty rather than as
+        gone. Counted by status rather than over every job, as the jobs that
+        are done are kept in the same table and outnumber the others.
+        """
+        counts = {queue.value: {"todo": 0, "doing": 0} for queue in TaskQueue}
+        for status in ("todo", "doing"):
+            for queue in await self._app.job_manager.list_queues_async(status=status):
+                counts.setdefault(queue["name"], {"todo": 0, "doing": 0})
+                counts[queue["name"]][status] = queue[status]
+        return counts
+
+    async def _defer_per_image(self, task: Task, image_uids: Iterable[UUID]) -> None:
+        """Defer a task for each image, ``DEFER_CHUNK_SIZE`` images to a
+        statement.
+
+        Deferring them one at a time was a round trip to the database for each
+        image, which for a batch of thousands kept whoever started it waiting
+        for minutes. Each job keeps a lock of its own image, as deferring them
+        one at a time gave them.
+        """
+        jobs = [
+            task.configure(lock=f"image-{uid}").make_new_job(image_uid=str(uid))
+            for uid in image_uids
+        ]
+        for start in range(0, len(jobs), self.DEFER_CHUNK_SIZE):
+            chunk = jobs[start : start + self.DEFER_CHUNK_SIZE]
+            await self._app.job_manager.batch_defer_jobs_async(chunk)
+        self._logger.info(f"Deferred {task.name} for {len(jobs)} images.")
@@ -54,7 +54,15 @@ from slidetap.external_interfaces import (
     TransientTaskError,
 )
 from slidetap.image_processor.dicom_metadata import DicomMetadataWriter
-from slidetap.model import ImageFile, ImageStatus
+from slidetap.image_processor.image_processor import ImageProcessingError
+from slidetap.image_processor.processing_meter import ProcessingMeter
+from slidetap.model import (
+    ImageFile,
+    ImageProcessingPhase,
+    ImageStatus,
+    OperationKind,
+    ProcessingMeasurement,
+)
 from slidetap.services import (
     AttributeService,
     BatchService,
@@ -62,11 +70,15 @@ from slidetap.services import (
     ItemService,
     MapperService,
     MetadataSearchItemService,
+    OperationProgress,
+    OperationService,
     ProjectService,
     ReviewService,
     SchemaService,
     StorageService,
+    ValidationService,
 )
+from slidetap.services.operation_service import OperationWork
 from slidetap.task.dishka_integration import dishka_task
 
 logger = logging.getLogger(__name__)
@@ -115,19 +127,6 @@ scale exponentially: 3 s, 9 s, 27 s — total ~40 s across three attempts.
 """
 
 
-PRE_PROCESSING_SETTLED = [
-    # An image that failed is not going to reach the next status by itself, and
-    # waiting for it would leave the batch unfinished for good — which would
-    # also keep the case it is under from ever being flagged for somebody to
-    # deal with it. It stays in the batch, not valid and raised on, for a
-    # person to fetch again or take out of the project.
-    ImageStatus.DOWNLOADING_FAILED,
-    ImageStatus.PRE_PROCESSING_FAILED,
-    ImageStatus.PRE_PROCESSED,
-]
-"""What an image has to be for the batch to be finished pre-processing it."""
-
-
 def _record_image_phase_failure(
     database_image: DatabaseImage,
     exception: BaseException,
@@ -147,6 +146,19 @@ def _record_image_phase_failure(
         database_image.set_status_message(str(exception))
 
 
+def _failed_processing_steps(
+    exception: BaseException,
+) -> dict[str, ProcessingMeasurement] | None:
+    """What the steps run before a processing failure took, where the failure
+    came from an `ImageProcessor`, however the export wrapped it."""
+    cause: BaseException | None = exception
+    while cause is not None:
+        if isinstance(cause, ImageProcessingError):
+            return cause.steps
+        cause = cause.__cause__
+    return None
+
+
 @dishka_task(
     slidetap_tasks,
     name="download_and_pre_process_image",
@@ -246,21 +258,9 @@ def download_and_pre_process_image(
         return
 
     with database_service.get_session() as session:
-        database_image = database_service.get_image(session, image_uid)
-        any_non_completed = database_service.get_first_image_for_batch(
-            session,
-            batch_uid=database_image.batch.uid,
-            exclude_status=PRE_PROCESSING_SETTLED,
-            selected=True,
-        )
-        if any_non_completed is not None:
-            logger.debug(
-                f"Batch {database_image.batch.uid} not yet finished pre-processing. "
-                f"Image {any_non_completed.uid} has status {any_non_completed.status}."
-            )
-            return
-        logger.debug(f"Batch {database_image.batch.uid} pre-processed.")
-        batch_service.set_as_pre_processed(database_image.batch, session=session)
+        batch_uid = database_service.get_image(session, image_uid).batch_uid
+        if batch_service.finish_pre_processing(batch_uid, session):
+            logger.debug(f"Batch {batch_uid} pre-processed.")
 
 
 def _run_download_phase(
@@ -269,6 +269,7 @@ def _run_download_phase(
     database_service: DatabaseService,
     review_service: ReviewService,
 ) -> bool:
+    meter = ProcessingMeter()
     try:
         with database_service.get_session() as session:
             database_image = database_service.get_image(session, image_uid)
@@ -281,6 +282,9 @@ def _run_download_phase(
                 database_image_file = DatabaseImageFile(database_image, image_file.name)
                 session.add(database_image_file)
                 database_image.files.add(database_image_file)
+            database_image.record_processing(
+                ImageProcessingPhase.DOWNLOAD, meter.read()
+            )
             database_image.set_as_downloaded()
         return True
     except TransientTaskError:
@@ -293,6 +297,9 @@ def _run_download_phase(
         logger.error(f"Failed to download image {image_uid}", exc_info=True)
         with database_service.get_session() as session:
             database_image = database_service.get_image(session, image_uid)
+            database_image.record_processing(
+                ImageProcessingPhase.DOWNLOAD, meter.read(failed=True)
+            )
             _record_image_phase_failure(
                 database_image,
                 exception,
@@ -317,6 +324,7 @@ def _run_pre_process_phase(
     database_service: DatabaseService,
     attribute_service: AttributeService,
 ) -> bool:
+    meter = ProcessingMeter()
     try:
         with database_service.get_session() as session:
             database_image = database_service.get_image(session, image_uid)
@@ -339,6 +347,9 @@ def _run_pre_process_phase(
             # put these attributes in the item, to write over when the metadata
             # is written into DICOM.
             database_image.source_metadata = image.source_metadata
+            database_image.record_processing(
+                ImageProcessingPhase.PRE_PROCESS, meter.read()
+            )
             database_image.set_as_pre_processed()
         return True
     except TransientTaskError:
@@ -351,6 +362,9 @@ def _run_pre_process_phase(
         logger.error(f"Failed to pre-process image {image_uid}", exc_info=True)
         with database_service.get_session() as session:
             database_image = database_service.get_image(session, image_uid)
+            database_image.record_processing(
+                ImageProcessingPhase.PRE_PROCESS, meter.read(failed=True)
+            )
             _record_image_phase_failure(
                 database_image,
                 exception,
@@ -396,6 +410,7 @@ def post_process_image(
     with database_service.get_session() as session:
         database_image = database_service.get_image(session, image_uid)
 
+        meter = ProcessingMeter()
         try:
             project = database_image.batch.project.model
             image = image_export_interface.export(
@@ -419,6 +434,11 @@ def post_process_image(
             # has to say it again. From the processing that wrote them; empty
             # where it wrote no metadata of its own.
             database_image.metadata_digest = image.metadata_digest
+            database_image.record_processing(
+                ImageProcessingPhase.POST_PROCESS,
+                meter.read(),
+                image.processing_profile.steps if image.processing_profile else None,
+            )
             database_image.set_as_post_processed()
         except TransientTaskError:
             session.rollback()
@@ -433,6 +453,11 @@ def post_process_image(
             logger.error(f"Failed to post-process image {image_uid}", exc_info=True)
             if project is not None:
                 storage_service.cleanup_processing_task(project, task_id)
+            database_image.record_processing(
+                ImageProcessingPhase.POST_PROCESS,
+                meter.read(failed=True),
+                _failed_processing_steps(exception),
+            )
             _record_image_phase_failure(
                 database_image,
                 exception,
@@ -441,157 +466,191 @@ def post_process_image(
             )
 
         session.commit()
-        any_non_completed = database_service.get_first_image_for_batch(
-            session,
-            batch_uid=database_image.batch.uid,
-            exclude_status=[
-                ImageStatus.POST_PROCESSING_FAILED,
-                ImageStatus.POST_PROCESSED,
-            ],
-            selected=True,
-        )
-        if any_non_completed is not None:
-            logger.debug(
-                f"Batch {database_image.batch.uid} not yet finished post-processing. "
-                f"Image {any_non_completed.uid} has status {any_non_completed.status}."
-            )
-            return
-        logger.debug(f"Batch {database_image.batch.uid} post-processed.")
-        batch_service.set_as_post_processed(database_image.batch, session=session)
+        batch_uid = database_image.batch_uid
+        if batch_service.finish_post_processing(batch_uid, session):
+            logger.debug(f"Batch {batch_uid} post-processed.")
 
 
 @dishka_task(
     slidetap_tasks,
-    name="store_batch_images_to_outbox",
+    name="store_image_to_outbox",
     queue=TaskQueue.IMAGE,
     priority=TaskPriority.LOW,
     retry=_TRANSIENT_RETRY,
 )
-def store_batch_images_to_outbox(
-    batch_uid: UUID | str,
+def store_image_to_outbox(
+    image_uid: UUID | str,
     database_service: FromDishka[DatabaseService],
     batch_service: FromDishka[BatchService],
     storage_service: FromDishka[StorageService],
-    schema_service: FromDishka[SchemaService],
     image_export_interface: FromDishka[ImageExportInterface],
     dicom_metadata_writer: FromDishka[DicomMetadataWriter],
 ) -> None:
-    """Move post-processed images from the processing directory to the outbox.
-
-    Each image is stored and set as stored one image at a time, so that a failure
-    part-way through the batch cannot leave images on record in the processing
-    directory they have already been moved out of, and so that a retry, which
-    only selects images that are post-processed, resumes where the failed attempt
-    left off.
-
-    An image that cannot be stored is set as storing failed, and the batch is not
-    completed: the dataset in the outbox is missing an image, and the batch stays
-    storing until the image has been retried and stored. An image left as storing
-    by a failed attempt is stored again, as storing an already stored image is a
-    no-op.
+    """Move a post-processed image from the processing directory to the outbox,
+    and complete its batch if it was the last image of it to be stored.
+
+    Storing was done for a batch at a time, one image after another in one
+    job, and an image whose metadata had changed is written again in full, so
+    a batch where every image had changed kept one worker busy for hours. Each
+    image is now a job of its own, run as many at a time as the image queue
+    has workers for.
+
+    The image is set as storing before it is moved and as stored once the paths
+    it was moved to are on record, so that a failure part-way cannot leave an
+    image on record in the processing directory it has already been moved out
+    of. An image left as storing by a failed attempt is stored again, as
+    storing an already stored image is a no-op.
+
+    An image that cannot be stored is set as storing failed, and the batch is
+    not completed: the dataset in the outbox is missing an image, and the batch
+    stays storing until the image has been retried and stored, or deselected.
     """
-    if isinstance(batch_uid, str):
-        batch_uid = UUID(batch_uid)
-    logger.info(f"Storing batch {batch_uid} images to outbox")
+    if isinstance(image_uid, str):
+        image_uid = UUID(image_uid)
 
-    with database_service.get_session(commit=False) as session:
-        database_batch = database_service.get_batch(session, batch_uid)
-        project = database_batch.project.model
+    with database_service.get_session() as session:
+        database_image = database_service.get_image(session, image_uid)
+        batch_uid = database_image.batch_uid
+        if not database_image.selected or not (
+            database_image.post_processed or database_image.storing
+        ):
+            logger.debug(
+                f"Image {image_uid} not to be stored "
+                f"(status={database_image.status.name}), skipping store"
+            )
+            return
+        project = database_image.batch.project.model
         dataset = database_service.get_dataset(session, project.dataset_uid).model
+        database_image.set_as_storing()
+        image_model = database_image.model
 
-        image_models = []
-        for image_schema in schema_service.images.values():
-            for database_image in database_service.get_images(
-                session,
-                schema=image_schema,
-                batch=batch_uid,
-                selected=True,
-                status_filter=[ImageStatus.POST_PROCESSED, ImageStatus.STORING],
-            ):
-                image_models.append(database_image.model)
-
-    for image_model in image_models:
+    meter = ProcessingMeter()
+    try:
+        # What goes in the files is asked for again here rather than
+        # trusted from the export: the items it was read from have been
+        # curated since. Where an export format carries no metadata, the
+        # files are moved across as they are.
+        # Written again only where what they say has changed since they were
+        # written; unchanged, the files are moved across as they are. A
+        # digest that could not be taken counts as changed.
+        # Written over what the image file said about itself. Where that was
+        # not kept — an image converted before it was — there is nothing to
+        # write it over, and the files are moved as they are.
+        base = dicom_metadata_writer.recorded(image_model.source_metadata)
+        metadata = (
+            None
+            if base is None
+            else image_export_interface.create_export_metadata(image_model, base)
+        )
+        digest = None if metadata is None else dicom_metadata_writer.digest(metadata)
+        unchanged = digest is not None and digest == image_model.metadata_digest
+        if metadata is None or unchanged:
+            storage_service.store_image_to_outbox(project, image_model, dataset)
+        else:
+            source = Path(image_model.folder_path or "")
+            with storage_service.stage_image_in_outbox(
+                project, image_model, dataset
+            ) as staged:
+                written_files = dicom_metadata_writer.resave(source, staged, metadata)
+            # DICOM names its files after the instances in them, and the
+            # instances written are new ones, so the files that were stored
+            # are not the files that were processed.
+            image_model.files = [
+                ImageFile(uid=uuid4(), filename=str(file.relative_to(staged)))
+                for file in written_files
+            ]
+        image_model.metadata_digest = digest
+    except TransientTaskError:
+        raise
+    except Exception as exception:
+        logger.error(f"Failed to store image {image_uid}", exc_info=True)
         with database_service.get_session() as session:
-            database_image = database_service.get_image(session, image_model.uid)
-            database_image.set_as_storing()
-        try:
-            # What goes in the files is asked for again here rather than
-            # trusted from the export: the items it was read from have been
-            # curated since. Where an export format carries no metadata, the
-            # files are moved across as they are.
-            # Written again only where what they say has changed since they were
-            # written; unchanged, the files are moved across as they are. A
-            # digest that could not be taken counts as changed.
-            # Written over what the image file said about itself. Where that was
-            # not kept — an image converted before it was — there is nothing to
-            # write it over, and the files are moved as they are.
-            base = dicom_metadata_writer.recorded(image_model.source_metadata)
-            metadata = (
-                None
-                if base is None
-                else image_export_interface.create_export_metadata(image_model, base)
+            database_image = database_service.get_image(session, image_uid)
+            database_image.record_processing(
+                ImageProcessingPhase.STORE, meter.read(failed=True)
             )
-            digest = (
-                None if metadata is None else dicom_metadata_writer.digest(metadata)
+            _record_image_phase_failure(
+                database_image,
+                exception,
+                database_image.set_as_storing_failed,
+                ImageStatus.STORING_FAILED,
             )
-            unchanged = digest is not None and digest == image_model.metadata_digest
-            if metadata is None or unchanged:
-                storage_service.store_image_to_outbox(project, image_model, dataset)
-            else:
-                source = Path(image_model.folder_path or "")
-                with storage_service.stage_image_in_outbox(
-                    project, image_model, dataset
-                ) as staged:
-                    written_files = dicom_metadata_writer.resave(
-                        source, staged, metadata
-                    )
-                # DICOM names its files after the instances in them, and the
-                # instances written are new ones, so the files that were stored
-                # are not the files that were processed.
-                image_model.files = [
-                    ImageFile(uid=uuid4(), filename=str(file.relative_to(staged)))
-                    for file in written_files
-                ]
-            image_model.metadata_digest = digest
-        except TransientTaskError:
-            raise
-        except Exception as exception:
-            logger.error(f"Failed to store image {image_model.uid}", exc_info=True)
-            with database_service.get_session() as session:
-                database_image = database_service.get_image(session, image_model.uid)
-                _record_image_phase_failure(
-                    database_image,
-                    exception,
-                    database_image.set_as_storing_failed,
-                    ImageStatus.STORING_FAILED,
-                )
-            continue
-        with database_service.get_session() as session:
-            database_image = database_service.get_image(session, image_model.uid)
-            database_image.folder_path = image_model.folder_path
-            database_image.thumbnail_path = image_model.thumbnail_path
-            database_image.metadata_digest = image_model.metadata_digest
-            database_image.files.clear()
-            for image_file in image_model.files:
-                stored_file = DatabaseImageFile(database_image, image_file.filename)
-                session.add(stored_file)
-                database_image.files.add(stored_file)
-            database_image.set_as_stored()
+        # The dataset in the outbox is missing an image, and the batch is thus
+        # not complete. It stays storing, to be completed once the image that
+        # failed has been retried, or excluded from the batch.
+        logger.warning(
+            f"Batch {batch_uid} will not complete, image {image_uid} failed to "
+            f"store. Retry the image to store it, or deselect it to complete the "
+            f"batch without it."
+        )
+        return
 
     with database_service.get_session() as session:
-        database_batch = database_service.get_batch(session, batch_uid)
-        failed_image = batch_service.image_that_failed_to_store(database_batch, session)
-        if failed_image is not None:
-            # The dataset in the outbox is missing an image, and the batch is thus
-            # not complete. It stays storing, to be stored again once the image
-            # that failed has been retried, or excluded from the batch.
-            logger.warning(
-                f"Batch {batch_uid} not completed, image {failed_image.uid} failed "
-                f"to store. Retry the image to store it, or deselect it to complete "
-                f"the batch without it."
-            )
-            return
-        batch_service.set_as_completed(database_batch, session=session)
+        database_image = database_service.get_image(session, image_uid)
+        database_image.folder_path = image_model.folder_path
+        database_image.thumbnail_path = image_model.thumbnail_path
+        database_image.metadata_digest = image_model.metadata_digest
+        database_image.files.clear()
+        for image_file in image_model.files:
+            stored_file = DatabaseImageFile(database_image, image_file.filename)
+            session.add(stored_file)
+            database_image.files.add(stored_file)
+        database_image.record_processing(ImageProcessingPhase.STORE, meter.read())
+        database_image.set_as_stored()
+
+    with database_service.get_session() as session:
+        if batch_service.finish_storing(batch_uid, session):
+            logger.info(f"Batch {batch_uid} stored to outbox.")
+
+
+@dishka_task(
+    slidetap_tasks,
+    name="store_batch_images_to_outbox",
+    queue=TaskQueue.IMAGE,
+    priority=TaskPriority.LOW,
+    retry=_TRANSIENT_RETRY,
+)
+async def store_batch_images_to_outbox(
+    batch_uid: UUID | str,
+    database_service: FromDishka[DatabaseService],
+    batch_service: FromDishka[BatchService],
+    schema_service: FromDishka[SchemaService],
+    app: FromDishka[TaskApp],
+) -> None:
+    """Defer a :func:`store_image_to_outbox` job for each image of a batch left
+    to store, or complete the batch if none is.
+
+    Storing was a job for a whole batch under this name, and nothing defers it
+    any more. It is kept so that the jobs of it still queued when the workers
+    are upgraded are run rather than failed as of a task that does not exist,
+    and can go once no queue that could hold one is left.
+    """
+    if isinstance(batch_uid, str):
+        batch_uid = UUID(batch_uid)
+    with database_service.get_session(commit=False) as session:
+        image_uids = database_service.get_image_uids(
+            session,
+            batch_uid,
+            [image_schema.uid for image_schema in schema_service.images.values()],
+            selected=True,
+            status_filter=[ImageStatus.POST_PROCESSED, ImageStatus.STORING],
+        )
+    if image_uids:
+        logger.info(
+            f"Deferring storing of {len(image_uids)} images of batch {batch_uid}."
+        )
+        await app.job_manager.batch_defer_jobs_async(
+            [
+                store_image_to_outbox.configure(lock=f"image-{uid}").make_new_job(
+                    image_uid=str(uid)
+                )
+                for uid in image_uids
+            ]
+        )
+        return
+    with database_service.get_session() as session:
+        if batch_service.finish_storing(batch_uid, session):
+            logger.info(f"Batch {batch_uid} stored to outbox.")
 
 
 @dishka_task(
@@ -634,6 +693,78 @@ def remap_dataset_attributes(
     mapper_service.remap_dataset(dataset_uid)
 
 
+@dishka_task(
+    slidetap_tasks,
+    name="run_operation",
+    queue=TaskQueue.DEFAULT,
+    priority=TaskPriority.NORMAL,
+)
+def run_operation(
+    operation_uid: UUID | str,
+    operation_service: FromDishka[OperationService],
+    review_service: FromDishka[ReviewService],
+    mapper_service: FromDishka[MapperService],
+    item_service: FromDishka[ItemService],
+    batch_service: FromDishka[BatchService],
+) -> None:
+    """Run a curation action too large to be run in the request asking for it.
+
+    Not retried: what went wrong is recorded on the operation for whoever is
+    following it, and the action is one somebody asked for, so it is asked for
+    again rather than repeated behind their back.
+    """
+    if isinstance(operation_uid, str):
+        operation_uid = UUID(operation_uid)
+    logger.info(f"Running operation {operation_uid}")
+
+    def flag_invalid(
+        dataset_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+    ) -> str:
+        batch_uid = parameters.get("batch_uid")
+        flagged = review_service.flag_invalid_review_units(
+            dataset_uid,
+            UUID(batch_uid) if batch_uid is not None else None,
+            progress=progress,
+        )
+        return f"Flagged {flagged} review units for review."
+
+    def remap_item_hierarchy(
+        item_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+    ) -> None:
+        mapper_service.remap_item_hierarchy(item_uid, progress=progress)
+
+    def apply_mapping(
+        mapping_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+    ) -> str:
+        applied = mapper_service.apply_mapping(mapping_uid, progress=progress)
+        return f"Applied to {applied} attributes."
+
+    def move_item(
+        item_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+    ) -> None:
+        item_service.move_to_parent(
+            item_uid, UUID(parameters["target_parent_uid"]), progress=progress
+        )
+
+    def delete_batch(
+        batch_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+    ) -> None:
+        batch_service.delete(batch_uid, progress=progress)
+
+    work: dict[OperationKind, OperationWork] = {
+        OperationKind.FLAG_INVALID: flag_invalid,
+        OperationKind.REMAP_ITEM_HIERARCHY: remap_item_hierarchy,
+        OperationKind.APPLY_MAPPING: apply_mapping,
+        OperationKind.MOVE_ITEM: move_item,
+        OperationKind.DELETE_BATCH: delete_batch,
+    }
+    operation = operation_service.get(operation_uid)
+    if operation is None:
+        logger.warning(f"Operation {operation_uid} does not exist, skipping")
+        return
+    operation_service.run(operation_uid, work[operation.kind])
+
+
 @dishka_task(
     slidetap_tasks,
     name="process_metadata_export",
@@ -914,6 +1045,65 @@ async def retry_stalled_jobs(
         await app.job_manager.retry_job(job)
 
 
+_RECONCILE_VALIDATION_CRON = "*/15 * * * *"
+"""Recount batch validation every 15 minutes."""
+
+
+_RECONCILE_VALIDATION_LOCK = "reconcile_validation_counts"
+
+
+@slidetap_tasks.periodic(cron=_RECONCILE_VALIDATION_CRON)
+@dishka_task(
+    slidetap_tasks,
+    name="reconcile_validation_counts",
+    queue=TaskQueue.DEFAULT,
+    priority=TaskPriority.LOW,
+    lock=_RECONCILE_VALIDATION_LOCK,
+    queueing_lock=_RECONCILE_VALIDATION_LOCK,
+)
+def reconcile_validation_counts(
+    timestamp: int,
+    validation_service: FromDishka[ValidationService],
+) -> None:
+    """Correct the counts batch validation is answered from where they have
+    drifted from the items.
+
+    The counts are moved as items are written, so a write that goes around
+    the session leaves them off until this run recounts them.
+    """
+    corrected = validation_service.reconcile_validation_counts()
+    if corrected:
+        logger.warning(f"Corrected validation counts of {corrected} batch(es).")
+
+
+_RECONCILE_IMAGE_PROGRESS_LOCK = "reconcile_image_progress_counts"
+
+
+@slidetap_tasks.periodic(cron=_RECONCILE_VALIDATION_CRON)
+@dishka_task(
+    slidetap_tasks,
+    name="reconcile_image_progress_counts",
+    queue=TaskQueue.DEFAULT,
+    priority=TaskPriority.LOW,
+    lock=_RECONCILE_IMAGE_PROGRESS_LOCK,
+    queueing_lock=_RECONCILE_IMAGE_PROGRESS_LOCK,
+)
+def reconcile_image_progress_counts(
+    timestamp: int,
+    batch_service: FromDishka[BatchService],
+) -> None:
+    """Correct the counts a batch is moved on from when its images are done,
+    where they have drifted from the images.
+
+    A batch whose counts were too high when its last image finished is left
+    with no task to move it on, so this run also finishes each batch still
+    processing or storing whose images are all done.
+    """
+    corrected = batch_service.reconcile_image_progress_counts()
+    if corrected:
+        logger.warning(f"Corrected image progress counts of {corrected} batch(es).")
+
+
 def _reset_state_for_stalled_job(
     database_service: DatabaseService, job: TaskJob
 ) -> None:
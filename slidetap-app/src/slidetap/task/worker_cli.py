@@ -19,6 +19,9 @@ Reads worker tuning from ``config.yaml`` under ``task:`` (via
 behaviour lives alongside the rest of the app config instead of being
 threaded through ``.env`` into the docker-compose ``command:`` array.
 
+With ``task: metrics_port`` set, the worker also writes its metrics out on
+that port, see :mod:`slidetap.metrics`.
+
 Environment:
     ``SLIDETAP_TASK_APP`` — dotted package name whose ``task_app.py``
     exposes ``task_app`` (the configured Procrastinate :class:`App`).
@@ -32,21 +35,41 @@ import os
 
 from procrastinate import App as TaskApp
 
-from slidetap.config import ConfigParser, DatabaseConfig, SlideTapConfig, TaskConfig
+from slidetap.config import (
+    ConfigParser,
+    DatabaseConfig,
+    SlideTapConfig,
+    StorageConfig,
+    TaskConfig,
+)
 from slidetap.logging import setup_logging
+from slidetap.metrics import REGISTRY, collect_pool_statistics, serve_metrics
 from slidetap.migrations.cli import assert_up_to_date
+from slidetap.profiling import PROFILER
 from slidetap.services import DatabaseService
+from slidetap.task.dishka_integration import container_from_app
 
 
 def main() -> None:
     parser = ConfigParser.create()
     config = TaskConfig.parse(parser)
     logging.basicConfig(level=config.log_level)
-    setup_logging(SlideTapConfig.parse(parser).logging_config)
-    with DatabaseService(DatabaseConfig.parse(parser)).get_session() as session:
+    slidetap_config = SlideTapConfig.parse(parser)
+    setup_logging(slidetap_config.logging_config)
+    PROFILER.configure(slidetap_config.profiling, StorageConfig.parse(parser).profiles)
+    with DatabaseService(
+        DatabaseConfig.parse(parser, "worker")
+    ).get_session() as session:
         assert_up_to_date(session)
     module = importlib.import_module(f"{os.environ['SLIDETAP_TASK_APP']}.task_app")
     task_app: TaskApp = module.task_app
+    if config.metrics_port is not None:
+        # The pool read is that of the service the tasks are given.
+        database_service = container_from_app(task_app).get(DatabaseService)
+        REGISTRY.add_collector(
+            collect_pool_statistics(database_service.pool_statistics)
+        )
+        serve_metrics(config.metrics_port)
     task_app.run_worker(
         concurrency=config.concurrency,
         stalled_worker_timeout=config.stalled_worker_timeout,
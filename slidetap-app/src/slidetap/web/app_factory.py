@@ -25,10 +25,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from procrastinate import App as TaskApp
 from starlette.routing import Mount, Route, WebSocketRoute
 
-from slidetap.config import SlideTapConfig
+from slidetap.config import DatabaseConfig, SlideTapConfig, StorageConfig
 from slidetap.logging import setup_logging
+from slidetap.metrics import REGISTRY, collect_pool_statistics
 from slidetap.migrations.cli import assert_up_to_date
+from slidetap.profiling import PROFILER
 from slidetap.services import DatabaseService, ImageCache
+from slidetap.web.database_threads import size_database_threads
+from slidetap.web.request_metrics import RequestMetricsMiddleware
+from slidetap.web.request_profiling import RequestProfilingMiddleware
 from slidetap.web.routers import (
     attribute_router,
     batch_router,
@@ -39,6 +44,8 @@ from slidetap.web.routers import (
     login_router,
     mapper_router,
     metadata_search_router,
+    metrics_router,
+    operation_router,
     project_router,
     schema_router,
     tag_router,
@@ -79,22 +86,33 @@ class SlideTapWebAppFactory:
             logger.setLevel(config.web_app_log_level)
             setup_logging(config.logging_config)
             logger.info("Starting SlideTap FastAPI app.")
+            PROFILER.configure(
+                config.profiling, (await container.get(StorageConfig)).profiles
+            )
 
             database_service = await container.get(DatabaseService)
             with database_service.get_session() as session:
                 assert_up_to_date(session)
+            cls._size_database_threads(config, await container.get(DatabaseConfig))
 
             if config.cors_origins:
                 cls._setup_cors(app, config.cors_origins)
 
-            task_app = await container.get(TaskApp)
-            async with task_app.open_async():
-                logger.info("SlideTap FastAPI app started.")
-                yield
-                logger.info("Shutting down SlideTap FastAPI app.")
-
-            image_cache = await container.get(ImageCache)
-            image_cache.close()
+            # Added for this app and removed with it: the registry is of the
+            # process, which may start more than one app over its life.
+            pool_collector = collect_pool_statistics(database_service.pool_statistics)
+            REGISTRY.add_collector(pool_collector)
+            try:
+                task_app = await container.get(TaskApp)
+                async with task_app.open_async():
+                    logger.info("SlideTap FastAPI app started.")
+                    yield
+                    logger.info("Shutting down SlideTap FastAPI app.")
+
+                image_cache = await container.get(ImageCache)
+                image_cache.close()
+            finally:
+                REGISTRY.remove_collector(pool_collector)
             logger.info("SlideTap FastAPI app shut down.")
 
         logger.info("Creating SlideTap FastAPI app.")
@@ -105,6 +123,10 @@ class SlideTapWebAppFactory:
             lifespan=lifespan,
         )
         setup_dishka(container=container, app=app)
+        app.add_middleware(RequestMetricsMiddleware)
+        # Outside the timing, so that writing a profile out is not timed as
+        # part of the request it is of.
+        app.add_middleware(RequestProfilingMiddleware)
         cls._create_and_register_routers(app, extra_routers)
         logger.info("SlideTap FastAPI app created.")
         return app
@@ -127,6 +149,8 @@ class SlideTapWebAppFactory:
         app.include_router(item_router)
         app.include_router(mapper_router)
         app.include_router(metadata_search_router)
+        app.include_router(metrics_router)
+        app.include_router(operation_router)
         app.include_router(project_router)
         app.include_router(schema_router)
         app.include_router(tag_router)
@@ -179,6 +203,19 @@ class SlideTapWebAppFactory:
                 f"Registered extension router: {router.prefix or '(no prefix)'}"
             )
 
+    @classmethod
+    def _size_database_threads(
+        cls, config: SlideTapConfig, database_config: DatabaseConfig
+    ) -> None:
+        """Size the threads the routers run database work in to what the
+        database pool can serve, unless configured otherwise."""
+        logger = logging.getLogger(f"{__name__}.{cls.__name__}")
+        threads = config.web_threads or (
+            database_config.pool_size + database_config.max_overflow
+        )
+        size_database_threads(threads)
+        logger.info(f"Running database work in up to {threads} threads.")
+
     @staticmethod
     def _setup_cors(app: FastAPI, cors_origins: str):
         """Setup CORS middleware for the FastAPI app."""
@@ -0,0 +1,49 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""The threads the routers run database work in.
+
+The services use blocking sessions, so the routers hand their calls to a
+thread rather than run them on the event loop, where one slow query would hold
+up every request. The threads are held to what the database pool can serve by
+a limiter of their own: the event loop's default limiter is also what every
+blocking endpoint and dependency runs in, most of which do not touch the
+database, and holding that one to the pool would hold them up too.
+"""
+
+from collections.abc import Callable
+from functools import partial
+from typing import ParamSpec, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_LIMITER = CapacityLimiter(40)
+"""The threads database work runs in, as many as the default limiter has until
+sized by ``size_database_threads``."""
+
+
+def size_database_threads(threads: int) -> None:
+    """Set how many threads database work is run in at most."""
+    _LIMITER.total_tokens = threads
+
+
+async def run_in_database_thread(
+    func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """Run a blocking call that uses the database in a thread, waiting for one
+    where as many as there are run already."""
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=_LIMITER)
@@ -0,0 +1,61 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Timing of the requests the web app answers."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from slidetap.metrics import HTTP_REQUEST_SECONDS
+
+
+class RequestMetricsMiddleware:
+    """Time each request, by the template of the route that answered it.
+
+    By template rather than by path, so that the tiles of every image are one
+    route and not one per image. A request no route answered is counted as
+    ``unmatched``, for the same reason.
+
+    Written against ASGI rather than as an ``http`` middleware of the app,
+    which would read a streamed response into memory before passing it on.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            # The router sets the route it matched in the scope it was given.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
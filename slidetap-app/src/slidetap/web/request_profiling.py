@@ -0,0 +1,54 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Profiling of the requests the web app answers, and counting of their
+queries."""
+
+from uuid import uuid4
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from slidetap.profiling import PROFILER, Profiler
+
+
+class RequestProfilingMiddleware:
+    """Profile a sample of requests, and count the queries of each, as the
+    profiler is configured to.
+
+    Named by the template of the route that answered, as for the metrics, and
+    known only once it has: the router sets the route it matched in the scope
+    it was given. A request has no id of its own, so each profile is tagged
+    with one made up for it.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Profiler = PROFILER):
+        self._app = app
+        self._profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+        profile = self._profiler.start()
+        count = None
+        try:
+            with self._profiler.counting_queries() as count:
+                await self._app(scope, receive, send)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            name = f"{scope['method']} {route}"
+            if profile is not None:
+                self._profiler.finish(profile, "request", name, uuid4().hex[:12])
+            if count is not None:
+                self._profiler.log_queries(count, name)
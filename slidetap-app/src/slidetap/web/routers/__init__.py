@@ -23,6 +23,8 @@ from .item_router import item_router
 from .login_router import login_router
 from .mapper_router import mapper_router
 from .metadata_search_router import metadata_search_router
+from .metrics_router import metrics_router
+from .operation_router import operation_router
 from .project_router import project_router
 from .schema_router import schema_router
 from .tag_router import tag_router
@@ -37,6 +39,8 @@ __all__ = [
     "login_router",
     "mapper_router",
     "metadata_search_router",
+    "metrics_router",
+    "operation_router",
     "project_router",
     "schema_router",
     "tag_router",
@@ -24,20 +24,29 @@ from dishka.integrations.fastapi import (
     DishkaRoute,
     FromDishka,
 )
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
 from fastapi import File as FlaskFile
 
 from slidetap.database import NotAllowedActionError
-from slidetap.model import Batch, BatchCreate, BatchStatus, File
+from slidetap.model import (
+    Batch,
+    BatchCreate,
+    BatchStatus,
+    File,
+    Operation,
+    OperationKind,
+)
 from slidetap.model.validation import BatchValidation
 from slidetap.services import (
     BatchService,
     ValidationService,
 )
 from slidetap.task import Scheduler
+from slidetap.web.database_threads import run_in_database_thread
 from slidetap.web.routers.dependencies import create_logger_dependency
 from slidetap.web.routers.responses import StatusResponse
 from slidetap.web.services import (
+    BackgroundOperationService,
     ImagePipelineService,
     MetadataImportService,
 )
@@ -102,9 +111,8 @@ async def get_batches(
     Iterable[Batch]
         List of registered batches
     """
-    batches = batch_service.get_all(
-        project_uid=project_uid,
-        status=status,
+    batches = await run_in_database_thread(
+        batch_service.get_all, project_uid=project_uid, status=status
     )
     return batches
 
@@ -304,7 +312,7 @@ async def get_batch(
     Batch
         Batch data.
     """
-    batch = batch_service.get(batch_uid)
+    batch = await run_in_database_thread(batch_service.get, batch_uid)
     if batch is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Batch not found")
     return batch
@@ -347,9 +355,14 @@ async def remap_batch(
 async def delete_batch(
     batch_uid: UUID,
     batch_service: FromDishka[BatchService],
-) -> StatusResponse:
+    background_operation_service: FromDishka[BackgroundOperationService],
+    response: Response,
+) -> StatusResponse | Operation:
     """Delete batch specified by id.
 
+    A batch with more items than the background threshold is deleted by a
+    worker instead, answered with 202 and the operation to follow.
+
     Parameters
     ----------
     batch_uid: UUID
@@ -360,6 +373,13 @@ async def delete_batch(
     dict
         Ok status if successful.
     """
+    if await run_in_database_thread(
+        background_operation_service.is_large, OperationKind.DELETE_BATCH, batch_uid
+    ):
+        response.status_code = HTTPStatus.ACCEPTED
+        return await background_operation_service.start(
+            OperationKind.DELETE_BATCH, batch_uid
+        )
     batch = batch_service.delete(batch_uid)
     if batch is None:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Batch not found")
@@ -388,6 +408,8 @@ async def get_validation(
     BatchValidation
         Validation data if successful.
     """
-    validation = validation_service.get_validation_for_batch(batch_uid)
+    validation = await run_in_database_thread(
+        validation_service.get_validation_for_batch, batch_uid
+    )
     logger.debug(f"Validation of batch {batch_uid}: {validation}")
     return validation
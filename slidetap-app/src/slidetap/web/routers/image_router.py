@@ -24,8 +24,14 @@ from dishka.integrations.fastapi import (
 )
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
-from slidetap.model import Dzi, Image
+from slidetap.model import (
+    BatchProcessingProfile,
+    Dzi,
+    Image,
+    ImageProcessingProfile,
+)
 from slidetap.services import ImageService
+from slidetap.web.database_threads import run_in_database_thread
 from slidetap.web.services.login_service import require_valid_token
 
 image_router = APIRouter(
@@ -202,3 +208,54 @@ async def get_dzi(
             detail=f"DZI metadata not found for image {image_uid}",
         )
     return dzi
+
+
+@image_router.get("/image/{image_uid}/processing-profile")
+async def get_processing_profile(
+    image_uid: UUID,
+    image_service: FromDishka[ImageService],
+) -> ImageProcessingProfile:
+    """Get what each phase of processing an image took, the last time it ran.
+
+    Parameters
+    ----------
+    image_uid: UUID
+        Id of image
+
+    Returns
+    ----------
+    ImageProcessingProfile
+        The phases of processing the image, and the steps of post-processing it.
+    """
+    profile = await run_in_database_thread(
+        image_service.get_processing_profile, image_uid
+    )
+    if profile is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"Processing profile not found for image {image_uid}",
+        )
+    return profile
+
+
+@image_router.get("/batch/{batch_uid}/processing-profile")
+async def get_batch_processing_profile(
+    batch_uid: UUID,
+    image_service: FromDishka[ImageService],
+) -> BatchProcessingProfile:
+    """Get what processing the images of a batch took, over all of them.
+
+    Parameters
+    ----------
+    batch_uid: UUID
+        Id of batch
+
+    Returns
+    ----------
+    BatchProcessingProfile
+        Each phase and step summarized over the images of the batch, and the
+        images that took the longest.
+    """
+    return await run_in_database_thread(
+        image_service.get_batch_processing_profile, batch_uid
+    )
@@ -24,7 +24,7 @@ from dishka.integrations.fastapi import (
     DishkaRoute,
     FromDishka,
 )
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from slidetap.database import NotAllowedActionError
@@ -35,9 +35,12 @@ from slidetap.model import (
     MoveAttributeRequest,
     NewChildSuggestion,
     NonValidItem,
+    Operation,
+    OperationKind,
     ReviewIssue,
     ReviewIssueSource,
     ReviewQueueItem,
+    ReviewQueueSort,
     ReviewRequest,
     ReviewStatus,
     TableRequest,
@@ -53,9 +56,11 @@ from slidetap.services import (
     ReviewService,
     SchemaService,
 )
+from slidetap.web.database_threads import run_in_database_thread
 from slidetap.web.routers.dependencies import create_logger_dependency
 from slidetap.web.routers.login_router import require_valid_token
 from slidetap.web.services import (
+    BackgroundOperationService,
     ImagePipelineService,
     MetadataExportService,
 )
@@ -89,9 +94,11 @@ class ReviewIssueRequest(BaseModel):
 
 
 class ReviewQueueResponse(BaseModel):
-    """Response model for the items waiting to be reviewed."""
+    """Response model for the items waiting to be reviewed, a page at a time,
+    with how many there are in all."""
 
     items: list[ReviewQueueItem]
+    count: int
 
 
 item_router = APIRouter(
@@ -121,7 +128,7 @@ async def get_item(
         The requested item
     """
     logger.debug(f"Get item {item_uid}.")
-    item = item_service.get_optional(item_uid)
+    item = await run_in_database_thread(item_service.get_optional, item_uid)
     if item is None:
         logger.error(f"Item {item_uid} not found.")
         raise HTTPException(
@@ -304,19 +311,36 @@ async def resolve_review_issue(
 @item_router.post("/flag-invalid")
 async def flag_invalid_review_units(
     review_service: FromDishka[ReviewService],
+    background_operation_service: FromDishka[BackgroundOperationService],
+    response: Response,
     logger: Logger,
     dataset_uid: UUID = Query(..., alias="datasetUid"),
     batch_uid: UUID | None = Query(None, alias="batchUid"),
-) -> None:
+) -> Operation | None:
     """Flag every review unit that holds something invalid.
 
     Asked for rather than done on import: an application that imports metadata
     first and images after has items that are not valid yet until the second
     pass, and only the application knows when that is.
+
+    A dataset or batch with more items than the background threshold is swept
+    by a worker instead, answered with 202 and the operation to follow.
     """
     logger.debug(f"Flag invalid review units in dataset {dataset_uid}.")
+    parameters = {"batch_uid": str(batch_uid)} if batch_uid is not None else {}
+    if await run_in_database_thread(
+        background_operation_service.is_large,
+        OperationKind.FLAG_INVALID,
+        dataset_uid,
+        parameters,
+    ):
+        response.status_code = HTTPStatus.ACCEPTED
+        return await background_operation_service.start(
+            OperationKind.FLAG_INVALID, dataset_uid, parameters
+        )
     flagged = review_service.flag_invalid_review_units(dataset_uid, batch_uid)
     logger.debug(f"Flagged {flagged} review units for review.")
+    return None
 
 
 @item_router.post("/item/{item_uid}/select")
@@ -489,7 +513,8 @@ async def get_items_get(
     """
     table_request = table_request or TableRequest()
 
-    items = item_service.get_for_schema(
+    items = await run_in_database_thread(
+        item_service.get_for_schema,
         item_schema_uid,
         dataset_uid,
         batch_uid,
@@ -505,7 +530,8 @@ async def get_items_get(
         table_request.valid,
         table_request.status_filter,
     )
-    count = item_service.get_count_for_schema(
+    count = await run_in_database_thread(
+        item_service.get_count_for_schema,
         item_schema_uid,
         dataset_uid,
         batch_uid,
@@ -538,8 +564,8 @@ async def get_identities(
             status_code=HTTPStatus.NOT_FOUND,
             detail=f"Item schema {item_schema_uid} not found",
         )
-    items = item_service.get_identities_for_schema(
-        item_schema_uid, dataset_uid, batch_uid
+    items = await run_in_database_thread(
+        item_service.get_identities_for_schema, item_schema_uid, dataset_uid, batch_uid
     )
     return ItemIdentitiesResponse(identities={str(item.uid): item for item in items})
 
@@ -553,11 +579,18 @@ async def get_review_queue(
     item_schema_uid: UUID = Query(..., alias="itemSchemaUid"),
     batch_uid: UUID | None = Query(None, alias="batchUid"),
     review_status: ReviewStatus | None = Query(None, alias="reviewStatus"),
+    identifier_filter: str | None = Query(None, alias="identifierFilter"),
+    sort: ReviewQueueSort = Query(ReviewQueueSort.IDENTIFIER),
+    descending: bool = Query(False),
+    start: int | None = Query(None, ge=0),
+    size: int | None = Query(None, ge=1),
 ) -> ReviewQueueResponse:
     """Get the items of a schema a reviewer works through, and where they stand.
 
     Without a status this is every item of the schema, so that something
-    nothing flagged can still be picked out and looked at.
+    nothing flagged can still be picked out and looked at. Without a size this
+    is all of them; with one it is a page, and `count` says how many there are
+    in all. The filter matches the identifier or the pseudonym.
     """
     logger.debug(f"Get review queue for schema {item_schema_uid}.")
     item_schema = schema_service.get_item(item_schema_uid)
@@ -567,21 +600,46 @@ async def get_review_queue(
             detail=f"Item schema {item_schema_uid} not found",
         )
     return ReviewQueueResponse(
-        items=review_service.get_review_queue(
-            item_schema_uid, dataset_uid, batch_uid, review_status
-        )
+        items=await run_in_database_thread(
+            review_service.get_review_queue,
+            item_schema_uid,
+            dataset_uid,
+            batch_uid,
+            review_status,
+            identifier_filter,
+            sort,
+            descending,
+            start,
+            size,
+        ),
+        count=await run_in_database_thread(
+            review_service.get_review_queue_count,
+            item_schema_uid,
+            dataset_uid,
+            batch_uid,
+            review_status,
+            identifier_filter,
+        ),
     )
 
 
-@item_router.get("/item/{item_uid}/hierarchy/{hierarchy_layout_uid}")
+@item_router.get(
+    "/item/{item_uid}/hierarchy/{hierarchy_layout_uid}", response_model=HierarchyNode
+)
 async def get_hierarchy(
     item_uid: UUID,
     hierarchy_layout_uid: UUID,
     item_service: FromDishka[ItemService],
     schema_service: FromDishka[SchemaService],
+    response: Response,
     logger: Logger,
-) -> HierarchyNode:
-    """Get what hangs under an item, as the layout asks for it."""
+    if_none_match: str | None = Header(None),
+) -> HierarchyNode | Response:
+    """Get what hangs under an item, as the layout asks for it.
+
+    Tagged, so that a client asking again with the tag it was given hears that
+    nothing changed instead of being sent the whole tree again.
+    """
     logger.debug(f"Get hierarchy under item {item_uid}.")
     layout = schema_service.get_hierarchy_layout(hierarchy_layout_uid)
     if layout is None:
@@ -595,6 +653,10 @@ async def get_hierarchy(
             status_code=HTTPStatus.NOT_FOUND,
             detail=f"Item {item_uid} not found",
         )
+    etag = item_service.hierarchy_etag(hierarchy)
+    if if_none_match == etag:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return hierarchy
 
 
@@ -695,7 +757,8 @@ async def get_overview_data(
             detail=f"Overview layout {overview_layout_uid} not found",
         )
     try:
-        data = overview_service.get_overview_data(
+        data = await run_in_database_thread(
+            overview_service.get_overview_data,
             item_uid,
             overview_layout,
             pseudonym_mode,
@@ -720,11 +783,16 @@ async def get_overview_data(
 async def move_item(
     item_uid: UUID,
     item_service: FromDishka[ItemService],
+    background_operation_service: FromDishka[BackgroundOperationService],
+    response: Response,
     logger: Logger,
     target_parent_uid: UUID = Query(..., alias="targetParentUid"),
-) -> AnyItem:
+) -> AnyItem | Operation:
     """Move an item to another parent, keeping the item and everything on it.
 
+    An item with more under it than the background threshold is moved by a
+    worker instead, answered with 202 and the operation to follow.
+
     Parameters
     ----------
     item_uid: UUID
@@ -733,6 +801,15 @@ async def move_item(
         Parent to move it to.
     """
     logger.debug(f"Move item {item_uid} to parent {target_parent_uid}.")
+    if await run_in_database_thread(
+        background_operation_service.is_large, OperationKind.MOVE_ITEM, item_uid
+    ):
+        response.status_code = HTTPStatus.ACCEPTED
+        return await background_operation_service.start(
+            OperationKind.MOVE_ITEM,
+            item_uid,
+            {"target_parent_uid": str(target_parent_uid)},
+        )
     try:
         return item_service.move_to_parent(item_uid, target_parent_uid)
     except ValueError as exception:
@@ -810,12 +887,28 @@ async def remap_item_hierarchy_attributes(
     item_uid: UUID,
     item_service: FromDishka[ItemService],
     mapper_service: FromDishka[MapperService],
+    background_operation_service: FromDishka[BackgroundOperationService],
+    response: Response,
     logger: Logger,
-) -> None:
-    """Re-apply mappers to the item and all of its descendants."""
+) -> Operation | None:
+    """Re-apply mappers to the item and all of its descendants.
+
+    A hierarchy larger than the background threshold is remapped by a worker
+    instead, answered with 202 and the operation to follow.
+    """
     logger.info(f"Remap item hierarchy rooted at {item_uid}.")
     if item_service.get_optional(item_uid) is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail=f"Item {item_uid} not found"
         )
+    if await run_in_database_thread(
+        background_operation_service.is_large,
+        OperationKind.REMAP_ITEM_HIERARCHY,
+        item_uid,
+    ):
+        response.status_code = HTTPStatus.ACCEPTED
+        return await background_operation_service.start(
+            OperationKind.REMAP_ITEM_HIERARCHY, item_uid
+        )
     mapper_service.remap_item_hierarchy(item_uid)
+    return None
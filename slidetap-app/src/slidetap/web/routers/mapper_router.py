@@ -24,8 +24,9 @@ from dishka.integrations.fastapi import (
     DishkaRoute,
     FromDishka,
 )
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
+from slidetap.model import Operation, OperationKind
 from slidetap.model.mapper import (
     Mapper,
     MapperCreate,
@@ -36,8 +37,10 @@ from slidetap.model.mapper import (
     UnmappedValue,
 )
 from slidetap.services import MapperService
+from slidetap.web.database_threads import run_in_database_thread
 from slidetap.web.routers.dependencies import create_logger_dependency
 from slidetap.web.routers.responses import StatusResponse
+from slidetap.web.services import BackgroundOperationService
 from slidetap.web.services.login_service import require_valid_token
 
 Logger = Annotated[logging.Logger, Depends(create_logger_dependency(__name__))]
@@ -190,6 +193,9 @@ async def get_unmapped_values(
     project_uid: UUID,
     mapper_service: FromDishka[MapperService],
     batch_uid: UUID | None = None,
+    value_filter: str | None = Query(None, alias="valueFilter"),
+    start: int | None = Query(None, ge=0),
+    size: int | None = Query(None, ge=1),
 ) -> list[UnmappedValue]:
     """Get the recorded values in a project that no mapping accounts for.
 
@@ -199,23 +205,37 @@ async def get_unmapped_values(
         ID of project
     batch_uid: UUID | None
         Only values on items in this batch, when given
+    value_filter: str | None
+        Only values starting with this, when given
+    start: int | None
+        How many values to skip, for a page further down the list
+    size: int | None
+        How many values to return at most; all of them when not given
 
     Returns
     ----------
     list[UnmappedValue]
         Values with no mapping, most-carried first
     """
-    return mapper_service.get_unmapped_values(project_uid, batch_uid)
+    return mapper_service.get_unmapped_values(
+        project_uid, batch_uid, value_filter, start, size
+    )
 
 
 @mapper_router.post("/mappings/create")
 async def create_mapping(
     mapping: MappingItemCreate,
     mapper_service: FromDishka[MapperService],
+    background_operation_service: FromDishka[BackgroundOperationService],
+    response: Response,
     logger: Logger,
-) -> MappingItem:
+) -> MappingItem | Operation:
     """Create a new mapping.
 
+    For a mapper mapping more attributes than the background threshold the
+    mapping is created here and applied by a worker, answered with 202 and the
+    operation to follow.
+
     Parameters
     ----------
     mapping: MappingItemCreate
@@ -227,6 +247,14 @@ async def create_mapping(
         Created mapping
     """
     logger.debug("Creating mapping.")
+    if await run_in_database_thread(
+        background_operation_service.mapper_is_large, mapping.mapper_uid
+    ):
+        created_mapping = mapper_service.create_mapping(mapping, apply=False)
+        response.status_code = HTTPStatus.ACCEPTED
+        return await background_operation_service.start(
+            OperationKind.APPLY_MAPPING, created_mapping.uid
+        )
     created_mapping = mapper_service.create_mapping(mapping)
     return created_mapping
 
@@ -261,10 +289,15 @@ async def update_mapping(
     mapping_uid: UUID,
     mapping: MappingItem,
     mapper_service: FromDishka[MapperService],
+    background_operation_service: FromDishka[BackgroundOperationService],
+    response: Response,
     logger: Logger,
-) -> MappingItem:
+) -> MappingItem | Operation:
     """Update mapping.
 
+    Applied again by a worker for a mapper mapping more attributes than the
+    background threshold, as when creating one.
+
     Parameters
     ----------
     mapping_uid: UUID
@@ -278,6 +311,14 @@ async def update_mapping(
         Updated mapping
     """
     logger.debug(f"Updating mapping {mapping_uid}")
+    if await run_in_database_thread(
+        background_operation_service.mapper_is_large, mapping.mapper_uid
+    ):
+        updated_mapping = mapper_service.update_mapping(mapping, apply=False)
+        response.status_code = HTTPStatus.ACCEPTED
+        return await background_operation_service.start(
+            OperationKind.APPLY_MAPPING, updated_mapping.uid
+        )
     updated_mapping = mapper_service.update_mapping(mapping)
     return updated_mapping
 
@@ -0,0 +1,51 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""FastAPI router for the metrics of the web app."""
+
+import logging
+from typing import Annotated
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, Depends, Response
+
+from slidetap.metrics import CONTENT_TYPE, REGISTRY, TASK_QUEUE_JOBS
+from slidetap.task import Scheduler
+from slidetap.web.routers.dependencies import create_logger_dependency
+
+metrics_router = APIRouter(
+    tags=["metrics"],
+    route_class=DishkaRoute,
+)
+
+Logger = Annotated[logging.Logger, Depends(create_logger_dependency(__name__))]
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics(
+    scheduler: FromDishka[Scheduler],
+    logger: Logger,
+) -> Response:
+    """Get the metrics of the web app, in the Prometheus text format.
+
+    The jobs in the task queues are counted here rather than by the workers,
+    as every process would count the same jobs.
+    """
+    try:
+        for queue, counts in (await scheduler.count_jobs()).items():
+            for status, count in counts.items():
+                TASK_QUEUE_JOBS.set(count, queue=queue, status=status)
+    except Exception:
+        logger.warning("Failed to count the jobs in the task queues.", exc_info=True)
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,151 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""FastAPI router for following and cancelling background operations."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import Annotated
+from uuid import UUID
+
+from dishka.integrations.fastapi import (
+    DishkaRoute,
+    FromDishka,
+)
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from slidetap.model import Operation
+from slidetap.services import OperationService
+from slidetap.web.database_threads import run_in_database_thread
+from slidetap.web.routers.dependencies import create_logger_dependency
+from slidetap.web.services.login_service import require_valid_token
+
+Logger = Annotated[logging.Logger, Depends(create_logger_dependency(__name__))]
+
+EVENT_INTERVAL = 1.0
+"""Seconds between events sent to a client following an operation. The same
+as how often the operation writes its progress, so that each event can carry
+something new."""
+
+
+operation_router = APIRouter(
+    prefix="/api/operations",
+    tags=["operation"],
+    route_class=DishkaRoute,
+    dependencies=[Depends(require_valid_token)],
+)
+
+
+@operation_router.get("/operation/{operation_uid}")
+async def get_operation(
+    operation_uid: UUID,
+    operation_service: FromDishka[OperationService],
+    logger: Logger,
+) -> Operation:
+    """Get an operation, to poll how far it has come.
+
+    Parameters
+    ----------
+    operation_uid: UUID
+        ID of operation
+
+    Returns
+    ----------
+    Operation
+        The operation
+    """
+    operation = operation_service.get(operation_uid)
+    if operation is None:
+        logger.error(f"No operation found with uid {operation_uid}.")
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Operation not found"
+        )
+    return operation
+
+
+@operation_router.get("/operation/{operation_uid}/events")
+async def get_operation_events(
+    operation_uid: UUID,
+    operation_service: FromDishka[OperationService],
+    logger: Logger,
+) -> StreamingResponse:
+    """Follow an operation as server-sent events.
+
+    Sends the operation as it stands whenever it has changed, and ends the
+    stream once it has finished.
+
+    Parameters
+    ----------
+    operation_uid: UUID
+        ID of operation
+    """
+    if await run_in_database_thread(operation_service.get, operation_uid) is None:
+        logger.error(f"No operation found with uid {operation_uid}.")
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Operation not found"
+        )
+
+    async def events() -> AsyncIterator[str]:
+        sent: str | None = None
+        while True:
+            # Read in the thread pool: a stream is open for as long as the
+            # operation runs, and a read on the event loop holds up every
+            # other request each time it polls.
+            operation = await run_in_database_thread(
+                operation_service.get, operation_uid
+            )
+            if operation is None:
+                return
+            event = operation.model_dump_json(by_alias=True)
+            if event != sent:
+                yield f"data: {event}\n\n"
+                sent = event
+            if operation.status.finished:
+                return
+            await asyncio.sleep(EVENT_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@operation_router.post("/operation/{operation_uid}/cancel")
+async def cancel_operation(
+    operation_uid: UUID,
+    operation_service: FromDishka[OperationService],
+    logger: Logger,
+) -> Operation:
+    """Ask an operation to stop.
+
+    One still queued is stopped at once; one running stops at the next step
+    it reports, and keeps what it did before then.
+
+    Parameters
+    ----------
+    operation_uid: UUID
+        ID of operation
+
+    Returns
+    ----------
+    Operation
+        The operation, as it stands after asking
+    """
+    logger.info(f"Cancelling operation {operation_uid}.")
+    operation = operation_service.cancel(operation_uid)
+    if operation is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Operation not found"
+        )
+    return operation
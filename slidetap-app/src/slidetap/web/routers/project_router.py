@@ -36,6 +36,7 @@ from slidetap.services import (
     ProjectService,
     ValidationService,
 )
+from slidetap.web.database_threads import run_in_database_thread
 from slidetap.web.routers.dependencies import create_logger_dependency
 from slidetap.web.services import (
     ImagePipelineService,
@@ -115,7 +116,7 @@ async def get_projects(
     Iterable[Project]
         List of registered projects
     """
-    projects = project_service.get_all_of_root_schema()
+    projects = await run_in_database_thread(project_service.get_all_of_root_schema)
     return projects
 
 
@@ -242,7 +243,7 @@ async def get_project(
     Project
         Project data.
     """
-    project = project_service.get_optional(project_uid)
+    project = await run_in_database_thread(project_service.get_optional, project_uid)
     if project is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
@@ -292,6 +293,8 @@ async def get_project_validation(
     ProjectValidation
         Validation data if successful.
     """
-    validation = validation_service.get_validation_for_project(project_uid)
+    validation = await run_in_database_thread(
+        validation_service.get_validation_for_project, project_uid
+    )
     logger.debug(f"Validation of project {project_uid}: {validation}")
     return validation
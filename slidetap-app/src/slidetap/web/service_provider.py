@@ -20,6 +20,7 @@ from slidetap.external_interfaces import AuthInterface
 from slidetap.services import ImageCache, ImageService
 from slidetap.task.scheduler import Scheduler
 from slidetap.web.services import (
+    BackgroundOperationService,
     ImagePipelineService,
     LoginService,
     MetadataExportService,
@@ -38,3 +39,4 @@ class WebAppProvider(Provider):
         self.provide(MetadataImportService)
         self.provide(MetadataExportService)
         self.provide(ImagePipelineService)
+        self.provide(BackgroundOperationService)
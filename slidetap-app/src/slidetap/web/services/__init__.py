@@ -13,12 +13,16 @@
 #    limitations under the License.
 
 
+from slidetap.web.services.background_operation_service import (
+    BackgroundOperationService,
+)
 from slidetap.web.services.image_pipeline_service import ImagePipelineService
 from slidetap.web.services.login_service import LoginService
 from slidetap.web.services.metadata_export_service import MetadataExportService
 from slidetap.web.services.metadata_import_service import MetadataImportService
 
 __all__ = [
+    "BackgroundOperationService",
     "ImagePipelineService",
     "LoginService",
     "MetadataImportService",
@@ -0,0 +1,124 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Deciding which curation actions are run in the background, and starting
+them there."""
+
+import logging
+from typing import Any
+from uuid import UUID
+
+from slidetap.config import TaskConfig
+from slidetap.model import Operation, OperationKind
+from slidetap.services import DatabaseService, OperationService
+from slidetap.task import Scheduler
+
+
+class BackgroundOperationService:
+    """Starts curation actions as background operations when they are too large
+    to run in the request asking for them.
+
+    What is large is counted before the action is started, as the rows it is
+    going to touch, and compared with the configured
+    :py:attr:`TaskConfig.background_threshold`. Below it the router runs the
+    action as it always has and answers with its outcome; above it the router
+    answers with the operation, which the client follows until it finishes.
+    """
+
+    def __init__(
+        self,
+        operation_service: OperationService,
+        scheduler: Scheduler,
+        database_service: DatabaseService,
+        config: TaskConfig,
+    ):
+        self._operation_service = operation_service
+        self._scheduler = scheduler
+        self._database_service = database_service
+        self._threshold = config.background_threshold
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def is_large(
+        self,
+        kind: OperationKind,
+        subject_uid: UUID,
+        parameters: dict[str, Any] | None = None,
+    ) -> bool:
+        """Whether the action would touch more rows than the threshold."""
+        parameters = parameters or {}
+        with self._database_service.get_session(commit=False) as session:
+            if kind == OperationKind.FLAG_INVALID:
+                batch_uid = parameters.get("batch_uid")
+                affected = self._database_service.count_items(
+                    session,
+                    dataset_uid=subject_uid,
+                    batch_uid=UUID(batch_uid) if batch_uid is not None else None,
+                )
+            elif kind == OperationKind.DELETE_BATCH:
+                affected = self._database_service.count_items(
+                    session, batch_uid=subject_uid
+                )
+            elif kind in (
+                OperationKind.REMAP_ITEM_HIERARCHY,
+                OperationKind.MOVE_ITEM,
+            ):
+                affected = self._database_service.count_descendants(
+                    session, subject_uid
+                )
+            elif kind == OperationKind.APPLY_MAPPING:
+                mapping = self._database_service.get_optional_mapping(
+                    session, subject_uid
+                )
+                if mapping is None:
+                    return False
+                return self.mapper_is_large(mapping.mapper_uid)
+            else:
+                raise ValueError(f"Unknown operation kind {kind}.")
+        return affected > self._threshold
+
+    def mapper_is_large(self, mapper_uid: UUID) -> bool:
+        """Whether applying a mapping of a mapper would touch more attributes
+        than the threshold, for a mapping that is not created yet."""
+        with self._database_service.get_session(commit=False) as session:
+            mapper = self._database_service.get_optional_mapper(session, mapper_uid)
+            if mapper is None:
+                return False
+            affected = self._database_service.count_attributes_for_schema(
+                session, mapper.root_attribute_schema_uid
+            )
+        return affected > self._threshold
+
+    async def start(
+        self,
+        kind: OperationKind,
+        subject_uid: UUID,
+        parameters: dict[str, Any] | None = None,
+    ) -> Operation:
+        """Record an operation and hand it to a worker.
+
+        An operation that could not be handed over is recorded as failed, so
+        that whoever follows it is told rather than left waiting.
+        """
+        operation = self._operation_service.create(kind, subject_uid, parameters)
+        try:
+            await self._scheduler.run_operation(operation)
+        except Exception as exception:
+            self._logger.error(
+                f"Error scheduling operation {operation.uid}", exc_info=True
+            )
+            failed = self._operation_service.fail(
+                operation.uid, f"Could not be scheduled: {exception}"
+            )
+            return failed if failed is not None else operation
+        return operation
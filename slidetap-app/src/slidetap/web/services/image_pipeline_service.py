@@ -13,11 +13,11 @@
 #    limitations under the License.
 
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
 from functools import partial
 from uuid import UUID
 
-from slidetap.model import Batch, BatchStatus, ImageSchema, ImageStatus, RootSchema
+from slidetap.model import Batch, BatchStatus, ImageStatus, RootSchema
 from slidetap.services import BatchService, DatabaseService, SchemaService
 from slidetap.task import Scheduler
 
@@ -55,9 +55,9 @@ class ImagePipelineService:
         stalled-job recovery handles those (see
         :func:`slidetap.task.tasks.retry_stalled_jobs`).
 
-        An image that failed to store is stored by storing its batch again, as
-        storing is done for a batch at a time. The batch is still storing, as it
-        is not completed while an image it stores has failed to store.
+        An image that failed to store is stored again by itself. The batch is
+        still storing, as it is not completed while an image it stores has
+        failed to store, and the image completes it once stored.
         """
         retry_action: Callable[[], Awaitable[None]] | None = None
 
@@ -85,9 +85,7 @@ class ImagePipelineService:
             elif image.status == ImageStatus.STORING_FAILED:
                 image.set_status_message("")
                 image.reset_as_post_processed()
-                retry_action = partial(
-                    self._scheduler.store_images_in_batch, image.batch.model
-                )
+                retry_action = partial(self._scheduler.store_image, image.model)
             else:
                 return
 
@@ -107,14 +105,12 @@ class ImagePipelineService:
                 )
             batch = self._batch_service.set_as_pre_processing(database_batch, session)
             session.commit()
-        for image_schema in self._image_schemas:
-            self._logger.info(
-                f"Pre-processing images for batch {batch.uid} "
-                f"and schema {image_schema.uid}."
-            )
-            image_uids = self._image_uids_in_batch(batch.uid, image_schema)
-            if image_uids:
-                await self._scheduler.pre_process_images(image_uids)
+        image_uids = self._image_uids_in_batch(batch.uid)
+        self._logger.info(
+            f"Pre-processing {len(image_uids)} images for batch {batch.uid}."
+        )
+        if image_uids:
+            await self._scheduler.pre_process_images(image_uids)
         return batch
 
     async def export(self, batch_uid: UUID) -> Batch | None:
@@ -128,14 +124,12 @@ class ImagePipelineService:
             batch = self._batch_service.set_as_post_processing(
                 database_batch, False, session
             )
-        for image_schema in self._image_schemas:
-            self._logger.info(
-                f"Post processing images of schema {image_schema.name} "
-                f"for batch {batch.uid}."
-            )
-            image_uids = self._image_uids_in_batch(batch.uid, image_schema)
-            if image_uids:
-                await self._scheduler.post_process_images(image_uids)
+        image_uids = self._image_uids_in_batch(batch.uid)
+        self._logger.info(
+            f"Post processing {len(image_uids)} images for batch {batch.uid}."
+        )
+        if image_uids:
+            await self._scheduler.post_process_images(image_uids)
         return batch
 
     async def store_project(self, project_uid: UUID) -> None:
@@ -145,6 +139,9 @@ class ImagePipelineService:
         a batch reopened until then leaves nothing behind in a bundle that has
         been handed over. A batch already storing is stored again, which is how
         an attempt that failed part-way is resumed.
+
+        Each image left to store is stored by a task of its own, the last of
+        which completes the batch. A batch with none left is completed here.
         """
         for batch in self._batch_service.get_all(project_uid=project_uid):
             if batch.status in (
@@ -152,13 +149,30 @@ class ImagePipelineService:
                 BatchStatus.IMAGE_STORING,
             ):
                 stored = self._batch_service.set_as_storing(batch.uid)
-                await self._scheduler.store_images_in_batch(stored)
+                image_uids = self._image_uids_in_batch(
+                    stored.uid,
+                    selected=True,
+                    status_filter=[ImageStatus.POST_PROCESSED, ImageStatus.STORING],
+                )
+                if image_uids:
+                    await self._scheduler.store_images(image_uids)
+                    continue
+                with self._database_service.get_session() as session:
+                    self._batch_service.finish_storing(stored.uid, session)
 
     def _image_uids_in_batch(
-        self, batch_uid: UUID, image_schema: ImageSchema
+        self,
+        batch_uid: UUID,
+        selected: bool | None = None,
+        status_filter: Iterable[ImageStatus] | None = None,
     ) -> list[UUID]:
+        """The images of every image schema in a batch, read in one query of
+        their uids rather than loading the images of one schema at a time."""
         with self._database_service.get_session(commit=False) as session:
-            images = self._database_service.get_images(
-                session, schema=image_schema, batch=batch_uid
+            return self._database_service.get_image_uids(
+                session,
+                batch_uid,
+                [image_schema.uid for image_schema in self._image_schemas],
+                selected=selected,
+                status_filter=status_filter,
             )
-            return [image.uid for image in images]
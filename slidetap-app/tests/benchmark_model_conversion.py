@@ -0,0 +1,147 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Time turning rows into models, as the list endpoints do, both ways.
+
+Not a test: timings depend on the machine, and a test failing because the
+machine it ran on was busy says nothing about the code. Run it before and
+after a change to the models or the JSON columns, and compare.
+
+What is timed, each against what it replaced:
+
+- reading object attribute values from their JSON, where nothing uses the
+  nested attributes -- against validating every one of them as it is read;
+- building items with their attributes as models from rows -- against
+  validating each model as it is built.
+
+Run from ``slidetap-app``::
+
+    uv run python tests/benchmark_model_conversion.py
+"""
+
+import sys
+from collections.abc import Callable
+from timeit import repeat
+from typing import Any
+from uuid import uuid4
+
+from slidetap.database import (
+    DatabaseObjectAttribute,
+    DatabaseSample,
+    DatabaseStringAttribute,
+)
+from slidetap.database.types import AttributeDictJson
+from slidetap.model import ReviewStatus, Sample, StringAttribute, attribute_factory
+
+ITEMS = 500
+ATTRIBUTES = 10
+NESTED = 5
+REPEATS = 5
+
+
+def _stored_object_values() -> list[dict[str, Any]]:
+    """Object attribute values, as their JSON column holds them."""
+    return [
+        {
+            f"nested {index}": StringAttribute(
+                uid=uuid4(), schema_uid=uuid4(), original_value=f"value {index}"
+            ).model_dump(mode="json", by_alias=True)
+            for index in range(NESTED)
+        }
+        for _ in range(ITEMS * ATTRIBUTES)
+    ]
+
+
+def _samples() -> list[DatabaseSample]:
+    """Samples with string and object attributes, as if read from rows."""
+    samples = []
+    for index in range(ITEMS):
+        attributes: list = []
+        for attribute_index in range(ATTRIBUTES):
+            attribute = (
+                DatabaseStringAttribute(
+                    f"string {attribute_index}", uuid4(), "value", valid=True
+                )
+                if attribute_index % 2
+                else DatabaseObjectAttribute(
+                    f"object {attribute_index}",
+                    uuid4(),
+                    original_value={
+                        "nested": StringAttribute(
+                            uid=uuid4(), schema_uid=uuid4(), original_value="value"
+                        )
+                    },
+                    valid=True,
+                )
+            )
+            attribute.uid = uuid4()
+            attribute.rejected = 0
+            attributes.append(attribute)
+        sample = DatabaseSample(
+            uuid4(), uuid4(), uuid4(), f"sample {index}", attributes=attributes
+        )
+        sample.valid_attributes = True
+        sample.valid_relations = True
+        sample.valid_pseudonym = True
+        sample.review_status = ReviewStatus.NOT_REVIEWED
+        samples.append(sample)
+    return samples
+
+
+def _validated(sample: DatabaseSample) -> Sample:
+    """A sample built the way ``DatabaseSample.model`` used to, validating
+    each attribute and then the item."""
+    constructed = sample.model
+    return Sample(
+        **{
+            **{name: getattr(constructed, name) for name in Sample.model_fields},
+            "attributes": {
+                tag: type(attribute).model_validate(dict(attribute))
+                for tag, attribute in constructed.attributes.items()
+            },
+        }
+    )
+
+
+def _best(run: Callable[[], object]) -> float:
+    return min(repeat(run, number=1, repeat=REPEATS))
+
+
+def main() -> int:
+    json_type = AttributeDictJson()
+    stored = _stored_object_values()
+    lazy = _best(
+        lambda: [json_type.process_result_value(value, None) for value in stored]  # type: ignore[arg-type]
+    )
+    eager = _best(
+        lambda: [
+            {key: attribute_factory(dict(nested)) for key, nested in value.items()}
+            for value in stored
+        ]
+    )
+    samples = _samples()
+    constructed = _best(lambda: [sample.model for sample in samples])
+    validated = _best(lambda: [_validated(sample) for sample in samples])
+
+    print(f"{'':40}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name, before, after in (
+        (f"read {len(stored)} object values", eager, lazy),
+        (f"build {ITEMS} samples with {ATTRIBUTES} attributes", validated, constructed),
+    ):
+        print(f"{name:40}{before:>9.3f}s{after:>9.3f}s{before / after:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,32 +13,160 @@
 #    limitations under the License.
 
 import datetime
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, TypeVar
 from uuid import UUID, uuid4
 
 import pytest
 from slidetap_example import ExampleSchema
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 
 from slidetap.config import DatabaseConfig
-from slidetap.database import Base
+from slidetap.database import (
+    Base,
+    DatabaseAnnotation,
+    DatabaseBatchImageProgress,
+    DatabaseBatchValidation,
+    DatabaseImage,
+    DatabaseItem,
+    DatabaseObservation,
+    DatabaseSample,
+)
 from slidetap.model import (
     Batch,
+    BatchCreate,
     BatchStatus,
     Code,
     CodeAttribute,
     Dataset,
+    ImageFormat,
     Project,
     RootSchema,
 )
 from slidetap.services import DatabaseService
 
+ItemType = TypeVar("ItemType", bound=DatabaseItem)
+
+
+@dataclass
+class CaseBuilder:
+    """Adds the items of a case to a batch, each by the name of its schema, in
+    the session the case is built in."""
+
+    session: Session
+    dataset_uid: UUID
+    batch_uid: UUID
+    schemas: dict[str, UUID]
+
+    def sample(
+        self,
+        schema: str,
+        identifier: str,
+        parents: list[DatabaseSample] | None = None,
+        **kwargs: Any,
+    ) -> DatabaseSample:
+        return self._added(
+            DatabaseSample(
+                self.dataset_uid,
+                self.batch_uid,
+                self.schemas[schema],
+                identifier,
+                parents=parents,
+                **kwargs,
+            )
+        )
+
+    def image(
+        self, schema: str, identifier: str, samples: list[DatabaseSample]
+    ) -> DatabaseImage:
+        return self._added(
+            DatabaseImage(
+                self.dataset_uid,
+                self.batch_uid,
+                self.schemas[schema],
+                identifier,
+                ImageFormat.DICOM_WSI,
+                samples,
+            )
+        )
+
+    def annotation(
+        self, schema: str, identifier: str, image: DatabaseImage
+    ) -> DatabaseAnnotation:
+        return self._added(
+            DatabaseAnnotation(
+                self.dataset_uid,
+                self.batch_uid,
+                self.schemas[schema],
+                identifier,
+                image,
+            )
+        )
+
+    def observation(
+        self,
+        schema: str,
+        identifier: str,
+        item: DatabaseAnnotation | DatabaseImage | DatabaseSample,
+        **kwargs: Any,
+    ) -> DatabaseObservation:
+        return self._added(
+            DatabaseObservation(
+                self.dataset_uid,
+                self.batch_uid,
+                self.schemas[schema],
+                identifier,
+                item,
+                **kwargs,
+            )
+        )
+
+    def _added(self, item: ItemType) -> ItemType:
+        self.session.add(item)
+        return item
+
+
+def kept_counts(
+    database_service: DatabaseService,
+    table: type[DatabaseBatchImageProgress | DatabaseBatchValidation],
+    batch_uid: UUID,
+) -> tuple[int, ...] | None:
+    """The counts a table of them keeps of a batch, in the order of its columns,
+    or None where it keeps none."""
+    with database_service.get_session() as session:
+        kept = session.get(table, batch_uid)
+        if kept is None:
+            return None
+        return tuple(
+            getattr(kept, column.key)
+            for column in table.__table__.columns
+            if not column.primary_key
+        )
+
 
 @pytest.fixture
 def schema():
     yield ExampleSchema()
 
 
+@pytest.fixture()
+def schemas(schema: RootSchema) -> dict[str, UUID]:
+    """The uid of each item schema of the example, by its name."""
+    return {
+        item.name: item.uid
+        for item in (
+            *schema.samples.values(),
+            *schema.images.values(),
+            *schema.observations.values(),
+            *schema.annotations.values(),
+        )
+    }
+
+
 @pytest.fixture()
 def sqlite_database_service(tmp_path: Path) -> DatabaseService:
     """A DatabaseService backed by a throwaway SQLite file.
@@ -51,6 +179,30 @@ def sqlite_database_service(tmp_path: Path) -> DatabaseService:
     return DatabaseService(DatabaseConfig(uri, False))
 
 
+@pytest.fixture()
+def counted_statements(
+    sqlite_database_service: DatabaseService,
+) -> Callable[[], AbstractContextManager[list[str]]]:
+    """Collects the statements run on the test database within a block, for
+    tests pinning how many statements something takes."""
+
+    @contextmanager
+    def counted() -> Iterator[list[str]]:
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = sqlite_database_service._engine
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+    return counted
+
+
 @pytest.fixture()
 def mapper_uid(sqlite_database_service: DatabaseService) -> UUID:
     with sqlite_database_service.get_session() as session:
@@ -103,3 +255,36 @@ def batch(project: Project):
         is_default=True,
         created=datetime.datetime(2021, 1, 1),
     )
+
+
+@pytest.fixture()
+def batch_uid(
+    sqlite_database_service: DatabaseService, dataset: Dataset, project: Project
+) -> UUID:
+    """A batch in the test database, with its dataset and project stored."""
+    with sqlite_database_service.get_session() as session:
+        sqlite_database_service.add_dataset(session, dataset)
+        sqlite_database_service.add_project(session, project)
+        batch = sqlite_database_service.add_batch(
+            session, BatchCreate(name="batch", project_uid=project.uid)
+        )
+        session.commit()
+        return batch.uid
+
+
+@pytest.fixture()
+def build_case(
+    sqlite_database_service: DatabaseService,
+    dataset: Dataset,
+    batch_uid: UUID,
+    schemas: dict[str, UUID],
+) -> Callable[[], AbstractContextManager[CaseBuilder]]:
+    """Builds a case in the batch, committed as the block it is built in ends.
+    Its items are read by uid within the block, as they are not after it."""
+
+    @contextmanager
+    def build() -> Iterator[CaseBuilder]:
+        with sqlite_database_service.get_session() as session:
+            yield CaseBuilder(session, dataset.uid, batch_uid, schemas)
+
+    return build
@@ -0,0 +1,195 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for attributes of every kind being read with the row they are on.
+
+Against a real database: what is pinned is how many statements reading the
+attributes of a page of items takes, whatever kinds of attribute they have,
+and a mock cannot count statements.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from slidetap.database import (
+    DatabaseAttribute,
+    DatabaseBooleanAttribute,
+    DatabaseCodeAttribute,
+    DatabaseDatetimeAttribute,
+    DatabaseEnumAttribute,
+    DatabaseListAttribute,
+    DatabaseMeasurementAttribute,
+    DatabaseNumericAttribute,
+    DatabaseObjectAttribute,
+    DatabaseSample,
+    DatabaseStringAttribute,
+    DatabaseUnionAttribute,
+)
+from slidetap.model import (
+    BatchCreate,
+    Code,
+    Dataset,
+    Measurement,
+    Project,
+    RootSchema,
+    SampleSchema,
+    StringAttribute,
+)
+from slidetap.services import DatabaseService
+
+
+def every_kind() -> list[DatabaseAttribute]:
+    """One attribute of each kind, private ones being the same kinds."""
+    nested = StringAttribute(uid=uuid4(), schema_uid=uuid4(), original_value="v")
+    return [
+        DatabaseStringAttribute("string", uuid4(), "value"),
+        DatabaseEnumAttribute("enum", uuid4(), "value"),
+        DatabaseDatetimeAttribute("datetime", uuid4(), datetime(2026, 1, 1)),
+        DatabaseNumericAttribute("numeric", uuid4(), 1.0),
+        DatabaseMeasurementAttribute(
+            "measurement", uuid4(), Measurement(value=1, unit="mm")
+        ),
+        DatabaseCodeAttribute(
+            "code", uuid4(), Code(code="1", scheme="scheme", meaning="meaning")
+        ),
+        DatabaseBooleanAttribute("boolean", uuid4(), True),
+        DatabaseObjectAttribute("object", uuid4(), original_value={"v": nested}),
+        DatabaseListAttribute("list", uuid4(), original_value=[nested]),
+        DatabaseUnionAttribute("union", uuid4(), original_value=nested),
+    ]
+
+
+@pytest.fixture()
+def slide(schema: RootSchema) -> SampleSchema:
+    return next(sample for sample in schema.samples.values() if sample.name == "slide")
+
+
+def add_samples(
+    database_service: DatabaseService,
+    dataset: Dataset,
+    project: Project,
+    slide: SampleSchema,
+    count: int,
+) -> None:
+    with database_service.get_session() as session:
+        database_service.add_dataset(session, dataset)
+        database_service.add_project(session, project)
+        batch = database_service.add_batch(
+            session, BatchCreate(name="batch", project_uid=project.uid)
+        )
+        for index in range(count):
+            session.add(
+                DatabaseSample(
+                    dataset.uid,
+                    batch.uid,
+                    slide.uid,
+                    f"slide {index}",
+                    attributes=every_kind(),
+                )
+            )
+        session.commit()
+
+
+@pytest.mark.integration
+class TestEveryKindOfAttributeInOneRead:
+    @pytest.mark.parametrize("count", [1, 5])
+    def test_models_of_a_page_of_items(
+        self,
+        sqlite_database_service: DatabaseService,
+        dataset: Dataset,
+        project: Project,
+        slide: SampleSchema,
+        count: int,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+    ):
+        # Arrange
+        add_samples(sqlite_database_service, dataset, project, slide, count)
+
+        with sqlite_database_service.get_session() as session:
+            # Act
+            with counted_statements() as statements:
+                samples = [
+                    sample.model
+                    for sample in sqlite_database_service.get_samples(
+                        session, slide, load_relations=True
+                    )
+                ]
+
+            # Assert: the samples, and one statement for each relationship the
+            # model reads -- the attributes among them, whatever their kinds.
+            assert len(statements) == 8
+            assert len(samples) == count
+            assert all(len(sample.attributes) == 10 for sample in samples)
+
+    def test_values_are_read_with_the_attribute(
+        self,
+        sqlite_database_service: DatabaseService,
+        dataset: Dataset,
+        project: Project,
+        slide: SampleSchema,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+    ):
+        # Arrange
+        add_samples(sqlite_database_service, dataset, project, slide, 1)
+
+        with sqlite_database_service.get_session() as session:
+            sample = next(iter(sqlite_database_service.get_samples(session, slide)))
+
+            # Act
+            with counted_statements() as statements:
+                values = {
+                    attribute.tag: attribute.original_value
+                    for attribute in sample.attributes
+                }
+
+            # Assert
+            assert len(statements) == 1
+            assert values["numeric"] == 1.0
+            assert values["code"] == Code(code="1", scheme="scheme", meaning="meaning")
+
+    def test_attributes_of_items_in_one_statement(
+        self,
+        sqlite_database_service: DatabaseService,
+        dataset: Dataset,
+        project: Project,
+        slide: SampleSchema,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+    ):
+        # Arrange
+        add_samples(sqlite_database_service, dataset, project, slide, 3)
+        with sqlite_database_service.get_session() as session:
+            uids: list[UUID] = [
+                sample.uid
+                for sample in sqlite_database_service.get_samples(session, slide)
+            ]
+
+        with sqlite_database_service.get_session() as session:
+            # Act
+            with counted_statements() as statements:
+                attributes = sqlite_database_service.get_attributes_of_items(
+                    session, uids
+                )
+                values = [
+                    attribute.original_value
+                    for loaded in attributes.values()
+                    for attribute in loaded
+                ]
+
+            # Assert
+            assert len(statements) == 1
+            assert len(values) == 30
@@ -0,0 +1,193 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for attributes nested in a row being read when first used.
+
+What is pinned is that an entry read back from its JSON is never handed out as
+JSON, whichever way it is read, and that one nobody read is written back as it
+was stored.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from slidetap.database import (
+    DatabaseListAttribute,
+    DatabaseObjectAttribute,
+    DatabaseStringAttribute,
+)
+from slidetap.database.types import (
+    AttributeDictJson,
+    AttributeListJson,
+    LazyAttributeDict,
+    LazyAttributeList,
+)
+from slidetap.model import ListAttribute, ObjectAttribute, StringAttribute
+
+
+def string(value: str) -> StringAttribute:
+    return StringAttribute(uid=uuid4(), schema_uid=uuid4(), original_value=value)
+
+
+def stored(*values: str) -> list[dict]:
+    """Attributes as a JSON column holds them."""
+    return [string(value).model_dump(mode="json", by_alias=True) for value in values]
+
+
+@pytest.mark.unittest
+class TestLazyAttributeDict:
+    @pytest.fixture()
+    def lazy(self) -> LazyAttributeDict:
+        first, second = stored("first", "second")
+        return AttributeDictJson().process_result_value(
+            {"first": first, "second": second},
+            None,  # type: ignore[arg-type]
+        )
+
+    def test_nothing_is_read_until_looked_up(self, lazy: LazyAttributeDict):
+        # Act
+        value = lazy["first"]
+
+        # Assert
+        assert isinstance(value, StringAttribute)
+        assert value.original_value == "first"
+        held = dict(lazy.stored_items())
+        assert isinstance(held["first"], StringAttribute)
+        assert isinstance(held["second"], dict)
+
+    @pytest.mark.parametrize(
+        "read",
+        [
+            lambda lazy: list(lazy.values()),
+            lambda lazy: [value for _, value in lazy.items()],
+            lambda lazy: list(dict(lazy).values()),
+            lambda lazy: list({**lazy}.values()),
+            lambda lazy: [lazy.get(key) for key in lazy],
+            lambda lazy: list(lazy.copy().values()),
+        ],
+    )
+    def test_every_way_of_reading_hands_out_attributes(
+        self, lazy: LazyAttributeDict, read
+    ):
+        assert all(isinstance(value, StringAttribute) for value in read(lazy))
+
+    def test_equal_whether_read_or_not(self, lazy: LazyAttributeDict):
+        # Arrange
+        read = LazyAttributeDict(lazy)
+
+        # Assert
+        assert read == {key: lazy[key] for key in lazy}
+        assert lazy == read
+
+    def test_what_was_not_read_is_written_back_as_stored(self, lazy: LazyAttributeDict):
+        # Arrange
+        before = dict(lazy.stored_items())
+
+        # Act
+        written = AttributeDictJson().process_bind_param(lazy, None)  # type: ignore[arg-type]
+
+        # Assert
+        assert written == before
+
+
+@pytest.mark.unittest
+class TestLazyAttributeList:
+    @pytest.fixture()
+    def lazy(self) -> LazyAttributeList:
+        return AttributeListJson().process_result_value(
+            stored("first", "second"),
+            None,  # type: ignore[arg-type]
+        )
+
+    @pytest.mark.parametrize(
+        "read",
+        [
+            lambda lazy: list(lazy),
+            lambda lazy: [lazy[0], lazy[1]],
+            lambda lazy: lazy[:],
+            lambda lazy: [] + lazy,
+            lambda lazy: lazy + [],
+            lambda lazy: list(reversed(lazy)),
+            lambda lazy: lazy.copy(),
+        ],
+    )
+    def test_every_way_of_reading_hands_out_attributes(
+        self, lazy: LazyAttributeList, read
+    ):
+        values = read(lazy)
+
+        assert len(values) == 2
+        assert all(isinstance(value, StringAttribute) for value in values)
+
+    def test_what_was_not_read_is_written_back_as_stored(self, lazy: LazyAttributeList):
+        # Arrange
+        before = list(lazy.stored_items())
+
+        # Act
+        written = AttributeListJson().process_bind_param(lazy, None)  # type: ignore[arg-type]
+
+        # Assert
+        assert written == before
+
+
+@pytest.mark.unittest
+class TestConstructedModels:
+    """A model built from a row says what a validated one would."""
+
+    def test_a_plain_attribute(self):
+        # Arrange
+        attribute = DatabaseStringAttribute("tag", uuid4(), "value", valid=True)
+        attribute.uid = uuid4()
+
+        # Act
+        model = attribute.model
+
+        # Assert
+        assert model == StringAttribute.model_validate(model.model_dump())
+
+    def test_an_object_does_not_share_its_values_with_the_row(self):
+        # Arrange
+        attribute = DatabaseObjectAttribute(
+            "tag", uuid4(), original_value={"nested": string("value")}
+        )
+        attribute.uid = uuid4()
+
+        # Act
+        model = attribute.model
+        assert model.original_value is not None
+        model.original_value["other"] = string("other")
+
+        # Assert
+        assert isinstance(model, ObjectAttribute)
+        assert attribute.original_value is not None
+        assert list(attribute.original_value) == ["nested"]
+
+    def test_a_list_read_from_json_is_handed_out_as_attributes(self):
+        # Arrange
+        attribute = DatabaseListAttribute("tag", uuid4())
+        attribute.uid = uuid4()
+        attribute.original_value = AttributeListJson().process_result_value(
+            stored("first"),
+            None,  # type: ignore[arg-type]
+        )
+
+        # Act
+        model = attribute.model
+
+        # Assert
+        assert isinstance(model, ListAttribute)
+        assert model.original_value is not None
+        assert isinstance(model.original_value[0], StringAttribute)
+        assert model == ListAttribute.model_validate(model.model_dump())
@@ -12,7 +12,9 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import asyncio
 import io
+from datetime import datetime
 from http import HTTPStatus
 from uuid import uuid4
 
@@ -24,10 +26,17 @@ from dishka.integrations.fastapi import setup_dishka
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from slidetap.model import Batch, BatchStatus
+from slidetap.model import (
+    Batch,
+    BatchStatus,
+    Operation,
+    OperationKind,
+    OperationStatus,
+)
 from slidetap.services import BatchService
 from slidetap.web.routers import batch_router
 from slidetap.web.services import (
+    BackgroundOperationService,
     ImagePipelineService,
     LoginService,
     MetadataImportService,
@@ -54,6 +63,11 @@ def metadata_import_service(decoy: Decoy):
     return decoy.mock(cls=MetadataImportService)
 
 
+@pytest.fixture()
+def background_operation_service(decoy: Decoy):
+    return decoy.mock(cls=BackgroundOperationService)
+
+
 @pytest.fixture()
 def batch_router_app(
     simple_app: FastAPI,
@@ -61,6 +75,7 @@ def batch_router_app(
     batch_service: BatchService,
     image_pipeline_service: ImagePipelineService,
     metadata_import_service: MetadataImportService,
+    background_operation_service: BackgroundOperationService,
 ):
     service_provider = Provider(scope=Scope.APP)
     service_provider.provide(lambda: login_service, provides=LoginService)
@@ -71,6 +86,9 @@ def batch_router_app(
     service_provider.provide(
         lambda: metadata_import_service, provides=MetadataImportService
     )
+    service_provider.provide(
+        lambda: background_operation_service, provides=BackgroundOperationService
+    )
 
     container = make_async_container(service_provider)
     simple_app.include_router(batch_router, tags=["batch"])
@@ -110,6 +128,40 @@ class TestSlideTapBatchRouter:
         # Assert
         assert response.status_code == HTTPStatus.OK
 
+    @pytest.mark.asyncio
+    async def test_delete_large_batch_is_started_as_operation(
+        self,
+        decoy: Decoy,
+        test_client: TestClient,
+        batch: Batch,
+        batch_service: BatchService,
+        background_operation_service: BackgroundOperationService,
+    ):
+        # Arrange
+        operation = Operation(
+            uid=uuid4(),
+            kind=OperationKind.DELETE_BATCH,
+            subject_uid=batch.uid,
+            status=OperationStatus.QUEUED,
+            created_at=datetime.now(),
+        )
+        decoy.when(
+            background_operation_service.is_large(OperationKind.DELETE_BATCH, batch.uid)
+        ).then_return(True)
+        decoy.when(
+            await background_operation_service.start(
+                OperationKind.DELETE_BATCH, batch.uid
+            )
+        ).then_return(operation)
+
+        # Act
+        response = test_client.delete(f"api/batches/batch/{batch.uid}")
+
+        # Assert
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert response.json()["uid"] == str(operation.uid)
+        decoy.verify(batch_service.delete(batch.uid), times=0)
+
     @pytest.mark.asyncio
     async def test_upload_valid(
         self,
@@ -138,6 +190,28 @@ class TestSlideTapBatchRouter:
         # Assert
         assert response.status_code == HTTPStatus.OK
 
+    def test_get_batch_is_read_off_the_event_loop(
+        self,
+        decoy: Decoy,
+        test_client: TestClient,
+        batch: Batch,
+        batch_service: BatchService,
+    ):
+        # Arrange: a blocking read run on the event loop would find it running.
+        def get(batch_uid):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return batch
+
+        decoy.when(batch_service.get(batch.uid)).then_do(get)
+
+        # Act
+        response = test_client.get(f"api/batches/batch/{batch.uid}")
+
+        # Assert
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["uid"] == str(batch.uid)
+
     def test_upload_no_file(
         self,
         test_client: TestClient,
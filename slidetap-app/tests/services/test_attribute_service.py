@@ -12,21 +12,27 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from typing import Literal
 from uuid import UUID, uuid4
 
 import pytest
-from decoy import Decoy
+from decoy import Decoy, matchers
 from slidetap_example.schema import ExampleSchema
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from slidetap.database import DatabaseAttribute
+from slidetap.database import DatabaseAttribute, DatabaseSample, DatabaseUnmappedValue
 from slidetap.model import (
     AttributeDisplay,
+    BatchCreate,
     Code,
     CodeAttribute,
     CodeAttributeSchema,
+    Dataset,
     EnumAttributeSchema,
+    Project,
     RejectedValues,
 )
 from slidetap.services import (
@@ -267,6 +273,52 @@ class TestAttributeService:
                 times=1,
             )
 
+    @pytest.mark.parametrize("parent", ["item"])
+    def test_update_as_it_was_writes_nothing(
+        self,
+        decoy: Decoy,
+        attribute_service: AttributeService,
+        database_service: DatabaseService,
+        schema_service: SchemaService,
+        validation_service: ValidationService,
+        code_attribute: CodeAttribute,
+        parent: Literal["item", "project", "dataset"],
+        database_attribute: DatabaseAttribute,
+    ):
+        # Arrange
+        session = decoy.mock(cls=Session)
+        attribute_schema = decoy.mock(cls=CodeAttributeSchema)
+        decoy.when(database_service.get_session(None)).then_enter_with(session)
+        decoy.when(
+            schema_service.get_any_attribute(code_attribute.schema_uid)
+        ).then_return(attribute_schema)
+        decoy.when(
+            database_service.get_attribute(session, code_attribute.uid)
+        ).then_return(database_attribute)
+        decoy.when(database_attribute.holds(code_attribute)).then_return(True)
+        decoy.when(database_attribute.model).then_return(code_attribute)
+
+        # Act
+        result = attribute_service.update(code_attribute)
+
+        # Assert
+        assert result == code_attribute
+        decoy.verify(
+            database_attribute.set_value(
+                matchers.Anything(),
+                matchers.Anything(),
+            ),
+            times=0,
+        )
+        decoy.verify(
+            database_service.record_unmapped_values(database_attribute, session),
+            times=0,
+        )
+        decoy.verify(
+            validation_service.validate_attribute(database_attribute, session),
+            times=0,
+        )
+
     @pytest.mark.parametrize("parent", ["item"])
     def test_update_carries_what_the_curator_refused(
         self,
@@ -373,6 +425,121 @@ class TestAttributeService:
             )
 
 
+@pytest.mark.integration
+class TestUpdateForItem:
+    """Against a real database, where storing the attributes of an item as a
+    group has to end as storing them one by one did."""
+
+    @pytest.fixture()
+    def stored_attribute_service(
+        self, sqlite_database_service: DatabaseService, schema: ExampleSchema
+    ) -> AttributeService:
+        schema_service = SchemaService(schema)
+        validation_service = ValidationService(schema_service, sqlite_database_service)
+        return AttributeService(
+            schema_service,
+            validation_service,
+            sqlite_database_service,
+            ReviewService(schema_service, validation_service, sqlite_database_service),
+        )
+
+    @pytest.fixture()
+    def collection(self, schema: ExampleSchema) -> CodeAttribute:
+        return CodeAttribute(
+            uid=uuid4(),
+            schema_uid=schema.specimen.attributes["collection"].uid,
+            mappable_value="Hudstans",
+        )
+
+    @pytest.fixture()
+    def specimen_uid(
+        self,
+        sqlite_database_service: DatabaseService,
+        schema: ExampleSchema,
+        dataset: Dataset,
+        project: Project,
+        collection: CodeAttribute,
+    ) -> UUID:
+        with sqlite_database_service.get_session() as session:
+            sqlite_database_service.add_dataset(session, dataset)
+            sqlite_database_service.add_project(session, project)
+            batch = sqlite_database_service.add_batch(
+                session, BatchCreate(name="batch", project_uid=project.uid)
+            )
+            specimen = DatabaseSample(
+                dataset.uid, batch.uid, schema.specimen.uid, "PL1234-20-1"
+            )
+            specimen.attributes.add(
+                sqlite_database_service.add_attribute(
+                    session, collection, schema.specimen.attributes["collection"]
+                )
+            )
+            session.add(specimen)
+            session.commit()
+            return specimen.uid
+
+    def test_updates_and_adds_as_a_group(
+        self,
+        stored_attribute_service: AttributeService,
+        sqlite_database_service: DatabaseService,
+        schema: ExampleSchema,
+        collection: CodeAttribute,
+        specimen_uid: UUID,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        # Arrange: looked up together, not one at a time.
+        def get_optional_attribute(*args, **kwargs):
+            raise AssertionError("Attribute looked up on its own.")
+
+        monkeypatch.setattr(
+            sqlite_database_service, "get_optional_attribute", get_optional_attribute
+        )
+
+        # Act
+        stored_attribute_service.update_for_item(
+            specimen_uid,
+            [
+                collection.model_copy(update={"mappable_value": "Biopsi"}),
+                CodeAttribute(
+                    uid=uuid4(),
+                    schema_uid=schema.specimen.attributes["fixation"].uid,
+                    mappable_value="Formalin",
+                ),
+            ],
+        )
+
+        # Assert
+        with sqlite_database_service.get_session() as session:
+            specimen = session.get_one(DatabaseSample, specimen_uid)
+            assert {
+                attribute.tag: attribute.mappable_value
+                for attribute in specimen.attributes
+            } == {"collection": "Biopsi", "fixation": "Formalin"}
+            recorded = session.scalars(select(DatabaseUnmappedValue.value)).all()
+            assert sorted(recorded) == ["Biopsi", "Formalin"]
+
+    def test_saving_as_it_was_writes_nothing(
+        self,
+        stored_attribute_service: AttributeService,
+        collection: CodeAttribute,
+        specimen_uid: UUID,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+    ):
+        # Act
+        with counted_statements() as statements:
+            stored_attribute_service.update_for_item(
+                specimen_uid, [collection.model_copy()]
+            )
+
+        # Assert
+        written = [
+            statement
+            for statement in statements
+            if not statement.lstrip().upper().startswith("SELECT")
+        ]
+        assert written == []
+
+
 class TestEmptyAttributeFromSchema:
     """A created item carries the schema's defaults, which is the only way a
     read-only attribute — one the curator cannot set — ever gets a value."""
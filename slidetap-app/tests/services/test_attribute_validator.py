@@ -0,0 +1,181 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for validators compiled from attribute schemas."""
+
+from uuid import uuid4
+
+import pytest
+from slidetap_example.schema import ExampleSchema
+
+from slidetap.model import (
+    CodeAttribute,
+    EnumAttribute,
+    EnumAttributeSchema,
+    NumericAttribute,
+    NumericAttributeSchema,
+    ObjectAttribute,
+    ObjectAttributeSchema,
+    StringAttribute,
+    StringAttributeSchema,
+    UnionAttribute,
+    UnionAttributeSchema,
+)
+from slidetap.services import SchemaService
+from slidetap.services.validators.attribute_validator import AttributeValidator
+
+
+def string_schema(optional: bool = False) -> StringAttributeSchema:
+    return StringAttributeSchema(
+        uid=uuid4(),
+        tag="comment",
+        name="comment",
+        display_name="Comment",
+        optional=optional,
+        read_only=False,
+    )
+
+
+@pytest.mark.unittest
+class TestCompiledValidators:
+    @pytest.mark.parametrize(
+        ["value", "expected"], [("HE", True), ("PAS", False), ("", False)]
+    )
+    def test_enum_value_must_be_allowed(self, value: str, expected: bool):
+        # Arrange
+        schema = EnumAttributeSchema(
+            uid=uuid4(),
+            tag="staining",
+            name="staining",
+            display_name="Staining",
+            optional=False,
+            read_only=False,
+            allowed_values=("HE", "IHC"),
+        )
+        attribute = EnumAttribute(
+            uid=uuid4(), schema_uid=schema.uid, original_value=value
+        )
+
+        # Act
+        valid = AttributeValidator.compile(schema)(attribute)
+
+        # Assert
+        assert valid is expected
+        assert attribute.valid is expected
+
+    @pytest.mark.parametrize(
+        ["value", "expected"], [(2.0, True), (2.5, False), (11.0, False)]
+    )
+    def test_numeric_value_must_be_whole_and_in_range(
+        self, value: float, expected: bool
+    ):
+        # Arrange
+        schema = NumericAttributeSchema(
+            uid=uuid4(),
+            tag="count",
+            name="count",
+            display_name="Count",
+            optional=False,
+            read_only=False,
+            is_integer=True,
+            min_value=0,
+            max_value=10,
+        )
+        attribute = NumericAttribute(
+            uid=uuid4(), schema_uid=schema.uid, original_value=value
+        )
+
+        # Act
+        valid = AttributeValidator.compile(schema)(attribute)
+
+        # Assert
+        assert valid is expected
+
+    def test_object_validates_each_nested_attribute(self):
+        # Arrange
+        required, optional = string_schema(), string_schema(optional=True)
+        schema = ObjectAttributeSchema(
+            uid=uuid4(),
+            tag="statement",
+            name="statement",
+            display_name="Statement",
+            optional=False,
+            read_only=False,
+            display_attributes_in_parent=False,
+            display_value_tags=[],
+            attributes={"required": required, "optional": optional},
+        )
+        nested = StringAttribute(uid=uuid4(), schema_uid=required.uid)
+        attribute = ObjectAttribute(
+            uid=uuid4(), schema_uid=schema.uid, original_value={"required": nested}
+        )
+
+        # Act
+        valid = AttributeValidator.compile(schema)(attribute)
+
+        # Assert
+        assert not valid
+        assert nested.valid is False
+
+    def test_union_value_of_no_kind_it_is_of_is_not_valid(self):
+        # Arrange
+        schema = UnionAttributeSchema(
+            uid=uuid4(),
+            tag="finding",
+            name="finding",
+            display_name="Finding",
+            optional=False,
+            read_only=False,
+            attributes=(string_schema(),),
+        )
+        attribute = UnionAttribute(
+            uid=uuid4(),
+            schema_uid=schema.uid,
+            original_value=StringAttribute(
+                uid=uuid4(), schema_uid=uuid4(), original_value="value"
+            ),
+        )
+
+        # Act
+        valid = AttributeValidator.compile(schema)(attribute)
+
+        # Assert
+        assert not valid
+
+    def test_attribute_of_another_kind_is_refused(self):
+        # Arrange
+        validate = AttributeValidator.compile(string_schema())
+        attribute = CodeAttribute(uid=uuid4(), schema_uid=uuid4())
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            validate(attribute)
+
+
+@pytest.mark.unittest
+class TestSchemaServiceValidators:
+    def test_compiled_once_for_every_attribute_schema(self, schema: ExampleSchema):
+        # Arrange
+        schema_service = SchemaService(schema)
+
+        # Act
+        validators = schema_service.attribute_validators
+
+        # Assert
+        assert set(validators) == set(schema_service.attributes) | set(
+            schema_service.private_attributes
+        )
+        collection = schema.specimen.attributes["collection"].uid
+        validator = schema_service.get_attribute_validator(collection)
+        assert validator is validators[collection]
@@ -0,0 +1,266 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the counts a batch is moved on from when its images are done.
+
+Against a real database: what is pinned is that the counts moved as images
+change status end up where counting the images again puts them, and that the
+batch is moved on by the last image to finish, once.
+"""
+
+from uuid import UUID
+
+import pytest
+from sqlalchemy import update
+
+from slidetap.database import DatabaseBatch, DatabaseBatchImageProgress, DatabaseImage
+from slidetap.model import (
+    BatchStatus,
+    Dataset,
+    ImageFormat,
+    RootSchema,
+)
+from slidetap.services import (
+    BatchService,
+    DatabaseService,
+    ReviewService,
+    SchemaService,
+    ValidationService,
+)
+from tests.conftest import kept_counts
+
+
+@pytest.fixture()
+def batch_service(
+    sqlite_database_service: DatabaseService, schema: RootSchema
+) -> BatchService:
+    schema_service = SchemaService(schema)
+    validation_service = ValidationService(schema_service, sqlite_database_service)
+    return BatchService(
+        schema_service,
+        validation_service,
+        sqlite_database_service,
+        ReviewService(schema_service, validation_service, sqlite_database_service),
+    )
+
+
+@pytest.fixture()
+def images(
+    sqlite_database_service: DatabaseService,
+    dataset: Dataset,
+    batch_uid: UUID,
+    schema: RootSchema,
+) -> list[UUID]:
+    """Three images in the batch, none of them started."""
+    wsi = next(iter(schema.images.values())).uid
+    with sqlite_database_service.get_session() as session:
+        added = [
+            DatabaseImage(
+                dataset.uid, batch_uid, wsi, f"PL1234-20-{index}", ImageFormat.OTHER_WSI
+            )
+            for index in range(3)
+        ]
+        session.add_all(added)
+        session.commit()
+        return [image.uid for image in added]
+
+
+def pre_process(image: DatabaseImage) -> None:
+    image.set_as_downloading()
+    image.set_as_downloaded()
+    image.set_as_pre_processing()
+    image.set_as_pre_processed()
+
+
+@pytest.mark.integration
+class TestBatchImageProgress:
+    def test_counts_follow_images_as_their_status_changes(
+        self,
+        sqlite_database_service: DatabaseService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Arrange
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchImageProgress, batch_uid
+        ) == (3, 3, 3, 0)
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            done, failed, deselected = (
+                session.get_one(DatabaseImage, uid) for uid in images
+            )
+            pre_process(done)
+            failed.set_as_downloading()
+            failed.set_as_downloading_failed()
+            deselected.selected = False
+            session.commit()
+        after_pre_processing = kept_counts(
+            sqlite_database_service, DatabaseBatchImageProgress, batch_uid
+        )
+        with sqlite_database_service.get_session() as session:
+            done = session.get_one(DatabaseImage, images[0])
+            done.set_as_post_processing()
+            done.set_as_post_processed()
+            done.set_as_storing()
+            done.set_as_storing_failed()
+            session.delete(session.get_one(DatabaseImage, images[1]))
+            session.commit()
+
+        # Assert
+        assert after_pre_processing == (0, 2, 2, 0)
+        # Counted as the scans they replace asked: past pre-processing is not
+        # one of the statuses pre-processing settles on.
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchImageProgress, batch_uid
+        ) == (1, 1, 1, 1)
+        with sqlite_database_service.get_session() as session:
+            assert sqlite_database_service.reconcile_batch_image_progress(session) == 0
+
+    def test_last_image_moves_the_batch_on_once(
+        self,
+        batch_service: BatchService,
+        sqlite_database_service: DatabaseService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Arrange
+        with sqlite_database_service.get_session() as session:
+            session.get_one(
+                DatabaseBatch, batch_uid
+            ).status = BatchStatus.IMAGE_PRE_PROCESSING
+            for uid in images[:2]:
+                pre_process(session.get_one(DatabaseImage, uid))
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            waiting = batch_service.finish_pre_processing(batch_uid, session)
+        with sqlite_database_service.get_session() as session:
+            pre_process(session.get_one(DatabaseImage, images[2]))
+            session.commit()
+
+        # Act
+        finished = []
+        for _ in range(2):
+            with sqlite_database_service.get_session() as session:
+                finished.append(batch_service.finish_pre_processing(batch_uid, session))
+
+        # Assert
+        assert not waiting
+        assert finished == [True, False]
+        assert (
+            batch_service.get(batch_uid).status
+            == BatchStatus.IMAGE_PRE_PROCESSING_COMPLETE
+        )
+
+    def test_batch_is_completed_once_its_images_are_stored(
+        self,
+        batch_service: BatchService,
+        sqlite_database_service: DatabaseService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Arrange: every image post-processed, the last one failed to store.
+        with sqlite_database_service.get_session() as session:
+            session.get_one(DatabaseBatch, batch_uid).status = BatchStatus.IMAGE_STORING
+            for uid in images:
+                image = session.get_one(DatabaseImage, uid)
+                pre_process(image)
+                image.set_as_post_processing()
+                image.set_as_post_processed()
+                image.set_as_storing()
+                if uid == images[-1]:
+                    image.set_as_storing_failed()
+                else:
+                    image.set_as_stored()
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            held = batch_service.finish_storing(batch_uid, session)
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            session.get_one(DatabaseImage, images[-1]).selected = False
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            completed = batch_service.finish_storing(batch_uid, session)
+
+        # Assert
+        assert not held
+        assert completed
+        assert batch_service.get(batch_uid).status == BatchStatus.COMPLETED
+
+    def test_reconcile_corrects_drifted_counts(
+        self,
+        batch_service: BatchService,
+        sqlite_database_service: DatabaseService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Arrange: counts written around the session.
+        with sqlite_database_service.get_session() as session:
+            session.execute(
+                update(DatabaseBatchImageProgress).values(
+                    not_pre_processed=0,
+                    not_post_processed=0,
+                    not_stored=0,
+                    failed_to_store=2,
+                )
+            )
+            session.commit()
+
+        # Act
+        corrected = batch_service.reconcile_image_progress_counts()
+
+        # Assert
+        assert corrected == 1
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchImageProgress, batch_uid
+        ) == (3, 3, 3, 0)
+
+    def test_reconcile_moves_on_batch_held_by_drifted_counts(
+        self,
+        batch_service: BatchService,
+        sqlite_database_service: DatabaseService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Arrange: every image post-processed, but counted as one still to be
+        # when the last of them finished.
+        with sqlite_database_service.get_session() as session:
+            session.get_one(
+                DatabaseBatch, batch_uid
+            ).status = BatchStatus.IMAGE_POST_PROCESSING
+            for uid in images:
+                image = session.get_one(DatabaseImage, uid)
+                pre_process(image)
+                image.set_as_post_processing()
+                image.set_as_post_processed()
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            session.execute(
+                update(DatabaseBatchImageProgress).values(not_post_processed=1)
+            )
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            held = batch_service.finish_post_processing(batch_uid, session)
+
+        # Act
+        corrected = batch_service.reconcile_image_progress_counts()
+
+        # Assert
+        assert not held
+        assert corrected == 1
+        assert (
+            batch_service.get(batch_uid).status
+            == BatchStatus.IMAGE_POST_PROCESSING_COMPLETE
+        )
@@ -0,0 +1,217 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the counts the validation of a batch is answered from.
+
+Against a real database: what is pinned is that the counts moved as items are
+written end up where counting the items again puts them, whichever way the
+items were written.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from uuid import UUID
+
+import pytest
+from sqlalchemy import update
+
+from slidetap.database import DatabaseBatchValidation, DatabaseImage, DatabaseSample
+from slidetap.model import BatchCreate, Dataset, ImageFormat, Project, RootSchema
+from slidetap.services import DatabaseService, SchemaService, ValidationService
+from tests.conftest import CaseBuilder, kept_counts
+
+
+@pytest.fixture()
+def validation_service(
+    sqlite_database_service: DatabaseService, schema: RootSchema
+) -> ValidationService:
+    return ValidationService(SchemaService(schema), sqlite_database_service)
+
+
+@pytest.fixture()
+def batches(
+    sqlite_database_service: DatabaseService, project: Project, batch_uid: UUID
+) -> tuple[UUID, UUID]:
+    with sqlite_database_service.get_session() as session:
+        second = sqlite_database_service.add_batch(
+            session, BatchCreate(name="second", project_uid=project.uid)
+        )
+        session.commit()
+        return batch_uid, second.uid
+
+
+@pytest.fixture()
+def cases(
+    build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+) -> list[UUID]:
+    """Four cases in the first batch, the first two of them valid."""
+    with build_case() as build:
+        added = [build.sample("case", f"PL1234-2{index}") for index in range(4)]
+        for case in added[:2]:
+            case.valid_attributes = True
+            case.valid_relations = True
+        return [case.uid for case in added]
+
+
+@pytest.mark.integration
+class TestBatchValidationCounts:
+    def test_counts_follow_items_written_through_the_session(
+        self,
+        sqlite_database_service: DatabaseService,
+        batches: tuple[UUID, UUID],
+        cases: list[UUID],
+    ):
+        # Arrange
+        first, second = batches
+        assert kept_counts(sqlite_database_service, DatabaseBatchValidation, first) == (
+            4,
+            2,
+        )
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            valid, _, non_valid, moved = (
+                session.get_one(DatabaseSample, uid) for uid in cases
+            )
+            valid.selected = False
+            non_valid.valid_attributes = True
+            non_valid.valid_relations = True
+            moved.batch_uid = second
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            session.delete(session.get_one(DatabaseSample, cases[1]))
+            session.commit()
+
+        # Assert
+        assert kept_counts(sqlite_database_service, DatabaseBatchValidation, first) == (
+            1,
+            0,
+        )
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchValidation, second
+        ) == (1, 1)
+        with sqlite_database_service.get_session() as session:
+            assert sqlite_database_service.reconcile_batch_validations(session) == 0
+
+    def test_counts_follow_relations_validated_as_a_group(
+        self,
+        validation_service: ValidationService,
+        sqlite_database_service: DatabaseService,
+        batches: tuple[UUID, UUID],
+        cases: list[UUID],
+    ):
+        # Arrange: a case needs a patient, so none of them have valid relations.
+        with sqlite_database_service.get_session() as session:
+            for uid in cases:
+                session.get_one(DatabaseSample, uid).valid_attributes = True
+            session.commit()
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            validation_service.validate_relations_for(cases, session)
+            session.commit()
+
+        # Assert
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchValidation, batches[0]
+        ) == (4, 4)
+        with sqlite_database_service.get_session() as session:
+            assert sqlite_database_service.reconcile_batch_validations(session) == 0
+
+    def test_validation_of_batch_lists_non_valid_items(
+        self,
+        validation_service: ValidationService,
+        batches: tuple[UUID, UUID],
+        cases: list[UUID],
+    ):
+        # Act
+        first = validation_service.get_validation_for_batch(batches[0])
+        second = validation_service.get_validation_for_batch(batches[1])
+
+        # Assert
+        assert not first.valid
+        assert [item.uid for item in first.non_valid_items] == cases[2:]
+        assert second.valid
+        assert second.non_valid_items == []
+
+    def test_failed_image_is_counted_as_not_valid(
+        self,
+        validation_service: ValidationService,
+        sqlite_database_service: DatabaseService,
+        schema: RootSchema,
+        dataset: Dataset,
+        batches: tuple[UUID, UUID],
+    ):
+        # Arrange
+        with sqlite_database_service.get_session() as session:
+            image = DatabaseImage(
+                dataset.uid,
+                batches[1],
+                next(iter(schema.images.values())).uid,
+                "PL1234-20",
+                ImageFormat.OTHER_WSI,
+            )
+            image.valid_attributes = True
+            image.valid_relations = True
+            session.add(image)
+            session.commit()
+            image_uid = image.uid
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchValidation, batches[1]
+        ) == (1, 0)
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            image = session.get_one(DatabaseImage, image_uid)
+            image.set_as_downloading()
+            image.set_as_downloading_failed()
+            session.commit()
+        validation = validation_service.get_validation_for_batch(batches[1])
+
+        # Assert
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchValidation, batches[1]
+        ) == (1, 1)
+        assert not validation.valid
+        assert [item.uid for item in validation.non_valid_items] == [image_uid]
+        with sqlite_database_service.get_session() as session:
+            assert sqlite_database_service.reconcile_batch_validations(session) == 0
+
+    def test_reconcile_corrects_drifted_counts(
+        self,
+        validation_service: ValidationService,
+        sqlite_database_service: DatabaseService,
+        batches: tuple[UUID, UUID],
+        cases: list[UUID],
+    ):
+        # Arrange: counts written around the session.
+        with sqlite_database_service.get_session() as session:
+            session.execute(
+                update(DatabaseBatchValidation).values(
+                    selected_items=0, non_valid_items=0
+                )
+            )
+            session.commit()
+
+        # Act
+        corrected = validation_service.reconcile_validation_counts()
+
+        # Assert
+        assert corrected == 1
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchValidation, batches[0]
+        ) == (4, 2)
+        assert kept_counts(
+            sqlite_database_service, DatabaseBatchValidation, batches[1]
+        ) == (0, 0)
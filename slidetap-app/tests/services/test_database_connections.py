@@ -0,0 +1,106 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for how DatabaseService connects, and keeps its connections.
+
+What is pinned is that the settings for one kind of process are read over the
+shared ones, and that the pool counts what it hands out and what it could not,
+which is what tells a pool too small from a database too slow.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import exc, text
+
+from slidetap.config import ConfigParser, DatabaseConfig
+from slidetap.services import DatabaseService
+
+
+@pytest.mark.unittest
+class TestDatabaseConfig:
+    def test_role_settings_override_shared_ones(self):
+        # Arrange
+        parser = ConfigParser(
+            {
+                "database": {
+                    "pool_size": 3,
+                    "statement_timeout": 10,
+                    "web": {"pool_size": 20},
+                    "worker": {"statement_timeout": None},
+                }
+            },
+            env={"SLIDETAP_DBURI": "sqlite://"},
+        )
+
+        # Act
+        shared = DatabaseConfig.parse(parser)
+        web = DatabaseConfig.parse(parser, "web")
+        worker = DatabaseConfig.parse(parser, "worker")
+
+        # Assert
+        assert (shared.pool_size, shared.statement_timeout) == (3, 10)
+        assert (web.pool_size, web.statement_timeout) == (20, 10)
+        assert (worker.pool_size, worker.statement_timeout) == (3, None)
+
+    def test_unknown_setting_is_refused(self):
+        # Arrange
+        parser = ConfigParser(
+            {"database": {"web": {"pool_sise": 20}}},
+            env={"SLIDETAP_DBURI": "sqlite://"},
+        )
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="pool_sise"):
+            DatabaseConfig.parse(parser, "web")
+
+
+@pytest.mark.integration
+class TestConnectionPool:
+    def test_statistics_count_checkouts_and_timeouts(self, tmp_path: Path):
+        # Arrange: one connection, and no waiting for it.
+        database_service = DatabaseService(
+            DatabaseConfig(
+                f"sqlite:///{tmp_path / 'pool.db'}",
+                False,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=0.01,
+            )
+        )
+
+        # Act
+        with database_service.get_session() as holding:
+            holding.execute(text("SELECT 1"))
+            with (
+                pytest.raises(exc.TimeoutError),
+                database_service.get_session() as waiting,
+            ):
+                waiting.execute(text("SELECT 1"))
+            during = database_service.pool_statistics()
+
+        # Assert
+        after = database_service.pool_statistics()
+        assert during is not None and after is not None
+        assert (during.checkouts, during.timeouts) == (1, 1)
+        assert during.checked_out == 1
+        assert during.longest_wait_seconds >= 0.01
+        assert after.checked_out == 0
+
+    def test_sessions_share_one_maker(self, sqlite_database_service: DatabaseService):
+        # Act & Assert
+        assert (
+            sqlite_database_service.create_session()
+            is sqlite_database_service.create_session()
+        )
@@ -0,0 +1,277 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for sweeping a batch for review units holding something not valid.
+
+Against a real database: what is pinned is what the sweep finds from the
+validity stored on the items, and that it takes as many statements for a
+batch of many cases as for one of few, and a mock can do neither.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import select
+
+from slidetap.database import DatabaseItem, DatabaseReviewIssue
+from slidetap.model import (
+    BatchStatus,
+    Dataset,
+    MetadataImportCompleteness,
+    ReviewIssueSource,
+    ReviewLayout,
+    ReviewStatus,
+    ReviewUnitSchema,
+    RootSchema,
+)
+from slidetap.services import (
+    DatabaseService,
+    ReviewService,
+    SchemaService,
+    ValidationService,
+)
+from tests.conftest import CaseBuilder
+
+
+@pytest.fixture()
+def left_out() -> str | None:
+    """The kind of sample whose attributes the import of a case leaves for a
+    later step, if any."""
+    return None
+
+
+@pytest.fixture()
+def review_service(
+    sqlite_database_service: DatabaseService,
+    schema: RootSchema,
+    schemas: dict[str, UUID],
+    left_out: str | None,
+) -> ReviewService:
+    completeness = (
+        MetadataImportCompleteness(non_complete_items=frozenset({schemas[left_out]}))
+        if left_out is not None
+        else None
+    )
+    reviewed = schema.model_copy(
+        update={
+            "review_unit": ReviewUnitSchema(
+                schema_uid=schemas["case"],
+                layout=ReviewLayout(uid=uuid4(), name="review"),
+                completeness=completeness,
+            )
+        }
+    )
+    schema_service = SchemaService(reviewed)
+    return ReviewService(
+        schema_service,
+        ValidationService(schema_service, sqlite_database_service),
+        sqlite_database_service,
+    )
+
+
+def add_case(
+    build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    identifier: str,
+    invalid_slides: int = 0,
+    deselected_invalid_slides: int = 0,
+) -> UUID:
+    """A case with a specimen, a block, and a slide that is valid, and as many
+    slides not valid, in the project and out of it, as asked for."""
+    with build_case() as build:
+        case = build.sample("case", identifier)
+        specimen = build.sample("specimen", f"{identifier}-1", [case])
+        block = build.sample("block", f"{identifier}-1-1", [specimen])
+        valid = [
+            case,
+            specimen,
+            block,
+            build.sample("slide", f"{identifier}-1-1-1", [block]),
+        ]
+        invalid = [
+            build.sample("slide", f"{identifier}-1-1-{index + 2}", [block])
+            for index in range(invalid_slides)
+        ] + [
+            build.sample(
+                "slide", f"{identifier}-1-1-{index + 10}", [block], selected=False
+            )
+            for index in range(deselected_invalid_slides)
+        ]
+        for sample in valid + invalid:
+            sample.valid_attributes = sample in valid
+            sample.valid_relations = True
+            sample.valid_pseudonym = True
+        return case.uid
+
+
+def open_issues(database_service: DatabaseService) -> list[tuple[str, UUID, str]]:
+    """What validation has open, as (item identifier, unit, reason)."""
+    with database_service.get_session() as session:
+        return sorted(
+            (issue.item.identifier, issue.review_unit_uid, issue.reason)
+            for issue in session.scalars(
+                select(DatabaseReviewIssue)
+                .where(DatabaseReviewIssue.source == ReviewIssueSource.VALIDATION)
+                .where(DatabaseReviewIssue.resolved_at.is_(None))
+            )
+        )
+
+
+def review_status(database_service: DatabaseService, uid: UUID) -> ReviewStatus:
+    with database_service.get_session() as session:
+        return session.get_one(DatabaseItem, uid).review_status
+
+
+@pytest.fixture()
+def flag_with_statements(
+    review_service: ReviewService,
+    sqlite_database_service: DatabaseService,
+    dataset: Dataset,
+    batch_uid: UUID,
+    counted_statements: Callable[[], AbstractContextManager[list[str]]],
+) -> Callable[[], tuple[int, int]]:
+    """Sweeps the batch, giving how many review units were flagged and how many
+    statements the sweep took."""
+
+    def flag() -> tuple[int, int]:
+        with (
+            counted_statements() as statements,
+            sqlite_database_service.get_session() as session,
+        ):
+            flagged = review_service.flag_invalid_review_units(
+                dataset.uid, batch_uid, session=session
+            )
+            session.commit()
+        return flagged, len(statements)
+
+    return flag
+
+
+@pytest.mark.integration
+class TestFlagInvalidReviewUnits:
+    def test_raises_on_each_selected_item_not_valid(
+        self,
+        flag_with_statements: Callable[[], tuple[int, int]],
+        sqlite_database_service: DatabaseService,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        invalid = add_case(
+            build_case,
+            "PL1234-20",
+            invalid_slides=2,
+            deselected_invalid_slides=1,
+        )
+        valid = add_case(build_case, "PL1234-21")
+
+        # Act
+        flagged, _ = flag_with_statements()
+
+        # Assert
+        assert flagged == 1
+        assert open_issues(sqlite_database_service) == [
+            ("PL1234-20-1-1-2", invalid, "Not valid: attributes"),
+            ("PL1234-20-1-1-3", invalid, "Not valid: attributes"),
+        ]
+        assert review_status(sqlite_database_service, invalid) == ReviewStatus.FLAGGED
+        assert review_status(sqlite_database_service, valid) == (
+            ReviewStatus.NOT_REVIEWED
+        )
+
+    def test_sweeping_again_raises_nothing_new(
+        self,
+        flag_with_statements: Callable[[], tuple[int, int]],
+        sqlite_database_service: DatabaseService,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        add_case(
+            build_case,
+            "PL1234-20",
+            invalid_slides=2,
+        )
+        flag_with_statements()
+        raised = open_issues(sqlite_database_service)
+
+        # Act
+        flagged, _ = flag_with_statements()
+
+        # Assert: still counted as holding something not valid.
+        assert flagged == 1
+        assert open_issues(sqlite_database_service) == raised
+
+    @pytest.mark.parametrize("left_out", ["slide"])
+    @pytest.mark.parametrize(
+        ["status", "expected"],
+        [
+            (BatchStatus.METADATA_SEARCH_COMPLETE, 0),
+            (BatchStatus.IMAGE_PRE_PROCESSING_COMPLETE, 1),
+        ],
+    )
+    def test_what_the_import_leaves_out_is_excused_until_pre_processed(
+        self,
+        flag_with_statements: Callable[[], tuple[int, int]],
+        sqlite_database_service: DatabaseService,
+        batch_uid: UUID,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+        status: BatchStatus,
+        expected: int,
+    ):
+        # Arrange
+        add_case(
+            build_case,
+            "PL1234-20",
+            invalid_slides=1,
+        )
+        with sqlite_database_service.get_session() as session:
+            sqlite_database_service.get_batch(session, batch_uid).status = status
+            session.commit()
+
+        # Act
+        flagged, _ = flag_with_statements()
+
+        # Assert
+        assert flagged == expected
+        assert len(open_issues(sqlite_database_service)) == expected
+
+    def test_statements_do_not_grow_with_the_cases_swept(
+        self,
+        flag_with_statements: Callable[[], tuple[int, int]],
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange: everything not valid is already raised on, as on a second
+        # sweep, which is what a sweep mostly is.
+        for index in range(2):
+            add_case(
+                build_case,
+                f"PL1234-2{index}",
+                invalid_slides=1,
+            )
+        flag_with_statements()
+        _, few = flag_with_statements()
+        for index in range(2, 8):
+            add_case(
+                build_case,
+                f"PL1234-2{index}",
+                invalid_slides=1,
+            )
+        flag_with_statements()
+
+        # Act
+        flagged, many = flag_with_statements()
+
+        # Assert
+        assert flagged == 8
+        assert many == few
@@ -23,7 +23,7 @@ from decoy.matchers import Anything
 from sqlalchemy.orm import Session
 
 from slidetap.database import DatabaseBatch, DatabaseImage
-from slidetap.model import Batch, ImageStatus, RootSchema
+from slidetap.model import Batch, Image, ImageStatus, RootSchema
 from slidetap.services import BatchService, DatabaseService, SchemaService
 from slidetap.task import Scheduler
 from slidetap.web.services import ImagePipelineService
@@ -79,28 +79,30 @@ def image_pipeline_service(
 @pytest.mark.unittest
 class TestImagePipelineService:
     @pytest.mark.asyncio
-    async def test_retry_of_storing_failed_image_stores_its_batch_again(
+    async def test_retry_of_storing_failed_image_stores_it_again(
         self,
         decoy: Decoy,
         image_pipeline_service: ImagePipelineService,
         scheduler: Scheduler,
         database_image: DatabaseImage,
-        batch: Batch,
     ) -> None:
-        """A retried image is reset to post-processed, and its batch stored again.
+        """A retried image is reset to post-processed, and stored again.
 
-        Storing is done for a batch at a time, and the store selects images that
-        are post-processed, so this is what stores the image that failed.
+        Storing is done an image at a time, and the store takes images that are
+        post-processed, so this is what stores the image that failed, and what
+        completes the batch it held.
         """
         # Arrange
+        image = decoy.mock(cls=Image)
         decoy.when(database_image.status).then_return(ImageStatus.STORING_FAILED)
+        decoy.when(database_image.model).then_return(image)
 
         # Act
         await image_pipeline_service.retry(uuid4())
 
         # Assert
         decoy.verify(database_image.reset_as_post_processed(), times=1)
-        decoy.verify(await scheduler.store_images_in_batch(batch), times=1)
+        decoy.verify(await scheduler.store_image(image), times=1)
 
     @pytest.mark.asyncio
     async def test_retry_of_storing_image_is_not_retried(
@@ -114,7 +116,7 @@ class TestImagePipelineService:
         """An image a worker may still be storing is left alone.
 
         A store left by a worker that died is recovered by the stalled job being
-        retried, which stores the images it left storing again.
+        retried, which stores the image it left storing again.
         """
         # Arrange
         decoy.when(database_image.status).then_return(ImageStatus.STORING)
@@ -124,4 +126,4 @@ class TestImagePipelineService:
 
         # Assert
         decoy.verify(database_image.reset_as_post_processed(), times=0)
-        decoy.verify(await scheduler.store_images_in_batch(batch), times=0)
+        decoy.verify(await scheduler.store_image(Anything()), times=0)
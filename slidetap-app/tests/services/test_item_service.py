@@ -18,15 +18,15 @@ Run against a real database, since what is being pinned is what a sequence of
 writes leaves behind, which is the part that broke.
 """
 
-from collections.abc import Sequence
-from contextlib import nullcontext
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager, nullcontext
 from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
 
 import pytest
 from decoy import Decoy
 from sqlalchemy.orm import Session
 
-from slidetap.database import DatabaseImage, DatabaseSample
+from slidetap.database import DatabaseImage, DatabaseSample, DatabaseStringAttribute
 from slidetap.model import (
     Dataset,
     Image,
@@ -41,17 +41,23 @@ from slidetap.model import (
 )
 from slidetap.model.batch import BatchCreate
 from slidetap.model.schema.attribute_value_layout import AttributeValueLayout
-from slidetap.model.schema.hierarchy_layout import HierarchyLevelLayout
+from slidetap.model.schema.hierarchy_layout import (
+    HierarchyLayout,
+    HierarchyLevelLayout,
+)
 from slidetap.services import (
     AttributeService,
     DatabaseService,
     ItemService,
     MapperService,
+    OperationProgress,
     ReviewService,
     SchemaService,
     TagService,
     ValidationService,
 )
+from slidetap.services.item_service import HierarchyTree
+from tests.conftest import CaseBuilder
 
 # ---------------------------------------------------------------------------
 # Adding what a metadata search found
@@ -461,13 +467,13 @@ class TestMovingAnAttributeBetweenItems:
         # Assert
         decoy.verify(
             review_service.item_validity_changed(
-                source.uid, True, False, session=session
+                source.uid, True, False, review_unit=None, session=session
             ),
             times=1,
         )
         decoy.verify(
             review_service.item_validity_changed(
-                target.uid, False, True, session=session
+                target.uid, False, True, review_unit=None, session=session
             ),
             times=1,
         )
@@ -635,6 +641,25 @@ class TestMovingAnItemToAnotherParent:
             times=1,
         )
 
+    def test_progress_is_told_of_each_item_checked(
+        self,
+        decoy: Decoy,
+        item_service: ItemService,
+        parked_image: DatabaseImage,
+        slide: DatabaseSample,
+    ):
+        """A move run as an operation shows how far it has come, and can be
+        stopped, by reporting the item and the two parents it checks."""
+        # Arrange
+        progress = decoy.mock(cls=OperationProgress)
+
+        # Act
+        item_service.move_to_parent(parked_image.uid, slide.uid, progress=progress)
+
+        # Assert
+        decoy.verify(progress.begin(3), times=1)
+        decoy.verify(progress.advance(), times=3)
+
 
 # ---------------------------------------------------------------------------
 # What a row of the tree says
@@ -655,19 +680,17 @@ class TestHierarchyRowAttributes:
         """Enough of a database attribute for the lookup: a tag and a model."""
         return type("Attribute", (), {"tag": tag, "model": f"{tag} value"})()
 
-    def _item(self, tags: Sequence[str], private_tags: Sequence[str]) -> object:
-        return type(
-            "Item",
-            (),
-            {
-                "attributes": {self._attribute(tag) for tag in tags},
-                "private_attributes": {self._attribute(tag) for tag in private_tags},
-            },
-        )()
+    def _item_attributes(
+        self, tags: Sequence[str], private_tags: Sequence[str]
+    ) -> list[object]:
+        """What is read for an item, its public and private attributes alike."""
+        return [self._attribute(tag) for tag in (*tags, *private_tags)]
 
     def test_a_named_private_attribute_is_shown(self):
         # Arrange
-        item = self._item(tags=["staining"], private_tags=["pacs_staining"])
+        attributes = self._item_attributes(
+            tags=["staining"], private_tags=["pacs_staining"]
+        )
         level = HierarchyLevelLayout(
             schema_uid=uuid4(),
             attributes=[
@@ -677,24 +700,26 @@ class TestHierarchyRowAttributes:
         )
 
         # Act
-        attributes = ItemService._layout_attributes(item, level)  # type: ignore[arg-type]
+        shown = ItemService._layout_attributes(attributes, level)  # type: ignore[arg-type]
 
         # Assert
-        assert list(attributes) == ["staining", "pacs_staining"]
+        assert list(shown) == ["staining", "pacs_staining"]
 
     def test_an_attribute_the_level_does_not_name_is_not_shown(self):
         """Including the private ones: naming is what asks for them."""
         # Arrange
-        item = self._item(tags=["staining"], private_tags=["pacs_exam_id"])
+        attributes = self._item_attributes(
+            tags=["staining"], private_tags=["pacs_exam_id"]
+        )
         level = HierarchyLevelLayout(
             schema_uid=uuid4(), attributes=[AttributeValueLayout(tag="staining")]
         )
 
         # Act
-        attributes = ItemService._layout_attributes(item, level)  # type: ignore[arg-type]
+        shown = ItemService._layout_attributes(attributes, level)  # type: ignore[arg-type]
 
         # Assert
-        assert list(attributes) == ["staining"]
+        assert list(shown) == ["staining"]
 
 
 @pytest.mark.unittest
@@ -762,14 +787,152 @@ class TestWhetherARowIsStillInTheProject:
         decoy.when(item.valid).then_return(False)
         decoy.when(item.selected).then_return(selected)
         decoy.when(item.locked).then_return(locked)
-        decoy.when(database_service.get_children(item)).then_return([])
+        tree = HierarchyTree(
+            items={item.uid: item}, children={}, attributes={}, levels={}
+        )
 
         # Act
         node = item_service._build_hierarchy_node(
-            item, orphan=False, ancestors=frozenset(), levels={}
+            item.uid, orphan=False, ancestors=frozenset(), tree=tree
         )
 
         # Assert
         assert node.selected is selected
         assert node.locked is locked
         assert node.children == []
+
+
+@pytest.mark.integration
+class TestHierarchyIsReadInOneGo:
+    """The tree under an item is read in the same few queries however much
+    hangs under it, and tagged so that asking again can be answered short.
+
+    A case here is a specimen and a block, with slides cut from the block and
+    an image of each slide. The layout names the samples but not the image, so
+    the images are not in the tree.
+    """
+
+    @pytest.fixture()
+    def item_service(
+        self, decoy: Decoy, sqlite_database_service: DatabaseService, schema: RootSchema
+    ) -> ItemService:
+        return ItemService(
+            decoy.mock(cls=AttributeService),
+            decoy.mock(cls=TagService),
+            decoy.mock(cls=MapperService),
+            SchemaService(schema),
+            decoy.mock(cls=ValidationService),
+            sqlite_database_service,
+            decoy.mock(cls=ReviewService),
+        )
+
+    @pytest.fixture()
+    def layout(self, schemas: dict[str, UUID]) -> HierarchyLayout:
+        return HierarchyLayout(
+            uid=uuid4(),
+            name="case",
+            display_name="Case",
+            schema_uid=schemas["case"],
+            levels=[
+                HierarchyLevelLayout(schema_uid=schemas["specimen"]),
+                HierarchyLevelLayout(schema_uid=schemas["block"]),
+                HierarchyLevelLayout(
+                    schema_uid=schemas["slide"],
+                    attributes=[AttributeValueLayout(tag="staining")],
+                ),
+            ],
+        )
+
+    def _case(
+        self,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+        slides: int,
+    ) -> UUID:
+        with build_case() as build:
+            case = build.sample("case", "case")
+            specimen = build.sample("specimen", "specimen", [case])
+            block = build.sample("block", "block", [specimen])
+            for index in range(1, slides + 1):
+                slide = build.sample(
+                    "slide",
+                    f"slide {index}",
+                    [block],
+                    attributes=[
+                        DatabaseStringAttribute("staining", uuid4(), f"stain {index}")
+                    ],
+                )
+                build.image("wsi", f"image {index}", [slide])
+            return case.uid
+
+    @pytest.mark.parametrize("slides", [2, 12])
+    def test_the_same_queries_however_many_rows(
+        self,
+        item_service: ItemService,
+        layout: HierarchyLayout,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+        slides: int,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+    ):
+        # Arrange
+        case_uid = self._case(build_case, slides)
+
+        # Act
+        with counted_statements() as statements:
+            hierarchy = item_service.get_hierarchy(case_uid, layout)
+
+        # Assert: the links, the items, and the public and private attributes.
+        assert hierarchy is not None
+        assert len(statements) == 4
+        (specimen,) = hierarchy.children
+        (block,) = specimen.children
+        assert len(block.children) == slides
+
+    def test_rows_are_built_as_the_layout_asks(
+        self,
+        item_service: ItemService,
+        layout: HierarchyLayout,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        case_uid = self._case(build_case, 10)
+
+        # Act
+        hierarchy = item_service.get_hierarchy(case_uid, layout)
+
+        # Assert: slides in numeric order, with their staining and no images.
+        assert hierarchy is not None
+        slides = hierarchy.children[0].children[0].children
+        assert [slide.identifier for slide in slides] == [
+            f"slide {index}" for index in range(1, 11)
+        ]
+        assert all(list(slide.attributes) == ["staining"] for slide in slides)
+        assert all(slide.children == [] for slide in slides)
+
+    def test_an_unknown_item_has_no_hierarchy(
+        self, item_service: ItemService, layout: HierarchyLayout
+    ):
+        assert item_service.get_hierarchy(uuid4(), layout) is None
+
+    def test_the_tag_follows_what_the_tree_says(
+        self,
+        item_service: ItemService,
+        sqlite_database_service: DatabaseService,
+        layout: HierarchyLayout,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        case_uid = self._case(build_case, 2)
+        before = item_service.get_hierarchy(case_uid, layout)
+        assert before is not None
+
+        # Act
+        again = item_service.get_hierarchy(case_uid, layout)
+        with sqlite_database_service.get_session() as session:
+            sqlite_database_service.get_item(session, case_uid).selected = False
+            session.commit()
+        after = item_service.get_hierarchy(case_uid, layout)
+
+        # Assert
+        assert again is not None and after is not None
+        assert ItemService.hierarchy_etag(again) == ItemService.hierarchy_etag(before)
+        assert ItemService.hierarchy_etag(after) != ItemService.hierarchy_etag(before)
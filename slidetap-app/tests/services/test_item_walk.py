@@ -0,0 +1,240 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Walking up and down the items in one query.
+
+Against a real SQLite database rather than mocks: what is being pinned is the
+recursive query itself, which relation tables it follows and how many
+statements it takes, and neither can be seen through a mock.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from slidetap.database import (
+    DatabaseObservation,
+    DatabaseSample,
+)
+from slidetap.model import Dataset
+from slidetap.services import DatabaseService
+from tests.conftest import CaseBuilder
+
+CASE = uuid4()
+SPECIMEN = uuid4()
+BLOCK = uuid4()
+SLIDE = uuid4()
+ANNOTATION = uuid4()
+DIAGNOSIS = uuid4()
+
+
+@dataclass
+class Case:
+    case: UUID
+    specimens: list[UUID]
+    blocks: list[UUID]
+    slide: UUID
+    annotation: UUID
+    observation: UUID
+
+
+@pytest.fixture()
+def schemas() -> dict[str, UUID]:
+    """Schemas of the names the walk is pinned by, rather than the example's,
+    which has no annotation."""
+    return {
+        "case": CASE,
+        "specimen": SPECIMEN,
+        "block": BLOCK,
+        "slide": SLIDE,
+        "annotation": ANNOTATION,
+        "diagnosis": DIAGNOSIS,
+    }
+
+
+@pytest.fixture()
+def case(build_case: Callable[[], AbstractContextManager[CaseBuilder]]) -> Case:
+    """A case with two specimens, both embedded in the one block the slide is
+    cut from, and an observation on the annotation on that slide."""
+    with build_case() as build:
+        case = build.sample("case", "case")
+        specimens = [
+            build.sample("specimen", f"specimen {index}", [case]) for index in (1, 2)
+        ]
+        block = build.sample("block", "block", specimens)
+        slide = build.image("slide", "slide", [block])
+        annotation = build.annotation("annotation", "annotation", slide)
+        observation = build.observation("diagnosis", "diagnosis", annotation)
+        return Case(
+            case=case.uid,
+            specimens=[specimen.uid for specimen in specimens],
+            blocks=[block.uid],
+            slide=slide.uid,
+            annotation=annotation.uid,
+            observation=observation.uid,
+        )
+
+
+def stored(session: Session, uid: UUID) -> DatabaseSample:
+    sample = session.get(DatabaseSample, uid)
+    assert sample is not None
+    return sample
+
+
+@pytest.mark.integration
+class TestDescendants:
+    def test_walks_every_kind_of_link(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            descendants = sqlite_database_service.get_descendants(session, [case.case])
+
+            assert [item.uid for item in descendants][0] == case.case
+            assert {item.uid for item in descendants} == {
+                case.case,
+                *case.specimens,
+                *case.blocks,
+                case.slide,
+                case.annotation,
+                case.observation,
+            }
+
+    def test_an_item_under_two_parents_is_walked_once(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            descendants = sqlite_database_service.get_descendants(session, [case.case])
+
+            assert len(descendants) == len({item.uid for item in descendants})
+
+    def test_links_carry_depth_and_where_they_came_from(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            links = sqlite_database_service.get_descendant_links(session, [case.case])
+
+            block_links = {link.via_uid for link in links if link.uid in case.blocks}
+            assert block_links == set(case.specimens)
+            depths = {link.uid: link.depth for link in links}
+            assert depths[case.case] == 0
+            assert depths[case.observation] == 5
+
+    def test_links_can_be_narrowed_to_schemas(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            links = sqlite_database_service.get_descendant_links(
+                session, [case.case], schema_uids={SLIDE}
+            )
+
+            assert {link.uid for link in links} == {case.slide}
+
+    def test_walk_is_one_statement_for_the_items(
+        self,
+        sqlite_database_service: DatabaseService,
+        case: Case,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+    ):
+        with sqlite_database_service.get_session() as session:
+            root = stored(session, case.case)
+            with counted_statements() as statements:
+                walked = list(sqlite_database_service.walk_item_descendants(root))
+                selected = [item.selected for item in walked]
+
+            assert all(selected)
+            assert len(walked) == 7
+            assert len(statements) == 1
+
+    def test_an_item_not_stored_yet_is_walked_through_its_relationships(
+        self, sqlite_database_service: DatabaseService, dataset: Dataset, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            block = stored(session, case.blocks[0])
+            new = DatabaseSample(dataset.uid, block.batch_uid, SPECIMEN, "new")
+            new.children = {block}
+            session.add(new)
+
+            walked = {
+                item.uid for item in sqlite_database_service.walk_item_descendants(new)
+            }
+
+            assert case.slide in walked
+            assert case.case not in walked
+
+
+@pytest.mark.integration
+class TestAncestors:
+    def test_nearest_of_the_schemas_asked_for(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            observation = session.get(DatabaseObservation, case.observation)
+            assert observation is not None
+
+            ancestor = sqlite_database_service.get_ancestor(
+                observation, {SPECIMEN, CASE}
+            )
+
+            assert ancestor is not None
+            assert ancestor.uid in case.specimens
+
+    def test_nothing_when_no_ancestor_is_of_the_schemas(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            case_sample = stored(session, case.case)
+
+            assert sqlite_database_service.get_ancestor(case_sample, {CASE}) is None
+
+    def test_links_up_reach_the_root(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            links = sqlite_database_service.get_ancestor_links(
+                session, [case.observation]
+            )
+
+            depths = {link.uid: link.depth for link in links}
+            assert depths[case.observation] == 0
+            assert depths[case.case] == 5
+
+
+@pytest.mark.integration
+class TestSampleChildrenRecursive:
+    def test_finds_samples_through_those_between(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            blocks = sqlite_database_service.get_sample_children(
+                session, case.case, BLOCK, recursive=True
+            )
+
+            assert {block.uid for block in blocks} == set(case.blocks)
+
+    def test_filters_apply_to_what_is_found(
+        self, sqlite_database_service: DatabaseService, case: Case
+    ):
+        with sqlite_database_service.get_session() as session:
+            stored(session, case.blocks[0]).selected = False
+
+            assert (
+                sqlite_database_service.get_sample_children(
+                    session, case.case, BLOCK, recursive=True, selected=True
+                )
+                == set()
+            )
@@ -0,0 +1,203 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for injecting the mappers a process starts with.
+
+Against a real database: what is pinned is that a process starting with what
+the mappers were last injected from leaves them be, and that one starting with
+something else adds what is new and leaves what is there as it is.
+"""
+
+from collections.abc import Iterable
+from uuid import uuid4
+
+import pytest
+from decoy import Decoy
+from slidetap_example import ExampleSchema
+from sqlalchemy import func, select, update
+
+from slidetap.database import DatabaseMappingItem
+from slidetap.external_interfaces import MapperInjectorInterface
+from slidetap.model import (
+    Code,
+    CodeAttribute,
+    Mapper,
+    MapperGroup,
+    MappingItem,
+)
+from slidetap.services import (
+    AttributeService,
+    DatabaseService,
+    ReviewService,
+    SchemaService,
+    ValidationService,
+)
+from slidetap.services.mapper_service import MapperService
+
+
+class FixedMapperInjector(MapperInjectorInterface):
+    """Injects a collection mapper with a mapping to a code of the same name
+    for each expression, and counts how often it is asked to."""
+
+    def __init__(self, schema: ExampleSchema, expressions: list[str], fingerprint: str):
+        self._schema = schema.specimen.attributes["collection"]
+        self._expressions = expressions
+        self._fingerprint = fingerprint
+        self.injected = 0
+
+    def fingerprint(self) -> str | None:
+        return self._fingerprint
+
+    def inject(
+        self,
+    ) -> Iterable[tuple[MapperGroup, Iterable[tuple[Mapper, Iterable[MappingItem]]]]]:
+        self.injected += 1
+        mapper = Mapper(
+            uid=uuid4(),
+            name="collection",
+            attribute_schema_uid=self._schema.uid,
+            root_attribute_schema_uid=self._schema.uid,
+        )
+        items = [
+            MappingItem(
+                uid=uuid4(),
+                mapper_uid=mapper.uid,
+                expression=expression,
+                attribute=CodeAttribute(
+                    uid=uuid4(),
+                    schema_uid=self._schema.uid,
+                    original_value=Code(
+                        code=expression, scheme="CUSTOM", meaning=expression
+                    ),
+                ),
+            )
+            for expression in self._expressions
+        ]
+        group = MapperGroup(
+            uid=uuid4(), name="Example Mappers", mappers=[], default_enabled=True
+        )
+        yield group, [(mapper, items)]
+
+
+@pytest.fixture()
+def example_schema() -> ExampleSchema:
+    return ExampleSchema()
+
+
+@pytest.fixture()
+def start_with(
+    decoy: Decoy,
+    example_schema: ExampleSchema,
+    sqlite_database_service: DatabaseService,
+):
+    """Start a mapper service as a process does, injecting from an injector."""
+    schema_service = SchemaService(example_schema)
+    validation_service = ValidationService(schema_service, sqlite_database_service)
+    review_service = decoy.mock(cls=ReviewService)
+    attribute_service = AttributeService(
+        schema_service, validation_service, sqlite_database_service, review_service
+    )
+
+    def start(injector: MapperInjectorInterface) -> MapperService:
+        return MapperService(
+            attribute_service,
+            validation_service,
+            schema_service,
+            sqlite_database_service,
+            review_service,
+            injector,
+        )
+
+    return start
+
+
+def mappings(database_service: DatabaseService) -> dict[str, str]:
+    """The code each expression is mapped to."""
+    with database_service.get_session() as session:
+        return {
+            item.expression: item.attribute.original_value.code
+            for item in session.scalars(select(DatabaseMappingItem))
+        }
+
+
+@pytest.mark.integration
+class TestMapperInjection:
+    def test_unchanged_mappers_are_not_injected_again(
+        self,
+        start_with,
+        example_schema: ExampleSchema,
+        sqlite_database_service: DatabaseService,
+    ):
+        # Arrange
+        first = FixedMapperInjector(example_schema, ["Excision", "Biopsy"], "one")
+        start_with(first)
+        restarted = FixedMapperInjector(example_schema, ["Excision", "Biopsy"], "one")
+
+        # Act
+        start_with(restarted)
+
+        # Assert
+        assert first.injected == 1
+        assert restarted.injected == 0
+        assert mappings(sqlite_database_service) == {
+            "Excision": "Excision",
+            "Biopsy": "Biopsy",
+        }
+
+    def test_changed_mappers_add_what_is_new_and_keep_what_is_there(
+        self,
+        start_with,
+        example_schema: ExampleSchema,
+        sqlite_database_service: DatabaseService,
+    ):
+        # Arrange
+        start_with(FixedMapperInjector(example_schema, ["Excision"], "one"))
+        # Curated since it was injected.
+        with sqlite_database_service.get_session() as session:
+            item = session.scalars(select(DatabaseMappingItem)).one()
+            session.execute(
+                update(DatabaseMappingItem)
+                .where(DatabaseMappingItem.uid == item.uid)
+                .values(
+                    attribute=item.attribute.model_copy(
+                        update={
+                            "original_value": Code(
+                                code="Resection", scheme="CUSTOM", meaning="Resection"
+                            )
+                        }
+                    )
+                )
+            )
+            session.commit()
+        changed = FixedMapperInjector(example_schema, ["Excision", "Biopsy"], "two")
+
+        # Act
+        start_with(changed)
+
+        # Assert
+        assert changed.injected == 1
+        assert mappings(sqlite_database_service) == {
+            "Excision": "Resection",
+            "Biopsy": "Biopsy",
+        }
+        with sqlite_database_service.get_session() as session:
+            injection = sqlite_database_service.get_mapper_injection(
+                session, "FixedMapperInjector"
+            )
+            assert injection is not None
+            assert injection.fingerprint == "two"
+            assert (
+                session.scalar(select(func.count()).select_from(DatabaseMappingItem))
+                == 2
+            )
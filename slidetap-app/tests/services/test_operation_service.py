@@ -0,0 +1,142 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for running curation actions as background operations.
+
+Against a real database: what is pinned is what is read back from the record
+while and after the work runs, through sessions of its own, as the web process
+following an operation reads it.
+"""
+
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+
+from slidetap.model import OperationKind, OperationStatus
+from slidetap.services import (
+    DatabaseService,
+    OperationProgress,
+    OperationService,
+)
+
+
+@pytest.fixture()
+def operation_service(sqlite_database_service: DatabaseService) -> OperationService:
+    return OperationService(sqlite_database_service)
+
+
+@pytest.mark.integration
+class TestOperationService:
+    def test_run_records_progress_and_outcome(
+        self, operation_service: OperationService
+    ):
+        # Arrange
+        subject_uid = uuid4()
+        operation = operation_service.create(
+            OperationKind.FLAG_INVALID, subject_uid, {"batch_uid": "batch"}
+        )
+        seen: list[tuple[UUID, dict[str, Any]]] = []
+        totals: list[int | None] = []
+
+        def work(
+            subject_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+        ) -> str:
+            seen.append((subject_uid, parameters))
+            progress.begin(3)
+            totals.append(operation_service.get(operation.uid).total)
+            progress.advance()
+            progress.advance()
+            return "Flagged 2 review units for review."
+
+        # Act
+        ran = operation_service.run(operation.uid, work)
+
+        # Assert
+        assert seen == [(subject_uid, {"batch_uid": "batch"})]
+        assert totals == [3]
+        assert ran is not None
+        assert ran.status == OperationStatus.COMPLETED
+        assert (ran.total, ran.done) == (3, 3)
+        assert ran.message == "Flagged 2 review units for review."
+        assert ran.finished_at is not None
+
+    def test_run_records_error_as_failed(self, operation_service: OperationService):
+        # Arrange
+        operation = operation_service.create(OperationKind.DELETE_BATCH, uuid4())
+
+        def work(
+            subject_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+        ) -> None:
+            raise ValueError("Batch is being processed.")
+
+        # Act
+        ran = operation_service.run(operation.uid, work)
+
+        # Assert
+        assert ran is not None
+        assert ran.status == OperationStatus.FAILED
+        assert ran.message == "Batch is being processed."
+
+    def test_cancelled_while_queued_is_not_run(
+        self, operation_service: OperationService
+    ):
+        # Arrange
+        operation = operation_service.create(OperationKind.MOVE_ITEM, uuid4())
+        runs: list[UUID] = []
+
+        def work(
+            subject_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+        ) -> None:
+            runs.append(subject_uid)
+
+        # Act
+        cancelled = operation_service.cancel(operation.uid)
+        ran = operation_service.run(operation.uid, work)
+
+        # Assert
+        assert cancelled is not None
+        assert cancelled.status == OperationStatus.CANCELLED
+        assert runs == []
+        assert ran is not None
+        assert ran.status == OperationStatus.CANCELLED
+
+    def test_cancelled_while_running_stops_at_next_progress(
+        self, operation_service: OperationService, monkeypatch: pytest.MonkeyPatch
+    ):
+        # Arrange: each step written, so that the next one is where it stops.
+        monkeypatch.setattr(OperationProgress, "WRITE_INTERVAL", 0.0)
+        operation = operation_service.create(
+            OperationKind.REMAP_ITEM_HIERARCHY, uuid4()
+        )
+        steps: list[int] = []
+
+        def work(
+            subject_uid: UUID, parameters: dict[str, Any], progress: OperationProgress
+        ) -> None:
+            progress.begin(5)
+            for step in range(5):
+                steps.append(step)
+                if step == 1:
+                    operation_service.cancel(operation.uid)
+                progress.advance()
+
+        # Act
+        ran = operation_service.run(operation.uid, work)
+
+        # Assert
+        assert steps == [0, 1]
+        assert ran is not None
+        assert ran.status == OperationStatus.CANCELLED
+        assert (ran.total, ran.done) == (5, 2)
@@ -0,0 +1,275 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for `OverviewService`.
+
+Against a real database: what is pinned is what the overview finds under a
+case and how many queries it takes to find it, and a mock answers whatever it
+is told to.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from uuid import UUID, uuid4
+
+import pytest
+
+from slidetap.database import (
+    DatabaseAttribute,
+    DatabaseStringAttribute,
+)
+from slidetap.model import (
+    OverviewLayout,
+    OverviewSectionLayout,
+    RootSchema,
+)
+from slidetap.services import (
+    AttributeService,
+    DatabaseService,
+    OverviewService,
+    ReviewService,
+    SchemaService,
+    ValidationService,
+)
+from tests.conftest import CaseBuilder
+
+
+@pytest.fixture()
+def overview_service(
+    sqlite_database_service: DatabaseService, schema: RootSchema
+) -> OverviewService:
+    schema_service = SchemaService(schema)
+    validation_service = ValidationService(schema_service, sqlite_database_service)
+    review_service = ReviewService(
+        schema_service, validation_service, sqlite_database_service
+    )
+    return OverviewService(
+        AttributeService(
+            schema_service, validation_service, sqlite_database_service, review_service
+        ),
+        schema_service,
+        sqlite_database_service,
+    )
+
+
+@pytest.fixture()
+def layout(schemas: dict[str, UUID]) -> OverviewLayout:
+    """The diagnoses of each specimen, with its fixation, and the slides cut
+    from it -- through a block the layout does not name."""
+    return OverviewLayout(
+        uid=uuid4(),
+        name="case",
+        display_name="Case",
+        schema_uid=schemas["case"],
+        sections=[
+            OverviewSectionLayout(
+                schema_uid=schemas["observation"],
+                path=[schemas["specimen"]],
+                attributes=["diagnose"],
+                parent_attributes=["fixation"],
+            ),
+            OverviewSectionLayout(
+                schema_uid=schemas["slide"],
+                path=[schemas["specimen"]],
+                attributes=["staining"],
+            ),
+        ],
+    )
+
+
+def add_case(
+    build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    identifier: str,
+    specimens: int = 2,
+    pseudonym: str | None = None,
+) -> UUID:
+    """A case with specimens, each with a diagnose and a slide cut from a
+    block of it. The last specimen is no longer part of the project."""
+
+    def string(tag: str, value: str) -> list[DatabaseAttribute]:
+        return [DatabaseStringAttribute(tag, uuid4(), value)]
+
+    with build_case() as build:
+        case = build.sample("case", identifier, pseudonym=pseudonym)
+        for index in range(specimens, 0, -1):
+            specimen = build.sample(
+                "specimen",
+                f"{identifier} specimen {index}",
+                [case],
+                attributes=string("fixation", "formalin")
+                + string("collection", "excision"),
+                selected=index != specimens,
+            )
+            block = build.sample("block", f"{identifier} block {index}", [specimen])
+            build.sample(
+                "slide",
+                f"{identifier} slide {index}",
+                [block],
+                attributes=string("staining", "HE"),
+            )
+            build.observation(
+                "observation",
+                f"{identifier} diagnose {index}",
+                specimen,
+                attributes=string("diagnose", "carcinoma") + string("comment", "none"),
+            )
+        return case.uid
+
+
+@pytest.mark.integration
+class TestOverviewSections:
+    def test_groups_what_is_under_each_selected_specimen(
+        self,
+        overview_service: OverviewService,
+        layout: OverviewLayout,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        case_uid = add_case(build_case, "A", specimens=3)
+
+        # Act
+        overview = overview_service.get_overview_data(case_uid, layout)
+
+        # Assert
+        assert overview is not None
+        diagnoses, slides = overview.sections[:2], overview.sections[2:]
+        assert [section.label for section in diagnoses] == [
+            "A specimen 1",
+            "A specimen 2",
+        ]
+        assert [
+            [item.identifier for item in section.items] for section in diagnoses
+        ] == [["A diagnose 1"], ["A diagnose 2"]]
+        assert [[item.identifier for item in section.items] for section in slides] == [
+            ["A slide 1"],
+            ["A slide 2"],
+        ]
+
+    def test_shows_only_the_attributes_the_sections_name(
+        self,
+        overview_service: OverviewService,
+        layout: OverviewLayout,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        case_uid = add_case(build_case, "A")
+
+        # Act
+        overview = overview_service.get_overview_data(case_uid, layout)
+
+        # Assert
+        assert overview is not None
+        section = overview.sections[0]
+        assert list(section.items[0].attributes) == ["diagnose"]
+        assert section.parent_item is not None
+        assert list(section.parent_item.attributes) == ["fixation"]
+
+    @pytest.mark.parametrize("specimens", [2, 8])
+    def test_the_same_queries_however_large_the_case(
+        self,
+        overview_service: OverviewService,
+        layout: OverviewLayout,
+        specimens: int,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        case_uid = add_case(build_case, "A", specimens)
+
+        # Act
+        with counted_statements() as statements:
+            overview = overview_service.get_overview_data(case_uid, layout)
+
+        # Assert: the case, the walk, the items, the attributes public and
+        # private, and the neighbours.
+        assert overview is not None
+        assert len(statements) == 6
+        assert len(overview.sections) == 2 * (specimens - 1)
+
+
+@pytest.mark.integration
+class TestOverviewNeighbours:
+    @pytest.fixture()
+    def cases(
+        self, build_case: Callable[[], AbstractContextManager[CaseBuilder]]
+    ) -> list[UUID]:
+        """Three cases, whose pseudonyms run the other way to their names."""
+        return [
+            add_case(
+                build_case,
+                identifier,
+                pseudonym=pseudonym,
+            )
+            for identifier, pseudonym in (("A", "P3"), ("B", "P2"), ("C", "P1"))
+        ]
+
+    def test_by_identifier(
+        self,
+        overview_service: OverviewService,
+        layout: OverviewLayout,
+        cases: list[UUID],
+    ):
+        overview = overview_service.get_overview_data(cases[1], layout)
+
+        assert overview is not None
+        assert (overview.previous_uid, overview.next_uid) == (cases[0], cases[2])
+
+    def test_by_pseudonym(
+        self,
+        overview_service: OverviewService,
+        layout: OverviewLayout,
+        cases: list[UUID],
+    ):
+        overview = overview_service.get_overview_data(
+            cases[0], layout, pseudonym_mode=True
+        )
+
+        assert overview is not None
+        assert (overview.previous_uid, overview.next_uid) == (cases[1], None)
+
+    def test_by_pseudonym_falls_back_for_a_case_without_one(
+        self,
+        overview_service: OverviewService,
+        layout: OverviewLayout,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        """A case without a pseudonym is placed by the one it is shown under,
+        derived from its uid, and not wherever the database puts nulls."""
+        # Arrange
+        pseudonyms = {
+            add_case(build_case, identifier, pseudonym=pseudonym): pseudonym
+            for identifier, pseudonym in (
+                ("A", None),
+                ("B", None),
+                ("C", "0"),
+                ("D", "Z"),
+            )
+        }
+        ordered = sorted(
+            pseudonyms,
+            key=lambda uid: pseudonyms[uid] or f"ANON-{str(uid)[:8].upper()}",
+        )
+
+        # Act
+        neighbours = [
+            overview_service.get_overview_data(uid, layout, pseudonym_mode=True)
+            for uid in ordered
+        ]
+
+        # Assert
+        assert [
+            (overview.previous_uid, overview.next_uid)
+            for overview in neighbours
+            if overview is not None
+        ] == list(zip([None, *ordered[:-1]], [*ordered[1:], None], strict=True))
@@ -26,9 +26,9 @@ from uuid import UUID, uuid4
 import pytest
 
 from slidetap.database import DatabaseImage
+from slidetap.database.batch_image_progress import PRE_PROCESSING_SETTLED
 from slidetap.model import ImageFormat, ImageStatus
 from slidetap.services import DatabaseService
-from slidetap.task.tasks import PRE_PROCESSING_SETTLED
 
 
 @pytest.fixture()
@@ -0,0 +1,279 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for what processing an image is recorded to have taken, and what that
+comes to over a batch."""
+
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from decoy import Decoy
+
+from slidetap.config import ImageCacheConfig
+from slidetap.database import DatabaseImage
+from slidetap.image_processor import (
+    ImageProcessingError,
+    ImageProcessingStep,
+    ImageProcessor,
+)
+from slidetap.image_processor.processing_meter import ProcessingMeter
+from slidetap.model import (
+    Batch,
+    Dataset,
+    Image,
+    ImageFormat,
+    ImageProcessingPhase,
+    ImageProcessingProfile,
+    ProcessingMeasurement,
+    Project,
+    RootSchema,
+)
+from slidetap.services import (
+    DatabaseService,
+    ImageService,
+    SchemaService,
+    StorageService,
+)
+from slidetap.services.image_service import ImageCache
+
+
+def measurement(wall_seconds: float, failed: bool = False) -> ProcessingMeasurement:
+    return ProcessingMeasurement(
+        wall_seconds=wall_seconds,
+        cpu_seconds=wall_seconds / 2,
+        read_bytes=100,
+        written_bytes=None,
+        peak_rss_bytes=int(wall_seconds * 1000),
+        failed=failed,
+    )
+
+
+class PassingStep(ImageProcessingStep):
+    def run(
+        self, schema, storage_service, project, image, path, working_folder, task_id
+    ):
+        return path, image
+
+
+class FailingStep(ImageProcessingStep):
+    def run(
+        self, schema, storage_service, project, image, path, working_folder, task_id
+    ):
+        raise ValueError("Corrupt tile.")
+
+
+@pytest.fixture()
+def image_service(
+    decoy: Decoy, sqlite_database_service: DatabaseService
+) -> ImageService:
+    return ImageService(
+        decoy.mock(cls=StorageService),
+        sqlite_database_service,
+        ImageCache(ImageCacheConfig(cache_size=1), sqlite_database_service),
+    )
+
+
+@pytest.fixture()
+def images(
+    sqlite_database_service: DatabaseService,
+    dataset: Dataset,
+    batch_uid: UUID,
+    schema: RootSchema,
+) -> list[UUID]:
+    """Four images in the batch, none of them processed."""
+    wsi = next(iter(schema.images.values())).uid
+    with sqlite_database_service.get_session() as session:
+        added = [
+            DatabaseImage(
+                dataset.uid, batch_uid, wsi, f"PL1234-20-{index}", ImageFormat.OTHER_WSI
+            )
+            for index in range(4)
+        ]
+        session.add_all(added)
+        session.commit()
+        return [image.uid for image in added]
+
+
+@pytest.mark.unittest
+class TestProcessingMeasurement:
+    def test_meter_measures_the_run_it_was_started_for(self):
+        # Arrange
+        meter = ProcessingMeter()
+        sum(range(10000))
+
+        # Act
+        done = meter.read()
+        failed = meter.read(failed=True)
+
+        # Assert
+        assert done.wall_seconds >= 0
+        assert done.cpu_seconds >= 0
+        assert failed.wall_seconds >= done.wall_seconds
+        assert not done.failed
+        assert failed.failed
+
+    def test_a_phase_run_again_replaces_the_earlier_run(self):
+        # Arrange
+        profile = ImageProcessingProfile(steps={"Step": measurement(1.0)})
+        profile = profile.with_phase(ImageProcessingPhase.DOWNLOAD, measurement(1.0))
+
+        # Act
+        profile = profile.with_phase(
+            ImageProcessingPhase.DOWNLOAD, measurement(2.0)
+        ).with_phase(ImageProcessingPhase.PRE_PROCESS, measurement(3.0))
+
+        # Assert
+        assert profile.phases == {
+            ImageProcessingPhase.DOWNLOAD: measurement(2.0),
+            ImageProcessingPhase.PRE_PROCESS: measurement(3.0),
+        }
+        assert profile.steps == {"Step": measurement(1.0)}
+
+    def test_failed_step_is_carried_with_the_steps_before_it(
+        self,
+        decoy: Decoy,
+        schema: RootSchema,
+        dataset: Dataset,
+        tmp_path: Path,
+    ):
+        # Arrange
+        processor = ImageProcessor(
+            decoy.mock(cls=StorageService),
+            SchemaService(schema),
+            [PassingStep(), FailingStep()],
+        )
+        image = Image(
+            uid=uuid4(),
+            identifier="image identifier",
+            dataset_uid=dataset.uid,
+            schema_uid=schema.image_schema_uid,
+            format=ImageFormat.OTHER_WSI,
+            folder_path=str(tmp_path),
+        )
+
+        # Act
+        with pytest.raises(ImageProcessingError) as raised:
+            processor.run(
+                image, decoy.mock(cls=Batch), decoy.mock(cls=Project), "task id"
+            )
+
+        # Assert
+        steps = raised.value.steps
+        assert list(steps) == ["PassingStep", "FailingStep"]
+        assert not steps["PassingStep"].failed
+        assert steps["FailingStep"].failed
+        assert isinstance(raised.value.__cause__, ValueError)
+
+    def test_profile_survives_a_round_trip_through_json(self):
+        # Arrange
+        profile = ImageProcessingProfile().with_phase(
+            ImageProcessingPhase.POST_PROCESS,
+            measurement(4.0, failed=True),
+            {"DicomProcessingStep": measurement(3.5, failed=True)},
+        )
+
+        # Act
+        loaded = ImageProcessingProfile.model_validate_json(
+            profile.model_dump_json(by_alias=True)
+        )
+
+        # Assert
+        assert loaded == profile
+
+
+@pytest.mark.integration
+class TestBatchProcessingProfile:
+    def test_batch_profile_sums_phases_and_steps_over_its_images(
+        self,
+        sqlite_database_service: DatabaseService,
+        image_service: ImageService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Arrange
+        walls = [1.0, 2.0, 12.0]
+        with sqlite_database_service.get_session() as session:
+            for uid, wall in zip(images, walls, strict=False):
+                image = session.get_one(DatabaseImage, uid)
+                image.record_processing(
+                    ImageProcessingPhase.DOWNLOAD, measurement(wall / 2)
+                )
+                image.record_processing(
+                    ImageProcessingPhase.POST_PROCESS,
+                    measurement(wall / 2, failed=wall > 10),
+                    {"Step": measurement(wall / 4, failed=wall > 10)},
+                )
+            session.commit()
+
+        # Act
+        profile = image_service.get_batch_processing_profile(batch_uid)
+
+        # Assert
+        assert profile.images == 3
+        download = profile.phases[ImageProcessingPhase.DOWNLOAD]
+        assert download.images == 3
+        assert download.failed == 0
+        assert download.total_wall_seconds == pytest.approx(7.5)
+        assert download.median_wall_seconds == pytest.approx(1.0)
+        assert download.max_wall_seconds == pytest.approx(6.0)
+        assert download.total_cpu_seconds == pytest.approx(3.75)
+        assert download.read_bytes == 300
+        assert download.written_bytes is None
+        assert download.peak_rss_bytes == 6000
+        assert profile.phases[ImageProcessingPhase.POST_PROCESS].failed == 1
+        assert profile.steps["Step"].total_wall_seconds == pytest.approx(3.75)
+        assert [image.uid for image in profile.slowest] == [
+            images[2],
+            images[1],
+            images[0],
+        ]
+        assert profile.slowest[0].wall_seconds == pytest.approx(12.0)
+        assert profile.slowest[0].times_median == pytest.approx(6.0)
+
+    def test_image_not_processed_has_no_profile(
+        self,
+        image_service: ImageService,
+        batch_uid: UUID,
+        images: list[UUID],
+    ):
+        # Act
+        image_profile = image_service.get_processing_profile(images[0])
+        batch_profile = image_service.get_batch_processing_profile(batch_uid)
+
+        # Assert
+        assert image_profile is None
+        assert batch_profile.images == 0
+        assert batch_profile.phases == {}
+        assert batch_profile.slowest == []
+
+    def test_image_profile_is_read_back_as_recorded(
+        self,
+        sqlite_database_service: DatabaseService,
+        image_service: ImageService,
+        images: list[UUID],
+    ):
+        # Arrange
+        with sqlite_database_service.get_session() as session:
+            image = session.get_one(DatabaseImage, images[0])
+            image.record_processing(ImageProcessingPhase.STORE, measurement(2.0))
+            session.commit()
+
+        # Act
+        profile = image_service.get_processing_profile(images[0])
+
+        # Assert
+        assert profile == ImageProcessingProfile(
+            phases={ImageProcessingPhase.STORE: measurement(2.0)}
+        )
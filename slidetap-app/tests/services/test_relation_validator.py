@@ -0,0 +1,177 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for validating the relations of a group of items as a set.
+
+Against a real database: what is pinned is that counting relations from the
+links read for the whole group answers as following each item's relationships
+does, and takes as many statements for many cases as for few.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from uuid import UUID
+
+import pytest
+from sqlalchemy import not_, select, update
+
+from slidetap.database import (
+    DatabaseItem,
+    DatabaseSample,
+)
+from slidetap.model import RootSchema
+from slidetap.services import DatabaseService, SchemaService, ValidationService
+from tests.conftest import CaseBuilder
+
+
+@pytest.fixture()
+def validation_service(
+    sqlite_database_service: DatabaseService, schema: RootSchema
+) -> ValidationService:
+    return ValidationService(SchemaService(schema), sqlite_database_service)
+
+
+def add_case(
+    build_case: Callable[[], AbstractContextManager[CaseBuilder]], identifier: str
+) -> list[UUID]:
+    """A case under a patient, down to a slide with an image and a slide
+    without one, and an observation on the case."""
+    with build_case() as build:
+        patient = build.sample("patient", f"{identifier}-patient")
+        case = build.sample("case", identifier, [patient])
+        specimen = build.sample("specimen", f"{identifier}-1", [case])
+        block = build.sample("block", f"{identifier}-1-1", [specimen])
+        scanned = build.sample("slide", f"{identifier}-1-1-1", [block])
+        not_scanned = build.sample("slide", f"{identifier}-1-1-2", [block])
+        image = build.image("wsi", f"{identifier}-1-1-1-image", [scanned])
+        observation = build.observation("observation", f"{identifier}-obs", case)
+        items: list[DatabaseItem] = [
+            patient,
+            case,
+            specimen,
+            block,
+            scanned,
+            not_scanned,
+            image,
+            observation,
+        ]
+        return [item.uid for item in items]
+
+
+def stored_relations(database_service: DatabaseService) -> dict[str, bool]:
+    with database_service.get_session() as session:
+        return {
+            identifier: valid
+            for identifier, valid in session.execute(
+                select(DatabaseItem.identifier, DatabaseItem.valid_relations)
+            )
+        }
+
+
+@pytest.mark.integration
+class TestValidateRelationsFor:
+    def test_answers_as_validating_item_by_item(
+        self,
+        validation_service: ValidationService,
+        sqlite_database_service: DatabaseService,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        uids = add_case(build_case, "PL1234-20")
+        with sqlite_database_service.get_session() as session:
+            for uid in uids:
+                validation_service.validate_item_relations(uid, session)
+            session.commit()
+        item_by_item = stored_relations(sqlite_database_service)
+        # Every stored value turned over, so that each has to be written again.
+        with sqlite_database_service.get_session() as session:
+            session.execute(
+                update(DatabaseItem).values(
+                    valid_relations=not_(DatabaseItem.valid_relations)
+                )
+            )
+            session.commit()
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            validation_service.validate_relations_for(uids, session)
+            session.commit()
+
+        # Assert
+        assert stored_relations(sqlite_database_service) == item_by_item
+        assert item_by_item["PL1234-20-1-1-1"] is True
+        assert item_by_item["PL1234-20-1-1-2"] is False
+
+    def test_items_loaded_in_the_session_see_what_was_stored(
+        self,
+        validation_service: ValidationService,
+        sqlite_database_service: DatabaseService,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        uids = add_case(build_case, "PL1234-20")
+        scanned = uids[4]
+
+        with sqlite_database_service.get_session() as session:
+            slide = session.get_one(DatabaseSample, scanned)
+            slide.valid_relations = False
+            session.flush()
+
+            # Act
+            validation_service.validate_relations_for([scanned], session)
+
+            # Assert
+            assert slide.valid_relations is True
+
+    def test_statements_do_not_grow_with_the_cases_validated(
+        self,
+        validation_service: ValidationService,
+        sqlite_database_service: DatabaseService,
+        counted_statements: Callable[[], AbstractContextManager[list[str]]],
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+    ):
+        # Arrange
+        few = add_case(build_case, "PL1234-20")
+        many = [
+            uid
+            for index in range(1, 6)
+            for uid in add_case(
+                build_case,
+                f"PL1234-2{index}",
+            )
+        ]
+
+        def validate(uids: list[UUID]) -> int:
+            # Turned over, so that each run has every value to write.
+            with sqlite_database_service.get_session() as session:
+                session.execute(
+                    update(DatabaseItem).values(
+                        valid_relations=not_(DatabaseItem.valid_relations)
+                    )
+                )
+                session.commit()
+            with (
+                counted_statements() as statements,
+                sqlite_database_service.get_session() as session,
+            ):
+                validation_service.validate_relations_for(uids, session)
+                session.commit()
+            return len(statements)
+
+        # Act
+        for_few = validate(few)
+        for_many = validate(many)
+
+        # Assert
+        assert for_many == for_few
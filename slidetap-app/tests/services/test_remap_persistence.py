@@ -49,6 +49,7 @@ from slidetap.services import (
     ValidationService,
 )
 from slidetap.services.mapper_service import MapperService
+from slidetap.services.validators.attribute_validator import AttributeValidator
 
 MAPPED_CODE = Code(code="87697008", scheme="SCT", meaning="Punch biopsy")
 """What the mapping puts in place of the wording the laboratory recorded."""
@@ -127,6 +128,9 @@ def schema_service(
     for schema in (child_schema, object_schema, list_schema, union_schema):
         decoy.when(service.get_any_attribute(schema.uid)).then_return(schema)
         decoy.when(service.get_attribute(schema.uid)).then_return(schema)
+        decoy.when(service.get_attribute_validator(schema.uid)).then_return(
+            AttributeValidator.compile(schema)
+        )
     return service
 
 
@@ -0,0 +1,160 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the queue a reviewer works through.
+
+Against a real database: what is pinned is that what is kept written down of
+each unit follows the issues as they are raised and settled, and that paging,
+sorting and filtering are done by the query, which a mock can show neither of.
+"""
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from uuid import UUID, uuid4
+
+import pytest
+
+from slidetap.model import (
+    Dataset,
+    ReviewIssueSource,
+    ReviewLayout,
+    ReviewQueueSort,
+    ReviewUnitSchema,
+    RootSchema,
+)
+from slidetap.services import (
+    DatabaseService,
+    ReviewService,
+    SchemaService,
+    ValidationService,
+)
+from tests.conftest import CaseBuilder
+
+
+@pytest.fixture()
+def case_schema_uid(schemas: dict[str, UUID]) -> UUID:
+    return schemas["case"]
+
+
+@pytest.fixture()
+def review_service(
+    sqlite_database_service: DatabaseService,
+    schema: RootSchema,
+    case_schema_uid: UUID,
+) -> ReviewService:
+    reviewed = schema.model_copy(
+        update={
+            "review_unit": ReviewUnitSchema(
+                schema_uid=case_schema_uid,
+                layout=ReviewLayout(uid=uuid4(), name="review"),
+            )
+        }
+    )
+    schema_service = SchemaService(reviewed)
+    return ReviewService(
+        schema_service,
+        ValidationService(schema_service, sqlite_database_service),
+        sqlite_database_service,
+    )
+
+
+@pytest.fixture()
+def cases(
+    build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+) -> dict[str, UUID]:
+    """Five cases, by identifier."""
+    with build_case() as build:
+        return {
+            identifier: build.sample("case", identifier).uid
+            for identifier in (f"PL1234-2{index}" for index in range(5))
+        }
+
+
+@pytest.mark.integration
+class TestReviewQueue:
+    def test_entry_follows_issues_raised_and_settled(
+        self,
+        review_service: ReviewService,
+        dataset: Dataset,
+        cases: dict[str, UUID],
+        case_schema_uid: UUID,
+    ):
+        # Arrange
+        case = cases["PL1234-20"]
+        first = review_service.raise_issue(case, "Wrong site", ReviewIssueSource.USER)
+        review_service.raise_issue(case, "Wrong stain", ReviewIssueSource.USER)
+        assert first is not None
+
+        # Act
+        review_service.resolve_issue(first.uid)
+
+        # Assert
+        entry = next(
+            entry
+            for entry in review_service.get_review_queue(case_schema_uid, dataset.uid)
+            if entry.uid == case
+        )
+        assert entry.open_issues == 1
+        assert entry.review_reasons == ["Wrong stain"]
+
+    def test_page_sorted_by_open_issues(
+        self,
+        review_service: ReviewService,
+        dataset: Dataset,
+        cases: dict[str, UUID],
+        case_schema_uid: UUID,
+    ):
+        # Arrange
+        for identifier, count in (("PL1234-21", 1), ("PL1234-23", 3)):
+            for index in range(count):
+                review_service.raise_issue(
+                    cases[identifier], f"Issue {index}", ReviewIssueSource.USER
+                )
+
+        # Act
+        page = review_service.get_review_queue(
+            case_schema_uid,
+            dataset.uid,
+            sort=ReviewQueueSort.OPEN_ISSUES,
+            descending=True,
+            start=1,
+            size=2,
+        )
+        count = review_service.get_review_queue_count(case_schema_uid, dataset.uid)
+
+        # Assert: ties taken by identifier.
+        assert [(entry.identifier, entry.open_issues) for entry in page] == [
+            ("PL1234-21", 1),
+            ("PL1234-20", 0),
+        ]
+        assert count == 5
+
+    def test_filtered_by_identifier(
+        self,
+        review_service: ReviewService,
+        dataset: Dataset,
+        cases: dict[str, UUID],
+        case_schema_uid: UUID,
+    ):
+        # Act
+        entries = review_service.get_review_queue(
+            case_schema_uid, dataset.uid, identifier_filter="-22"
+        )
+        count = review_service.get_review_queue_count(
+            case_schema_uid, dataset.uid, identifier_filter="-22"
+        )
+
+        # Assert
+        assert [entry.uid for entry in entries] == [cases["PL1234-22"]]
+        assert count == 1
@@ -0,0 +1,107 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the lookups worked out from a schema when it is loaded."""
+
+from uuid import UUID, uuid4
+
+import pytest
+
+from slidetap.model import RootSchema
+from slidetap.services import SchemaService
+from slidetap.services.schema_index import SchemaIndex
+
+
+@pytest.mark.unittest
+class TestSchemaIndex:
+    def test_hierarchy_is_each_schema_above_what_hangs_from_it(
+        self, schema: RootSchema, schemas: dict[str, UUID]
+    ):
+        # Arrange
+        schema_service = SchemaService(schema)
+
+        # Act
+        hierarchy = schema_service.get_item_schema_hierarchy_recursive(
+            schema_service.get_item(schemas["specimen"])
+        )
+
+        # Assert
+        assert hierarchy[0] == schemas["specimen"]
+        assert hierarchy.index(schemas["block"]) < hierarchy.index(schemas["slide"])
+        assert hierarchy.index(schemas["slide"]) < hierarchy.index(schemas["wsi"])
+        assert schemas["case"] not in hierarchy
+
+    def test_hierarchy_of_schema_the_root_does_not_have_is_walked(
+        self, schema: RootSchema, schemas: dict[str, UUID]
+    ):
+        # Arrange
+        schema_service = SchemaService(schema)
+        specimen = schema_service.get_item(schemas["specimen"])
+        outside = specimen.model_copy(update={"uid": uuid4()})
+
+        # Act
+        hierarchy = schema_service.get_item_schema_hierarchy_recursive(outside)
+
+        # Assert
+        assert hierarchy[0] == outside.uid
+        assert (
+            hierarchy[1:]
+            == schema_service.get_item_schema_hierarchy_recursive(specimen)[1:]
+        )
+
+    def test_ancestors_are_every_schema_hung_under(
+        self, schema: RootSchema, schemas: dict[str, UUID]
+    ):
+        # Act
+        index = SchemaIndex.build(schema)
+
+        # Assert
+        assert {
+            schemas["wsi"],
+            schemas["slide"],
+            schemas["block"],
+            schemas["specimen"],
+            schemas["case"],
+            schemas["patient"],
+        } <= index.ancestors[schemas["wsi"]]
+        assert index.ancestors[schemas["patient"]] == {schemas["patient"]}
+
+    def test_index_read_back_answers_as_the_one_built(
+        self, schema: RootSchema, schemas: dict[str, UUID]
+    ):
+        # Arrange
+        built = SchemaService(schema)
+        written = built.index.model_dump_json()
+
+        # Act
+        loaded = SchemaService.with_index(
+            schema, SchemaIndex.model_validate_json(written)
+        )
+
+        # Assert
+        assert loaded.index == built.index
+        slide = loaded.get_item(schemas["slide"])
+        assert loaded.parent_schema_caps(slide) == built.parent_schema_caps(slide)
+        assert loaded.get_item_schema_hierarchy_recursive(
+            slide
+        ) == built.get_item_schema_hierarchy_recursive(slide)
+
+    def test_index_of_another_schema_is_refused(self, schema: RootSchema):
+        # Arrange
+        index = SchemaIndex.build(schema)
+        another = schema.model_copy(update={"uid": uuid4()})
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            SchemaService.with_index(another, index)
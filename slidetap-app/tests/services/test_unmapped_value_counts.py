@@ -0,0 +1,221 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the counts the mapping work list is read from.
+
+Against a real database: what is pinned is that the counts moved as values are
+recorded, replaced and carried between batches end up where counting the
+values again puts them, and that the order, filter and page are the query's.
+"""
+
+from uuid import UUID, uuid4
+
+import pytest
+from slidetap_example.schema import ExampleSchema
+
+from slidetap.database import DatabaseSample
+from slidetap.model import BatchCreate, CodeAttribute, Dataset, Project
+from slidetap.services import DatabaseService
+
+
+@pytest.fixture()
+def batches(
+    sqlite_database_service: DatabaseService, dataset: Dataset, project: Project
+) -> tuple[UUID, UUID]:
+    with sqlite_database_service.get_session() as session:
+        sqlite_database_service.add_dataset(session, dataset)
+        sqlite_database_service.add_project(session, project)
+        first, second = (
+            sqlite_database_service.add_batch(
+                session, BatchCreate(name=name, project_uid=project.uid)
+            )
+            for name in ("first", "second")
+        )
+        session.commit()
+        return first.uid, second.uid
+
+
+def add_specimen(
+    database_service: DatabaseService,
+    schema: ExampleSchema,
+    dataset: Dataset,
+    batch_uid: UUID,
+    identifier: str,
+    **values: str,
+) -> UUID:
+    """A specimen in a batch, with a code attribute by name for each value."""
+    with database_service.get_session() as session:
+        specimen = DatabaseSample(
+            dataset.uid, batch_uid, schema.specimen.uid, identifier
+        )
+        for name, value in values.items():
+            attribute_schema = schema.specimen.attributes[name]
+            specimen.attributes.add(
+                database_service.add_attribute(
+                    session,
+                    CodeAttribute(
+                        uid=uuid4(),
+                        schema_uid=attribute_schema.uid,
+                        mappable_value=value,
+                    ),
+                    attribute_schema,
+                )
+            )
+        session.add(specimen)
+        session.commit()
+        return specimen.uid
+
+
+def counts(
+    database_service: DatabaseService, project: Project, **kwargs
+) -> list[tuple[str, int]]:
+    with database_service.get_session() as session:
+        return [
+            (value, items)
+            for _, value, items in database_service.unmapped_value_counts(
+                session, project.uid, **kwargs
+            )
+        ]
+
+
+def recounted(
+    database_service: DatabaseService, project: Project
+) -> list[tuple[str, int]]:
+    with database_service.get_session() as session:
+        database_service.rebuild_unmapped_value_counts(session, project.uid)
+        session.commit()
+    return counts(database_service, project)
+
+
+@pytest.mark.integration
+class TestUnmappedValueCounts:
+    def test_counts_items_rather_than_occurrences(
+        self,
+        sqlite_database_service: DatabaseService,
+        schema: ExampleSchema,
+        dataset: Dataset,
+        project: Project,
+        batches: tuple[UUID, UUID],
+    ):
+        # Act
+        add_specimen(
+            sqlite_database_service,
+            schema,
+            dataset,
+            batches[0],
+            "PL1234-20-1",
+            collection="Biopsi",
+            fixation="Biopsi",
+        )
+        add_specimen(
+            sqlite_database_service,
+            schema,
+            dataset,
+            batches[1],
+            "PL1234-21-1",
+            collection="Biopsi",
+        )
+        add_specimen(
+            sqlite_database_service,
+            schema,
+            dataset,
+            batches[1],
+            "PL1234-22-1",
+            collection="Hudstans",
+        )
+
+        # Assert: by schema, so the specimen carrying it twice counts once for
+        # each.
+        assert counts(sqlite_database_service, project) == [
+            ("Biopsi", 2),
+            ("Biopsi", 1),
+            ("Hudstans", 1),
+        ]
+        assert counts(sqlite_database_service, project, batch_uid=batches[1]) == [
+            ("Biopsi", 1),
+            ("Hudstans", 1),
+        ]
+
+    def test_counts_follow_values_replaced_moved_and_removed(
+        self,
+        sqlite_database_service: DatabaseService,
+        schema: ExampleSchema,
+        dataset: Dataset,
+        project: Project,
+        batches: tuple[UUID, UUID],
+    ):
+        # Arrange
+        first, second = batches
+        replaced, moved, removed = (
+            add_specimen(
+                sqlite_database_service,
+                schema,
+                dataset,
+                first,
+                f"PL1234-2{index}-1",
+                collection="Biopsi",
+            )
+            for index in range(3)
+        )
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            attribute = next(iter(session.get_one(DatabaseSample, replaced).attributes))
+            attribute.mappable_value = "Hudstans"
+            sqlite_database_service.record_unmapped_values(attribute, session)
+            session.get_one(DatabaseSample, moved).batch_uid = second
+            session.commit()
+        with sqlite_database_service.get_session() as session:
+            session.delete(session.get_one(DatabaseSample, removed))
+            session.commit()
+
+        # Assert
+        assert counts(sqlite_database_service, project, batch_uid=first) == [
+            ("Hudstans", 1)
+        ]
+        assert counts(sqlite_database_service, project, batch_uid=second) == [
+            ("Biopsi", 1)
+        ]
+        assert counts(sqlite_database_service, project) == recounted(
+            sqlite_database_service, project
+        )
+
+    def test_paged_and_filtered_by_the_query(
+        self,
+        sqlite_database_service: DatabaseService,
+        schema: ExampleSchema,
+        dataset: Dataset,
+        project: Project,
+        batches: tuple[UUID, UUID],
+    ):
+        # Arrange
+        for index, value in enumerate(
+            ("Biopsi", "Biopsi", "Bi%psi", "Hudstans", "Biopsi", "Bi%psi")
+        ):
+            add_specimen(
+                sqlite_database_service,
+                schema,
+                dataset,
+                batches[0],
+                f"PL1234-2{index}-1",
+                collection=value,
+            )
+
+        # Act
+        page = counts(sqlite_database_service, project, start=1, size=2)
+        filtered = counts(sqlite_database_service, project, value_prefix="Bi%")
+
+        # Assert: the prefix is taken as written, not as a pattern.
+        assert page == [("Bi%psi", 2), ("Hudstans", 1)]
+        assert filtered == [("Bi%psi", 2)]
@@ -0,0 +1,185 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for validating what a unit of work changed once, at its end."""
+
+from uuid import UUID, uuid4
+
+import pytest
+from decoy import Decoy, matchers
+from sqlalchemy.orm import Session
+
+from slidetap.database import DatabaseItem
+from slidetap.services import ReviewService, ValidationService
+from slidetap.services.validation_tracker import ValidationTracker
+
+
+@pytest.fixture()
+def validation_service(decoy: Decoy) -> ValidationService:
+    return decoy.mock(cls=ValidationService)
+
+
+@pytest.fixture()
+def review_service(decoy: Decoy) -> ReviewService:
+    return decoy.mock(cls=ReviewService)
+
+
+@pytest.fixture()
+def session(decoy: Decoy) -> Session:
+    return decoy.mock(cls=Session)
+
+
+@pytest.fixture()
+def item_uid(
+    decoy: Decoy, validation_service: ValidationService, session: Session
+) -> UUID:
+    """An item that is valid before the change and not after it."""
+    uid = uuid4()
+    decoy.when(validation_service.item_is_valid_for_now(uid, session)).then_return(
+        True, False
+    )
+    return uid
+
+
+@pytest.mark.unittest
+class TestValidationTracker:
+    def test_item_changed_many_times_is_validated_and_reported_once(
+        self,
+        decoy: Decoy,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+        item_uid: UUID,
+    ):
+        # Act
+        with ValidationTracker.track(
+            validation_service, review_service, session
+        ) as tracker:
+            for _ in range(60):
+                tracker.attributes_changed(item_uid)
+
+        # Assert
+        decoy.verify(
+            validation_service.validate_item_attributes(item_uid, session), times=1
+        )
+        decoy.verify(
+            review_service.item_validity_changed(
+                item_uid, True, False, review_unit=None, session=session
+            ),
+            times=1,
+        )
+
+    def test_the_outermost_tracker_validates(
+        self,
+        decoy: Decoy,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+        item_uid: UUID,
+    ):
+        # Act
+        with ValidationTracker.track(
+            validation_service, review_service, session
+        ) as outer:
+            with ValidationTracker.track(
+                validation_service, review_service, session
+            ) as inner:
+                inner.attributes_changed(item_uid)
+
+            # Assert: nothing until the outer one is done.
+            assert inner is outer
+            decoy.verify(
+                validation_service.validate_item_attributes(item_uid, session), times=0
+            )
+        decoy.verify(
+            validation_service.validate_item_attributes(item_uid, session), times=1
+        )
+
+    def test_relations_of_the_items_are_validated_together(
+        self,
+        decoy: Decoy,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+    ):
+        # Arrange
+        first, second = uuid4(), uuid4()
+
+        # Act
+        with ValidationTracker.track(
+            validation_service, review_service, session
+        ) as tracker:
+            tracker.relations_changed(first)
+            tracker.relations_changed(second)
+            tracker.relations_changed(first)
+
+        # Assert
+        captor = matchers.Captor()
+        decoy.verify(
+            validation_service.validate_relations_for(captor, session), times=1
+        )
+        assert sorted(captor.value) == sorted([first, second])
+
+    def test_item_is_reported_against_the_unit_read_before_its_relations_changed(
+        self,
+        decoy: Decoy,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+        item_uid: UUID,
+    ):
+        # Arrange
+        unit, later = decoy.mock(cls=DatabaseItem), decoy.mock(cls=DatabaseItem)
+
+        # Act
+        with ValidationTracker.track(
+            validation_service, review_service, session
+        ) as tracker:
+            tracker.relations_changed(item_uid, review_unit=unit)
+            tracker.relations_changed(item_uid, review_unit=later)
+
+        # Assert
+        decoy.verify(
+            review_service.item_validity_changed(
+                item_uid, True, False, review_unit=unit, session=session
+            ),
+            times=1,
+        )
+
+    def test_nothing_is_validated_when_the_work_fails(
+        self,
+        decoy: Decoy,
+        validation_service: ValidationService,
+        review_service: ReviewService,
+        session: Session,
+        item_uid: UUID,
+    ):
+        # Act
+        with (
+            pytest.raises(RuntimeError),
+            ValidationTracker.track(
+                validation_service, review_service, session
+            ) as failed,
+        ):
+            failed.attributes_changed(item_uid)
+            raise RuntimeError()
+
+        # Assert
+        decoy.verify(
+            validation_service.validate_item_attributes(item_uid, session), times=0
+        )
+        with ValidationTracker.track(
+            validation_service, review_service, session
+        ) as tracker:
+            assert tracker is not failed
@@ -12,15 +12,22 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
-"""Tests for the image status transitions of storing."""
+"""Tests for the image status transitions of storing, and for what the status
+says of whether an image is valid."""
 
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from uuid import uuid4
 
 import pytest
+from sqlalchemy import select
 
 from slidetap.database import DatabaseImage
 from slidetap.database.attribute import NotAllowedActionError
+from slidetap.database.item import FAILED_IMAGE_STATUSES
 from slidetap.model import ImageFormat, ImageStatus
+from slidetap.services import DatabaseService
+from tests.conftest import CaseBuilder
 
 
 @pytest.fixture()
@@ -183,3 +190,36 @@ class TestImageStatus:
         assert image.failed
         assert not image.valid
         assert image.selected
+
+
+@pytest.mark.integration
+class TestImageValidity:
+    @pytest.mark.parametrize("status", list(ImageStatus))
+    def test_valid_reads_the_same_in_sql_as_in_python(
+        self,
+        build_case: Callable[[], AbstractContextManager[CaseBuilder]],
+        sqlite_database_service: DatabaseService,
+        status: ImageStatus,
+    ) -> None:
+        """The batch counters select valid images in SQL, and what an image
+        says of itself has to agree with them on every status."""
+        # Arrange
+        with build_case() as case:
+            slide = case.sample("slide", "slide")
+            image = case.image("wsi", "image", [slide])
+            image.valid_attributes = True
+            image.valid_relations = True
+            image.status = status
+            image_uid = image.uid
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            image = session.get_one(DatabaseImage, image_uid)
+            in_python = image.valid
+            in_sql = session.scalar(
+                select(DatabaseImage.valid).where(DatabaseImage.uid == image_uid)
+            )
+
+        # Assert
+        assert bool(in_sql) == bool(in_python)
+        assert bool(in_python) != (status in FAILED_IMAGE_STATUSES)
@@ -0,0 +1,144 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the metrics a process writes out, and the timing of requests."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from slidetap.metrics import (
+    HTTP_REQUEST_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from slidetap.web.request_metrics import RequestMetricsMiddleware
+
+
+@pytest.mark.unittest
+class TestMetricsRegistry:
+    def test_histogram_buckets_count_everything_under_their_bound(self):
+        # Arrange
+        registry = MetricsRegistry()
+        histogram = registry.register(
+            Histogram("test_seconds", "Test.", ("step",), buckets=(0.1, 1.0))
+        )
+
+        # Act
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, step="store")
+
+        # Assert
+        assert registry.render().splitlines() == [
+            "# HELP test_seconds Test.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{step="store",le="0.1"} 1',
+            'test_seconds_bucket{step="store",le="1.0"} 3',
+            'test_seconds_bucket{step="store",le="+Inf"} 4',
+            'test_seconds_sum{step="store"} 6.05',
+            'test_seconds_count{step="store"} 4',
+        ]
+
+    def test_label_values_are_escaped(self):
+        # Arrange
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("test_total", "Test.", ("route",)))
+
+        # Act
+        counter.inc(route='a "quoted"\\path')
+
+        # Assert
+        assert 'test_total{route="a \\"quoted\\"\\\\path"} 1.0' in (
+            registry.render().splitlines()
+        )
+
+    def test_failing_collector_leaves_the_rest_to_be_written(self):
+        # Arrange
+        registry = MetricsRegistry()
+        gauge = registry.register(Gauge("test_jobs", "Test."))
+
+        def fail() -> None:
+            raise RuntimeError("Database is gone.")
+
+        registry.add_collector(fail)
+        registry.add_collector(lambda: gauge.set(3))
+
+        # Act
+        rendered = registry.render()
+
+        # Assert
+        assert "test_jobs 3.0" in rendered.splitlines()
+
+    def test_collector_is_read_once_until_removed(self):
+        # Arrange
+        registry = MetricsRegistry()
+        reads: list[None] = []
+
+        def collect() -> None:
+            reads.append(None)
+
+        registry.add_collector(collect)
+        registry.add_collector(collect)
+
+        # Act
+        registry.render()
+        registry.remove_collector(collect)
+        registry.render()
+
+        # Assert
+        assert len(reads) == 1
+
+    def test_labels_must_be_those_of_the_metric(self):
+        # Arrange
+        counter = Counter("test_total", "Test.", ("route",))
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            counter.inc(path="/api")
+
+
+@pytest.mark.unittest
+class TestRequestMetricsMiddleware:
+    def test_requests_are_timed_by_route_template(self):
+        # Arrange
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware)
+
+        @app.get("/api/test/{uid}")
+        async def get_test(uid: str) -> str:
+            return uid
+
+        route = "/api/test/{uid}"
+        before = HTTP_REQUEST_SECONDS.count(method="GET", route=route, status="200")
+        unmatched = HTTP_REQUEST_SECONDS.count(
+            method="GET", route="unmatched", status="404"
+        )
+        client = TestClient(app)
+
+        # Act
+        client.get("/api/test/1")
+        client.get("/api/test/2")
+        client.get("/api/missing")
+
+        # Assert
+        assert (
+            HTTP_REQUEST_SECONDS.count(method="GET", route=route, status="200")
+            == before + 2
+        )
+        assert (
+            HTTP_REQUEST_SECONDS.count(method="GET", route="unmatched", status="404")
+            == unmatched + 1
+        )
@@ -0,0 +1,165 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for the profiling of requests and tasks, and the counting of the
+queries of a request."""
+
+import pstats
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from slidetap.config import ConfigParser, ProfilingConfig
+from slidetap.profiling import Profiler
+from slidetap.services import DatabaseService
+from slidetap.web.request_profiling import RequestProfilingMiddleware
+
+
+@pytest.mark.unittest
+class TestProfiler:
+    def test_sampled_run_is_written_under_its_kind_name_and_tag(self, tmp_path: Path):
+        # Arrange
+        profiler = Profiler(sample_rate=1.0, directory=tmp_path)
+
+        # Act
+        with profiler.profiling("task", "post_process_image", "42"):
+            sum(range(1000))
+
+        # Assert
+        written = list(tmp_path.joinpath("task").iterdir())
+        assert len(written) == 1
+        assert written[0].name.startswith("post_process_image-42-")
+        assert pstats.Stats(str(written[0])).total_calls > 0
+
+    def test_nothing_is_profiled_when_not_configured(self, tmp_path: Path):
+        # Arrange
+        profiler = Profiler(sample_rate=0.0, directory=tmp_path)
+
+        # Act
+        with profiler.profiling("task", "post_process_image", "42"):
+            sum(range(1000))
+
+        # Assert
+        assert list(tmp_path.iterdir()) == []
+
+    def test_run_sampled_while_another_is_profiled_is_not(self, tmp_path: Path):
+        # Arrange
+        profiler = Profiler(sample_rate=1.0, directory=tmp_path)
+        first = profiler.start()
+
+        # Act
+        second = profiler.start()
+        assert first is not None
+        profiler.finish(first, "task", "first", "1")
+        third = profiler.start()
+        assert third is not None
+        profiler.finish(third, "task", "third", "3")
+
+        # Assert
+        assert second is None
+        assert len(list(tmp_path.joinpath("task").iterdir())) == 2
+
+    def test_config_is_read_from_environment_without_section(self):
+        # Arrange
+        parser = ConfigParser(
+            config={},
+            env={
+                "SLIDETAP_PROFILING_SAMPLE_RATE": "0.25",
+                "SLIDETAP_PROFILING_QUERY_THRESHOLD": "10",
+            },
+        )
+
+        # Act
+        config = ProfilingConfig.parse(parser)
+
+        # Assert
+        assert config == ProfilingConfig(sample_rate=0.25, repeated_query_threshold=10)
+
+    def test_config_rejects_sample_rate_above_one(self):
+        # Arrange
+        parser = ConfigParser(config={"profiling": {"sample_rate": 2}}, env={})
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            ProfilingConfig.parse(parser)
+
+
+@pytest.mark.integration
+class TestQueryCounting:
+    def test_statement_run_once_per_row_is_found_repeated(
+        self, sqlite_database_service: DatabaseService
+    ):
+        # Arrange
+        profiler = Profiler(repeated_query_threshold=2)
+
+        # Act
+        with (
+            profiler.counting_queries() as count,
+            sqlite_database_service.get_session() as session,
+        ):
+            for value in range(3):
+                session.execute(text("SELECT :value"), {"value": value})
+            session.execute(text("SELECT 1"))
+
+        # Assert
+        assert count is not None
+        assert count.queries == 4
+        repeated = count.repeated(2)
+        assert [(statement.statement, statement.count) for statement in repeated] == [
+            ("SELECT ?", 3)
+        ]
+
+    def test_queries_are_not_counted_outside_a_counted_request(
+        self, sqlite_database_service: DatabaseService
+    ):
+        # Arrange
+        profiler = Profiler(repeated_query_threshold=2)
+        with profiler.counting_queries() as count:
+            pass
+
+        # Act
+        with sqlite_database_service.get_session() as session:
+            session.execute(text("SELECT 1"))
+
+        # Assert
+        assert count is not None
+        assert count.queries == 0
+
+
+@pytest.mark.unittest
+class TestRequestProfilingMiddleware:
+    def test_sampled_request_is_written_under_its_route(self, tmp_path: Path):
+        # Arrange
+        app = FastAPI()
+
+        @app.get("/items/{item_uid}")
+        def get_item(item_uid: str) -> str:
+            return item_uid
+
+        app.add_middleware(
+            RequestProfilingMiddleware,
+            profiler=Profiler(sample_rate=1.0, directory=tmp_path),
+        )
+
+        # Act
+        response = TestClient(app).get("/items/abc")
+
+        # Assert
+        assert response.status_code == 200
+        written = list(tmp_path.joinpath("request").iterdir())
+        assert len(written) == 1
+        assert written[0].name.startswith("GET_items_item_uid-")
@@ -0,0 +1,121 @@
+#    Copyright 2026 SECTRA AB
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Tests for deferring the per-image tasks of a batch, and counting jobs.
+
+Against Procrastinate's in-memory connector, which records every query it is
+sent: what is pinned is that the images of a batch are deferred a chunk to a
+query, each job still locked to its own image, and that the jobs deferred are
+counted in the queue of their task.
+"""
+
+from uuid import uuid4
+
+import pytest
+from procrastinate import App as TaskApp
+from procrastinate.testing import InMemoryConnector
+
+from slidetap.task.scheduler import Scheduler
+from slidetap.task.tasks import (
+    TaskQueue,
+    post_process_image,
+    slidetap_tasks,
+    store_image_to_outbox,
+)
+
+
+@pytest.fixture(scope="module")
+def task_app() -> TaskApp:
+    """An app with the tasks registered once, as registering them namespaces
+    the tasks of the blueprint in place."""
+    app = TaskApp(connector=InMemoryConnector())
+    app.add_tasks_from(slidetap_tasks, namespace="slidetap")
+    return app
+
+
+@pytest.fixture()
+def connector(task_app: TaskApp) -> InMemoryConnector:
+    connector = task_app.connector
+    assert isinstance(connector, InMemoryConnector)
+    connector.reset()
+    return connector
+
+
+@pytest.fixture()
+def scheduler(task_app: TaskApp, connector: InMemoryConnector) -> Scheduler:
+    return Scheduler(task_app)
+
+
+@pytest.mark.unittest
+class TestDeferPerImage:
+    @pytest.mark.asyncio
+    async def test_images_are_deferred_a_chunk_to_a_query(
+        self,
+        scheduler: Scheduler,
+        connector: InMemoryConnector,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        # Arrange
+        monkeypatch.setattr(Scheduler, "DEFER_CHUNK_SIZE", 4)
+        image_uids = [uuid4() for _ in range(10)]
+
+        # Act
+        await scheduler.post_process_images(image_uids)
+
+        # Assert
+        assert [name for name, _ in connector.queries] == ["defer_jobs"] * 3
+        assert [
+            (job["args"]["image_uid"], job["lock"]) for job in connector.jobs.values()
+        ] == [(str(uid), f"image-{uid}") for uid in image_uids]
+        assert {job["task_name"] for job in connector.jobs.values()} == {
+            post_process_image.name
+        }
+
+    @pytest.mark.asyncio
+    async def test_images_of_a_batch_are_stored_a_job_each(
+        self,
+        scheduler: Scheduler,
+        connector: InMemoryConnector,
+    ):
+        # Arrange
+        image_uids = [uuid4() for _ in range(3)]
+
+        # Act
+        await scheduler.store_images(image_uids)
+
+        # Assert
+        assert [
+            (job["args"]["image_uid"], job["lock"], job["task_name"])
+            for job in connector.jobs.values()
+        ] == [
+            (str(uid), f"image-{uid}", store_image_to_outbox.name) for uid in image_uids
+        ]
+
+
+@pytest.mark.unittest
+class TestCountJobs:
+    @pytest.mark.asyncio
+    async def test_every_queue_is_counted_by_status(self, scheduler: Scheduler):
+        # Arrange
+        await scheduler.post_process_images([uuid4() for _ in range(3)])
+
+        # Act
+        counts = await scheduler.count_jobs()
+
+        # Assert
+        assert counts == {
+            TaskQueue.IMAGE.value: {"todo": 3, "doing": 0},
+            TaskQueue.METADATA.value: {"todo": 0, "doing": 0},
+            TaskQueue.DEFAULT.value: {"todo": 0, "doing": 0},
+        }